@@ -0,0 +1,111 @@
+"""
+agents/async_runner.py
+
+공유 이벤트 루프
+- 백그라운드 스레드 1개에서 이벤트 루프를 계속 돌리고,
+  Streamlit 세션 스레드 / 콘솔은 코루틴을 제출한 뒤 결과만 기다린다
+- 동시 대화가 많아도 대화마다 스레드를 점유하지 않고 루프 1개를 공유
+- 비동기 LLM/임베딩 클라이언트는 처음 사용한 루프에 묶이므로
+  질문마다 asyncio.run으로 새 루프를 만들지 않고 항상 이 루프를 사용
+"""
+
+import asyncio
+import queue
+import threading
+from typing import Any, AsyncIterator, Coroutine, Iterator, Optional
+
+
+class AsyncRunner:
+    """백그라운드 스레드의 이벤트 루프 (프로세스 전체 공유)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """이벤트 루프 반환 (최초 호출 시 스레드 시작)"""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(
+                        target=loop.run_forever, name="graph-event-loop", daemon=True
+                    )
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        코루틴을 공유 루프에서 실행하고 결과 대기 (호출 스레드만 블록)
+
+        Args:
+            coro: 실행할 코루틴 (예: graph.ainvoke(...))
+            timeout: 최대 대기 시간 (초, None이면 무제한)
+
+        Returns:
+            코루틴 결과 (예외는 그대로 raise)
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def iterate(self, agen: AsyncIterator) -> Iterator:
+        """
+        비동기 이터레이터를 공유 루프에서 돌리며 항목을 하나씩 동기로 전달
+
+        (예: graph.astream 이벤트를 Streamlit 세션 스레드에서 for 문으로 소비)
+        소비 측이 중간에 멈추면 루프 쪽 작업도 취소한다.
+
+        Args:
+            agen: 비동기 이터레이터
+
+        Yields:
+            agen의 항목 (예외는 그대로 raise)
+        """
+        items: "queue.Queue" = queue.Queue()
+        end = object()
+
+        async def pump():
+            try:
+                async for item in agen:
+                    items.put((item, None))
+            except BaseException as e:
+                # 취소(CancelledError)도 전달해야 소비 측이 items.get()에서 멈추지 않음
+                items.put((end, e))
+                if not isinstance(e, Exception):
+                    raise
+                return
+            items.put((end, None))
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self.loop)
+        try:
+            while True:
+                item, error = items.get()
+                if error is not None:
+                    raise error
+                if item is end:
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+    def stop(self):
+        """루프 정지 (테스트/종료 시)"""
+        with self._lock:
+            if self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+
+# 전역 러너
+async_runner = AsyncRunner()
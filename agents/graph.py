@@ -1,6 +1,9 @@
+from typing import Any, Dict, Iterator, Optional, Tuple
+
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from agents.state import StatsChatbotState
+from agents.async_runner import async_runner
 from agents.nodes import (
     classify_intent,
     search_tables,
@@ -11,29 +14,57 @@ from agents.nodes import (
     analyze_insight,
     plan_visualization,
     generate_response,
+    aclassify_intent,
+    asearch_tables,
+    agenerate_sql,
+    aexecute_sql,
+    aprocess_data,
+    aanalyze_insight,
+    aplan_visualization,
+    agenerate_response,
 )
+from config.settings import settings
+
+# 노드 이름 → (동기 버전, 비동기 버전)
+# request_clarification은 I/O 없이 interrupt만 하므로 양쪽 그래프에서 그대로 사용
+NODES = {
+    "classify_intent": (classify_intent, aclassify_intent),
+    "search_tables": (search_tables, asearch_tables),
+    "request_clarification": (request_clarification, request_clarification),
+    "generate_sql": (generate_sql, agenerate_sql),
+    "execute_sql": (execute_sql, aexecute_sql),
+    "process_data": (process_data, aprocess_data),
+    "analyze_insight": (analyze_insight, aanalyze_insight),
+    "plan_visualization": (plan_visualization, aplan_visualization),
+    "generate_response": (generate_response, agenerate_response),
+}
 
 
-def create_stats_chatbot_graph():
-    """통계 챗봇 그래프 생성 및 컴파일"""
+def create_stats_chatbot_graph(use_async: Optional[bool] = None):
+    """
+    통계 챗봇 그래프 생성 및 컴파일
+
+    Args:
+        use_async: True면 비동기 노드 (ainvoke / astream 전용),
+                   False면 동기 노드 (invoke), None이면 settings.GRAPH_ASYNC_ENABLED
+    """
+    if use_async is None:
+        use_async = settings.GRAPH_ASYNC_ENABLED
 
     # StateGraph 생성
     graph = StateGraph(StatsChatbotState)
 
     # 노드 추가
-    graph.add_node("classify_intent", classify_intent)
-    graph.add_node("search_tables", search_tables)
-    graph.add_node("request_clarification", request_clarification)
-    graph.add_node("generate_sql", generate_sql)
-    graph.add_node("execute_sql", execute_sql)
-    graph.add_node("process_data", process_data)
-    graph.add_node("analyze_insight", analyze_insight)
-    graph.add_node("plan_visualization", plan_visualization)
-    graph.add_node("generate_response", generate_response)
+    for name, (node, anode) in NODES.items():
+        graph.add_node(name, anode if use_async else node)
 
     # 진입점 설정
     graph.set_entry_point("classify_intent")
 
+    # 병렬 합류: execute_sql 이후 (process_data → analyze_insight)와
+    # plan_visualization이 동시에 실행되고, 둘 다 끝나야 응답 생성
+    graph.add_edge(["analyze_insight", "plan_visualization"], "generate_response")
+
     # 체크포인터 설정 (대화 상태 저장용)
     checkpointer = MemorySaver()
 
@@ -43,5 +74,115 @@ def create_stats_chatbot_graph():
     return compiled_graph
 
 
+def run_graph(graph, state: dict, config: dict) -> dict:
+    """
+    그래프 실행 (동기 호출용 진입점 - Streamlit 세션, 콘솔)
+
+    비동기 그래프면 공유 이벤트 루프에서 ainvoke하고 결과만 기다린다
+    (대화마다 스레드가 네트워크 응답을 기다리며 묶여 있지 않음).
+
+    Args:
+        graph: create_stats_chatbot_graph() 결과
+        state: 입력 상태
+        config: {"configurable": {"thread_id": ...}}
+
+    Returns:
+        최종 상태
+    """
+    if settings.GRAPH_ASYNC_ENABLED:
+        return async_runner.run(graph.ainvoke(state, config=config))
+    return graph.invoke(state, config=config)
+
+
+def stream_graph(graph, state: dict, config: dict) -> Iterator[Tuple[str, Any]]:
+    """
+    그래프 실행 + 진행 이벤트 스트리밍 (동기 이터레이터)
+
+    노드가 끝날 때마다 진행 메시지를, generate_response의 LLM 출력은 토큰 단위로
+    내보내므로 전체 노드가 끝나기 전에 화면에 표시할 수 있다.
+
+    Args:
+        graph: create_stats_chatbot_graph() 결과
+        state: 입력 상태
+        config: {"configurable": {"thread_id": ...}}
+
+    Yields:
+        ("progress", 진행 메시지) / ("token", 응답 텍스트 조각) /
+        ("done", 최종 상태) - done은 항상 마지막 1번
+    """
+    modes = ["updates", "custom", "values"]
+    if settings.GRAPH_ASYNC_ENABLED:
+        chunks = async_runner.iterate(
+            graph.astream(state, config=config, stream_mode=modes)
+        )
+    else:
+        chunks = graph.stream(state, config=config, stream_mode=modes)
+
+    final_state: Dict[str, Any] = {}
+    for mode, chunk in chunks:
+        if mode == "values":
+            final_state = chunk
+        elif mode == "custom":
+            if isinstance(chunk, dict) and chunk.get("token"):
+                yield "token", chunk["token"]
+        else:
+            for node, update in chunk.items():
+                message = describe_progress(node, update)
+                if message:
+                    yield "progress", message
+
+    yield "done", final_state
+
+
+def describe_progress(node: str, update: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    노드 완료 이벤트 → 사용자에게 보여줄 진행 메시지
+
+    Args:
+        node: 노드 이름
+        update: 노드가 반환한 상태 업데이트
+
+    Returns:
+        진행 메시지 (보여줄 게 없으면 None)
+    """
+    if not isinstance(update, dict):
+        return None
+
+    if node == "classify_intent":
+        if update.get("scenario_type") in (None, "out_of_scope"):
+            return None
+        reasoning = update.get("reasoning")
+        return f"🎯 질문 분류: {update['scenario_type']}" + (
+            f" ({reasoning})" if reasoning else ""
+        )
+
+    if node == "search_tables":
+        tables = [t["table_name"] for t in update.get("tables_info") or []]
+        if not tables:
+            return "🔎 관련 테이블을 찾지 못했습니다"
+        return f"🔎 테이블 {len(tables)}개: {', '.join(tables)}"
+
+    if node == "generate_sql" and update.get("sql_query"):
+        return f"🛠️ SQL 생성: `{update['sql_query']}`"
+
+    if node == "execute_sql":
+        if update.get("sql_error"):
+            return f"🔁 SQL 재시도: {str(update['sql_error']).splitlines()[0]}"
+        if update.get("query_result") is not None:
+            return f"📊 조회 결과: {len(update['query_result'])}행"
+        return None
+
+    if node == "process_data" and update.get("processed_data"):
+        return "🧮 데이터 계산 완료"
+
+    if node == "analyze_insight" and update.get("insight"):
+        return "💡 인사이트 분석 완료"
+
+    if node == "plan_visualization" and update.get("chart_spec"):
+        return "📈 차트 준비 완료"
+
+    return None
+
+
 # 그래프 인스턴스 생성
 stats_chatbot = create_stats_chatbot_graph()
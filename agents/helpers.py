@@ -7,7 +7,7 @@ agents/helpers.py
 import re
 import json
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+from agents.llm_clients import llm_registry
 from config.settings import settings
 
 # ============================================
@@ -17,72 +17,70 @@ from config.settings import settings
 
 def get_llm():
     """
-    LLM 인스턴스 반환
+    LLM 인스턴스 반환 (JSON 응답, 프로세스 전체 공유 클라이언트)
 
     Returns:
-        ChatGoogleGenerativeAI 인스턴스
-    """
-    return ChatGoogleGenerativeAI(
-        model=settings.MODEL_NAME,
-        temperature=settings.TEMPERATURE,
-        google_api_key=settings.GOOGLE_API_KEY,
-        response_mime_type="application/json",
-        max_output_tokens=8192,
-    )
+        PooledLLM (ChatGoogleGenerativeAI 래퍼)
+    """
+    return llm_registry.get("json")
 
 
 def get_llm_text():
-    """텍스트 출력 전용 (JSON 모드 없음)"""
-    return ChatGoogleGenerativeAI(
-        model=settings.MODEL_NAME,
-        temperature=settings.TEMPERATURE,
-        google_api_key=settings.GOOGLE_API_KEY,
-        max_output_tokens=8192,
-    )
+    """텍스트 출력 전용 (JSON 모드 없음, 공유 클라이언트)"""
+    return llm_registry.get("text")
 
 
-def extract_calculation_hints(user_query: str) -> list:
+def llm_stats() -> dict:
+    """LLM 클라이언트별 호출 수 / 에러 / 지연 시간 지표"""
+    return llm_registry.stats()
+
+
+# (질문 패턴, 계산 힌트, 계산 종류)
+# 종류: derived (파생 지표), aggregate (집계), rank (정렬/추출), change (변화량)
+CALCULATION_HINTS = [
+    (re.compile(r"증가율|감소율|증감"), "시간에 따른 증가율 또는 감소율 계산", "derived"),
+    (re.compile(r"비율|성비|비중"), "항목 간 비율 계산", "derived"),
+    (re.compile(r"평균"), "평균값 계산", "aggregate"),
+    (re.compile(r"상위\s*(\d+)"), "상위 {}개 추출 및 정렬", "rank"),
+    (re.compile(r"하위\s*(\d+)"), "하위 {}개 추출 및 정렬", "rank"),
+    (re.compile(r"변화|차이"), "값의 변화량 계산", "change"),
+]
+
+DEFAULT_CALCULATION_HINT = "질문에 맞는 적절한 계산 수행"
+
+
+def match_calculation_hints(user_query: str) -> list:
     """
-    사용자 질문에서 계산 힌트 추출
+    질문에서 계산 힌트와 계산 종류 추출
 
     Args:
         user_query: 사용자 질문
 
     Returns:
-        list: 계산 힌트 리스트
+        list: [(계산 힌트, 계산 종류)] - 매칭된 것이 없으면 빈 리스트
     """
-    hints = []
-
-    # 증가율/감소율
-    if "증가율" in user_query or "감소율" in user_query or "증감" in user_query:
-        hints.append("시간에 따른 증가율 또는 감소율 계산")
-
-    # 비율
-    if "비율" in user_query or "성비" in user_query or "비중" in user_query:
-        hints.append("항목 간 비율 계산")
+    matched = []
+    for pattern, hint, kind in CALCULATION_HINTS:
+        match = pattern.search(user_query)
+        if match:
+            matched.append((hint.format(*match.groups()), kind))
+    return matched
 
-    # 평균
-    if "평균" in user_query:
-        hints.append("평균값 계산")
 
-    # 상위 N개
-    top_match = re.search(r"상위\s*(\d+)", user_query)
-    if top_match:
-        n = top_match.group(1)
-        hints.append(f"상위 {n}개 추출 및 정렬")
+def extract_calculation_hints(user_query: str) -> list:
+    """
+    사용자 질문에서 계산 힌트 추출
 
-    # 하위 N개
-    bottom_match = re.search(r"하위\s*(\d+)", user_query)
-    if bottom_match:
-        n = bottom_match.group(1)
-        hints.append(f"하위 {n}개 추출 및 정렬")
+    Args:
+        user_query: 사용자 질문
 
-    # 변화량
-    if "변화" in user_query or "차이" in user_query:
-        hints.append("값의 변화량 계산")
+    Returns:
+        list: 계산 힌트 리스트
+    """
+    hints = [hint for hint, _ in match_calculation_hints(user_query)]
 
     # 힌트 없으면 기본
-    return hints if hints else ["질문에 맞는 적절한 계산 수행"]
+    return hints if hints else [DEFAULT_CALCULATION_HINT]
 
 
 def validate_calculation_result(result: dict) -> bool:
@@ -112,66 +110,124 @@ def validate_calculation_result(result: dict) -> bool:
 
 
 # ============================================
-# 나중에 MapleRepair용으로 추가할 함수들
+# SQL 로컬 검증 (DB 실행 전)
 # ============================================
 
 
+def get_value_dictionary():
+    """
+    범주 값 사전 (VALUE_DICT_ENABLED가 꺼져 있으면 None)
+
+    Returns:
+        ValueDictionary 또는 None
+    """
+    if not settings.VALUE_DICT_ENABLED:
+        return None
+    from database.value_dictionary import get_value_dictionary as get_dictionary
+
+    return get_dictionary()
+
+
+def _validation_context(tables_info: list) -> tuple:
+    """(스키마, 값 조회 함수) - 범주 값 사전이 있으면 실제 기간/값 사용"""
+    from database.sql_validator import schema_for_tables
+
+    dictionary = get_value_dictionary()
+    if dictionary is None:
+        return schema_for_tables(tables_info), None
+    return schema_for_tables(tables_info, dictionary.periods()), dictionary.lookup
+
+
 def validate_schema(sql_query: str, tables_info: list) -> str:
     """
     SQL 스키마 검증 (Rule-based)
 
+    - 테이블명 / 컬럼명 / 별칭 존재 여부 (오타면 비슷한 이름 제안), 다른 DB 전용 함수
+    - 괄호가 든 컬럼명 따옴표, 연령대 표기, 시간 컬럼 형식/기간
+    - 범주 값 사전에 없는 값 (항목, 행정구역 등)
+
     Args:
         sql_query: 생성된 SQL 쿼리
-        tables_info: 사용 가능한 테이블 정보
+        tables_info: 사용 가능한 테이블 정보 (검색 시점의 상세 정보 우선)
 
     Returns:
         str: 에러 메시지 (없으면 빈 문자열)
+    """
+    from database.sql_validator import check_schema
+
+    schema, value_lookup = _validation_context(tables_info)
+    return "\n".join(check_schema(sql_query, schema, value_lookup))
+
+
+def repair_sql(
+    sql_query: str, tables_info: list, user_query: str = "", error_msg: str = ""
+) -> tuple:
+    """
+    SQL 규칙 기반 자동 수정 (LLM 재생성 전)
+
+    - 실행 전: 코드블록, 괄호 컬럼 따옴표, 연령대/시간 값 형식, 행정구역 != '전국',
+      범주 값 사전에 없는 값 ('서울' → '서울특별시') 등
+    - DB 에러 후: classify_sql_error로 에러 종류를 나눠 해당 규칙만 적용
 
-    TODO: MapleRepair 적용 시 구현
-    - 테이블명 존재 여부 확인
-    - 컬럼명 존재 여부 확인
-    - 오타 체크
+    Args:
+        sql_query: 생성된 SQL 쿼리
+        tables_info: 사용 가능한 테이블 정보
+        user_query: 사용자 질문
+        error_msg: DB 에러 메시지 (없으면 실행 전 수정)
+
+    Returns:
+        tuple: (수정된 SQL, 적용한 수정 설명 리스트)
     """
-    # TODO: 구현 필요
-    return ""
+    from database.sql_repair import repair_sql as repair
+
+    schema, value_lookup = _validation_context(tables_info)
+    return repair(
+        sql_query,
+        schema,
+        user_query,
+        error_kind=classify_sql_error(error_msg) if error_msg else None,
+        error=error_msg,
+        value_lookup=value_lookup,
+    )
 
 
 def validate_syntax(sql_query: str) -> str:
     """
     SQL 문법 검증 (Rule-based)
 
+    - 조회 쿼리(SELECT/WITH) 1개인지
+    - 괄호 / 따옴표 짝, 끝나지 않은 절, 쉼표 위치
+
     Args:
         sql_query: 생성된 SQL 쿼리
 
     Returns:
         str: 에러 메시지 (없으면 빈 문자열)
-
-    TODO: MapleRepair 적용 시 구현
-    - SELECT 키워드 포함 여부
-    - 괄호 매칭
-    - 기본 문법 체크 (sqlparse 사용)
     """
-    # TODO: 구현 필요
-    return ""
+    from database.sql_validator import check_syntax
+
+    return "\n".join(check_syntax(sql_query))
 
 
 def classify_sql_error(error_msg: str) -> str:
     """
-    SQL 에러 메시지 분류
+    SQL 에러 메시지 분류 (자동 수정 규칙 선택용)
 
     Args:
         error_msg: Exception 에러 메시지
 
     Returns:
         str: 에러 타입 ("schema", "syntax", "value", "other")
-
-    TODO: MapleRepair 적용 시 구현
     """
     error_lower = error_msg.lower()
 
     if "no such table" in error_lower or "no such column" in error_lower:
         return "schema"
-    elif "syntax error" in error_lower:
+    elif "no such function" in error_lower:
+        return "schema"
+    elif "syntax error" in error_lower or "unrecognized token" in error_lower:
+        return "syntax"
+    elif "incomplete input" in error_lower or "unterminated" in error_lower:
         return "syntax"
     elif "datatype mismatch" in error_lower or "invalid" in error_lower:
         return "value"
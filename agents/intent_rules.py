@@ -0,0 +1,322 @@
+"""
+agents/intent_rules.py
+
+규칙 기반 질문 분류 (classify_intent의 LLM 호출 전 빠른 경로)
+- 카테고리 키워드(detect_category) + 계산 힌트(match_calculation_hints)
+  + 질문 패턴(연도 수, 기간/추이 표현, 집계/순위 표현, 통계와 무관한 표현)
+- 분류마다 확신도(0~1)를 매기고, 설정한 임계값 이상일 때만 LLM 없이 확정
+- 지시어로 이전 대화를 참조하는 질문, 신호가 겹치는 질문은 LLM으로 넘긴다
+- 규칙 분류와 LLM 분류의 일치 여부 로그 (JSONL + 누적 일치율)
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from agents.helpers import match_calculation_hints
+from config.settings import settings
+
+# 통계와 무관한 주제 ("영화 관람객 수"처럼 통계 질문일 수도 있음 → LLM 확인)
+OFF_TOPIC_PATTERN = re.compile(
+    r"날씨|맛집|메뉴|레시피|여행지|영화|드라마|노래|게임|코드|파이썬|프로그래밍"
+)
+
+# 통계 조회가 아닌 요청/대화 (카테고리 키워드가 없을 때만 범위 외로 확정)
+OFF_TOPIC_REQUEST_PATTERN = re.compile(
+    r"추천\s*해|짜\s*줘|만들어\s*줘|번역|농담|운세|안녕|고마워|너는 누구|누구야|"
+    r"어때\s*\??\s*$"
+)
+
+# 통계 질문임을 보여주는 표현 (카테고리 키워드가 없어도 범위 내일 수 있음)
+STAT_TERM_PATTERN = re.compile(
+    r"통계|수치|지표|데이터|몇\s*명|얼마|건수|비율|률|전국|시도|지역"
+)
+
+# 이전 대화 참조 (지시어 해석은 LLM에 맡김)
+CONTEXT_REFERENCE_PATTERN = re.compile(
+    r"^\s*(그럼|그러면|그리고|그건|그거)|그\s*(연도|해|지역|때|값|데이터)|"
+    r"거기|그때|아까|이전|위\s*(결과|데이터)"
+)
+
+YEAR_PATTERN = re.compile(r"(?<!\d)(?:19|20)\d{2}(?!\d)")
+
+# 여러 행(기간/추이) 조회 표현
+SERIES_PATTERN = re.compile(
+    r"추이|추세|동안|년간|개년|개월간|연도별|년도별|월별|분기별|매년|매월|"
+    r"부터|까지|~|최근\s*\d+\s*(년|개월)"
+)
+
+# SQL 집계 표현 (합계, 평균, 최대/최소, 차이)
+AGGREGATE_PATTERN = re.compile(
+    r"합계|총합|합은|평균|최대|최소|가장|제일|차이|합친|더한|뺀|나눈"
+)
+
+# 파생 계산 표현 (증가율, 비중, 배수, 밀도 등)
+DERIVED_PATTERN = re.compile(
+    r"증가율|감소율|증감률|성비|비중|비율|점유율|몇\s*배|몇\s*%|몇\s*퍼센트|밀도|대비"
+)
+
+# 순위 / 상위 N개 표현
+RANK_PATTERN = re.compile(r"(상위|하위)\s*\d+|순위|\d+\s*(위|곳)")
+
+# 정해진 수로 하는 산술 (10%, 2배, 나누기) → 단일 값이 아니라 계산
+ARITHMETIC_PATTERN = re.compile(
+    r"\d+(\.\d+)?\s*(%|퍼센트|배)|나누기|곱하기|더하기|빼기|곱한|나눈|더한|뺀"
+)
+
+# 시도 이름 (2곳 이상이면 단일 값이 아님)
+REGION_PATTERN = re.compile(
+    r"서울|부산|대구|인천|광주|대전|울산|세종|경기|강원|충북|충남|전북|전남|"
+    r"경북|경남|제주"
+)
+
+# 여러 대상을 나열하는 표현 ("A 지역과 B 지역", "남자 및 여자")
+MULTI_TARGET_PATTERN = re.compile(r"\S(와|과)\s|및|,")
+
+# 단일 값을 묻는 표현
+SINGLE_ASK_PATTERN = re.compile(r"얼마|몇\s*명|알려\s*줘")
+
+# 조사로 끝나는 질문 ("...는?") - 거의 모든 질문에 맞으므로 약한 신호
+PARTICLE_END_PATTERN = re.compile(r"(은|는|이|가)\s*\??\s*$")
+
+
+@dataclass(frozen=True)
+class IntentGuess:
+    """규칙 분류 결과"""
+
+    scenario_type: Optional[str]  # 추정 시나리오 (판단 불가면 None)
+    confidence: float  # 0~1 (임계값 이상이면 LLM 없이 확정)
+    features: Tuple[str, ...]  # 판단에 쓴 신호 (로그/분류 이유용)
+
+    @property
+    def reasoning(self) -> str:
+        return "규칙 분류: " + ", ".join(self.features)
+
+
+def classify_by_rules(user_query: str, conversation_history: str = "") -> IntentGuess:
+    """
+    규칙 기반 질문 분류
+
+    Args:
+        user_query: 사용자 질문
+        conversation_history: 이전 대화 (지시어 참조 판단용)
+
+    Returns:
+        IntentGuess
+    """
+    from database.vector_db import detect_category, match_query
+
+    query = user_query.strip()
+    features = []
+
+    # 1. 이전 대화 참조 → LLM
+    has_history = conversation_history not in ("", "없음", None)
+    if has_history and CONTEXT_REFERENCE_PATTERN.search(query):
+        return IntentGuess(None, 0.0, ("이전 대화 참조",))
+
+    # 2. 카테고리 (키워드 매칭)
+    category = detect_category(query, match_query(query))
+    if category == "meta":
+        return IntentGuess(None, 0.0, ("메타 질문",))
+    if category:
+        features.append(f"카테고리={category}")
+
+    # 3. 계산 힌트 + 질문 패턴
+    kinds = {kind for _, kind in match_calculation_hints(query)}
+    derived = "derived" in kinds or bool(DERIVED_PATTERN.search(query))
+    rank = "rank" in kinds or bool(RANK_PATTERN.search(query))
+    aggregate = "aggregate" in kinds or bool(AGGREGATE_PATTERN.search(query))
+    series = bool(SERIES_PATTERN.search(query))
+    years = len(set(YEAR_PATTERN.findall(query)))
+    arithmetic = bool(ARITHMETIC_PATTERN.search(query))
+    regions = len(set(REGION_PATTERN.findall(query)))
+    multi_target = regions >= 2 or bool(MULTI_TARGET_PATTERN.search(query))
+    single_ask = bool(SINGLE_ASK_PATTERN.search(query))
+    particle_end = bool(PARTICLE_END_PATTERN.search(query))
+    if "change" in kinds and not series:
+        aggregate = True  # "차이" → 집계, "변화 추이" → 표 조회
+
+    # 4. 범위 외 (무관한 주제만으로는 확정하지 않고, 통계가 아닌 요청이 있어야 확정)
+    off_topic = bool(OFF_TOPIC_PATTERN.search(query))
+    off_topic_request = bool(OFF_TOPIC_REQUEST_PATTERN.search(query))
+    stat_term = bool(STAT_TERM_PATTERN.search(query)) or derived or years > 0
+    if category is None and not stat_term:
+        if off_topic_request:
+            return IntentGuess("out_of_scope", 0.95, ("통계 무관 요청",))
+        if off_topic:
+            return IntentGuess("out_of_scope", 0.6, ("통계 무관 주제",))
+        return IntentGuess("out_of_scope", 0.5, ("통계 키워드 없음",))
+    if off_topic:
+        features.append("통계 무관 표현")
+        return IntentGuess(None, 0.0, tuple(features))
+
+    for name, on in (
+        ("파생 계산", derived),
+        ("순위", rank),
+        ("집계", aggregate),
+        ("산술", arithmetic),
+        ("기간", series),
+        (f"연도 {years}개", years > 0),
+        ("여러 대상", multi_target),
+        ("단일 값 질문", single_ask),
+        ("조사 어미", particle_end),
+    ):
+        if on:
+            features.append(name)
+    features = tuple(features)
+
+    scenario_type, confidence = _scenario_from_features(
+        derived,
+        rank,
+        aggregate,
+        arithmetic,
+        series,
+        years,
+        regions,
+        multi_target,
+        single_ask,
+        particle_end,
+    )
+    if category is None:
+        # 카테고리 키워드 없이 표현만으로는 확정하지 않음
+        confidence = min(confidence, 0.7)
+    return IntentGuess(scenario_type, confidence, features)
+
+
+def _scenario_from_features(
+    derived: bool,
+    rank: bool,
+    aggregate: bool,
+    arithmetic: bool,
+    series: bool,
+    years: int,
+    regions: int,
+    multi_target: bool,
+    single_ask: bool,
+    particle_end: bool,
+) -> Tuple[str, float]:
+    """
+    범위 내 질문의 시나리오와 확신도 (신호가 겹치면 확신도를 낮춤)
+
+    single_value는 산술 표현이나 여러 대상이 없고 연도가 1개일 때만 확정한다.
+    단일 값 표현(얼마, 몇 명, 알려줘)이 있거나, 지역 1곳 + 조사 어미
+    ("2023년 서울 인구는?")여야 하며 그 밖의 조사 어미만으로는 확정하지 않음.
+    """
+    if derived and rank:
+        return "multi_step_analysis", 0.9
+    if derived:
+        return "derived_calculation", 0.6 if aggregate else 0.9
+    if rank:
+        return "simple_aggregation", 0.6
+    if aggregate:
+        return "simple_aggregation", 0.6 if series else 0.9
+    if arithmetic:
+        return "simple_aggregation", 0.6  # "10% 이상인 지역" 같은 조건일 수도 있음
+    if series or years >= 2:
+        return "table_view", 0.9
+    if multi_target:
+        return "table_view", 0.6  # 여러 지역/항목 나열 → 표 또는 비교
+    if years == 1 and (single_ask or (regions == 1 and particle_end)):
+        return "single_value", 0.9
+    if single_ask or particle_end:
+        return "single_value", 0.6  # 연도 없음 / 조사 어미만 → LLM 확인
+    return "table_view", 0.4
+
+
+# ============================================================
+# 규칙 vs LLM 일치 로그
+# ============================================================
+
+
+class IntentAgreementLog:
+    """
+    규칙 분류 / LLM 분류 일치 로그 (스레드 안전)
+
+    - fast: 규칙으로 확정 (LLM 호출 없음)
+    - shadow: 규칙으로 확정할 수 있었지만 표본 검사로 LLM도 호출 (LLM 결과 사용)
+    - escalated: 확신도 미달로 LLM 호출
+    """
+
+    def __init__(self, path: Optional[str]):
+        """
+        Args:
+            path: JSONL 파일 경로 (None/빈 문자열이면 메모리 지표만)
+        """
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self.modes: Counter = Counter()
+        self.compared: Counter = Counter()  # 모드별 LLM과 비교한 수
+        self.agreed: Counter = Counter()  # 모드별 일치 수
+        self.confusion: Counter = Counter()  # (규칙, LLM) 불일치 쌍
+
+    def record(
+        self, user_query: str, guess: IntentGuess, mode: str, llm_type: Optional[str]
+    ):
+        """
+        분류 1건 기록 (실패해도 요청 처리에는 영향 없음)
+
+        Args:
+            user_query: 사용자 질문
+            guess: 규칙 분류 결과
+            mode: "fast", "shadow", "escalated"
+            llm_type: LLM 분류 결과 (fast면 None)
+        """
+        agreed = None
+        with self._lock:
+            self.modes[mode] += 1
+            if llm_type is not None and guess.scenario_type is not None:
+                agreed = guess.scenario_type == llm_type
+                self.compared[mode] += 1
+                self.agreed[mode] += agreed
+                if not agreed:
+                    self.confusion[(guess.scenario_type, llm_type)] += 1
+
+        if self.path is None:
+            return
+        entry = {
+            "ts": round(time.time(), 3),
+            "query": user_query,
+            "mode": mode,
+            "rule_type": guess.scenario_type,
+            "confidence": guess.confidence,
+            "features": list(guess.features),
+            "llm_type": llm_type,
+            "agreed": agreed,
+        }
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️  분류 로그 기록 실패: {e}")
+
+    def stats(self) -> Dict:
+        """모드별 건수, LLM 대비 일치율, 자주 틀리는 쌍"""
+        with self._lock:
+            total = sum(self.modes.values())
+            return {
+                "total": total,
+                "fast_path_rate": (
+                    round(self.modes["fast"] / total, 3) if total else 0.0
+                ),
+                "modes": dict(self.modes),
+                "agreement": {
+                    mode: round(self.agreed[mode] / count, 3)
+                    for mode, count in self.compared.items()
+                    if count
+                },
+                "top_confusions": [
+                    f"{rule}→{llm} ({count})"
+                    for (rule, llm), count in self.confusion.most_common(5)
+                ],
+            }
+
+
+# 전역 분류 로그
+intent_log = IntentAgreementLog(settings.INTENT_LOG_PATH)
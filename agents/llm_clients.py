@@ -0,0 +1,356 @@
+"""
+agents/llm_clients.py
+
+공유 LLM 클라이언트 레지스트리
+- (모델, 출력 모드, temperature)별 ChatGoogleGenerativeAI 1개를 프로세스 전체가 재사용
+  (노드 호출마다 새로 만들지 않으므로 gRPC/HTTP 연결이 keep-alive로 유지됨)
+- 프로세스 전체 동시 호출 수 제한 (LLM_MAX_CONCURRENCY, API 할당량 보호)
+- 클라이언트별 지표 (호출 수, 에러, 지연 시간, 대기 시간, 동시 호출 수)
+- 동기(invoke) / 비동기(ainvoke) 호출이 같은 동시 호출 제한과 지표를 공유
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Iterator, Optional, Tuple, Union
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+from config.settings import settings
+
+# 출력 모드 → 추가 생성 옵션
+OUTPUT_MODES = {
+    "json": {"response_mime_type": "application/json"},
+    "text": {},
+}
+
+
+class LLMMetrics:
+    """LLM 클라이언트 1개의 호출 지표 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_wait = 0.0
+        self.last_error: Optional[str] = None
+
+    def record_start(self, wait: float):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.total_wait += wait
+
+    def record_end(self, latency: float, error: Optional[BaseException] = None):
+        with self._lock:
+            self.in_flight -= 1
+            self.calls += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            if error is not None:
+                self.errors += 1
+                self.last_error = f"{type(error).__name__}: {error}"
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "avg_latency_ms": (
+                    round(self.total_latency / self.calls * 1000, 1)
+                    if self.calls
+                    else 0.0
+                ),
+                "max_latency_ms": round(self.max_latency * 1000, 1),
+                "avg_wait_ms": (
+                    round(self.total_wait / self.calls * 1000, 2) if self.calls else 0.0
+                ),
+                "last_error": self.last_error,
+            }
+
+
+class ConcurrencyLimiter:
+    """
+    프로세스 전체 동시 호출 제한 (스레드 / asyncio 공용, 먼저 기다린 순서대로)
+
+    스레드는 Event로, 코루틴은 자기 이벤트 루프의 Future로 기다리므로
+    비동기 호출이 이벤트 루프를 막거나 슬롯을 폴링하지 않는다.
+    반납된 슬롯은 다음 대기자에게 바로 넘어간다 (사용 중 수는 그대로).
+    """
+
+    def __init__(self, limit: int):
+        """
+        Args:
+            limit: 최대 동시 호출 수 (1 이상)
+        """
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters: Deque[
+            Union[threading.Event, Tuple[asyncio.AbstractEventLoop, asyncio.Future]]
+        ] = deque()
+
+    @property
+    def active(self) -> int:
+        """사용 중인 슬롯 수"""
+        return self._active
+
+    def _try_acquire(self) -> bool:
+        """대기자가 없고 빈 슬롯이 있으면 바로 차지 (잠금 안에서 호출)"""
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            return True
+        return False
+
+    def acquire(self):
+        """슬롯 대여 (스레드 블로킹)"""
+        with self._lock:
+            if self._try_acquire():
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        event.wait()
+
+    async def acquire_async(self):
+        """슬롯 대여 (이벤트 루프를 막지 않고 대기, 취소되면 대기열에서 빠짐)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_acquire():
+                return
+            future = loop.create_future()
+            waiter = (loop, future)
+            self._waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # 슬롯을 넘겨받은 직후 취소됨 → 반납 (Future가 취소됐으면 _hand_over가 반납)
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        """슬롯 반납 (대기자가 있으면 그대로 넘겨줌)"""
+        with self._lock:
+            if not self._waiters:
+                self._active -= 1
+                return
+            waiter = self._waiters.popleft()
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+        else:
+            loop, future = waiter
+            loop.call_soon_threadsafe(self._hand_over, future)
+
+    def _hand_over(self, future: asyncio.Future):
+        """대기 중인 코루틴에 슬롯 전달 (그 사이 취소됐으면 다음 대기자에게)"""
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+
+class PooledLLM:
+    """
+    공유 LLM 클라이언트 (동시 호출 수 제한 + 지표)
+
+    invoke / ainvoke / stream / astream은 슬롯을 얻은 뒤 실제 클라이언트에 위임하고,
+    그 밖의 속성(model, temperature 등)은 실제 클라이언트 것을 그대로 보여준다.
+    """
+
+    def __init__(self, name: str, client, limiter: Optional[ConcurrencyLimiter]):
+        """
+        Args:
+            name: 지표 이름 (예: "gemini-2.5-flash/json")
+            client: ChatGoogleGenerativeAI 인스턴스
+            limiter: 프로세스 전체 동시 호출 제한 (None이면 제한 없음)
+        """
+        self.name = name
+        self.client = client
+        self.limiter = limiter
+        self.metrics = LLMMetrics()
+
+    def _start(self, started: float) -> float:
+        """슬롯을 얻은 뒤 호출 시작 기록 → 호출 시작 시각"""
+        called = time.perf_counter()
+        self.metrics.record_start(called - started)
+        return called
+
+    def _finish(self, called: float, error: Optional[Exception] = None):
+        """호출 종료 기록 + 슬롯 반납"""
+        self.metrics.record_end(time.perf_counter() - called, error)
+        if self.limiter is not None:
+            self.limiter.release()
+
+    def _acquire(self) -> float:
+        """동시 호출 슬롯 대여 (스레드 블로킹) → 호출 시작 시각"""
+        started = time.perf_counter()
+        if self.limiter is not None:
+            self.limiter.acquire()
+        return self._start(started)
+
+    async def _aacquire(self) -> float:
+        """비동기 슬롯 대여 (_acquire와 같은 제한/지표, 이벤트 루프를 막지 않음)"""
+        started = time.perf_counter()
+        if self.limiter is not None:
+            await self.limiter.acquire_async()
+        return self._start(started)
+
+    def invoke(self, prompt, **kwargs):
+        """LLM 호출 (동시 호출 수 제한 안에서)"""
+        called = self._acquire()
+        error = None
+        try:
+            return self.client.invoke(prompt, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._finish(called, error)
+
+    async def ainvoke(self, prompt, **kwargs):
+        """비동기 LLM 호출 (스레드를 점유하지 않고 응답 대기)"""
+        called = await self._aacquire()
+        error = None
+        try:
+            return await self.client.ainvoke(prompt, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._finish(called, error)
+
+    def stream(self, prompt, **kwargs) -> Iterator:
+        """
+        토큰 스트리밍 (마지막 청크까지 슬롯 점유)
+
+        반복이 끝나거나, 에러가 나거나, 호출자가 중간에 닫으면(close) 바로 반납.
+        중간에 멈출 수 있는 호출자는 contextlib.closing으로 감싸서 사용
+        """
+        called = self._acquire()
+        error = None
+        try:
+            for chunk in self.client.stream(prompt, **kwargs):
+                yield chunk
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._finish(called, error)
+
+    async def astream(self, prompt, **kwargs) -> AsyncIterator:
+        """비동기 토큰 스트리밍 (반납 시점은 stream과 같음, contextlib.aclosing 사용)"""
+        called = await self._aacquire()
+        error = None
+        try:
+            async for chunk in self.client.astream(prompt, **kwargs):
+                yield chunk
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._finish(called, error)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def __repr__(self) -> str:
+        return f"PooledLLM({self.name})"
+
+
+class LLMClientRegistry:
+    """(모델, 출력 모드, temperature) → PooledLLM (프로세스 전체 공유)"""
+
+    def __init__(self, max_concurrency: int = 0):
+        """
+        Args:
+            max_concurrency: 전체 LLM 동시 호출 수 (0이면 제한 없음)
+        """
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[str, str, float], PooledLLM] = {}
+        self.limiter = (
+            ConcurrencyLimiter(max_concurrency) if max_concurrency > 0 else None
+        )
+
+    def get(
+        self,
+        mode: str = "text",
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+    ) -> PooledLLM:
+        """
+        공유 클라이언트 반환 (없으면 1번만 생성)
+
+        Args:
+            mode: "json" (JSON 응답) 또는 "text"
+            model: 모델명 (None이면 settings.MODEL_NAME)
+            temperature: None이면 settings.TEMPERATURE
+
+        Returns:
+            PooledLLM
+        """
+        if mode not in OUTPUT_MODES:
+            raise ValueError(f"알 수 없는 LLM 출력 모드: {mode}")
+        model = model or settings.MODEL_NAME
+        temperature = settings.TEMPERATURE if temperature is None else temperature
+        key = (model, mode, temperature)
+
+        client = self._clients.get(key)
+        if client is None:
+            # 여러 노드가 동시에 첫 호출을 해도 클라이언트는 1개만 생성
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = PooledLLM(
+                        f"{model}/{mode}",
+                        create_chat_model(model, mode, temperature),
+                        self.limiter,
+                    )
+                    self._clients[key] = client
+        return client
+
+    def stats(self) -> Dict[str, Dict]:
+        """클라이언트별 지표"""
+        clients = list(self._clients.values())
+        return {client.name: client.metrics.snapshot() for client in clients}
+
+
+def create_chat_model(model: str, mode: str, temperature: float):
+    """
+    ChatGoogleGenerativeAI 생성 (레지스트리에서만 호출)
+
+    Args:
+        model: 모델명
+        mode: 출력 모드 ("json", "text")
+        temperature: temperature
+
+    Returns:
+        ChatGoogleGenerativeAI 인스턴스
+    """
+    options = dict(OUTPUT_MODES[mode])
+    if settings.LLM_TRANSPORT:
+        options["transport"] = settings.LLM_TRANSPORT
+    if settings.LLM_TIMEOUT > 0:
+        options["timeout"] = settings.LLM_TIMEOUT
+
+    return ChatGoogleGenerativeAI(
+        model=model,
+        temperature=temperature,
+        google_api_key=settings.GOOGLE_API_KEY,
+        max_output_tokens=8192,
+        max_retries=settings.LLM_MAX_RETRIES,
+        **options,
+    )
+
+
+# 전역 레지스트리
+llm_registry = LLMClientRegistry(max_concurrency=settings.LLM_MAX_CONCURRENCY)
@@ -1,11 +1,11 @@
 """Nodes 패키지"""
 
-from .intent import classify_intent
-from .search import search_tables, request_clarification
-from .sql import generate_sql, execute_sql
-from .analysis import process_data, analyze_insight
-from .visualization import plan_visualization
-from .response import generate_response
+from .intent import classify_intent, aclassify_intent
+from .search import search_tables, asearch_tables, request_clarification
+from .sql import generate_sql, agenerate_sql, execute_sql, aexecute_sql
+from .analysis import process_data, aprocess_data, analyze_insight, aanalyze_insight
+from .visualization import plan_visualization, aplan_visualization
+from .response import generate_response, agenerate_response
 
 
 __all__ = [
@@ -18,4 +18,13 @@ __all__ = [
     "analyze_insight",
     "plan_visualization",
     "generate_response",
+    # 비동기 버전 (ainvoke / astream 전용 그래프)
+    "aclassify_intent",
+    "asearch_tables",
+    "agenerate_sql",
+    "aexecute_sql",
+    "aprocess_data",
+    "aanalyze_insight",
+    "aplan_visualization",
+    "agenerate_response",
 ]
@@ -1,7 +1,7 @@
 """데이터 처리 및 인사이트 분석 노드"""
 
 import json
-from typing import Literal
+from typing import Literal, Optional
 from langgraph.types import Command
 
 from agents.state import StatsChatbotState
@@ -21,42 +21,70 @@ def process_data(state: StatsChatbotState) -> Command[Literal["analyze_insight"]
     - derived_calculation, multi_step_analysis: LLM이 계산 수행
     - 나머지: 계산 없이 패스
     """
-    scenario_type = state["scenario_type"]
+    prompt = _processing_prompt(state)
 
     # 계산이 필요한 시나리오가 아니면 패스
-    if scenario_type not in ["derived_calculation", "multi_step_analysis"]:
+    if prompt is None:
         return Command(goto="analyze_insight", update={"processed_data": None})
 
-    # 1. 질문에서 계산 힌트 추출
-    hints = extract_calculation_hints(state["user_query"])
+    # LLM 호출
+    try:
+        response = get_llm().invoke(prompt)
+        return _processed_command(state, response.content)
+    except Exception as e:
+        print(f"데이터 처리 실패: {e}")
+        return _processed_command(state, None)
+
+
+async def aprocess_data(
+    state: StatsChatbotState,
+) -> Command[Literal["analyze_insight"]]:
+    """process_data의 비동기 버전"""
+    prompt = _processing_prompt(state)
+
+    if prompt is None:
+        return Command(goto="analyze_insight", update={"processed_data": None})
+
+    try:
+        response = await get_llm().ainvoke(prompt)
+        return _processed_command(state, response.content)
+    except Exception as e:
+        print(f"데이터 처리 실패: {e}")
+        return _processed_command(state, None)
 
-    # 2. LLM 초기화
-    llm = get_llm()
 
-    # 3. 프롬프트 포맷팅
-    prompt = DATA_PROCESSING_PROMPT.format(
+def _processing_prompt(state: StatsChatbotState) -> Optional[str]:
+    """후처리 프롬프트 (계산이 필요 없는 시나리오면 None)"""
+    if state["scenario_type"] not in ["derived_calculation", "multi_step_analysis"]:
+        return None
+
+    # 질문에서 계산 힌트 추출
+    hints = extract_calculation_hints(state["user_query"])
+
+    return DATA_PROCESSING_PROMPT.format(
         user_query=state["user_query"],
         query_result=str(state["query_result"]),
         hints=", ".join(hints),
     )
 
-    # 4. LLM 호출
-    try:
-        response = llm.invoke(prompt)
 
-        # 5. JSON 파싱
-        processed_data = json.loads(response.content)
+def _processed_command(
+    state: StatsChatbotState, content: Optional[str]
+) -> Command[Literal["analyze_insight"]]:
+    """LLM 응답(JSON) 파싱 + 검증 → 실패하면 원본 데이터로 analyze_insight"""
+    if content is not None:
+        try:
+            processed_data = json.loads(content)
 
-        # 6. 결과 검증
-        if validate_calculation_result(processed_data):
-            return Command(
-                goto="analyze_insight", update={"processed_data": processed_data}
-            )
+            # 결과 검증
+            if validate_calculation_result(processed_data):
+                return Command(
+                    goto="analyze_insight", update={"processed_data": processed_data}
+                )
+        except (json.JSONDecodeError, Exception) as e:
+            print(f"데이터 처리 실패: {e}")
 
-    except (json.JSONDecodeError, Exception) as e:
-        print(f"데이터 처리 실패: {e}")
-
-    # 7. 실패 시 원본 데이터 반환
+    # 실패 시 원본 데이터 반환
     fallback_data = {
         "calculated_data": state["query_result"],
         "description": "원본 데이터",
@@ -64,17 +92,46 @@ def process_data(state: StatsChatbotState) -> Command[Literal["analyze_insight"]
     return Command(goto="analyze_insight", update={"processed_data": fallback_data})
 
 
-def analyze_insight(state: StatsChatbotState) -> Command[Literal["plan_visualization"]]:
+def analyze_insight(state: StatsChatbotState) -> Command:
     """
     7. 인사이트 분석 노드 (LLM 단계)
 
     데이터를 분석하여 경향, 패턴, 특이사항 파악
     - 예: "2020년 이후 감소하다가 2023년부터 회복"
     - 단위 정보를 포함하여 정확한 수치 표현
+    - plan_visualization과 병렬 실행, 둘 다 끝나면 generate_response (그래프의 합류 엣지)
     """
-    # LLM 초기화
-    llm = get_llm()
+    # LLM 호출
+    try:
+        response = get_llm().invoke(_insight_prompt(state))
+        insight = response.content.strip()
+
+        print(f"[DEBUG] 생성된 인사이트: {insight[:100]}...")
 
+    except Exception as e:
+        print(f"인사이트 분석 실패: {e}")
+        insight = ""  # 실패 시 빈 문자열
+
+    return Command(update={"insight": insight})
+
+
+async def aanalyze_insight(state: StatsChatbotState) -> Command:
+    """analyze_insight의 비동기 버전"""
+    try:
+        response = await get_llm().ainvoke(_insight_prompt(state))
+        insight = response.content.strip()
+
+        print(f"[DEBUG] 생성된 인사이트: {insight[:100]}...")
+
+    except Exception as e:
+        print(f"인사이트 분석 실패: {e}")
+        insight = ""
+
+    return Command(update={"insight": insight})
+
+
+def _insight_prompt(state: StatsChatbotState) -> str:
+    """인사이트 분석 프롬프트 (단위 정보 포함)"""
     # 분석할 데이터 결정
     # processed_data가 있으면 사용, 없으면 query_result 사용
     if state.get("processed_data"):
@@ -94,21 +151,8 @@ def analyze_insight(state: StatsChatbotState) -> Command[Literal["plan_visualiza
     print(f"[DEBUG] 단위 정보: {value_unit}")
 
     # 프롬프트 포맷팅
-    prompt = INSIGHT_ANALYSIS_PROMPT.format(
+    return INSIGHT_ANALYSIS_PROMPT.format(
         user_query=state["user_query"],
         data=str(data_to_analyze),
         value_unit=value_unit,  # ← 단위 정보 추가!
     )
-
-    # LLM 호출
-    try:
-        response = llm.invoke(prompt)
-        insight = response.content.strip()
-
-        print(f"[DEBUG] 생성된 인사이트: {insight[:100]}...")
-
-    except Exception as e:
-        print(f"인사이트 분석 실패: {e}")
-        insight = ""  # 실패 시 빈 문자열
-
-    return Command(goto="plan_visualization", update={"insight": insight})
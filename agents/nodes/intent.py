@@ -1,12 +1,16 @@
 """Intent 분류 노드"""
 
 import json
-from typing import Literal
+import random
+import time
+from typing import Literal, Optional, Tuple
 from langgraph.types import Command
 from langgraph.graph import END
 
 from agents.state import StatsChatbotState
 from agents.helpers import get_llm
+from agents.intent_rules import IntentGuess, classify_by_rules, intent_log
+from config.settings import settings
 from utils.prompts import CLASSIFY_INTENT_PROMPT
 
 
@@ -14,9 +18,10 @@ def classify_intent(
     state: StatsChatbotState,
 ) -> Command[Literal["search_tables", "__end__"]]:
     """
-    1. 질문 분류 노드 (LLM 단계)
+    1. 질문 분류 노드 (규칙 → LLM 단계)
 
     사용자 질문을 분석하여 6가지 시나리오 중 하나로 분류
+    (규칙 분류 확신도가 INTENT_RULE_MIN_CONFIDENCE 이상이면 LLM 호출 생략)
     - single_value: 단순 조회
     - table_view: 표 조회
     - simple_aggregation: 단순 집계
@@ -24,31 +29,108 @@ def classify_intent(
     - multi_step_analysis: 다단계 분석
     - out_of_scope: 범위 외 질문
     """
-    user_query = state["user_query"]
-    conversation_history = state.get("conversation_history", "없음")
+    # 규칙으로 확실한 질문은 LLM 호출 생략
+    guess, mode = _rule_guess(state)
+    if mode == "fast":
+        return _route_intent(guess.scenario_type, guess.reasoning)
 
-    # LLM 초기화
-    llm = get_llm()
+    # LLM 호출
+    response = get_llm().invoke(_intent_prompt(state))
+
+    return _route_llm_intent(state, response.content, guess, mode)
+
+
+async def aclassify_intent(
+    state: StatsChatbotState,
+) -> Command[Literal["search_tables", "__end__"]]:
+    """classify_intent의 비동기 버전"""
+    guess, mode = _rule_guess(state)
+    if mode == "fast":
+        return _route_intent(guess.scenario_type, guess.reasoning)
+
+    response = await get_llm().ainvoke(_intent_prompt(state))
+
+    return _route_llm_intent(state, response.content, guess, mode)
+
+
+def _rule_guess(state: StatsChatbotState) -> Tuple[Optional[IntentGuess], str]:
+    """
+    규칙 분류 + 처리 방식 결정
+
+    Returns:
+        (규칙 분류 결과, "fast" / "shadow" / "escalated" / "disabled")
+        - fast: 확신도 임계값 이상 → LLM 없이 확정 (여기서 로그 기록)
+        - shadow: 확정 가능하지만 표본 검사로 LLM도 호출
+        - escalated: 확신도 미달 → LLM 호출
+    """
+    if not settings.INTENT_RULES_ENABLED:
+        return None, "disabled"
+
+    started = time.perf_counter()
+    try:
+        guess = classify_by_rules(
+            state["user_query"], state.get("conversation_history") or ""
+        )
+    except Exception as e:  # 규칙 오류로 분류가 막히지 않도록
+        print(f"⚠️ 규칙 분류 건너뜀: {e}")
+        return None, "disabled"
+    elapsed_ms = (time.perf_counter() - started) * 1000
 
-    # 프롬프트 포맷팅
-    prompt = CLASSIFY_INTENT_PROMPT.format(
-        conversation_history=conversation_history, user_query=user_query
+    confident = (
+        guess.scenario_type is not None
+        and guess.confidence >= settings.INTENT_RULE_MIN_CONFIDENCE
     )
+    if not confident:
+        mode = "escalated"
+    elif random.random() < settings.INTENT_RULE_SHADOW_RATE:
+        mode = "shadow"
+    else:
+        mode = "fast"
+        intent_log.record(state["user_query"], guess, mode, None)
 
-    # LLM 호출
-    response = llm.invoke(prompt)
+    print(
+        f"[classify_intent] 규칙 분류 {guess.scenario_type} "
+        f"(확신도 {guess.confidence:.2f}, {elapsed_ms:.2f}ms) → {mode}"
+    )
+    return guess, mode
+
+
+def _intent_prompt(state: StatsChatbotState) -> str:
+    """질문 분류 프롬프트"""
+    return CLASSIFY_INTENT_PROMPT.format(
+        conversation_history=state.get("conversation_history", "없음"),
+        user_query=state["user_query"],
+    )
 
+
+def _route_llm_intent(
+    state: StatsChatbotState,
+    content: str,
+    guess: Optional[IntentGuess],
+    mode: str,
+) -> Command[Literal["search_tables", "__end__"]]:
+    """LLM 응답(JSON) 파싱 + 규칙 분류와의 일치 기록 → 라우팅"""
     # JSON 파싱
     try:
-        result = json.loads(response.content)
+        result = json.loads(content)
         scenario_type = result["scenario_type"]
         reasoning = result.get("reasoning", "분류 완료")
     except (json.JSONDecodeError, KeyError) as e:
         print(f"JSON 파싱 실패: {e}")
-        print(f"원본 응답: {response.content}")
+        print(f"원본 응답: {content}")
         scenario_type = "out_of_scope"
         reasoning = "파싱 실패"
 
+    if guess is not None:
+        intent_log.record(state["user_query"], guess, mode, scenario_type)
+
+    return _route_intent(scenario_type, reasoning)
+
+
+def _route_intent(
+    scenario_type: str, reasoning: str
+) -> Command[Literal["search_tables", "__end__"]]:
+    """범위 외면 종료, 아니면 테이블 검색"""
     # 범위 외 질문이면 종료
     if scenario_type == "out_of_scope":
         final_response = "죄송합니다. 저는 통계 데이터 조회 전문 챗봇입니다. 인구, 경제, 사회 등의 통계 데이터 관련 질문을 해주세요."
@@ -1,7 +1,8 @@
 """최종 응답 생성 노드"""
 
-from typing import Literal
-from langgraph.types import Command
+from contextlib import aclosing, closing
+from typing import Literal, Optional
+from langgraph.types import Command, StreamWriter
 from langgraph.graph import END
 
 from agents.state import StatsChatbotState
@@ -37,7 +38,7 @@ def format_source_section(tables_info: list) -> str:
 
 
 def generate_response(
-    state: StatsChatbotState,
+    state: StatsChatbotState, writer: StreamWriter
 ) -> Command[Literal["__end__"]]:
     """
     9. 응답 생성 노드 (LLM 단계)
@@ -48,44 +49,108 @@ def generate_response(
     - 인사이트
     - 시각화 차트 (있으면)
     - 데이터 출처 (KOSIS 링크)  # 추가
+
+    LLM 출력은 토큰 단위로 {"token": 텍스트} 커스텀 스트림 이벤트로 내보낸다
+    (stream_mode="custom"으로 실행할 때만 전달, invoke에서는 무시됨)
     """
     try:
-        llm = get_llm_text()
-
-        # 응답에 포함할 데이터 결정 (안전하게)
-        data = state.get("processed_data") or state.get("query_result") or "데이터 없음"
+        # LLM 호출 (스트리밍)
+        # 중간에 에러가 나도 스트림을 닫아 동시 호출 슬롯을 바로 반납
+        chunks = []
+        with closing(get_llm_text().stream(_response_prompt(state))) as stream:
+            for chunk in stream:
+                text = _chunk_text(chunk)
+                if text:
+                    writer({"token": text})
+                    chunks.append(text)
+        final_response = "".join(chunks).strip()
 
-        # 인사이트
-        insight = state.get("insight", "")
+    except Exception as e:
+        print(f"응답 생성 실패: {e}")
+        print(f"State keys: {list(state.keys())}")
+        final_response = None
 
-        # 차트 정보
-        chart_info = ""
-        if state.get("chart_spec"):
-            chart_info = f"시각화: {state['chart_spec'].get('chart_type', 'none')}"
-        else:
-            chart_info = "시각화 없음"
-
-        # 프롬프트 포맷팅
-        prompt = RESPONSE_GENERATION_PROMPT.format(
-            user_query=state.get("user_query", "질문 없음"),
-            data=str(data)[:1000],
-            insight=insight,
-            chart_info=chart_info,
-        )
+    return _finish_response(state, final_response)
 
-        # LLM 호출
-        response = llm.invoke(prompt)
-        final_response = response.content.strip()
 
-        # ===== 출처 섹션 추가 =====
-        source_section = format_source_section(state.get("tables_info", []))
-        if source_section:
-            final_response += source_section
-        # ===== 추가 끝 =====
+async def agenerate_response(
+    state: StatsChatbotState, writer: StreamWriter
+) -> Command[Literal["__end__"]]:
+    """generate_response의 비동기 버전"""
+    try:
+        chunks = []
+        async with aclosing(get_llm_text().astream(_response_prompt(state))) as stream:
+            async for chunk in stream:
+                text = _chunk_text(chunk)
+                if text:
+                    writer({"token": text})
+                    chunks.append(text)
+        final_response = "".join(chunks).strip()
 
     except Exception as e:
         print(f"응답 생성 실패: {e}")
         print(f"State keys: {list(state.keys())}")
+        final_response = None
+
+    return _finish_response(state, final_response)
+
+
+def _chunk_text(chunk) -> str:
+    """스트리밍 청크 → 텍스트 (content가 파트 리스트인 경우 포함)"""
+    content = chunk.content
+    if isinstance(content, str):
+        return content
+    return "".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in content
+    )
+
+
+def _response_prompt(state: StatsChatbotState) -> str:
+    """응답 생성 프롬프트"""
+    # 응답에 포함할 데이터 결정 (안전하게)
+    data = state.get("processed_data") or state.get("query_result") or "데이터 없음"
+
+    # 인사이트
+    insight = state.get("insight", "")
+
+    # 차트 정보
+    chart_info = ""
+    if state.get("chart_spec"):
+        chart_info = f"시각화: {state['chart_spec'].get('chart_type', 'none')}"
+    else:
+        chart_info = "시각화 없음"
+
+    data_text = str(data)[:1000]
+    notice = _truncation_notice(state)
+    if notice:
+        data_text = f"({notice})\n{data_text}"
+
+    # 프롬프트 포맷팅
+    return RESPONSE_GENERATION_PROMPT.format(
+        user_query=state.get("user_query", "질문 없음"),
+        data=data_text,
+        insight=insight,
+        chart_info=chart_info,
+    )
+
+
+def _truncation_notice(state: StatsChatbotState) -> str:
+    """결과가 최대 행 수에서 잘렸으면 안내 문구 (아니면 빈 문자열)"""
+    if not state.get("result_truncated"):
+        return ""
+    rows = len(state.get("query_result") or [])
+    return (
+        f"조회 결과가 많아 처음 {rows:,}행만 사용했습니다. "
+        "조건(지역, 기간 등)을 좁히면 전체 결과를 볼 수 있습니다."
+    )
+
+
+def _finish_response(
+    state: StatsChatbotState, final_response: Optional[str]
+) -> Command[Literal["__end__"]]:
+    """출처 섹션 추가 (LLM 실패 시 원본 데이터 + 인사이트로 대체) → 종료"""
+    if final_response is None:
         # Fallback
         data = state.get("processed_data") or state.get("query_result") or "데이터 없음"
         insight = state.get("insight", "")
@@ -95,10 +160,15 @@ def generate_response(
             else "답변을 생성하지 못했습니다."
         )
 
-        # ===== Fallback에도 출처 추가 =====
-        source_section = format_source_section(state.get("tables_info", []))
-        if source_section:
-            final_response += source_section
-        # ===== 추가 끝 =====
+    # 최대 행 수에서 잘린 결과는 답변에 명시
+    notice = _truncation_notice(state)
+    if notice:
+        final_response += f"\n\n⚠️ {notice}"
+
+    # ===== 출처 섹션 추가 =====
+    source_section = format_source_section(state.get("tables_info", []))
+    if source_section:
+        final_response += source_section
+    # ===== 추가 끝 =====
 
     return Command(goto=END, update={"final_response": final_response})
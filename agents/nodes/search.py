@@ -25,6 +25,24 @@ def search_tables(
         state["user_query"], n_results=5  # 여러 테이블 가능
     )
 
+    return _route_search(state, tables_info)
+
+
+async def asearch_tables(
+    state: StatsChatbotState,
+) -> Command[Literal["request_clarification", "generate_sql", "__end__"]]:
+    """search_tables의 비동기 버전 (질문 임베딩을 비동기로 호출)"""
+    from database.vector_db import asmart_search_tables
+
+    tables_info = await asmart_search_tables(state["user_query"], n_results=5)
+
+    return _route_search(state, tables_info)
+
+
+def _route_search(
+    state: StatsChatbotState, tables_info: list
+) -> Command[Literal["request_clarification", "generate_sql", "__end__"]]:
+    """검색 결과에 따라 추가 정보 요청 / 종료 / SQL 생성"""
     clarification_count = state.get("clarification_count", 0)
 
     # 테이블 없음 & 재시도 0회 → 추가 정보 요청
@@ -1,15 +1,61 @@
 """SQL 생성 및 실행 노드"""
 
-import ast
-from typing import Literal
+import time
+from typing import Literal, Optional, Tuple
 from langgraph.types import Command
 from langgraph.graph import END
 
 from agents.state import StatsChatbotState
-from agents.helpers import get_llm_text
+from agents.helpers import (
+    get_llm_text,
+    get_value_dictionary,
+    repair_sql,
+    validate_schema,
+    validate_syntax,
+)
+from config.settings import settings
 from utils.prompts import SQL_GENERATION_PROMPT
 
 
+def format_tables_info(tables_info: list) -> str:
+    """
+    테이블 정보를 프롬프트 문자열로 조립
+
+    MetadataManager가 미리 렌더링해 둔 블록을 이어 붙이기만 한다.
+    범주 값 사전이 있으면 테이블별 실제 값 목록을 덧붙인다.
+    검색 이후 메타데이터가 갱신돼 스냅샷의 상세 정보가 달라졌거나
+    캐시에 없는 테이블은 검색 시점의 정보로 즉석 렌더링 (요청 내 일관성 유지)
+
+    Args:
+        tables_info: 검색된 테이블 정보 리스트
+
+    Returns:
+        str: 프롬프트용 테이블 정보
+    """
+    from database.metadata_manager import (
+        TableHit,
+        get_metadata_manager,
+        render_prompt_block,
+    )
+
+    snapshot = get_metadata_manager().snapshot
+    dictionary = get_value_dictionary() if settings.VALUE_DICT_PROMPT_VALUES else None
+
+    blocks = []
+    for table in tables_info:
+        detail = table.detail if isinstance(table, TableHit) else table
+        name = table["table_name"]
+        if snapshot.details.get(name) is detail:
+            block = snapshot.prompt_blocks[name]
+        else:
+            block = render_prompt_block(table)
+        # 실제 범주 값 목록 (값을 몰라 빈 결과가 나오는 재시도 방지)
+        hint = dictionary.prompt_hint(name) if dictionary else ""
+        blocks.append(f"{block}\n{hint}" if hint else block)
+
+    return "\n\n".join(blocks)
+
+
 def generate_sql(state: StatsChatbotState) -> Command[Literal["execute_sql"]]:
     """
     4. SQL 생성 노드 (LLM 단계)
@@ -17,26 +63,34 @@ def generate_sql(state: StatsChatbotState) -> Command[Literal["execute_sql"]]:
     자연어 질문과 테이블 스키마 정보를 바탕으로 SQL 쿼리 생성
     - 이전 에러가 있으면 에러 메시지도 함께 전달
     """
-    # LLM 초기화
-    llm = get_llm_text()
+    prompt, prompt_bytes = _sql_prompt(state)
+
+    # LLM 호출
+    response = get_llm_text().invoke(prompt)
+
+    return _parse_sql_response(response, prompt_bytes)
+
+
+async def agenerate_sql(state: StatsChatbotState) -> Command[Literal["execute_sql"]]:
+    """generate_sql의 비동기 버전"""
+    prompt, prompt_bytes = _sql_prompt(state)
+
+    response = await get_llm_text().ainvoke(prompt)
+
+    return _parse_sql_response(response, prompt_bytes)
+
+
+def _sql_prompt(state: StatsChatbotState) -> Tuple[str, int]:
+    """
+    SQL 생성 프롬프트
 
+    Returns:
+        (프롬프트, 프롬프트 크기 bytes)
+    """
     conversation_history = state.get("conversation_history", "없음")
 
-    # 테이블 정보 포맷팅
-    tables_info_str = "\n\n".join(
-        [
-            f"### {table['table_name']}\n"
-            f"설명: {table['description']}\n"
-            f"컬럼: {table['columns']}\n"
-            f"컬럼 상세: {table.get('column_detail', {})}\n"
-            f"시간컬럼: {table.get('period_column', '년월')}\n"
-            f"기간: {table.get('period', 'N/A')}\n"
-            f"**값의 단위: {table.get('value_unit', '단위 정보 없음')}**\n"
-            f"예시 쿼리: {table.get('example_queries', 'N/A')}\n"
-            f"주의사항: {table.get('caution', '없음')}"
-            for table in state["tables_info"]
-        ]
-    )
+    # 테이블 정보 포맷팅 (캐시된 블록 조립)
+    tables_info_str = format_tables_info(state["tables_info"])
 
     # 에러 피드백 (재시도 시)
     error_feedback = ""
@@ -51,13 +105,22 @@ def generate_sql(state: StatsChatbotState) -> Command[Literal["execute_sql"]]:
         error_feedback=error_feedback,
     )
 
+    # 프롬프트 크기 (요청별 추적용)
+    prompt_bytes = len(prompt.encode("utf-8"))
+
     # 디버깅
     print(f"\n[DEBUG] SQL 생성 시도 {state.get('sql_retry_count', 0) + 1}회")
+    print(
+        f"[DEBUG] 프롬프트 크기: {prompt_bytes} bytes "
+        f"(테이블 정보 {len(tables_info_str.encode('utf-8'))} bytes)"
+    )
     print(f"[DEBUG] 사용 테이블: {[t['table_name'] for t in state['tables_info']]}")
 
-    # LLM 호출
-    response = llm.invoke(prompt)
+    return prompt, prompt_bytes
+
 
+def _parse_sql_response(response, prompt_bytes: int) -> Command[Literal["execute_sql"]]:
+    """LLM 응답에서 SQL 추출 → execute_sql"""
     # 디버깅
     print(f"[DEBUG] LLM 응답 타입: {type(response)}")
     print(f"[DEBUG] LLM 응답 전체: {response}")
@@ -87,74 +150,206 @@ def generate_sql(state: StatsChatbotState) -> Command[Literal["execute_sql"]]:
 
     print(f"[DEBUG] 최종 SQL: {sql_query}")
 
-    return Command(goto="execute_sql", update={"sql_query": sql_query})
+    return Command(
+        goto="execute_sql",
+        update={"sql_query": sql_query, "sql_prompt_bytes": prompt_bytes},
+    )
 
 
 def execute_sql(
     state: StatsChatbotState,
-) -> Command[Literal["generate_sql", "process_data", "__end__"]]:
+) -> Command[Literal["generate_sql", "process_data", "plan_visualization", "__end__"]]:
     """
     5. SQL 실행 및 결과 확인 노드 (Data 단계)
 
     생성된 SQL을 실제 DB에 실행하고 결과 확인
+    - 규칙 기반 자동 수정 → 로컬 검증 (문법/스키마) → 실패 시 DB 왕복 없이 재시도
+    - DB 에러가 규칙으로 고쳐지면 LLM 재생성 없이 바로 재실행
     - Exception 발생 시 에러 메시지 저장 및 재시도
-    - 실행 성공 시 결과 데이터 확인
+    - 실행 성공 시 결과 데이터 확인 → process_data / plan_visualization 병렬 실행
     """
     from database.connection import db_manager
 
+    started = time.perf_counter()
+    sql_query, rejected = _prepare_sql(state, started)
+    if rejected:
+        return rejected
+
     try:
-        # DB 연결 및 SQL 실행
-        db = db_manager.get_db()
-        result_str = db.run(state["sql_query"])
-
-        # 문자열 결과를 리스트로 파싱
-        query_result = ast.literal_eval(result_str) if result_str else []
-
-        # 데이터 없음 → 재시도 체크
-        if not query_result:
-            sql_retry_count = state.get("sql_retry_count", 0)
-
-            # 재시도 2회 미만 → SQL 재생성
-            if sql_retry_count < 2:
-                return Command(
-                    goto="generate_sql",
-                    update={
-                        "query_result": [],
-                        "sql_error": "조회 결과가 없습니다. 쿼리를 수정해주세요.",
-                        "sql_retry_count": sql_retry_count + 1,
-                    },
-                )
-
-            # 재시도 2회 이상 → 종료
-            return Command(
-                goto=END,
-                update={
-                    "query_result": [],
-                    "final_response": "조회 결과가 없습니다.",
-                },
-            )
+        # SQL 실행 (DB 에러 시 에러 종류별 자동 수정 후 1회 재실행)
+        for attempt in range(2):
+            try:
+                query_result = db_manager.execute(sql_query)
+                break
+            except Exception as e:
+                sql_query = _repair_after_error(state, sql_query, e, attempt, started)
+        return _route_result(state, sql_query, query_result, started)
 
-        # 데이터 있음 → 후처리로
-        return Command(
-            goto="process_data",
-            update={"query_result": query_result, "sql_error": None},
-        )
+    except Exception as e:
+        return _retry_or_end(state, str(e), sql_query)
+
+
+async def aexecute_sql(
+    state: StatsChatbotState,
+) -> Command[Literal["generate_sql", "process_data", "plan_visualization", "__end__"]]:
+    """execute_sql의 비동기 버전 (DB 실행 중 이벤트 루프를 막지 않음)"""
+    from database.connection import db_manager
+
+    started = time.perf_counter()
+    sql_query, rejected = _prepare_sql(state, started)
+    if rejected:
+        return rejected
+
+    try:
+        for attempt in range(2):
+            try:
+                query_result = await db_manager.aexecute(sql_query)
+                break
+            except Exception as e:
+                sql_query = _repair_after_error(state, sql_query, e, attempt, started)
+        return _route_result(state, sql_query, query_result, started)
 
     except Exception as e:
+        return _retry_or_end(state, str(e), sql_query)
+
+
+def _prepare_sql(
+    state: StatsChatbotState, started: float
+) -> Tuple[str, Optional[Command[Literal["generate_sql", "__end__"]]]]:
+    """
+    규칙 기반 자동 수정 + 로컬 검증 (DB 실행 전)
+
+    Returns:
+        (실행할 SQL, 검증 실패 시 재시도/종료 Command - 통과하면 None)
+    """
+    from database.query_log import query_log
+
+    # 규칙 기반 자동 수정 (확실한 실수는 LLM 재생성 없이 고침)
+    sql_query, fixes = repair_sql(
+        state["sql_query"], state["tables_info"], state["user_query"]
+    )
+    if fixes:
+        print(f"[execute_sql] SQL 자동 수정 {len(fixes)}건: {fixes}")
+
+    # 로컬 검증 (테이블/컬럼 오타 등은 DB에 보내지 않음)
+    validation_error = validate_syntax(sql_query) or validate_schema(
+        sql_query, state["tables_info"]
+    )
+    if validation_error:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"[execute_sql] 로컬 검증 실패 ({elapsed_ms:.2f}ms):\n{validation_error}")
+        query_log.record(sql_query, elapsed_ms, error=f"validation: {validation_error}")
+        return sql_query, _retry_or_end(state, validation_error, sql_query)
+
+    return sql_query, None
+
+
+def _repair_after_error(
+    state: StatsChatbotState,
+    sql_query: str,
+    error: Exception,
+    attempt: int,
+    started: float,
+) -> str:
+    """
+    DB 에러 기록 후 규칙으로 고쳐지면 재실행할 SQL 반환
+
+    첫 시도가 아니거나 고칠 게 없으면 에러를 그대로 raise
+    """
+    from database.query_log import query_log
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    query_log.record(sql_query, elapsed_ms, error=str(error))
+    if attempt > 0:
+        raise error
+    repaired, fixes = repair_sql(
+        sql_query, state["tables_info"], state["user_query"], str(error)
+    )
+    if repaired == sql_query:
+        raise error
+    print(f"[execute_sql] DB 에러 자동 수정 {fixes} → 재실행")
+    return repaired
+
+
+def _route_result(
+    state: StatsChatbotState, sql_query: str, query_result, started: float
+) -> Command[Literal["generate_sql", "process_data", "plan_visualization", "__end__"]]:
+    """실행 결과 기록 → 데이터 없으면 재시도/종료, 있으면 후처리 + 시각화"""
+    from database.query_log import query_log
+
+    query_log.record(
+        sql_query, (time.perf_counter() - started) * 1000, rows=len(query_result)
+    )
+    print(
+        f"[execute_sql] {len(query_result)}행 x {len(query_result.columns)}열 "
+        f"{list(query_result.columns)}"
+    )
+    if query_result.truncated:
+        print(f"  ⚠️  결과가 {len(query_result)}행에서 잘림 (SQL_MAX_ROWS)")
+
+    # 데이터 없음 → 재시도 체크
+    if not query_result:
         sql_retry_count = state.get("sql_retry_count", 0)
 
         # 재시도 2회 미만 → SQL 재생성
         if sql_retry_count < 2:
             return Command(
                 goto="generate_sql",
-                update={"sql_error": str(e), "sql_retry_count": sql_retry_count + 1},
+                update={
+                    "sql_query": sql_query,
+                    "query_result": query_result,
+                    "result_truncated": False,
+                    "sql_error": "조회 결과가 없습니다. 쿼리를 수정해주세요.",
+                    "sql_retry_count": sql_retry_count + 1,
+                },
             )
 
         # 재시도 2회 이상 → 종료
         return Command(
             goto=END,
             update={
-                "sql_error": str(e),
-                "final_response": "SQL 쿼리 생성에 실패했습니다.",
+                "sql_query": sql_query,
+                "query_result": query_result,
+                "result_truncated": False,
+                "final_response": "조회 결과가 없습니다.",
             },
         )
+
+    # 데이터 있음 → 후처리(→ 인사이트)와 시각화를 동시에 (generate_response에서 합류)
+    return Command(
+        goto=["process_data", "plan_visualization"],
+        update={
+            "sql_query": sql_query,
+            "query_result": query_result,
+            "result_truncated": query_result.truncated,
+            "sql_error": None,
+        },
+    )
+
+
+def _retry_or_end(
+    state: StatsChatbotState, error: str, sql_query: str
+) -> Command[Literal["generate_sql", "__end__"]]:
+    """실행/검증 실패 → 에러를 피드백으로 SQL 재생성 (2회까지), 이후 종료"""
+    sql_retry_count = state.get("sql_retry_count", 0)
+
+    # 재시도 2회 미만 → SQL 재생성
+    if sql_retry_count < 2:
+        return Command(
+            goto="generate_sql",
+            update={
+                "sql_query": sql_query,
+                "sql_error": error,
+                "sql_retry_count": sql_retry_count + 1,
+            },
+        )
+
+    # 재시도 2회 이상 → 종료
+    return Command(
+        goto=END,
+        update={
+            "sql_query": sql_query,
+            "sql_error": error,
+            "final_response": "SQL 쿼리 생성에 실패했습니다.",
+        },
+    )
@@ -4,7 +4,7 @@
 
 import json
 import pandas as pd
-from typing import Dict, Any, Optional, Literal
+from typing import Dict, Any, Optional, Tuple
 from langgraph.types import Command
 from config.settings import settings
 from utils.prompts import (
@@ -12,7 +12,8 @@ from utils.prompts import (
     VISUALIZATION_PROMPT,
     VISUALIZATION_ERROR_PROMPT,
 )
-from frontend.utils.format import extract_column_names
+from database.query_result import QueryResult
+from frontend.utils.format import query_result_to_dataframe
 from agents.helpers import get_llm
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
@@ -25,213 +26,260 @@ def determine_visualization(
     질문과 데이터를 분석하여 시각화 메타데이터 생성
     """
     try:
-        if row_count == 0 or len(columns) < 2:
+        messages = _visualization_messages(question, columns, row_count, sample_data)
+        if messages is None:
             return None
 
-        columns = [str(col) for col in columns]
+        response = get_llm().invoke(messages)
+        return _parse_visualization(response.content, columns)
 
-        llm = get_llm()
+    except Exception as e:
+        print(f"시각화 메타데이터 생성 오류: {e}")
+        print(f"columns 타입: {type(columns)}, 값: {columns}")
+        return None
 
-        prompt = VISUALIZATION_PROMPT.format(
-            question=question,
-            columns=", ".join(columns),
-            row_count=row_count,
-            sample_data=str(sample_data[:3]),
-        )
 
-        messages = [
-            {"role": "system", "content": VISUALIZATION_SYSTEM_PROMPT},
-            {"role": "user", "content": prompt},
-        ]
+async def adetermine_visualization(
+    question: str, columns: list, row_count: int, sample_data: list
+) -> Optional[Dict[str, Any]]:
+    """determine_visualization의 비동기 버전"""
+    try:
+        messages = _visualization_messages(question, columns, row_count, sample_data)
+        if messages is None:
+            return None
 
-        response = llm.invoke(messages)
-        result_text = response.content.strip()
+        response = await get_llm().ainvoke(messages)
+        return _parse_visualization(response.content, columns)
 
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
+    except Exception as e:
+        print(f"시각화 메타데이터 생성 오류: {e}")
+        print(f"columns 타입: {type(columns)}, 값: {columns}")
+        return None
 
-        viz_metadata = json.loads(result_text.strip())
 
-        required_keys = ["type", "x_column", "y_column", "title"]
-        if not all(key in viz_metadata for key in required_keys):
-            return None
+def _visualization_messages(
+    question: str, columns: list, row_count: int, sample_data: list
+) -> Optional[list]:
+    """시각화 LLM 메시지 (차트를 그릴 수 없는 데이터면 None)"""
+    if row_count == 0 or len(columns) < 2:
+        return None
 
-        if (
-            viz_metadata["x_column"] not in columns
-            or viz_metadata["y_column"] not in columns
-        ):
-            return None
+    prompt = VISUALIZATION_PROMPT.format(
+        question=question,
+        columns=", ".join(str(col) for col in columns),
+        row_count=row_count,
+        sample_data=str(sample_data[:3]),
+    )
+
+    return [
+        {"role": "system", "content": VISUALIZATION_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _parse_visualization(content: str, columns: list) -> Optional[Dict[str, Any]]:
+    """LLM 응답(JSON) → 시각화 메타데이터 (필수 키/컬럼 검증)"""
+    columns = [str(col) for col in columns]
+    result_text = content.strip()
 
-        return viz_metadata
+    if result_text.startswith("```"):
+        result_text = result_text.split("```")[1]
+        if result_text.startswith("json"):
+            result_text = result_text[4:]
 
+    try:
+        viz_metadata = json.loads(result_text.strip())
     except json.JSONDecodeError as e:
         print(f"JSON 파싱 오류: {e}")
-        print(f"LLM 응답: {result_text if 'result_text' in locals() else 'N/A'}")
+        print(f"LLM 응답: {result_text}")
         return None
-    except Exception as e:
-        print(f"시각화 메타데이터 생성 오류: {e}")
-        print(f"columns 타입: {type(columns)}, 값: {columns}")
+
+    required_keys = ["type", "x_column", "y_column", "title"]
+    if not all(key in viz_metadata for key in required_keys):
         return None
 
+    if (
+        viz_metadata["x_column"] not in columns
+        or viz_metadata["y_column"] not in columns
+    ):
+        return None
+
+    return viz_metadata
+
+
+# 시각화 없음
+NO_CHART = {
+    "chart_spec": None,
+    "chart_data": None,
+    "extended_sql": None,
+    "target_value": None,
+}
+
 
-def plan_visualization(state: Dict[str, Any]) -> Command[Literal["generate_response"]]:
+def plan_visualization(state: Dict[str, Any]) -> Command:
     """
     시각화 노드
+
+    query_result / sql_query만 읽으므로 process_data → analyze_insight와 병렬 실행
+    (둘 다 끝나면 generate_response - 그래프의 합류 엣지)
     """
+    from database.connection import db_manager
+
     try:
-        question = state.get("user_query", "")
         sql_result = state.get("query_result", None)
 
         print(f"[DEBUG] sql_result 타입: {type(sql_result)}")
 
         if sql_result is None or not sql_result:
-            return Command(
-                goto="generate_response",
-                update={
-                    "chart_spec": None,
-                    "chart_data": None,
-                    "extended_sql": None,
-                    "target_value": None,
-                },
-            )
+            return Command(update=dict(NO_CHART))
 
         # 단일 값인 경우 SQL 확장
-        chart_data = None
-        extended_sql_used = None
-        target_value = None
-
-        if len(sql_result) == 1:
-            print("[DEBUG] 단일 값 감지 - SQL 확장 시도")
-            extended_sql, target = expand_sql_time_range(state.get("sql_query", ""))
-
-            if extended_sql:
-                from database.connection import db_manager
-
-                db = db_manager.get_db()
-                try:
-                    extended_result_str = db.run(extended_sql)
-                    import ast
-
-                    extended_result = (
-                        ast.literal_eval(extended_result_str)
-                        if extended_result_str
-                        else []
-                    )
-
-                    if len(extended_result) > 1:
-                        print(f"[DEBUG] SQL 확장 성공: {len(extended_result)}개 데이터")
-                        sql_result = extended_result
-                        chart_data = extended_result
-                        extended_sql_used = extended_sql
-                        target_value = target
-                    else:
-                        print("[DEBUG] SQL 확장 결과 1개 이하, 원본 사용")
-                        chart_data = sql_result
-                except Exception as e:
-                    print(f"[DEBUG] SQL 확장 실패: {e}")
-                    chart_data = sql_result
-            else:
-                print("[DEBUG] SQL 확장 불가 (패턴 미일치)")
-                chart_data = sql_result
-        else:
-            chart_data = sql_result
-
-        # DataFrame 변환
-        if isinstance(sql_result, list):
-            print("[DEBUG] sql_result를 DataFrame으로 변환 중...")
-            if not sql_result:
-                return Command(
-                    goto="generate_response",
-                    update={
-                        "chart_spec": None,
-                        "chart_data": None,
-                        "extended_sql": None,
-                        "target_value": None,
-                    },
-                )
-
-            # 확장 SQL 사용했으면 그걸로 컬럼명 추출
-            sql_for_columns = extended_sql_used or state.get("sql_query", "")
-
-            col_names = extract_column_names(sql_for_columns, len(sql_result[0]))
-            print(f"[DEBUG] 추출된 컬럼명: {col_names}")
-
-            df = pd.DataFrame(sql_result, columns=col_names)
-            df.columns = [str(col) for col in df.columns]
-
-            print(f"[DEBUG] DataFrame 생성 완료: {df.shape}")
-            print(f"[DEBUG] DataFrame columns (최종): {list(df.columns)}")
-
-        elif isinstance(sql_result, pd.DataFrame):
-            df = sql_result
-            df.columns = [str(col) for col in df.columns]
-        else:
-            print(f"[DEBUG] 지원하지 않는 타입: {type(sql_result)}")
-            return Command(
-                goto="generate_response",
-                update={
-                    "chart_spec": None,
-                    "chart_data": None,
-                    "extended_sql": None,
-                    "target_value": None,
-                },
-            )
-
-        columns = list(df.columns)
-        row_count = len(df)
-        sample_data = df.head(3).values.tolist()
-
-        print(
-            f"[DEBUG] plan_visualization - columns: {columns}, row_count: {row_count}"
-        )
+        extended_sql, target = _extension_for(state, sql_result)
+        extended_result = None
+        if extended_sql:
+            try:
+                extended_result = db_manager.execute(extended_sql)
+            except Exception as e:
+                print(f"[DEBUG] SQL 확장 실패: {e}")
+
+        chart = _chart_inputs(state, sql_result, extended_sql, target, extended_result)
+        if chart is None:
+            return Command(update=dict(NO_CHART))
+
+        viz_metadata = determine_visualization(**chart.pop("llm_inputs"))
+        print(f"[DEBUG] viz_metadata: {viz_metadata}")
 
-        if len(columns) < 2:
-            print(f"[DEBUG] 컬럼 수 부족: {len(columns)}개")
-            return Command(
-                goto="generate_response",
-                update={
-                    "chart_spec": None,
-                    "chart_data": None,
-                    "extended_sql": None,
-                    "target_value": None,
-                },
-            )
-
-        viz_metadata = determine_visualization(
-            question=question,
-            columns=columns,
-            row_count=row_count,
-            sample_data=sample_data,
-        )
+        return Command(update={"chart_spec": viz_metadata, **chart})
 
+    except Exception as e:
+        print(f"시각화 노드 오류: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return Command(update=dict(NO_CHART))
+
+
+async def aplan_visualization(state: Dict[str, Any]) -> Command:
+    """plan_visualization의 비동기 버전 (확장 SQL / LLM 호출을 비동기로)"""
+    from database.connection import db_manager
+
+    try:
+        sql_result = state.get("query_result", None)
+
+        print(f"[DEBUG] sql_result 타입: {type(sql_result)}")
+
+        if sql_result is None or not sql_result:
+            return Command(update=dict(NO_CHART))
+
+        extended_sql, target = _extension_for(state, sql_result)
+        extended_result = None
+        if extended_sql:
+            try:
+                extended_result = await db_manager.aexecute(extended_sql)
+            except Exception as e:
+                print(f"[DEBUG] SQL 확장 실패: {e}")
+
+        chart = _chart_inputs(state, sql_result, extended_sql, target, extended_result)
+        if chart is None:
+            return Command(update=dict(NO_CHART))
+
+        viz_metadata = await adetermine_visualization(**chart.pop("llm_inputs"))
         print(f"[DEBUG] viz_metadata: {viz_metadata}")
 
-        return Command(
-            goto="generate_response",
-            update={
-                "chart_spec": viz_metadata,
-                "chart_data": chart_data,
-                "extended_sql": extended_sql_used,
-                "target_value": target_value,
-            },
-        )
+        return Command(update={"chart_spec": viz_metadata, **chart})
 
     except Exception as e:
         print(f"시각화 노드 오류: {e}")
         import traceback
 
         traceback.print_exc()
-        return Command(
-            goto="generate_response",
-            update={
-                "chart_spec": None,
-                "chart_data": None,
-                "extended_sql": None,
-                "target_value": None,
-            },
-        )
+        return Command(update=dict(NO_CHART))
+
+
+def _extension_for(
+    state: Dict[str, Any], sql_result
+) -> Tuple[Optional[str], Optional[str]]:
+    """단일 값 결과면 시계열로 확장한 SQL과 타겟 값 (확장 불가면 (None, None))"""
+    if len(sql_result) != 1:
+        return None, None
+
+    print("[DEBUG] 단일 값 감지 - SQL 확장 시도")
+    extended_sql, target = expand_sql_time_range(state.get("sql_query", ""))
+    if not extended_sql:
+        print("[DEBUG] SQL 확장 불가 (패턴 미일치)")
+    return extended_sql, target
+
+
+def _chart_inputs(
+    state: Dict[str, Any],
+    sql_result,
+    extended_sql: Optional[str],
+    target: Optional[str],
+    extended_result,
+) -> Optional[Dict[str, Any]]:
+    """
+    차트 데이터 결정 + DataFrame 변환
+
+    Returns:
+        {"chart_data", "extended_sql", "target_value",
+         "llm_inputs": determine_visualization 인자} - 차트를 그릴 수 없으면 None
+    """
+    chart_data = sql_result
+    extended_sql_used = None
+    target_value = None
+
+    if extended_result is not None:
+        if len(extended_result) > 1:
+            print(f"[DEBUG] SQL 확장 성공: {len(extended_result)}개 데이터")
+            sql_result = extended_result
+            chart_data = extended_result
+            extended_sql_used = extended_sql
+            target_value = target
+        else:
+            print("[DEBUG] SQL 확장 결과 1개 이하, 원본 사용")
+
+    # DataFrame 변환
+    if isinstance(sql_result, (QueryResult, list)):
+        print("[DEBUG] sql_result를 DataFrame으로 변환 중...")
+        if not sql_result:
+            return None
+
+        # 확장 SQL 사용했으면 그걸로 컬럼명 추출 (QueryResult는 커서 컬럼명)
+        sql_for_columns = extended_sql_used or state.get("sql_query", "")
+
+        df = query_result_to_dataframe(sql_result, sql_for_columns)
+        df.columns = [str(col) for col in df.columns]
+
+        print(f"[DEBUG] DataFrame 생성 완료: {df.shape}")
+        print(f"[DEBUG] DataFrame columns (최종): {list(df.columns)}")
+
+    elif isinstance(sql_result, pd.DataFrame):
+        df = sql_result
+        df.columns = [str(col) for col in df.columns]
+    else:
+        print(f"[DEBUG] 지원하지 않는 타입: {type(sql_result)}")
+        return None
+
+    columns = list(df.columns)
+    row_count = len(df)
+
+    print(f"[DEBUG] plan_visualization - columns: {columns}, row_count: {row_count}")
+
+    if len(columns) < 2:
+        print(f"[DEBUG] 컬럼 수 부족: {len(columns)}개")
+        return None
+
+    return {
+        "chart_data": chart_data,
+        "extended_sql": extended_sql_used,
+        "target_value": target_value,
+        "llm_inputs": {
+            "question": state.get("user_query", ""),
+            "columns": columns,
+            "row_count": row_count,
+            "sample_data": df.head(3).values.tolist(),
+        },
+    }
 
 
 def expand_sql_time_range(sql_query: str) -> tuple[Optional[str], Optional[str]]:
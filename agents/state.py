@@ -1,5 +1,7 @@
 from typing import TypedDict, List, Optional, Dict, Any
 
+from database.query_result import QueryResult
+
 
 class StatsChatbotState(TypedDict):
     """통계 챗봇의 전체 상태를 관리하는 State 클래스"""
@@ -25,15 +27,17 @@ class StatsChatbotState(TypedDict):
     sql_retry_count: int  # SQL 생성 재시도 횟수
     sql_error: Optional[str]  # SQL 실행 에러 메시지
     extended_sql: Optional[str]  # 확장된 SQL (시각화용)
+    sql_prompt_bytes: Optional[int]  # 마지막 SQL 생성 프롬프트 크기 (bytes)
 
     # 데이터
-    query_result: List[Dict[str, Any]]  # SQL 실행 결과 데이터
+    query_result: QueryResult  # SQL 실행 결과 데이터 (커서 컬럼명 + 컬럼별 값)
+    result_truncated: Optional[bool]  # 최대 행 수(SQL_MAX_ROWS)에서 결과가 잘렸는지
     processed_data: Optional[Dict[str, Any]]  # 후처리된 데이터 (계산 결과 등)
 
     # 분석 및 시각화
     insight: str  # 데이터 분석 인사이트 (경향, 패턴)
     chart_spec: Optional[Dict[str, Any]]  # 시각화 차트 스펙 (차트 타입, 데이터 등)
-    chart_data: Optional[List[Dict[str, Any]]]  # 시각화 전용 데이터 (확장된 데이터)
+    chart_data: Optional[QueryResult]  # 시각화 전용 데이터 (확장된 데이터)
     target_value: Optional[str]  # 원본 질문의 시점
 
     # 응답
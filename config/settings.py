@@ -40,14 +40,157 @@ class Settings:
     MODEL_NAME: str = "gemini-2.5-flash"
     TEMPERATURE: float = 0.0
 
+    # LLM 클라이언트 (모델/출력 모드별 1개를 프로세스 전체가 공유)
+    # 전체 동시 호출 수 (0이면 제한 없음)
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    # 요청 제한 시간 (초, 0이면 라이브러리 기본값)
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "0"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "6"))
+    # "grpc", "rest" (빈 값이면 라이브러리 기본값)
+    LLM_TRANSPORT: str = os.getenv("LLM_TRANSPORT", "")
+
+    # 규칙 기반 질문 분류 (확신도가 임계값 이상이면 classify_intent LLM 호출 생략)
+    INTENT_RULES_ENABLED: bool = (
+        os.getenv("INTENT_RULES_ENABLED", "true").lower() == "true"
+    )
+    INTENT_RULE_MIN_CONFIDENCE: float = float(
+        os.getenv("INTENT_RULE_MIN_CONFIDENCE", "0.85")
+    )
+    # 규칙으로 확정한 질문 중 LLM으로도 분류해 일치율을 잴 비율 (0~1)
+    INTENT_RULE_SHADOW_RATE: float = float(
+        os.getenv("INTENT_RULE_SHADOW_RATE", "0.05")
+    )
+    # 규칙/LLM 분류 일치 로그 (JSONL, 빈 값이면 메모리 지표만)
+    INTENT_LOG_PATH: str = os.getenv(
+        "INTENT_LOG_PATH", str(BASE_DIR / "logs" / "intent_log.jsonl")
+    )
+
+    # 비동기 그래프 (모든 대화가 이벤트 루프 1개를 공유, false면 동기 invoke)
+    GRAPH_ASYNC_ENABLED: bool = (
+        os.getenv("GRAPH_ASYNC_ENABLED", "true").lower() == "true"
+    )
+
+    # 임베딩 제공자 ("upstage" 또는 "local" - 오프라인/벤치마크용 해싱 임베딩)
+    EMBEDDING_PROVIDER: str = os.getenv("EMBEDDING_PROVIDER", "upstage")
+    LOCAL_EMBEDDING_DIM: int = int(os.getenv("LOCAL_EMBEDDING_DIM", "512"))
+
+    # 테이블 검색 백엔드 ("chroma" 또는 "numpy")
+    VECTOR_BACKEND: str = os.getenv("VECTOR_BACKEND", "chroma")
+
+    # 하이브리드 검색 (BM25 + 벡터, RRF 융합)
+    HYBRID_SEARCH_ENABLED: bool = (
+        os.getenv("HYBRID_SEARCH_ENABLED", "true").lower() == "true"
+    )
+    HYBRID_RRF_K: int = int(os.getenv("HYBRID_RRF_K", "60"))
+    # 이 점수 미만의 어휘 검색 결과는 후보에서 제외
+    HYBRID_LEXICAL_MIN_SCORE: float = float(
+        os.getenv("HYBRID_LEXICAL_MIN_SCORE", "1.0")
+    )
+    # 1위 점수가 SKIP_MIN_SCORE 이상이고 2위의 SKIP_RATIO배 이상이면 임베딩 생략
+    HYBRID_SKIP_MIN_SCORE: float = float(os.getenv("HYBRID_SKIP_MIN_SCORE", "4.0"))
+    HYBRID_SKIP_RATIO: float = float(os.getenv("HYBRID_SKIP_RATIO", "2.0"))
+
+    # 벡터 DB 구축 (배치 임베딩)
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "16"))
+    EMBEDDING_MAX_WORKERS: int = int(os.getenv("EMBEDDING_MAX_WORKERS", "4"))
+    EMBEDDING_MAX_RETRIES: int = int(os.getenv("EMBEDDING_MAX_RETRIES", "3"))
+    EMBEDDING_CHECKPOINT_DIR: str = os.getenv(
+        "EMBEDDING_CHECKPOINT_DIR", str(BASE_DIR / ".embedding_checkpoints")
+    )
+
+    # 질문 임베딩 캐시
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))
+    EMBEDDING_CACHE_PATH: str = os.getenv(
+        "EMBEDDING_CACHE_PATH", str(BASE_DIR / "embedding_cache.db")
+    )
+
+    # DB 커넥션 풀
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # 시작 시 미리 열어둘 커넥션 수 (최대 DB_POOL_SIZE)
+    DB_WARMUP_CONNECTIONS: int = int(os.getenv("DB_WARMUP_CONNECTIONS", "2"))
+
+    # SQL 실행 결과 최대 행 수 (0이면 제한 없음)
+    SQL_MAX_ROWS: int = int(os.getenv("SQL_MAX_ROWS", "10000"))
+
+    # 실행 전 비용 검사 (EXPLAIN QUERY PLAN → 예상 읽기 행 수)
+    SQL_GUARD_ENABLED: bool = os.getenv("SQL_GUARD_ENABLED", "true").lower() == "true"
+    # 예상 읽기 행 수가 이보다 크면 실행 거부
+    SQL_MAX_COST: float = float(os.getenv("SQL_MAX_COST", "2000000"))
+    # 문장 실행 제한 시간 (초, 0이면 끔)
+    SQL_STATEMENT_TIMEOUT: float = float(os.getenv("SQL_STATEMENT_TIMEOUT", "15"))
+
+    # SQL 결과 캐시 (정규화 SQL + 데이터 버전 키, LRU + TTL)
+    SQL_CACHE_SIZE: int = int(os.getenv("SQL_CACHE_SIZE", "256"))  # 0이면 끔
+    SQL_CACHE_TTL: float = float(os.getenv("SQL_CACHE_TTL", "300"))
+    # 이보다 큰 결과는 캐시하지 않음
+    SQL_CACHE_MAX_ROWS: int = int(os.getenv("SQL_CACHE_MAX_ROWS", "5000"))
+    # 적재 버전 테이블 (적재 스크립트가 행을 추가하면 캐시된 결과가 무효화됨)
+    DATA_VERSION_TABLE: str = os.getenv("DATA_VERSION_TABLE", "data_load_version")
+    # 적재 버전 확인 주기 (초, 캐시 조회마다 DB를 왕복하지 않도록)
+    DATA_VERSION_CHECK_INTERVAL: float = float(
+        os.getenv("DATA_VERSION_CHECK_INTERVAL", "30")
+    )
+
+    # 범주 값 사전 (테이블별 항목/행정구역/연령대 등 실제 값, 값 검증/프롬프트용)
+    VALUE_DICT_ENABLED: bool = os.getenv("VALUE_DICT_ENABLED", "true").lower() == "true"
+    VALUE_DICT_PATH: str = os.getenv(
+        "VALUE_DICT_PATH", str(BASE_DIR / "value_dictionary.json")
+    )
+    # 값이 이보다 많은 컬럼은 범주로 보지 않음
+    VALUE_DICT_MAX_VALUES: int = int(os.getenv("VALUE_DICT_MAX_VALUES", "300"))
+    # 테이블별 최대 범주 조합 수 (넘으면 그 테이블은 값 검사 생략)
+    VALUE_DICT_MAX_COMBINATIONS: int = int(
+        os.getenv("VALUE_DICT_MAX_COMBINATIONS", "100000")
+    )
+    # SQL 생성 프롬프트에 넣을 컬럼별 값 개수 (0이면 넣지 않음)
+    VALUE_DICT_PROMPT_VALUES: int = int(os.getenv("VALUE_DICT_PROMPT_VALUES", "20"))
+
+    # 실행 SQL 로그 (JSONL, 인덱스 분석용, 빈 값이면 기록 안 함)
+    QUERY_LOG_PATH: str = os.getenv(
+        "QUERY_LOG_PATH", str(BASE_DIR / "logs" / "query_log.jsonl")
+    )
+
+    # Turso 로컬 복제본 (읽기 전용 쿼리를 로컬 SQLite 파일에서 실행)
+    DB_REPLICA_ENABLED: bool = (
+        os.getenv("DB_REPLICA_ENABLED", "false").lower() == "true"
+    )
+    DB_REPLICA_PATH: str = os.getenv("DB_REPLICA_PATH", str(BASE_DIR / "replica.db"))
+    # 동기화 주기 (초, 0이면 시작 시 1회 + 수동 동기화만)
+    DB_REPLICA_SYNC_INTERVAL: float = float(
+        os.getenv("DB_REPLICA_SYNC_INTERVAL", "600")
+    )
+    # 마지막 동기화가 이보다 오래되면 원격 DB 사용 (초)
+    DB_REPLICA_MAX_STALENESS: float = float(
+        os.getenv("DB_REPLICA_MAX_STALENESS", "3600")
+    )
+
+    # 메타데이터 자동 새로고침 주기 (초, 0이면 끔)
+    METADATA_REFRESH_INTERVAL: float = float(
+        os.getenv("METADATA_REFRESH_INTERVAL", "300")
+    )
+
     @property
     def DB_URI(self):
         """DB URI 동적 생성"""
         return f"sqlite+{self.TURSO_DATABASE_URL}?secure=true"
 
+    @property
+    def VECTOR_DB_DIR(self):
+        """벡터 DB 경로 (임베딩 제공자별로 분리)"""
+        default = (
+            "./embedding_db"
+            if self.EMBEDDING_PROVIDER == "upstage"
+            else f"./embedding_db_{self.EMBEDDING_PROVIDER}"
+        )
+        return os.getenv("VECTOR_DB_DIR", default)
+
     def validate(self):
         """필수 설정 값 검증"""
-        if not self.UPSTAGE_API_KEY:
+        if self.EMBEDDING_PROVIDER == "upstage" and not self.UPSTAGE_API_KEY:
             raise ValueError("UPSTAGE_API_KEY가 설정되지 않았습니다.")
 
         if not self.GOOGLE_API_KEY:
@@ -64,6 +207,7 @@ class Settings:
         print(f"   - LangSmith 추적: {self.LANGCHAIN_TRACING_V2}")
         print(f"   - LLM Provider: {self.LLM_PROVIDER}")
         print(f"   - 모델: {self.MODEL_NAME}")
+        print(f"   - 임베딩: {self.EMBEDDING_PROVIDER}")
 
 
 # 전역 설정 객체
@@ -1,10 +1,87 @@
 """
 데이터베이스 연결 관리 모듈
+- 크기/오버플로우/재활용 주기를 설정할 수 있는 커넥션 풀
+- 시작 시 커넥션 워밍업, 헬스 체크
+- 풀 지표 (대여 중 커넥션 수, 대기 시간, 타임아웃)
+- 읽기 전용 쿼리용 로컬 복제본 (선택, DB_REPLICA_ENABLED)
+- 정규화 SQL 기반 결과 캐시 (LRU + TTL + 데이터 버전 무효화)
+- 실행 전 비용 검사 (EXPLAIN QUERY PLAN), LIMIT 추가, 실행 제한 시간
+- 비동기 실행 (aexecute: 커넥션 풀 크기만큼의 전용 스레드에서 실행)
 """
 
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
 from langchain_community.utilities import SQLDatabase
 from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
 from config import settings
+from database.index_advisor import quote_identifier, sql_literal
+from database.query_guard import QueryGuard, statement_deadline
+from database.query_result import QueryResult
+from database.replica import LocalReplica
+from database.result_cache import QueryResultCache
+
+
+class PoolMetrics:
+    """커넥션 풀 지표 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    def record_checkout(self, wait: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def record_timeout(self, wait: float):
+        with self._lock:
+            self.timeouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": (
+                    round(self.total_wait / attempts * 1000, 2) if attempts else 0.0
+                ),
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+            }
+
+
+# 전역 풀 지표 (풀이 재생성돼도 유지)
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """커넥션 대여 대기 시간 / 타임아웃을 기록하는 QueuePool"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            conn = super().connect()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout(time.perf_counter() - started)
+            raise
+        pool_metrics.record_checkout(time.perf_counter() - started)
+        return conn
 
 
 class DatabaseManager:
@@ -14,9 +91,26 @@ class DatabaseManager:
         self.db_uri = settings.DB_URI
         self.db = None
         self.engine = None
+        self.replica = None
+        self._connect_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # (적재 버전, 확인 시각) - data_version에서 주기적으로 갱신
+        self._load_version: Tuple[str, float] = ("", 0.0)
+        self._load_version_lock = threading.Lock()
+        self.result_cache = QueryResultCache(
+            max_size=settings.SQL_CACHE_SIZE,
+            ttl=settings.SQL_CACHE_TTL,
+            max_rows=settings.SQL_CACHE_MAX_ROWS,
+            version_fn=self.data_version,
+        )
+        self.query_guard = QueryGuard(
+            max_cost=settings.SQL_MAX_COST,
+            row_count_fn=self.table_row_count,
+            version_fn=self.data_version,
+        )
 
     def connect(self):
-        """데이터베이스 연결"""
+        """데이터베이스 연결 (커넥션 풀 엔진 생성)"""
         try:
             # Turso용 SQLAlchemy 엔진 생성
             self.engine = create_engine(
@@ -25,12 +119,21 @@ class DatabaseManager:
                     "check_same_thread": False,  # 멀티스레드 지원
                     "auth_token": settings.TURSO_AUTH_TOKEN,
                 },
+                poolclass=InstrumentedQueuePool,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+                pool_pre_ping=settings.DB_POOL_PRE_PING,  # 끊긴 커넥션 자동 교체
             )
 
             # LangChain SQLDatabase 래퍼 생성
             self.db = SQLDatabase(self.engine)
 
-            print(f"✅ Turso DB 연결 성공: {settings.TURSO_DATABASE_URL}")
+            print(
+                f"✅ Turso DB 연결 성공: {settings.TURSO_DATABASE_URL} "
+                f"(풀 {settings.DB_POOL_SIZE} + 오버플로우 {settings.DB_MAX_OVERFLOW})"
+            )
             return self.db
 
         except Exception as e:
@@ -40,9 +143,373 @@ class DatabaseManager:
     def get_db(self):
         """DB 인스턴스 반환"""
         if self.db is None:
-            self.connect()
+            # 여러 세션이 동시에 첫 요청을 보내도 엔진은 1개만 생성
+            with self._connect_lock:
+                if self.db is None:
+                    self.connect()
         return self.db
 
+    def execute(
+        self, sql: str, max_rows: Optional[int] = None, use_cache: bool = True
+    ) -> QueryResult:
+        """
+        SQL 실행 → 컬럼 단위 결과 (문자열 변환/파싱 없음)
+
+        같은 SQL(정규화 기준)을 같은 데이터 버전에서 다시 실행하면 캐시된 결과 반환.
+        캐시에 없으면 실행 전에 비용을 검사하고(SQL_GUARD_ENABLED) LIMIT을 붙인다.
+        로컬 복제본이 켜져 있고 최신이면 복제본에서 실행하고,
+        오래됐거나 실패하면 원격 DB로 폴백한다.
+
+        Args:
+            sql: 실행할 SQL
+            max_rows: 최대 행 수 (None이면 settings.SQL_MAX_ROWS, 0이면 제한 없음)
+            use_cache: 결과 캐시 사용 여부
+
+        Returns:
+            QueryResult: 커서 컬럼명 + 컬럼별 값
+
+        Raises:
+            QueryRejected: 예상 비용 초과 / QueryTimeout: 실행 제한 시간 초과
+        """
+        if max_rows is None:
+            max_rows = settings.SQL_MAX_ROWS
+
+        if use_cache:
+            return self.result_cache.get_or_execute(sql, self._execute, max_rows)
+        return self._execute(sql, max_rows)
+
+    async def aexecute(
+        self, sql: str, max_rows: Optional[int] = None, use_cache: bool = True
+    ) -> QueryResult:
+        """
+        비동기 SQL 실행 (execute와 같은 캐시/비용 검사/복제본 경로)
+
+        Turso/libsql 드라이버는 동기 API뿐이라 전용 스레드 풀에서 실행한다.
+        스레드 수가 커넥션 풀 크기(풀 + 오버플로우)와 같아서
+        동시 대화가 많아도 풀 대기로 스레드가 쌓이지 않고 이벤트 루프는 막히지 않는다.
+
+        Args:
+            sql: 실행할 SQL
+            max_rows: 최대 행 수 (None이면 settings.SQL_MAX_ROWS, 0이면 제한 없음)
+            use_cache: 결과 캐시 사용 여부
+
+        Returns:
+            QueryResult
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), self.execute, sql, max_rows, use_cache
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """aexecute 전용 스레드 풀 (최초 호출 시 생성)"""
+        if self._executor is None:
+            with self._connect_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+                        thread_name_prefix="db",
+                    )
+        return self._executor
+
+    def _execute(self, sql: str, max_rows: int) -> QueryResult:
+        """비용 검사 후 실행"""
+        if settings.SQL_GUARD_ENABLED:
+            sql = self.query_guard.prepare(sql, self.explain, max_rows)
+        return self._run(sql, max_rows, timeout=settings.SQL_STATEMENT_TIMEOUT)
+
+    def _run(
+        self, sql: str, max_rows: int = 0, timeout: Optional[float] = None
+    ) -> QueryResult:
+        """복제본 우선 실행, 안 되면 원격 DB"""
+        replica = self.get_replica()
+        if replica is not None:
+            result = replica.try_execute(sql, max_rows, timeout)
+            if result is not None:
+                return result
+
+        return self.execute_remote(sql, max_rows, timeout)
+
+    def execute_internal(self, sql: str, max_rows: int = 0) -> QueryResult:
+        """
+        내부 조회 (범주 값 사전 구축 등, 비용 검사/결과 캐시/제한 시간 없음)
+
+        Args:
+            sql: 실행할 SQL
+            max_rows: 최대 행 수 (0 이하면 제한 없음)
+
+        Returns:
+            QueryResult
+        """
+        return self._run(sql, max_rows)
+
+    def explain(self, sql: str) -> List[Tuple]:
+        """
+        EXPLAIN QUERY PLAN 결과 (실제 실행과 같은 경로: 복제본 우선)
+
+        Returns:
+            (id, parent, notused, detail) 행 리스트
+        """
+        return self._run(f"EXPLAIN QUERY PLAN {sql}").rows()
+
+    def table_row_count(self, table_name: str) -> Optional[int]:
+        """
+        테이블 행 수 (비용 추정용, ANALYZE 통계 sqlite_stat1)
+
+        요청 경로에서 COUNT(*) 전체 스캔은 하지 않는다. 통계가 없으면 None을 반환해
+        그 테이블은 크기 검사에서 빠짐 (통계 생성: scripts/index_advisor.py --analyze)
+
+        Returns:
+            행 수 (통계가 없거나 테이블이 아니면 None - CTE, 서브쿼리 별칭 등)
+        """
+        try:
+            stat = self._run(
+                "SELECT stat FROM sqlite_stat1 "
+                f"WHERE tbl = {sql_literal(table_name)} LIMIT 1"
+            )
+            if stat:
+                return int(str(stat[0][0]).split()[0])
+        except Exception:
+            pass  # ANALYZE 전이면 sqlite_stat1이 없음
+        return None
+
+    def data_version(self) -> str:
+        """
+        현재 데이터 버전 (결과 캐시 키에 포함)
+
+        메타데이터 스냅샷 버전 + 로컬 복제본 동기화 세대 + 적재 버전.
+        셋 중 하나라도 바뀌면 이전에 캐시된 결과는 더 이상 조회되지 않음.
+        적재 버전 테이블이 없으면(적재 후 mark_data_loaded를 호출하지 않으면)
+        팩트 테이블 데이터가 바뀌어도 SQL_CACHE_TTL이 지날 때까지 이전 결과가 남음
+        """
+        from database.metadata_manager import get_metadata_manager
+
+        replica_generation = self.replica.generation if self.replica else 0
+        return (
+            f"m{get_metadata_manager().version}:r{replica_generation}"
+            f":d{self.load_version()}"
+        )
+
+    def load_version(self) -> str:
+        """
+        적재 버전 (DATA_VERSION_TABLE의 최신 version)
+
+        DATA_VERSION_CHECK_INTERVAL초마다 한 번만 조회하고 그 사이에는 마지막 값 사용
+
+        Returns:
+            최신 적재 버전 문자열 (테이블이 없거나 비어 있으면 "0")
+        """
+        version, checked_at = self._load_version
+        now = time.monotonic()
+        if checked_at and now - checked_at < settings.DATA_VERSION_CHECK_INTERVAL:
+            return version
+
+        with self._load_version_lock:
+            version, checked_at = self._load_version
+            if checked_at and now - checked_at < settings.DATA_VERSION_CHECK_INTERVAL:
+                return version
+            try:
+                rows = self._run(
+                    "SELECT MAX(version) FROM "
+                    f"{quote_identifier(settings.DATA_VERSION_TABLE)}"
+                )
+                version = str(rows[0][0] or 0) if rows else "0"
+            except Exception:
+                version = "0"  # 적재 버전 테이블 없음 → TTL로만 만료
+            self._load_version = (version, time.monotonic())
+            return version
+
+    def mark_data_loaded(self, note: str = "") -> str:
+        """
+        데이터 적재 완료 기록 (적재/롤업 스크립트에서 호출)
+
+        DATA_VERSION_TABLE에 행을 추가해 적재 버전을 올린다.
+        실행 중인 앱들은 DATA_VERSION_CHECK_INTERVAL초 안에 새 버전을 보고
+        이전에 캐시된 결과를 더 이상 사용하지 않음
+
+        Args:
+            note: 적재 내용 메모 (테이블명 등)
+
+        Returns:
+            새 적재 버전
+        """
+        table = quote_identifier(settings.DATA_VERSION_TABLE)
+        self.get_db()
+        conn = self.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "version INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "loaded_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+                "note TEXT)"
+            )
+            cursor.execute(f"INSERT INTO {table} (note) VALUES (?)", (note,))
+            version = str(cursor.lastrowid)
+            conn.commit()
+        finally:
+            conn.close()
+
+        self._load_version = ("", 0.0)  # 다음 조회 때 다시 읽음
+        self.invalidate_cache()
+        print(f"📦 데이터 적재 버전: {version} ({note or '메모 없음'})")
+        return version
+
+    def invalidate_cache(self):
+        """이 프로세스의 결과 캐시 전체 무효화 (다른 프로세스는 mark_data_loaded)"""
+        self.result_cache.invalidate()
+        print("🧹 SQL 결과 캐시 초기화")
+
+    def execute_remote(
+        self, sql: str, max_rows: int = 0, timeout: Optional[float] = None
+    ) -> QueryResult:
+        """
+        원격(Turso) DB에서 SQL 실행
+
+        Args:
+            sql: 실행할 SQL
+            max_rows: 최대 행 수 (0 이하면 제한 없음)
+            timeout: 실행 제한 시간 (초, 드라이버가 중단을 지원할 때만 적용)
+
+        Returns:
+            QueryResult
+        """
+        self.get_db()
+        with self.engine.connect() as conn:
+            dbapi_conn = conn.connection.dbapi_connection
+            with statement_deadline(dbapi_conn, timeout):
+                # text()를 거치지 않아 ':' 가 바인드 파라미터로 해석되지 않음
+                cursor = conn.exec_driver_sql(sql)
+                if not cursor.returns_rows:
+                    return QueryResult.from_rows([], [])
+                try:
+                    return QueryResult.from_cursor(cursor.keys(), cursor, max_rows)
+                finally:
+                    cursor.close()
+
+    def get_replica(self) -> Optional[LocalReplica]:
+        """
+        로컬 복제본 반환 (DB_REPLICA_ENABLED일 때만, 최초 호출 시 동기화 시작)
+
+        Returns:
+            LocalReplica 또는 None
+        """
+        if not settings.DB_REPLICA_ENABLED:
+            return None
+        if self.replica is None:
+            with self._connect_lock:
+                if self.replica is None:
+                    replica = LocalReplica(
+                        path=settings.DB_REPLICA_PATH,
+                        sync_url=settings.TURSO_DATABASE_URL,
+                        auth_token=settings.TURSO_AUTH_TOKEN,
+                        max_staleness=settings.DB_REPLICA_MAX_STALENESS,
+                    )
+                    # 첫 동기화도 백그라운드 (끝나기 전까지는 원격 DB 사용)
+                    replica.start_auto_sync(settings.DB_REPLICA_SYNC_INTERVAL)
+                    self.replica = replica
+        return self.replica
+
+    def warm_up(self, n_connections: Optional[int] = None) -> int:
+        """
+        커넥션 미리 열어두기 (첫 요청의 연결 지연 제거)
+
+        n개를 동시에 대여해 SELECT 1을 실행하고 반납하면 풀에 그대로 남는다.
+
+        Args:
+            n_connections: 열어둘 커넥션 수 (None이면 settings.DB_WARMUP_CONNECTIONS)
+
+        Returns:
+            int: 워밍업에 성공한 커넥션 수
+        """
+        if n_connections is None:
+            n_connections = settings.DB_WARMUP_CONNECTIONS
+        n_connections = min(n_connections, settings.DB_POOL_SIZE)
+        if n_connections <= 0:
+            return 0
+
+        self.get_db()
+        started = time.perf_counter()
+        barrier = threading.Barrier(n_connections)
+
+        def _open(_):
+            try:
+                with self.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                    # 모두 대여한 상태에서 반납해야 서로 다른 커넥션이 열림
+                    barrier.wait(timeout=settings.DB_POOL_TIMEOUT)
+            except threading.BrokenBarrierError:
+                # 다른 커넥션이 실패해도 이 커넥션은 이미 열림
+                pass
+            except Exception:
+                barrier.abort()
+                raise
+
+        ok = 0
+        with ThreadPoolExecutor(max_workers=n_connections) as executor:
+            futures = [executor.submit(_open, i) for i in range(n_connections)]
+            for future in futures:
+                try:
+                    future.result()
+                    ok += 1
+                except Exception as e:
+                    print(f"⚠️  커넥션 워밍업 실패: {e}")
+
+        elapsed = time.perf_counter() - started
+        print(f"🔥 DB 커넥션 워밍업: {ok}/{n_connections}개 ({elapsed:.2f}초)")
+        return ok
+
+    def health_check(self) -> Dict:
+        """
+        헬스 체크 (SELECT 1 왕복 시간 + 풀/복제본/결과 캐시/실행 가드 지표)
+
+        Returns:
+            dict: {"ok": bool, "latency_ms": float, "error": str, "pool": dict,
+                   "replica": dict, "result_cache": dict, "query_guard": dict}
+        """
+        started = time.perf_counter()
+        try:
+            self.get_db()
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            ok, error = True, None
+        except Exception as e:
+            ok, error = False, str(e)
+
+        return {
+            "ok": ok,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            "error": error,
+            "pool": self.pool_status(),
+            "replica": self.replica.status() if self.replica else None,
+            "result_cache": self.result_cache.stats(),
+            "query_guard": self.query_guard.stats(),
+        }
+
+    def pool_status(self) -> Dict:
+        """
+        커넥션 풀 지표
+
+        Returns:
+            dict: 풀 크기, 대여 중/유휴 커넥션 수, 오버플로우,
+                  누적 대여 수, 타임아웃 수, 평균/최대 대기 시간(ms)
+        """
+        status = pool_metrics.snapshot()
+        if self.engine is None:
+            return status
+
+        pool = self.engine.pool
+        if isinstance(pool, QueuePool):
+            status.update(
+                {
+                    "pool_size": pool.size(),
+                    "checked_out": pool.checkedout(),
+                    "idle": pool.checkedin(),
+                    "overflow": max(pool.overflow(), 0),
+                }
+            )
+        return status
+
     def test_connection(self):
         """연결 테스트"""
         if self.db is None:
@@ -56,6 +523,7 @@ class DatabaseManager:
             # 샘플 쿼리 실행
             result = self.db.run("SELECT COUNT(*) FROM population_gender_stats;")
             print(f"📈 population_gender_stats 행 수: {result}")
+            print(f"🏊 커넥션 풀: {self.pool_status()}")
 
             return True
 
@@ -72,8 +540,16 @@ class DatabaseManager:
 
     def close(self):
         """연결 종료"""
+        if self.replica:
+            self.replica.stop_auto_sync()
+            self.replica = None
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
         if self.engine:
             self.engine.dispose()
+            self.engine = None
+            self.db = None
             print("✅ DB 연결 종료")
 
 
@@ -0,0 +1,205 @@
+"""
+database/embedding_build.py
+
+벡터 DB 구축용 배치 임베딩
+- 설정한 크기의 배치로 나눠 제한된 워커 풀에서 병렬 임베딩
+- 완료된 배치는 디스크에 체크포인트 → 중단 후 재실행 시 이어서 진행
+- 처리량 리포트 (docs/sec, tokens/sec)
+"""
+
+import hashlib
+import json
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.embeddings import Embeddings
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정 (처리량 리포트용)
+
+    한글은 대략 1~2글자당 1토큰이므로 글자 수의 절반으로 추정
+    """
+    return max(1, len(text) // 2)
+
+
+def _batch_key(namespace: str, ids: Sequence[str], texts: Sequence[str]) -> str:
+    """배치 내용 기반 체크포인트 키 (문서가 바뀌면 키도 바뀜)"""
+    digest = hashlib.sha256(namespace.encode("utf-8"))
+    for doc_id, text in zip(ids, texts):
+        digest.update(b"\x00" + doc_id.encode("utf-8"))
+        digest.update(b"\x01" + text.encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+class BatchEmbeddingBuilder:
+    """배치 단위 병렬 임베딩 + 체크포인트"""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        namespace: str,
+        batch_size: int = 16,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        checkpoint_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            embeddings: 문서 임베딩 클라이언트
+            namespace: 임베딩 모델 구분용 이름 (체크포인트 키에 포함)
+            batch_size: 배치당 문서 수
+            max_workers: 동시 임베딩 요청 수
+            max_retries: 배치별 재시도 횟수
+            checkpoint_dir: 체크포인트 저장 경로 (None이면 체크포인트 없음)
+        """
+        self.embeddings = embeddings
+        self.namespace = namespace
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max(0, max_retries)
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+
+    # ------------------------------------------------------------
+    # 체크포인트
+    # ------------------------------------------------------------
+
+    def _checkpoint_path(self, key: str) -> Optional[Path]:
+        if self.checkpoint_dir is None:
+            return None
+        return self.checkpoint_dir / f"batch_{key}.json"
+
+    def _load_checkpoint(self, key: str) -> Optional[List[List[float]]]:
+        path = self._checkpoint_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["vectors"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  체크포인트 손상, 다시 임베딩: {path.name} ({e})")
+            return None
+
+    def _save_checkpoint(self, key: str, vectors: List[List[float]]):
+        path = self._checkpoint_path(key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 쓰는 도중 중단돼도 깨진 파일이 남지 않도록 임시 파일 → rename
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"vectors": vectors}, f)
+        tmp_path.replace(path)
+
+    def clear_checkpoints(self):
+        """체크포인트 삭제 (벡터 DB 저장 완료 후 호출)"""
+        if self.checkpoint_dir is not None and self.checkpoint_dir.exists():
+            shutil.rmtree(self.checkpoint_dir)
+
+    # ------------------------------------------------------------
+    # 임베딩
+    # ------------------------------------------------------------
+
+    def _embed_with_retry(self, texts: List[str]) -> List[List[float]]:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.embeddings.embed_documents(texts)
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise
+                wait = 2**attempt
+                print(f"⚠️  임베딩 실패, {wait}초 후 재시도 ({attempt + 1}회): {e}")
+                time.sleep(wait)
+
+    def _run_batch(self, key: str, texts: List[str]) -> List[List[float]]:
+        """배치 임베딩 후 바로 체크포인트 (다른 배치가 실패해도 진행분 보존)"""
+        vectors = self._embed_with_retry(texts)
+        self._save_checkpoint(key, vectors)
+        return vectors
+
+    def build(
+        self, ids: Sequence[str], texts: Sequence[str]
+    ) -> Dict[str, List[float]]:
+        """
+        문서 임베딩 (체크포인트가 있는 배치는 건너뜀)
+
+        Args:
+            ids: 문서 ID 리스트
+            texts: 문서 리스트
+
+        Returns:
+            {문서 ID: 임베딩}
+        """
+        ids = list(ids)
+        texts = list(texts)
+
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            batch_ids = ids[start : start + self.batch_size]
+            batch_texts = texts[start : start + self.batch_size]
+            key = _batch_key(self.namespace, batch_ids, batch_texts)
+            batches.append((key, batch_ids, batch_texts))
+
+        vectors: Dict[str, List[float]] = {}
+        pending = []
+        for key, batch_ids, batch_texts in batches:
+            cached = self._load_checkpoint(key)
+            if cached is not None and len(cached) == len(batch_ids):
+                vectors.update(zip(batch_ids, cached))
+            else:
+                pending.append((key, batch_ids, batch_texts))
+
+        resumed = len(batches) - len(pending)
+        if resumed:
+            print(f"♻️  체크포인트에서 {resumed}개 배치 복원")
+
+        if not pending:
+            return vectors
+
+        total_docs = sum(len(batch_ids) for _, batch_ids, _ in pending)
+        print(
+            f"🚀 임베딩 시작: {total_docs}개 문서, "
+            f"{len(pending)}개 배치 (배치 크기 {self.batch_size}, "
+            f"워커 {self.max_workers}개)"
+        )
+
+        started = time.perf_counter()
+        done_docs = 0
+        done_tokens = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._run_batch, key, batch_texts): (
+                    key,
+                    batch_ids,
+                    batch_texts,
+                )
+                for key, batch_ids, batch_texts in pending
+            }
+
+            for future in as_completed(futures):
+                key, batch_ids, batch_texts = futures[future]
+                batch_vectors = future.result()
+                vectors.update(zip(batch_ids, batch_vectors))
+
+                done_docs += len(batch_ids)
+                done_tokens += sum(estimate_tokens(t) for t in batch_texts)
+                elapsed = max(time.perf_counter() - started, 1e-9)
+                print(
+                    f"  ✓ 배치 완료 {done_docs}/{total_docs} "
+                    f"({done_docs / elapsed:.1f} docs/sec, "
+                    f"{done_tokens / elapsed:.0f} tokens/sec)"
+                )
+
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        print(
+            f"✅ 임베딩 완료: {done_docs}개 문서, {elapsed:.1f}초 "
+            f"({done_docs / elapsed:.1f} docs/sec, "
+            f"추정 {done_tokens / elapsed:.0f} tokens/sec)"
+        )
+
+        return vectors
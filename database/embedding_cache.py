@@ -0,0 +1,199 @@
+"""
+database/embedding_cache.py
+
+질문 임베딩 캐시 모듈
+- 콘텐츠 주소 기반 키 (임베딩 모델 + 정규화된 질문의 SHA-256)
+- 메모리 LRU 캐시 + 디스크(SQLite) 백업 저장소
+- hit/miss 카운터 (메모리 hit, 디스크 hit, miss)
+"""
+
+import hashlib
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+
+def normalize_query_text(text: str) -> str:
+    """공백 정규화 (같은 질문이 다른 키로 저장되지 않도록)"""
+    return " ".join(text.split())
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    질문 임베딩 캐시 래퍼
+
+    Chroma의 embedding_function 자리에 그대로 들어가며,
+    캐시에 있는 질문은 임베딩 API를 호출하지 않는다.
+    문서 임베딩(embed_documents)은 캐시하지 않고 그대로 위임한다.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        namespace: str,
+        max_size: int = 2048,
+        db_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            embeddings: 실제 임베딩 클라이언트
+            namespace: 캐시 키 구분용 이름 (예: "upstage:embedding-query")
+            max_size: 메모리 LRU 최대 항목 수
+            db_path: 디스크 캐시 파일 경로 (None이면 메모리만 사용)
+        """
+        self._embeddings = embeddings
+        self._namespace = namespace
+        self._max_size = max(1, max_size)
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._conn = None
+        if db_path:
+            self._open_disk_store(db_path)
+
+    # ------------------------------------------------------------
+    # 디스크 저장소
+    # ------------------------------------------------------------
+
+    def _open_disk_store(self, db_path: str):
+        """디스크 캐시 열기 (실패해도 메모리 캐시로 동작)"""
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  임베딩 디스크 캐시 사용 불가: {e}")
+            self._conn = None
+
+    def _load_from_disk(self, key: str) -> Optional[List[float]]:
+        if self._conn is None:
+            return None
+        row = self._conn.execute(
+            "SELECT vector FROM query_embeddings WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        vector = array("f")
+        vector.frombytes(row[0])
+        return vector.tolist()
+
+    def _save_to_disk(self, key: str, vector: List[float]):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO query_embeddings (key, vector) VALUES (?, ?)",
+                (key, array("f", vector).tobytes()),
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️  임베딩 디스크 캐시 저장 실패: {e}")
+
+    # ------------------------------------------------------------
+    # 메모리 LRU
+    # ------------------------------------------------------------
+
+    def _make_key(self, text: str) -> str:
+        raw = f"{self._namespace}\n{text}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def _remember(self, key: str, vector: List[float]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_size:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------
+    # Embeddings 인터페이스
+    # ------------------------------------------------------------
+
+    def _cached(self, key: str) -> Optional[List[float]]:
+        """메모리 → 디스크 순서로 조회 (없으면 miss로 기록)"""
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return list(vector)
+
+            vector = self._load_from_disk(key)
+            if vector is not None:
+                self._remember(key, vector)
+                self.disk_hits += 1
+                return list(vector)
+
+            self.misses += 1
+            return None
+
+    def _store(self, key: str, vector: List[float]):
+        with self._lock:
+            self._remember(key, vector)
+            self._save_to_disk(key, vector)
+
+    def embed_query(self, text: str) -> List[float]:
+        """질문 임베딩 (캐시 우선)"""
+        text = normalize_query_text(text)
+        key = self._make_key(text)
+
+        vector = self._cached(key)
+        if vector is not None:
+            return vector
+
+        # API 호출은 락 밖에서 (다른 세션의 캐시 조회를 막지 않도록)
+        vector = self._embeddings.embed_query(text)
+        self._store(key, vector)
+        return list(vector)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """질문 임베딩 (캐시 우선, API는 비동기 호출)"""
+        text = normalize_query_text(text)
+        key = self._make_key(text)
+
+        vector = self._cached(key)
+        if vector is not None:
+            return vector
+
+        vector = await self._embeddings.aembed_query(text)
+        self._store(key, vector)
+        return list(vector)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """문서 임베딩은 캐시하지 않음"""
+        return self._embeddings.embed_documents(texts)
+
+    def stats(self) -> Dict:
+        """캐시 통계 반환"""
+        with self._lock:
+            total = self.hits + self.disk_hits + self.misses
+            return {
+                "namespace": self._namespace,
+                "size": len(self._memory),
+                "max_size": self._max_size,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (
+                    round((self.hits + self.disk_hits) / total, 3) if total else 0.0
+                ),
+            }
+
+    def clear(self):
+        """메모리/디스크 캐시 비우기"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM query_embeddings")
+                self._conn.commit()
@@ -0,0 +1,110 @@
+"""
+database/embeddings.py
+
+임베딩 제공자 (provider) 선택
+- upstage: Upstage embedding-query / embedding-passage (원격 API)
+- local: 글자 n-gram 해싱 임베딩 (네트워크 불필요, 결정적)
+
+local은 오프라인 개발, 부하 테스트, 회귀 테스트용이다.
+제공자가 다르면 벡터 공간도 다르므로 벡터 DB 경로가 분리된다 (settings.VECTOR_DB_DIR).
+"""
+
+import hashlib
+import math
+import re
+from typing import List, Tuple
+
+from langchain_core.embeddings import Embeddings
+from config.settings import settings
+
+_WORD_PATTERN = re.compile(r"[0-9A-Za-z가-힣]+")
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    글자 n-gram 해싱 임베딩 (로컬, 결정적)
+
+    각 n-gram을 blake2b로 해싱해 차원 인덱스와 부호를 정하고,
+    누적한 벡터를 L2 정규화한다. 같은 입력은 항상 같은 벡터가 된다.
+    """
+
+    def __init__(self, dim: int = 512, ngram_range: Tuple[int, int] = (1, 3)):
+        """
+        Args:
+            dim: 임베딩 차원
+            ngram_range: (최소 n, 최대 n) 글자 n-gram
+        """
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    def _ngrams(self, text: str) -> List[str]:
+        min_n, max_n = self.ngram_range
+        grams = []
+        for word in _WORD_PATTERN.findall(text.lower()):
+            for n in range(min_n, max_n + 1):
+                for i in range(len(word) - n + 1):
+                    grams.append(word[i : i + n])
+        return grams
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+
+        for gram in self._ngrams(text):
+            digest = hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            index = value % self.dim
+            sign = 1.0 if (value >> 63) & 1 else -1.0
+            # 긴 n-gram일수록 의미가 구체적이므로 가중치 ↑
+            vector[index] += sign * len(gram)
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0:
+            return vector
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def get_embedding_namespace(kind: str) -> str:
+    """
+    임베딩 모델 구분 이름 (캐시 키, 체크포인트 키, 문서 해시에 사용)
+
+    Args:
+        kind: "query" 또는 "passage"
+    """
+    if settings.EMBEDDING_PROVIDER == "local":
+        # 로컬 임베딩은 질문/문서가 같은 공간
+        return f"local:hashing-{settings.LOCAL_EMBEDDING_DIM}"
+    return f"upstage:embedding-{kind}"
+
+
+def create_embeddings(kind: str) -> Embeddings:
+    """
+    설정된 제공자(EMBEDDING_PROVIDER)의 임베딩 클라이언트 생성
+
+    Args:
+        kind: "query" (검색 시) 또는 "passage" (벡터 DB 구축 시)
+
+    Returns:
+        Embeddings 인스턴스
+    """
+    if kind not in ("query", "passage"):
+        raise ValueError(f"알 수 없는 임베딩 종류: {kind}")
+
+    provider = settings.EMBEDDING_PROVIDER
+
+    if provider == "local":
+        return HashingEmbeddings(dim=settings.LOCAL_EMBEDDING_DIM)
+
+    if provider == "upstage":
+        from langchain_upstage import UpstageEmbeddings
+
+        return UpstageEmbeddings(
+            api_key=settings.UPSTAGE_API_KEY, model=f"embedding-{kind}"
+        )
+
+    raise ValueError(f"지원하지 않는 임베딩 제공자: {provider}")
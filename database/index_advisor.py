@@ -0,0 +1,442 @@
+"""
+database/index_advisor.py
+
+KOSIS 통계 테이블 인덱스 분석/생성
+- tables_metadata의 컬럼 스키마 + 쿼리 로그의 WHERE 조건으로 복합 인덱스 제안
+- 동등 조건 컬럼(행정구역, 항목, 연령대)을 앞에, 범위 조건 컬럼(년월/년도)을 마지막에
+- 인덱스 생성 전/후 EXPLAIN QUERY PLAN과 실행 시간 비교
+"""
+
+import statistics
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from database.sql_tokens import identifier_name, tokenize_sql
+
+# 프롬프트 규칙상 거의 모든 쿼리가 거는 필터 컬럼 (로그가 없을 때 기본값)
+DEFAULT_EQUALITY_COLUMNS = ("행정구역", "항목", "연령대")
+DEFAULT_RANGE_COLUMNS = ("년월", "년도")
+
+EQUALITY_OPERATORS = {"=", "==", "in", "is"}
+RANGE_OPERATORS = {">", "<", ">=", "<=", "between", "like"}
+
+# 복합 인덱스 최대 컬럼 수
+MAX_INDEX_COLUMNS = 4
+
+
+@dataclass
+class TableUsage:
+    """테이블별 필터 컬럼 사용 빈도 (쿼리 로그 기준)"""
+
+    queries: int = 0
+    equality: Counter = field(default_factory=Counter)
+    range: Counter = field(default_factory=Counter)
+    samples: Counter = field(default_factory=Counter)  # {SQL: 실행 횟수}
+
+
+@dataclass
+class IndexReport:
+    """테이블 1개의 인덱스 분석 결과"""
+
+    table_name: str
+    columns: List[str]
+    index_name: str
+    source: str  # "log" (쿼리 로그 기반) 또는 "schema" (기본 규칙)
+    existing: Optional[str] = None  # 이미 같은 앞부분을 가진 인덱스
+    sample_sql: Optional[str] = None
+    plan_before: List[str] = field(default_factory=list)
+    plan_after: List[str] = field(default_factory=list)
+    ms_before: Optional[float] = None
+    ms_after: Optional[float] = None
+    created: bool = False
+    error: Optional[str] = None
+
+
+# ============================================================
+# 쿼리 로그 분석
+# ============================================================
+
+
+def extract_filters(
+    sql: str, table_columns: Mapping[str, Set[str]]
+) -> Dict[str, Tuple[Set[str], Set[str]]]:
+    """
+    SQL에서 테이블별 필터 컬럼 추출
+
+    Args:
+        sql: SQL
+        table_columns: {테이블명: 컬럼명 집합}
+
+    Returns:
+        {테이블명: (동등 조건 컬럼, 범위 조건 컬럼)} - SQL에 등장한 테이블만
+    """
+    tokens = tokenize_sql(sql, lower=False)
+    names = [identifier_name(t) if t[0] in ("word", "quoted") else None for t in tokens]
+    keywords = [
+        value.lower() if kind in ("word", "other") else None for kind, value in tokens
+    ]
+
+    # 식별자는 대소문자 무시
+    table_lookup = {name.lower(): name for name in table_columns}
+    referenced = []
+    for i, name in enumerate(names):
+        if name and name.lower() in table_lookup and i > 0:
+            if keywords[i - 1] in ("from", "join", ","):
+                referenced.append(table_lookup[name.lower()])
+    referenced = list(dict.fromkeys(referenced))
+
+    column_lookup = {
+        table: {col.lower(): col for col in table_columns[table]}
+        for table in referenced
+    }
+    filters = {table: (set(), set()) for table in referenced}
+    for i, name in enumerate(names[:-1]):
+        if not name:
+            continue
+        operator = keywords[i + 1]
+        if operator == "not" and i + 2 < len(tokens):
+            operator = keywords[i + 2]
+        if operator in EQUALITY_OPERATORS:
+            slot = 0
+        elif operator in RANGE_OPERATORS:
+            slot = 1
+        else:
+            continue
+        for table in referenced:
+            column = column_lookup[table].get(name.lower())
+            if column:
+                filters[table][slot].add(column)
+
+    return filters
+
+
+def collect_usage(
+    sqls: Iterable[str], table_columns: Mapping[str, Set[str]]
+) -> Dict[str, TableUsage]:
+    """
+    쿼리 로그 → 테이블별 필터 컬럼 사용 빈도
+
+    Args:
+        sqls: 실행된 SQL 목록
+        table_columns: {테이블명: 컬럼명 집합}
+
+    Returns:
+        {테이블명: TableUsage}
+    """
+    usage: Dict[str, TableUsage] = defaultdict(TableUsage)
+    for sql in sqls:
+        for table, (equality, range_) in extract_filters(sql, table_columns).items():
+            stats = usage[table]
+            stats.queries += 1
+            stats.equality.update(equality)
+            stats.range.update(range_ - equality)
+            stats.samples[sql.strip().rstrip(";")] += 1
+    return dict(usage)
+
+
+def propose_index(
+    table_name: str,
+    columns: Set[str],
+    usage: Optional[TableUsage] = None,
+    min_share: float = 0.3,
+) -> Tuple[List[str], str]:
+    """
+    복합 인덱스 컬럼 제안
+
+    - 쿼리 로그가 있으면: min_share 이상 쿼리에서 쓰인 동등 조건 컬럼(빈도순)
+      + 가장 많이 쓰인 범위 조건 컬럼 1개
+    - 없으면: 스키마에 있는 기본 필터 컬럼
+
+    Args:
+        table_name: 테이블명
+        columns: 테이블 컬럼명 집합
+        usage: 쿼리 로그 사용 빈도
+        min_share: 포함 기준 (전체 쿼리 대비 비율)
+
+    Returns:
+        (인덱스 컬럼 리스트, "log" 또는 "schema")
+    """
+    if usage and usage.queries:
+        threshold = usage.queries * min_share
+
+        def rank(counter: Counter) -> List[str]:
+            return [
+                col
+                for col, count in sorted(counter.items(), key=lambda x: (-x[1], x[0]))
+                if count >= threshold
+            ]
+
+        index_columns = rank(usage.equality)
+        range_columns = rank(usage.range)
+        if range_columns:
+            index_columns.append(range_columns[0])
+        if index_columns:
+            return index_columns[:MAX_INDEX_COLUMNS], "log"
+
+    index_columns = [col for col in DEFAULT_EQUALITY_COLUMNS if col in columns]
+    for col in DEFAULT_RANGE_COLUMNS:
+        if col in columns:
+            index_columns.append(col)
+            break
+    return index_columns[:MAX_INDEX_COLUMNS], "schema"
+
+
+# ============================================================
+# DB 조회 (DB-API 연결)
+# ============================================================
+
+
+def quote_identifier(name: str) -> str:
+    """식별자 따옴표 처리 (괄호가 들어간 컬럼명 등)"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def sql_literal(value) -> str:
+    """값 → SQL 리터럴"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _fetchall(conn, sql: str) -> List[Tuple]:
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def analyze_tables(conn, table_names: Iterable[str]) -> List[str]:
+    """
+    테이블별 ANALYZE (플래너 통계 + 쿼리 비용 검사의 행 수, sqlite_stat1)
+
+    Returns:
+        실패한 테이블명 리스트
+    """
+    failed = []
+    for table_name in table_names:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"ANALYZE {quote_identifier(table_name)}")
+        except Exception as e:
+            print(f"⚠️  ANALYZE 실패 ({table_name}): {e}")
+            failed.append(table_name)
+        finally:
+            cursor.close()
+    conn.commit()
+    return failed
+
+
+def existing_indexes(conn, table_name: str) -> Dict[str, List[str]]:
+    """
+    테이블의 기존 인덱스
+
+    Returns:
+        {인덱스명: [컬럼명, ...]}
+    """
+    indexes = {}
+    for row in _fetchall(conn, f"PRAGMA index_list({quote_identifier(table_name)})"):
+        index_name = row[1]
+        info = _fetchall(conn, f"PRAGMA index_info({quote_identifier(index_name)})")
+        indexes[index_name] = [r[2] for r in sorted(info, key=lambda r: r[0])]
+    return indexes
+
+
+def find_covering_index(
+    indexes: Mapping[str, Sequence[str]], columns: Sequence[str]
+) -> Optional[str]:
+    """
+    columns와 같은 앞부분을 가진 기존 인덱스 이름 (없으면 None)
+
+    앞쪽 동등 조건 컬럼끼리는 순서가 달라도 같은 인덱스로 본다.
+    (마지막 컬럼은 범위 조건일 수 있으므로 위치까지 일치해야 함)
+    """
+    n = len(columns)
+    for index_name, index_columns in indexes.items():
+        prefix = list(index_columns[:n])
+        if len(prefix) < n:
+            continue
+        if set(prefix[:-1]) == set(columns[:-1]) and prefix[-1] == columns[-1]:
+            return index_name
+    return None
+
+
+def explain(conn, sql: str) -> List[str]:
+    """EXPLAIN QUERY PLAN 결과 (detail 컬럼만)"""
+    return [str(row[-1]) for row in _fetchall(conn, f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def time_query(conn, sql: str, runs: int = 5) -> float:
+    """쿼리 실행 시간 중앙값 (ms)"""
+    timings = []
+    for _ in range(max(1, runs)):
+        started = time.perf_counter()
+        _fetchall(conn, sql)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def build_sample_query(conn, table_name: str, columns: Sequence[str]) -> Optional[str]:
+    """
+    로그가 없을 때 측정용 쿼리 생성 (실제 행 1개의 값으로 조건 구성)
+
+    Returns:
+        SELECT * FROM table WHERE c1 = v1 AND ... (행이 없으면 None)
+    """
+    if not columns:
+        return None
+    select_cols = ", ".join(quote_identifier(c) for c in columns)
+    rows = _fetchall(
+        conn, f"SELECT {select_cols} FROM {quote_identifier(table_name)} LIMIT 1"
+    )
+    if not rows:
+        return None
+    conditions = " AND ".join(
+        f"{quote_identifier(col)} = {sql_literal(value)}"
+        for col, value in zip(columns, rows[0])
+    )
+    return f"SELECT * FROM {quote_identifier(table_name)} WHERE {conditions}"
+
+
+def index_name_for(table_name: str, columns: Sequence[str]) -> str:
+    """인덱스 이름 규칙: idx_<테이블>_<컬럼>_..."""
+    return "idx_" + "_".join([table_name, *columns])
+
+
+# ============================================================
+# 분석 / 생성
+# ============================================================
+
+
+def advise_indexes(
+    conn,
+    table_columns: Mapping[str, Set[str]],
+    logged_sqls: Iterable[str] = (),
+    apply: bool = False,
+    runs: int = 5,
+    min_share: float = 0.3,
+) -> List[IndexReport]:
+    """
+    테이블별 인덱스 제안 (apply=True면 생성까지) + 전/후 비교
+
+    Args:
+        conn: DB-API 연결 (원본 DB)
+        table_columns: {테이블명: 컬럼명 집합} (column_schema_detail 기준)
+        logged_sqls: 쿼리 로그의 SQL 목록
+        apply: 인덱스 생성 여부 (False면 제안 + 현재 실행 계획만)
+        runs: 시간 측정 반복 횟수
+        min_share: 로그 기반 제안 시 컬럼 포함 기준 비율
+
+    Returns:
+        테이블별 IndexReport 리스트
+    """
+    usage = collect_usage(logged_sqls, table_columns)
+    reports = []
+
+    for table_name in sorted(table_columns):
+        columns, source = propose_index(
+            table_name, table_columns[table_name], usage.get(table_name), min_share
+        )
+        if not columns:
+            continue
+
+        report = IndexReport(
+            table_name=table_name,
+            columns=columns,
+            index_name=index_name_for(table_name, columns),
+            source=source,
+        )
+        reports.append(report)
+
+        try:
+            report.existing = find_covering_index(
+                existing_indexes(conn, table_name), columns
+            )
+
+            table_usage = usage.get(table_name)
+            if table_usage and table_usage.samples:
+                report.sample_sql = table_usage.samples.most_common(1)[0][0]
+            else:
+                report.sample_sql = build_sample_query(conn, table_name, columns)
+
+            if report.sample_sql:
+                report.plan_before = explain(conn, report.sample_sql)
+                report.ms_before = time_query(conn, report.sample_sql, runs)
+
+            if not apply or report.existing:
+                continue
+
+            column_sql = ", ".join(quote_identifier(c) for c in columns)
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {quote_identifier(report.index_name)} "
+                    f"ON {quote_identifier(table_name)} ({column_sql})"
+                )
+                # 플래너 통계 갱신
+                cursor.execute(f"ANALYZE {quote_identifier(table_name)}")
+            finally:
+                cursor.close()
+            conn.commit()
+            report.created = True
+
+            if report.sample_sql:
+                report.plan_after = explain(conn, report.sample_sql)
+                report.ms_after = time_query(conn, report.sample_sql, runs)
+
+        except Exception as e:
+            report.error = str(e)
+
+    return reports
+
+
+def format_report(report: IndexReport) -> str:
+    """IndexReport → 출력용 문자열"""
+    lines = [
+        f"📋 {report.table_name}",
+        f"  제안 인덱스 ({report.source}): {report.index_name} "
+        f"({', '.join(report.columns)})",
+    ]
+    if report.existing:
+        lines.append(f"  ✓ 기존 인덱스로 충분: {report.existing}")
+    if report.sample_sql:
+        lines.append(f"  측정 쿼리: {' '.join(report.sample_sql.split())[:120]}")
+    if report.plan_before:
+        lines.append(f"  실행 계획(전): {' | '.join(report.plan_before)}")
+    if report.plan_after:
+        lines.append(f"  실행 계획(후): {' | '.join(report.plan_after)}")
+    if report.ms_before is not None:
+        timing = f"  실행 시간: {report.ms_before:.2f}ms"
+        if report.ms_after is not None:
+            speedup = report.ms_before / report.ms_after if report.ms_after else 0
+            timing += f" → {report.ms_after:.2f}ms (x{speedup:.1f})"
+        lines.append(timing)
+    if report.created:
+        lines.append("  ✅ 인덱스 생성 완료")
+    if report.error:
+        lines.append(f"  ❌ 실패: {report.error}")
+    return "\n".join(lines)
+
+
+def table_columns_from_metadata(manager) -> Dict[str, Set[str]]:
+    """
+    MetadataManager → {테이블명: 컬럼명 집합} (column_schema_detail + 컬럼 목록)
+
+    Args:
+        manager: MetadataManager
+
+    Returns:
+        {테이블명: 컬럼명 집합}
+    """
+    table_columns = {}
+    for table_name, detail in manager.snapshot.details.items():
+        columns = {c.strip() for c in detail.columns.split(",") if c.strip()}
+        if isinstance(detail.column_detail, dict):
+            columns.update(detail.column_detail)
+        table_columns[table_name] = columns
+    return table_columns
@@ -0,0 +1,98 @@
+"""
+database/keyword_matcher.py
+
+다중 키워드 매칭 (Aho-Corasick 오토마톤)
+- 키워드 사전을 한 번 컴파일해두고 질문을 한 번만 스캔
+- 겹치는 키워드도 모두 찾음 (예: "취업자" → "취업", "취업자")
+- 키워드마다 라벨(카테고리, Rule 태그 등)을 붙일 수 있음
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Set, Tuple
+
+
+class KeywordAutomaton:
+    """Aho-Corasick 기반 키워드 매처"""
+
+    def __init__(self, keyword_labels: Mapping[str, Iterable[str]]):
+        """
+        Args:
+            keyword_labels: {키워드: 라벨 목록}
+        """
+        self._labels: Dict[str, FrozenSet[str]] = {}
+
+        # 상태별 전이 / 실패 링크 / 출력 키워드
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+
+        for keyword, labels in keyword_labels.items():
+            if not keyword:
+                continue
+            self._labels[keyword] = frozenset(labels)
+            self._insert(keyword)
+
+        self._build_failure_links()
+
+    def _insert(self, keyword: str):
+        state = 0
+        for ch in keyword:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][ch] = next_state
+            state = next_state
+        self._output[state] = self._output[state] + (keyword,)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(ch, 0)
+
+                # 실패 링크 쪽 출력도 함께 (접미사 키워드)
+                self._output[next_state] = (
+                    self._output[next_state] + self._output[self._fail[next_state]]
+                )
+
+    def find(self, text: str) -> Set[str]:
+        """
+        텍스트에 등장하는 모든 키워드 반환 (한 번의 스캔)
+
+        Args:
+            text: 검색 대상 텍스트
+
+        Returns:
+            매칭된 키워드 집합
+        """
+        found: Set[str] = set()
+        state = 0
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found.update(output[state])
+
+        return found
+
+    def labels(self, keyword: str) -> FrozenSet[str]:
+        """키워드에 붙은 라벨 반환"""
+        return self._labels.get(keyword, frozenset())
+
+    def __len__(self) -> int:
+        return len(self._labels)
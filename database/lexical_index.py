@@ -0,0 +1,207 @@
+"""
+database/lexical_index.py
+
+메타데이터 어휘 검색 (BM25)
+- keywords_ko, short_desc_ko, 분류, 컬럼 스키마를 인메모리 역색인으로 구성
+- 한국어 조사/어미가 붙어도 매칭되도록 글자 n-gram 토큰화
+- 벡터 검색 결과와 합치는 Reciprocal Rank Fusion
+"""
+
+import json
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+WORD_PATTERN = re.compile(r"[0-9A-Za-z가-힣]+")
+
+# 필드별 가중치 (토큰 반복 횟수)
+FIELD_WEIGHTS = {
+    "keywords_ko": 3,
+    "short_desc_ko": 2,
+    "topic_main": 1,
+    "topic_sub": 1,
+    "columns_schema_outline": 1,
+    "column_schema_detail": 1,
+}
+
+
+def tokenize_ko(text: str, ngram_range: Tuple[int, int] = (2, 3)) -> List[str]:
+    """
+    한국어용 글자 n-gram 토큰화
+
+    "서울특별시의" → ["서울", "울특", ..., "서울특", ...]
+    숫자로만 된 토큰(연도 등)은 테이블 구분에 도움이 안 되므로 제외
+
+    Args:
+        text: 입력 텍스트
+        ngram_range: (최소 n, 최대 n)
+
+    Returns:
+        토큰 리스트 (중복 포함)
+    """
+    min_n, max_n = ngram_range
+    tokens = []
+
+    for word in WORD_PATTERN.findall(text.lower()):
+        if len(word) < min_n:
+            continue
+        if len(word) <= max_n and not word.isdigit():
+            tokens.append(word)
+        for n in range(min_n, min(max_n, len(word) - 1) + 1):
+            for i in range(len(word) - n + 1):
+                gram = word[i : i + n]
+                if not gram.isdigit():
+                    tokens.append(gram)
+
+    return tokens
+
+
+def _field_text(value) -> str:
+    """메타데이터 필드 → 검색용 텍스트 (JSON 문자열이면 키/값 펼침)"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return value
+    if isinstance(value, dict):
+        return " ".join(f"{k} {_field_text(v)}" for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return " ".join(_field_text(v) for v in value)
+    return str(value)
+
+
+class BM25Index:
+    """테이블 메타데이터 BM25 역색인"""
+
+    def __init__(
+        self,
+        table_metadata: Mapping[str, Mapping],
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        """
+        Args:
+            table_metadata: {테이블명: tables_metadata 행}
+            k1: BM25 tf 포화 파라미터
+            b: BM25 문서 길이 정규화 파라미터
+        """
+        self.k1 = k1
+        self.b = b
+
+        self.table_names: List[str] = []
+        self.topics: List[Optional[str]] = []
+        self.doc_lengths: List[int] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+
+        for table_name, meta in table_metadata.items():
+            tokens = []
+            for field, weight in FIELD_WEIGHTS.items():
+                tokens.extend(tokenize_ko(_field_text(meta.get(field))) * weight)
+
+            doc_id = len(self.table_names)
+            self.table_names.append(table_name)
+            self.topics.append(meta.get("topic_main"))
+            self.doc_lengths.append(len(tokens))
+
+            for term, tf in Counter(tokens).items():
+                self.postings[term].append((doc_id, tf))
+
+        n_docs = len(self.table_names)
+        self.avg_doc_length = (sum(self.doc_lengths) / n_docs) if n_docs else 0.0
+        self.idf = {
+            term: math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for term, posting in self.postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.table_names)
+
+    def search(
+        self, query: str, k: int, topic_main: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        BM25 검색
+
+        Args:
+            query: 사용자 질문
+            k: 반환 개수
+            topic_main: 카테고리 필터 (없으면 전체)
+
+        Returns:
+            [(테이블명, 점수)] - 점수 내림차순, 점수 0 제외
+        """
+        if not self.table_names or k <= 0:
+            return []
+
+        scores: Dict[int, float] = defaultdict(float)
+        avg_len = self.avg_doc_length or 1.0
+
+        # 질문 안에서 반복된 n-gram은 한 번만 반영
+        for term in set(tokenize_ko(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = self.idf[term]
+            for doc_id, tf in posting:
+                length_ratio = self.doc_lengths[doc_id] / avg_len
+                norm = self.k1 * (1 - self.b + self.b * length_ratio)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(
+            (
+                (doc_id, score)
+                for doc_id, score in scores.items()
+                if not topic_main or self.topics[doc_id] == topic_main
+            ),
+            key=lambda x: -x[1],
+        )
+        return [(self.table_names[doc_id], score) for doc_id, score in ranked[:k]]
+
+
+def is_confident(
+    results: Sequence[Tuple[str, float]], min_score: float, min_ratio: float
+) -> bool:
+    """
+    어휘 검색 결과만으로 충분한지 판단
+
+    1위 점수가 min_score 이상이고 2위보다 min_ratio배 이상 높으면 확신
+
+    Args:
+        results: BM25 검색 결과
+        min_score: 1위 최소 점수
+        min_ratio: 1위/2위 최소 비율
+    """
+    if not results:
+        return False
+    top_score = results[0][1]
+    if top_score < min_score:
+        return False
+    if len(results) == 1:
+        return True
+    second_score = results[1][1]
+    return second_score <= 0 or top_score / second_score >= min_ratio
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[str]], k: int = 60
+) -> List[Tuple[str, float]]:
+    """
+    Reciprocal Rank Fusion
+
+    score(d) = Σ 1 / (k + rank_i(d))
+
+    Args:
+        rankings: 테이블명 순위 리스트들 (각각 1위부터)
+        k: 순위 완화 상수
+
+    Returns:
+        [(테이블명, 융합 점수)] - 점수 내림차순
+    """
+    fused: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, table_name in enumerate(ranking, start=1):
+            fused[table_name] += 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda x: -x[1])
@@ -4,13 +4,20 @@ database/metadata_manager.py
 테이블 메타데이터 관리 모듈
 - DB에서 tables_metadata 로드 및 캐싱
 - 짧은 문서 생성 (임베딩용, 100~200토큰)
-- 상세 정보 반환 (검색 후 사용)
+- 상세 정보 반환 (검색 후 사용) - 로드 시 1회 파싱한 불변 레코드 공유
+- 버전별 불변 스냅샷 + 백그라운드 새로고침 (재시작 없이 카탈로그 변경 반영)
 """
 
 import sqlite3
 import json
+import hashlib
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Optional
 import streamlit as st
 
 
@@ -20,46 +27,363 @@ PERIOD_COLUMN_MAP = {
 }
 
 
-class MetadataManager:
-    """테이블 메타데이터 관리 클래스"""
+@dataclass(frozen=True, eq=False, slots=True)
+class TableDetail(Mapping):
+    """
+    테이블 상세 정보 (불변, 테이블당 1개를 모든 요청이 공유)
 
-    def __init__(self):
-        """초기화 및 전체 메타데이터 캐싱"""
-        from database.connection import db_manager
+    dict처럼 table["columns"], table.get("caution") 으로 읽을 수 있다.
+    column_detail은 공유 객체이므로 수정하지 말 것.
+    """
 
-        self._cache: Dict[str, Dict] = {}
+    table_name: str
+    description: str
+    topic_main: str
+    topic_sub: str
+    keywords: str
+    columns: str  # 리스트 → 문자열 (프롬프트용)
+    column_detail: Dict[str, Any]
+    example_queries: str
+    caution: str
+    period: str
+    geo_level: str
+    time_freq: str
+    period_column: str
+    value_unit: str
+    org_id: str
+    tbl_id: str
 
-        # Turso DB 연결 사용
-        db = db_manager.get_db()
-        conn = db._engine.raw_connection()
+    def __getitem__(self, key: str) -> Any:
+        if key in DETAIL_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(DETAIL_FIELDS)
+
+    def __len__(self) -> int:
+        return len(DETAIL_FIELDS)
+
+    def with_distance(self, distance: Optional[float]) -> "TableHit":
+        """검색 결과용 뷰 (요청별 필드만 덧붙이고 상세 정보는 공유)"""
+        return TableHit(detail=self, distance=distance)
+
+
+DETAIL_FIELDS = tuple(f.name for f in fields(TableDetail))
 
-        # 전체 메타데이터 로드
-        self._load_all_to_cache(conn)
 
-    def _load_all_to_cache(self, conn):
-        """DB에서 전체 메타데이터를 메모리에 캐싱"""
-        cursor = conn.cursor()
+@dataclass(frozen=True, eq=False, slots=True)
+class TableHit(Mapping):
+    """검색 결과 1건: 공유 TableDetail + 요청별 필드 (distance)"""
 
+    detail: TableDetail
+    distance: Optional[float] = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "distance" and self.distance is not None:
+            return self.distance
+        return self.detail[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.detail
+        if self.distance is not None:
+            yield "distance"
+
+    def __len__(self) -> int:
+        return len(self.detail) + (self.distance is not None)
+
+
+def build_table_detail(table_name: str, meta: Dict) -> TableDetail:
+    """
+    tables_metadata 행 → TableDetail (JSON 파싱 포함)
+
+    Args:
+        table_name: 테이블명
+        meta: tables_metadata 행 (dict)
+
+    Returns:
+        TableDetail
+    """
+    columns_list = json.loads(meta["columns_schema_outline"])
+    column_detail = json.loads(meta["column_schema_detail"])
+    time_freq = meta.get("time_freq", "month")
+
+    return TableDetail(
+        table_name=table_name,
+        description=meta["short_desc_ko"],
+        topic_main=meta["topic_main"],
+        topic_sub=meta["topic_sub"],
+        keywords=meta["keywords_ko"],
+        columns=", ".join(columns_list),
+        column_detail=column_detail,
+        example_queries=meta["example_queries_ko"],
+        caution=meta["caution_ko"],
+        period=f"{meta['period_start']} ~ {meta['period_end']}",
+        geo_level=meta.get("geo_level", ""),
+        time_freq=meta.get("time_freq", ""),
+        period_column=PERIOD_COLUMN_MAP.get(time_freq, "년월"),
+        value_unit=meta.get("value_unit", ""),
+        org_id=meta.get("org_id", ""),
+        tbl_id=meta.get("tbl_id", ""),
+    )
+
+
+def render_prompt_block(table: Mapping) -> str:
+    """
+    SQL 생성 프롬프트용 테이블 블록 렌더링
+
+    Args:
+        table: TableDetail (또는 같은 키를 가진 dict)
+
+    Returns:
+        str: "### 테이블명" 으로 시작하는 프롬프트 블록
+    """
+    return (
+        f"### {table['table_name']}\n"
+        f"설명: {table['description']}\n"
+        f"컬럼: {table['columns']}\n"
+        f"컬럼 상세: {table.get('column_detail', {})}\n"
+        f"시간컬럼: {table.get('period_column', '년월')}\n"
+        f"기간: {table.get('period', 'N/A')}\n"
+        f"**값의 단위: {table.get('value_unit', '단위 정보 없음')}**\n"
+        f"예시 쿼리: {table.get('example_queries', 'N/A')}\n"
+        f"주의사항: {table.get('caution', '없음')}"
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class MetadataSnapshot:
+    """
+    tables_metadata 한 시점의 불변 스냅샷
+
+    새로고침 시 통째로 새로 만들어 교체하므로,
+    요청 처리 중에 잡은 스냅샷은 끝까지 같은 내용을 본다.
+    """
+
+    version: int
+    checksum: str
+    rows: Mapping[str, Dict]  # {테이블명: tables_metadata 행}
+    details: Mapping[str, TableDetail]
+    prompt_blocks: Mapping[str, str]
+    loaded_at: float
+
+
+def fetch_metadata_rows(conn) -> Dict[str, Dict]:
+    """
+    tables_metadata 전체 행 조회
+
+    Args:
+        conn: DB-API 연결
+
+    Returns:
+        {테이블명: 행 dict} - 테이블명 순
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT * FROM tables_metadata ORDER BY table_name")
+        column_names = [desc[0] for desc in cursor.description]
+        rows = {}
+        for row in cursor.fetchall():
+            # 튜플을 딕셔너리로 변환
+            row_dict = dict(zip(column_names, row))
+            rows[row_dict["table_name"]] = row_dict
+        return rows
+    finally:
+        cursor.close()
+
+
+def metadata_checksum(rows: Mapping[str, Dict]) -> str:
+    """메타데이터 행 전체의 체크섬 (내용이 같으면 같은 값)"""
+    payload = json.dumps(
+        [rows[name] for name in sorted(rows)],
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_snapshot(
+    rows: Dict[str, Dict], version: int, checksum: Optional[str] = None
+) -> MetadataSnapshot:
+    """
+    메타데이터 행 → 불변 스냅샷 (상세 정보 파싱 + 프롬프트 블록 렌더링)
+
+    Args:
+        rows: {테이블명: tables_metadata 행}
+        version: 스냅샷 버전
+        checksum: 행 체크섬 (없으면 계산)
+
+    Returns:
+        MetadataSnapshot
+    """
+    details = {}
+    prompt_blocks = {}
+    for table_name, row in rows.items():
+        # 상세 정보는 로드 시 1회만 파싱
         try:
-            cursor.execute("SELECT * FROM tables_metadata")
-            rows = cursor.fetchall()
+            detail = build_table_detail(table_name, row)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"⚠️  상세 정보 파싱 실패, 검색에서 제외: {table_name} ({e})")
+            continue
+        details[table_name] = detail
+        prompt_blocks[table_name] = render_prompt_block(detail)
+
+    return MetadataSnapshot(
+        version=version,
+        checksum=checksum or metadata_checksum(rows),
+        rows=MappingProxyType(rows),
+        details=MappingProxyType(details),
+        prompt_blocks=MappingProxyType(prompt_blocks),
+        loaded_at=time.time(),
+    )
 
-            # 컬럼명 가져오기
-            column_names = [desc[0] for desc in cursor.description]
 
-            for row in rows:
-                # 튜플을 딕셔너리로 변환
-                row_dict = dict(zip(column_names, row))
-                table_name = row_dict["table_name"]
-                self._cache[table_name] = row_dict
+class MetadataManager:
+    """
+    테이블 메타데이터 관리 클래스
 
-            print(
-                f"✅ MetadataManager: {len(self._cache)}개 테이블 메타데이터 로드 완료"
-            )
+    메타데이터는 MetadataSnapshot으로 보관하고, 백그라운드 스레드가
+    tables_metadata 체크섬을 주기적으로 확인해 바뀌었으면 새 스냅샷으로 교체한다.
+    (재시작 없이 카탈로그 변경 반영)
+    """
+
+    def __init__(self, refresh_interval: Optional[float] = None):
+        """
+        초기화 및 전체 메타데이터 캐싱
+
+        Args:
+            refresh_interval: 새로고침 확인 주기 (초, 0이면 끔)
+                - None이면 settings.METADATA_REFRESH_INTERVAL
+        """
+        from config.settings import settings
+
+        if refresh_interval is None:
+            refresh_interval = settings.METADATA_REFRESH_INTERVAL
+        self.refresh_interval = refresh_interval
+
+        # 새로고침끼리만 직렬화 (읽기는 잠금 없이 스냅샷 참조만 읽음)
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+        # 전체 메타데이터 로드
+        self._snapshot = self._load_snapshot(version=1)
+        print(
+            f"✅ MetadataManager: {len(self._snapshot.rows)}개 테이블 "
+            f"메타데이터 로드 완료 (v{self.version})"
+        )
+
+        if self.refresh_interval > 0:
+            self.start_auto_refresh()
+
+    # ------------------------------------------------------------
+    # 스냅샷
+    # ------------------------------------------------------------
+
+    def _load_snapshot(
+        self, version: int, previous: Optional[MetadataSnapshot] = None
+    ) -> Optional[MetadataSnapshot]:
+        """
+        DB에서 메타데이터를 읽어 스냅샷 생성
 
+        Args:
+            version: 새 스냅샷 버전
+            previous: 현재 스냅샷 (체크섬이 같으면 None 반환)
+
+        Returns:
+            MetadataSnapshot (변경 없으면 None)
+        """
+        from database.connection import db_manager
+
+        # Turso DB 연결 사용 (풀에 반납되도록 사용 후 close)
+        db = db_manager.get_db()
+        conn = db._engine.raw_connection()
+        try:
+            rows = fetch_metadata_rows(conn)
         except Exception as e:
             print(f"❌ 메타데이터 로드 실패: {e}")
             raise
+        finally:
+            conn.close()
+
+        checksum = metadata_checksum(rows)
+        if previous is not None and checksum == previous.checksum:
+            return None
+
+        return build_snapshot(rows, version=version, checksum=checksum)
+
+    @property
+    def snapshot(self) -> MetadataSnapshot:
+        """
+        현재 스냅샷
+
+        한 요청 안에서 여러 번 조회할 때는 이 값을 한 번 잡아서 쓰면
+        중간에 새로고침이 일어나도 일관된 내용을 본다.
+        """
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """현재 메타데이터 버전 (새로고침으로 내용이 바뀔 때마다 1씩 증가)"""
+        return self._snapshot.version
+
+    @property
+    def _cache(self) -> Mapping[str, Dict]:
+        """현재 스냅샷의 원본 행 (읽기 전용, 기존 코드 호환)"""
+        return self._snapshot.rows
+
+    def refresh(self) -> bool:
+        """
+        메타데이터 변경 확인 후 바뀌었으면 새 스냅샷으로 교체
+
+        스냅샷 생성은 요청 경로 밖에서 끝내고, 교체는 참조 1회 대입(원자적)
+
+        Returns:
+            bool: 교체 여부
+        """
+        with self._refresh_lock:
+            current = self._snapshot
+            snapshot = self._load_snapshot(current.version + 1, previous=current)
+            if snapshot is None:
+                return False
+
+            self._snapshot = snapshot
+
+        added = snapshot.rows.keys() - current.rows.keys()
+        removed = current.rows.keys() - snapshot.rows.keys()
+        print(
+            f"🔄 메타데이터 갱신: v{current.version} → v{snapshot.version} "
+            f"({len(snapshot.rows)}개 테이블, 추가 {len(added)}, 삭제 {len(removed)})"
+        )
+        return True
+
+    def start_auto_refresh(self):
+        """백그라운드 새로고침 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, name="metadata-refresh", daemon=True
+        )
+        self._refresh_thread.start()
+        print(f"📌 메타데이터 자동 새로고침: {self.refresh_interval}초 주기")
+
+    def stop_auto_refresh(self):
+        """백그라운드 새로고침 스레드 중지"""
+        self._stop_event.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout=5)
+            self._refresh_thread = None
+
+    def _refresh_loop(self):
+        while not self._stop_event.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # 실패해도 기존 스냅샷으로 계속 서비스
+                print(f"⚠️  메타데이터 새로고침 실패 (기존 v{self.version} 유지): {e}")
 
     def get_short_doc(self, table_name: str) -> Optional[str]:
         """
@@ -71,11 +395,10 @@ class MetadataManager:
         Returns:
             str: 짧은 설명 문서 (임베딩용)
         """
-        if table_name not in self._cache:
+        meta = self._snapshot.rows.get(table_name)
+        if meta is None:
             return None
 
-        meta = self._cache[table_name]
-
         # 여러 줄 문자열 (벡터 검색 정확도 향상)
         short_doc = f"""
 테이블: {table_name}
@@ -94,7 +417,7 @@ class MetadataManager:
 
         return short_doc.strip()
 
-    def get_detailed_info(self, table_name: str) -> Optional[Dict]:
+    def get_detailed_info(self, table_name: str) -> Optional[TableDetail]:
         """
         상세 정보 반환 (검색 후 사용)
 
@@ -102,40 +425,26 @@ class MetadataManager:
             table_name: 테이블명
 
         Returns:
-            dict: 전체 메타데이터 (컬럼 스키마, 예시 쿼리, 주의사항 등)
+            TableDetail: 전체 메타데이터 (컬럼 스키마, 예시 쿼리, 주의사항 등)
+            - 로드 시 만들어 둔 공유 객체 (복사하지 않음)
         """
-        if table_name not in self._cache:
-            return None
+        return self._snapshot.details.get(table_name)
+
+    def get_prompt_block(self, table_name: str) -> Optional[str]:
+        """
+        SQL 생성 프롬프트용 테이블 블록 반환 (로드 시 미리 렌더링)
 
-        meta = self._cache[table_name]
-
-        # JSON 문자열 파싱
-        columns_list = json.loads(meta["columns_schema_outline"])
-        column_detail = json.loads(meta["column_schema_detail"])
-        time_freq = meta.get("time_freq", "month")
-
-        return {
-            "table_name": table_name,
-            "description": meta["short_desc_ko"],
-            "topic_main": meta["topic_main"],
-            "topic_sub": meta["topic_sub"],
-            "keywords": meta["keywords_ko"],
-            "columns": ", ".join(columns_list),  # 리스트 → 문자열 (프롬프트용)
-            "column_detail": column_detail,
-            "example_queries": meta["example_queries_ko"],
-            "caution": meta["caution_ko"],
-            "period": f"{meta['period_start']} ~ {meta['period_end']}",
-            "geo_level": meta.get("geo_level", ""),
-            "time_freq": meta.get("time_freq", ""),
-            "period_column": PERIOD_COLUMN_MAP.get(time_freq, "년월"),
-            "value_unit": meta.get("value_unit", ""),
-            "org_id": meta.get("org_id", ""),
-            "tbl_id": meta.get("tbl_id", ""),
-        }
+        Args:
+            table_name: 테이블명
+
+        Returns:
+            str: 프롬프트 블록 (없으면 None)
+        """
+        return self._snapshot.prompt_blocks.get(table_name)
 
     def get_table_names(self) -> List[str]:
         """모든 테이블명 반환"""
-        return list(self._cache.keys())
+        return list(self._snapshot.rows.keys())
 
     def filter_by_category(self, category: str) -> List[str]:
         """
@@ -148,14 +457,14 @@ class MetadataManager:
             list: 해당 카테고리의 테이블명 리스트
         """
         result = []
-        for table_name, meta in self._cache.items():
+        for table_name, meta in self._snapshot.rows.items():
             if meta["topic_main"] == category:
                 result.append(table_name)
         return result
 
     def exists(self, table_name: str) -> bool:
         """테이블 존재 여부 확인"""
-        return table_name in self._cache
+        return table_name in self._snapshot.rows
 
 
 # 싱글톤 인스턴스
@@ -214,5 +523,5 @@ if __name__ == "__main__":
     assert "테이블:" in short_doc, "라벨 포함"
     assert isinstance(detail["columns"], str), "columns는 문자열"
     assert "topic_main" in detail, "topic_main 필드 필수"
-    assert len(detail) == 12, "12개 필드 필수"
+    assert len(detail) == len(DETAIL_FIELDS), f"{len(DETAIL_FIELDS)}개 필드 필수"
     print("모든 검증 통과!")
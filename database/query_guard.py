@@ -0,0 +1,434 @@
+"""
+database/query_guard.py
+
+SQL 실행 전 비용 검사
+- EXPLAIN QUERY PLAN으로 예상 읽기 행 수 계산 (전체 스캔, 임시 B-tree, 상관 서브쿼리 반복)
+- 예산을 넘는 쿼리는 실행하지 않고 이유를 담은 QueryRejected 발생 (→ sql_error로 재생성)
+- 최상위 LIMIT이 없는 조회 쿼리에는 LIMIT 추가
+- 문장 실행 제한 시간 (드라이버가 지원하면 진행 핸들러 / interrupt로 중단)
+"""
+
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from database.sql_tokens import identifier_name, tokenize_sql
+
+# 행 수를 알 수 없는 대상 (CTE, 서브쿼리 결과)의 가정 행 수
+DEFAULT_UNKNOWN_ROWS = 1000
+
+# 인덱스 조건 1개당 선택도 (= 조건은 1/10, 범위 조건은 1/4)
+EQUALITY_SELECTIVITY = 10
+RANGE_SELECTIVITY = 4
+
+# 바깥 행 수와 무관하게 1회만 실행되는 계획 노드
+ONCE_PREFIXES = ("SCALAR SUBQUERY", "LIST SUBQUERY", "MATERIALIZE", "CO-ROUTINE")
+
+# 진행 핸들러 호출 간격 (SQLite VM 명령 수)
+PROGRESS_STEPS = 10000
+
+# "SCAN a", "SCAN TABLE p AS a", "SEARCH q USING INDEX i (r=? AND m>?)"
+_LOOP_PATTERN = re.compile(
+    r"^(?P<op>SCAN|SEARCH) (?:TABLE )?(?P<name>.+?)(?: AS (?P<alias>.+?))?"
+    r"(?P<using> USING .*)?$"
+)
+_EQUALITY_TERM = re.compile(r"(?<![<>!])=\?")
+_RANGE_TERM = re.compile(r"[<>]=?\?")
+
+# 별칭으로 오인하면 안 되는 키워드
+# fmt: off
+_CLAUSE_KEYWORDS = {
+    "where", "join", "inner", "left", "right", "full", "outer", "cross",
+    "natural", "on", "using", "group", "order", "limit", "having", "window",
+    "union", "except", "intersect", "as", "indexed", "not",
+}
+# fmt: on
+
+
+class QueryRejected(Exception):
+    """비용 예산을 넘어 실행하지 않은 쿼리 (메시지는 SQL 재생성 프롬프트로 전달)"""
+
+
+class QueryTimeout(QueryRejected):
+    """실행 제한 시간을 넘겨 중단된 쿼리"""
+
+
+@dataclass
+class PlanCost:
+    """실행 계획 비용 추정 결과"""
+
+    total: float = 0.0  # 예상 읽기 행 수
+    full_scans: List[str] = field(default_factory=list)
+    temp_btrees: int = 0
+    correlated_subqueries: int = 0
+    steps: List[Tuple[str, float]] = field(default_factory=list)  # (계획, 읽기 행 수)
+
+    def summary(self) -> str:
+        """한 줄 요약 (로그용)"""
+        return (
+            f"예상 {self.total:,.0f}행, 전체 스캔 {len(self.full_scans)}, "
+            f"임시 B-tree {self.temp_btrees}, 상관 서브쿼리 {self.correlated_subqueries}"
+        )
+
+
+# ============================================================
+# SQL 분석
+# ============================================================
+
+
+def table_aliases(sql: str) -> Dict[str, str]:
+    """
+    FROM / JOIN 절의 {별칭: 테이블명} (별칭이 없으면 {테이블명: 테이블명})
+
+    EXPLAIN QUERY PLAN은 별칭으로 출력하므로 실제 테이블을 찾는 데 사용
+    """
+    tokens = tokenize_sql(sql, lower=False)
+    aliases = {}
+    i = 0
+    while i < len(tokens):
+        kind, value = tokens[i]
+        if kind == "word" and value.lower() in ("from", "join"):
+            while i + 1 < len(tokens) and tokens[i + 1][0] in ("word", "quoted"):
+                table = identifier_name(tokens[i + 1])
+                alias = table
+                i += 1
+                if i + 1 < len(tokens) and tokens[i + 1][1].lower() == "as":
+                    i += 1
+                nxt = tokens[i + 1] if i + 1 < len(tokens) else None
+                if nxt and nxt[0] in ("word", "quoted"):
+                    if nxt[1].lower() not in _CLAUSE_KEYWORDS:
+                        alias = identifier_name(nxt)
+                        i += 1
+                aliases[alias] = table
+                # FROM a x, b y
+                if i + 1 < len(tokens) and tokens[i + 1] == ("other", ","):
+                    i += 1
+                    continue
+                break
+        i += 1
+    return aliases
+
+
+def has_top_level_limit(sql: str) -> bool:
+    """괄호 밖(최상위)에 LIMIT이 있는지"""
+    depth = 0
+    for kind, value in tokenize_sql(sql):
+        if value == "(":
+            depth += 1
+        elif value == ")":
+            depth -= 1
+        elif depth == 0 and kind == "word" and value == "limit":
+            return True
+    return False
+
+
+def apply_row_limit(sql: str, limit: int) -> str:
+    """
+    최상위 LIMIT이 없는 조회 쿼리에 LIMIT 추가
+
+    Args:
+        sql: 원본 SQL
+        limit: 최대 행 수 (0 이하면 그대로)
+
+    Returns:
+        LIMIT이 붙은 SQL (이미 있거나 조회 쿼리가 아니면 원본)
+    """
+    tokens = tokenize_sql(sql)
+    if limit <= 0 or not tokens or tokens[0][1] not in ("select", "with"):
+        return sql
+    if has_top_level_limit(sql):
+        return sql
+
+    body = sql.rstrip()
+    while body.endswith(";"):
+        body = body[:-1].rstrip()
+    # 끝에 주석 뒤 세미콜론 등이 남아 있으면 안전하게 원본 유지
+    if ";" in [value for _, value in tokenize_sql(body)]:
+        return sql
+    # 줄바꿈: 마지막 줄이 -- 주석이어도 LIMIT이 주석 처리되지 않도록
+    return f"{body}\nLIMIT {limit}"
+
+
+# ============================================================
+# 실행 계획 비용 추정
+# ============================================================
+
+
+def estimate_search_rows(table_rows: float, detail: str) -> float:
+    """SEARCH 1회당 읽는 행 수 (인덱스 조건 수 기반 추정)"""
+    if "rowid=?" in detail or ("PRIMARY KEY" in detail and "=?" in detail):
+        return 1.0
+    terms = detail[detail.rfind("(") :] if "(" in detail else ""
+    equalities = len(_EQUALITY_TERM.findall(terms))
+    ranges = len(_RANGE_TERM.findall(terms))
+    rows = table_rows / (EQUALITY_SELECTIVITY**equalities)
+    if ranges:
+        rows /= RANGE_SELECTIVITY
+    return max(rows, 1.0)
+
+
+def estimate_plan_cost(
+    plan_rows: Sequence[Sequence],
+    table_rows: Callable[[str], Optional[int]],
+    aliases: Optional[Dict[str, str]] = None,
+) -> PlanCost:
+    """
+    EXPLAIN QUERY PLAN 결과 → 예상 읽기 행 수
+
+    같은 부모 아래 SCAN/SEARCH는 중첩 루프(앞 루프 행 수만큼 반복),
+    상관 서브쿼리는 바깥 루프 행 수만큼 반복, 일반 서브쿼리는 1회로 계산
+
+    Args:
+        plan_rows: (id, parent, notused, detail) 행 목록
+        table_rows: 테이블명 → 행 수 (테이블이 아니면 None)
+        aliases: {별칭: 테이블명} (table_aliases 결과)
+
+    Returns:
+        PlanCost
+    """
+    aliases = aliases or {}
+    children: Dict[int, List[Tuple[int, str]]] = defaultdict(list)
+    for row in plan_rows:
+        children[row[1]].append((row[0], str(row[-1])))
+
+    cost = PlanCost()
+
+    def walk(parent: int, outer: float):
+        iterations = outer
+        for node_id, detail in children.get(parent, []):
+            match = _LOOP_PATTERN.match(detail)
+            if detail.startswith("SCAN CONSTANT ROW"):
+                continue
+            if match:
+                name = match.group("alias") or match.group("name")
+                table = aliases.get(name, name)
+                known = table_rows(table)
+                rows = float(known if known is not None else DEFAULT_UNKNOWN_ROWS)
+                if match.group("op") == "SCAN":
+                    per_loop = rows
+                    if known is not None:
+                        cost.full_scans.append(table)
+                else:
+                    per_loop = estimate_search_rows(rows, detail)
+                    if "AUTOMATIC" in detail:
+                        # 자동 인덱스 생성에 1회 전체 읽기
+                        cost.total += rows
+                visits = iterations * per_loop
+                cost.total += visits
+                cost.steps.append((detail, visits))
+                iterations *= per_loop
+                walk(node_id, iterations)
+            elif "TEMP B-TREE" in detail:
+                cost.temp_btrees += 1
+                cost.total += iterations
+                walk(node_id, iterations)
+            elif detail.startswith("CORRELATED"):
+                cost.correlated_subqueries += 1
+                walk(node_id, iterations)
+            elif detail.startswith(ONCE_PREFIXES):
+                # 1회만 실행
+                walk(node_id, 1.0)
+            else:
+                # COMPOUND QUERY, LEFT-MOST SUBQUERY, MULTI-INDEX OR 등
+                walk(node_id, iterations)
+
+    walk(0, 1.0)
+    return cost
+
+
+def rejection_message(cost: PlanCost, max_cost: float) -> str:
+    """예산 초과 사유 (SQL 재생성 프롬프트에 그대로 들어감)"""
+    lines = [
+        f"쿼리 비용이 너무 큽니다 (예상 {cost.total:,.0f}행 읽기, 한도 {max_cost:,.0f}행). "
+        "실행하지 않았습니다."
+    ]
+    for detail, visits in sorted(cost.steps, key=lambda x: -x[1])[:3]:
+        lines.append(f"- {detail}: 약 {visits:,.0f}행")
+    if cost.correlated_subqueries:
+        lines.append(
+            "- 바깥 행마다 반복되는 상관 서브쿼리가 있습니다. "
+            "GROUP BY나 바깥 쿼리와 무관한 서브쿼리로 바꾸세요."
+        )
+    if cost.full_scans:
+        lines.append(
+            f"- 전체 스캔: {', '.join(dict.fromkeys(cost.full_scans))}. "
+            "행정구역/항목/연령대 = 조건과 년월/년도 범위 조건을 추가하세요."
+        )
+    return "\n".join(lines)
+
+
+# ============================================================
+# 실행 제한 시간
+# ============================================================
+
+
+@contextmanager
+def statement_deadline(dbapi_conn, timeout: Optional[float]):
+    """
+    블록 안의 실행이 timeout초를 넘으면 중단하고 QueryTimeout 발생
+
+    - set_progress_handler 지원 (sqlite3): VM 명령 PROGRESS_STEPS개마다 확인
+    - interrupt만 지원: 타이머로 interrupt 호출
+    - 둘 다 없으면 (원격 HTTP 드라이버 등) 제한 없이 실행 (비용 검사에 의존)
+
+    Args:
+        dbapi_conn: DB-API 연결
+        timeout: 제한 시간 (초, None/0이면 제한 없음)
+    """
+    if not timeout or timeout <= 0:
+        yield
+        return
+
+    deadline = time.monotonic() + timeout
+    expired = threading.Event()
+    timer = None
+
+    if hasattr(dbapi_conn, "set_progress_handler"):
+
+        def _check() -> int:
+            if time.monotonic() > deadline:
+                expired.set()
+                return 1  # 0이 아니면 SQLite가 실행 중단
+            return 0
+
+        dbapi_conn.set_progress_handler(_check, PROGRESS_STEPS)
+    elif hasattr(dbapi_conn, "interrupt"):
+
+        def _interrupt():
+            expired.set()
+            dbapi_conn.interrupt()
+
+        timer = threading.Timer(timeout, _interrupt)
+        timer.daemon = True
+        timer.start()
+
+    try:
+        yield
+    except Exception as e:
+        if expired.is_set():
+            raise QueryTimeout(
+                f"쿼리 실행이 제한 시간({timeout:g}초)을 넘어 중단했습니다. "
+                "조건을 추가해 읽는 행 수를 줄이세요."
+            ) from e
+        raise
+    finally:
+        if timer is not None:
+            timer.cancel()
+        elif hasattr(dbapi_conn, "set_progress_handler"):
+            dbapi_conn.set_progress_handler(None, 0)
+
+
+# ============================================================
+# 가드
+# ============================================================
+
+
+class QueryGuard:
+    """실행 전 비용 검사 + LIMIT 추가 (테이블 행 수는 데이터 버전별 캐시)"""
+
+    def __init__(
+        self,
+        max_cost: float,
+        row_count_fn: Callable[[str], Optional[int]],
+        version_fn: Optional[Callable[[], str]] = None,
+    ):
+        """
+        Args:
+            max_cost: 허용 예상 읽기 행 수 (0 이하면 비용 검사 안 함)
+            row_count_fn: 테이블명 → 행 수 (테이블이 아니면 None)
+            version_fn: 현재 데이터 버전 (바뀌면 행 수 캐시 초기화)
+        """
+        self.max_cost = max_cost
+        self.row_count_fn = row_count_fn
+        self.version_fn = version_fn
+
+        self._row_counts: Dict[str, Optional[int]] = {}
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+        self.checked = 0
+        self.rejected = 0
+        self.limited = 0
+        self.unestimated = 0  # 행 수 통계가 없어 EXPLAIN을 생략한 쿼리 수
+
+    def table_rows(self, table_name: str) -> Optional[int]:
+        """테이블 행 수 (캐시)"""
+        version = self.version_fn() if self.version_fn else None
+        with self._lock:
+            if version != self._version:
+                self._row_counts.clear()
+                self._version = version
+            if table_name in self._row_counts:
+                return self._row_counts[table_name]
+
+        count = self.row_count_fn(table_name)
+        with self._lock:
+            self._row_counts[table_name] = count
+        return count
+
+    def prepare(
+        self,
+        sql: str,
+        explain_fn: Callable[[str], Sequence[Sequence]],
+        max_rows: int = 0,
+    ) -> str:
+        """
+        실행할 SQL 준비 (LIMIT 추가 + 비용 검사)
+
+        참조하는 테이블에 행 수 통계(ANALYZE)가 하나도 없으면 EXPLAIN 왕복 없이
+        LIMIT만 붙여서 반환한다.
+
+        Args:
+            sql: 원본 SQL
+            explain_fn: SQL → EXPLAIN QUERY PLAN 행 목록
+            max_rows: 최대 행 수 (LIMIT max_rows + 1을 붙여 잘림 여부 판단 가능)
+
+        Returns:
+            실행할 SQL
+
+        Raises:
+            QueryRejected: 예상 비용이 max_cost를 넘을 때
+        """
+        tokens = tokenize_sql(sql)
+        if not tokens or tokens[0][1] not in ("select", "with"):
+            return sql
+
+        limited = apply_row_limit(sql, max_rows + 1 if max_rows > 0 else 0)
+        if limited is not sql:
+            with self._lock:
+                self.limited += 1
+
+        if self.max_cost <= 0:
+            return limited
+
+        # 참조하는 테이블 모두 행 수 통계가 없으면 비용을 추정할 수 없음 → EXPLAIN 생략
+        aliases = table_aliases(limited)
+        if not any(self.table_rows(table) is not None for table in aliases.values()):
+            with self._lock:
+                self.unestimated += 1
+            return limited
+
+        cost = estimate_plan_cost(explain_fn(limited), self.table_rows, aliases)
+        with self._lock:
+            self.checked += 1
+            if cost.total > self.max_cost:
+                self.rejected += 1
+        if cost.total > self.max_cost:
+            print(f"🛡️  쿼리 거부: {cost.summary()}")
+            raise QueryRejected(rejection_message(cost, self.max_cost))
+        return limited
+
+    def stats(self) -> Dict:
+        """가드 통계"""
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "rejected": self.rejected,
+                "limited": self.limited,
+                "unestimated": self.unestimated,
+                "max_cost": self.max_cost,
+            }
@@ -0,0 +1,99 @@
+"""
+database/query_log.py
+
+실행된 SQL 로그 (JSONL)
+- execute_sql 노드가 실행한 쿼리, 소요 시간, 행 수, 에러를 한 줄씩 기록
+- 인덱스 분석(index_advisor) 등 오프라인 분석의 입력
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config.settings import settings
+
+
+class QueryLog:
+    """SQL 실행 로그 (스레드 안전, 크기 초과 시 1개 백업으로 교체)"""
+
+    def __init__(self, path: Optional[str], max_bytes: int = 10 * 1024 * 1024):
+        """
+        Args:
+            path: 로그 파일 경로 (None/빈 문자열이면 기록 안 함)
+            max_bytes: 이 크기를 넘으면 .1 파일로 옮기고 새로 시작
+        """
+        self.path = Path(path) if path else None
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        sql: str,
+        duration_ms: float,
+        rows: Optional[int] = None,
+        error: Optional[str] = None,
+    ):
+        """
+        쿼리 1건 기록 (실패해도 요청 처리에는 영향 없음)
+
+        Args:
+            sql: 실행한 SQL
+            duration_ms: 소요 시간 (ms)
+            rows: 결과 행 수
+            error: 에러 메시지 (성공이면 None)
+        """
+        if self.path is None:
+            return
+
+        entry = {
+            "ts": round(time.time(), 3),
+            "sql": sql,
+            "duration_ms": round(duration_ms, 2),
+            "rows": rows,
+            "error": error,
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                if self.path.exists() and self.path.stat().st_size > self.max_bytes:
+                    self.path.replace(self.path.with_name(self.path.name + ".1"))
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+        except OSError as e:
+            print(f"⚠️  쿼리 로그 기록 실패: {e}")
+
+    def read(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        로그 읽기 (백업 파일 포함, 오래된 순)
+
+        Args:
+            limit: 최근 N건만 (None이면 전체)
+
+        Returns:
+            로그 항목 리스트
+        """
+        if self.path is None:
+            return []
+
+        entries = []
+        for path in (self.path.with_name(self.path.name + ".1"), self.path):
+            if not path.exists():
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+
+        if limit is not None:
+            entries = entries[-limit:]
+        return entries
+
+
+# 전역 쿼리 로그 인스턴스
+query_log = QueryLog(settings.QUERY_LOG_PATH)
@@ -0,0 +1,110 @@
+"""
+database/query_result.py
+
+SQL 실행 결과 (컬럼 단위 저장)
+- 커서의 컬럼명 + 컬럼별 값 리스트
+- 행 단위 접근도 지원 (result[0] → 첫 행 튜플, len(result) → 행 수)
+- 문자열 변환 시 기존 db.run 출력과 같은 [(...), ...] 형식 (프롬프트 호환)
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, List, Tuple
+
+
+@dataclass(frozen=True, eq=False, slots=True)
+class QueryResult(Sequence):
+    """
+    SQL 실행 결과 (불변)
+
+    columns: 커서 컬럼명 (SELECT 별칭 그대로)
+    data: 컬럼별 값 리스트 (columns와 같은 순서)
+    truncated: 최대 행 수 제한으로 잘렸는지 여부
+    """
+
+    columns: Tuple[str, ...]
+    data: Tuple[List[Any], ...]
+    truncated: bool = False
+
+    @classmethod
+    def from_rows(
+        cls, columns: Iterable[str], rows: Iterable[Tuple], truncated: bool = False
+    ) -> "QueryResult":
+        """
+        행 리스트 → 컬럼 단위 결과
+
+        Args:
+            columns: 컬럼명
+            rows: 행 튜플 리스트
+            truncated: 잘림 여부
+
+        Returns:
+            QueryResult
+        """
+        columns = tuple(str(c) for c in columns)
+        rows = list(rows)
+        if rows:
+            data = tuple(list(values) for values in zip(*rows))
+        else:
+            data = tuple([] for _ in columns)
+        return cls(columns=columns, data=data, truncated=truncated)
+
+    @classmethod
+    def from_cursor(
+        cls, columns: Iterable[str], cursor, max_rows: int = 0
+    ) -> "QueryResult":
+        """
+        커서에서 최대 max_rows행까지 읽어 결과 생성
+
+        Args:
+            columns: 컬럼명
+            cursor: fetchmany/fetchall을 지원하는 커서 (DB-API, SQLAlchemy)
+            max_rows: 최대 행 수 (0 이하면 제한 없음)
+
+        Returns:
+            QueryResult (넘치면 truncated=True)
+        """
+        if max_rows and max_rows > 0:
+            rows = cursor.fetchmany(max_rows + 1)
+            truncated = len(rows) > max_rows
+            rows = rows[:max_rows]
+        else:
+            rows = cursor.fetchall()
+            truncated = False
+
+        if truncated:
+            print(f"⚠️  결과가 {max_rows}행을 넘어 잘렸습니다.")
+        return cls.from_rows(columns, rows, truncated=truncated)
+
+    def __len__(self) -> int:
+        return len(self.data[0]) if self.data else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [tuple(row) for row in zip(*(col[index] for col in self.data))]
+        return tuple(col[index] for col in self.data)
+
+    def __iter__(self) -> Iterator[Tuple]:
+        return zip(*self.data)
+
+    def __repr__(self) -> str:
+        return repr(self.rows())
+
+    __str__ = __repr__
+
+    def rows(self) -> List[Tuple]:
+        """행 튜플 리스트"""
+        return list(zip(*self.data))
+
+    def column(self, name: str) -> List[Any]:
+        """컬럼명으로 값 리스트 조회"""
+        return self.data[self.columns.index(name)]
+
+    def to_dataframe(self):
+        """pandas DataFrame 변환 (행 → 열 변환 없이 컬럼 그대로 사용)"""
+        import pandas as pd
+
+        # 같은 이름의 컬럼이 있어도 유지되도록 위치 기반으로 생성
+        df = pd.DataFrame(dict(enumerate(self.data)))
+        df.columns = list(self.columns)
+        return df
@@ -0,0 +1,253 @@
+"""
+database/replica.py
+
+Turso 로컬 복제본 (embedded replica)
+- libsql로 원격 DB를 로컬 SQLite 파일에 동기화 (주기적 또는 수동)
+- 쿼리는 로컬 파일을 읽기 전용으로 열어 실행 (네트워크 왕복 없음)
+- 마지막 동기화가 오래됐거나 로컬 실행이 실패하면 호출 측이 원격 DB로 폴백
+- 지표: 동기화 경과 시간, 복제본 적중률
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from database.query_guard import statement_deadline
+from database.query_result import QueryResult
+
+
+class LocalReplica:
+    """읽기 전용 쿼리용 Turso 로컬 복제본"""
+
+    def __init__(
+        self,
+        path: str,
+        sync_url: str,
+        auth_token: str,
+        max_staleness: float = 3600,
+    ):
+        """
+        Args:
+            path: 로컬 복제본 파일 경로
+            sync_url: 원격 DB URL (libsql://...)
+            auth_token: Turso 인증 토큰
+            max_staleness: 이 시간(초)보다 오래된 복제본은 사용하지 않음
+        """
+        self.path = Path(path)
+        self.sync_url = sync_url
+        self.auth_token = auth_token
+        self.max_staleness = max_staleness
+
+        self.last_synced: Optional[float] = None
+        self.last_sync_duration: Optional[float] = None
+        self.last_sync_error: Optional[str] = None
+
+        self._sync_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self._stop_event = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+
+        # 동기화로 파일 내용이 바뀔 때마다 증가 (결과 캐시 무효화용)
+        self.generation = 0
+
+        self.syncs = 0
+        self.hits = 0
+        self.stale_misses = 0
+        self.error_misses = 0
+
+    # ------------------------------------------------------------
+    # 동기화
+    # ------------------------------------------------------------
+
+    def sync(self) -> bool:
+        """
+        원격 DB → 로컬 파일 동기화 (변경분만 받아옴)
+
+        Returns:
+            bool: 성공 여부
+        """
+        import libsql_experimental as libsql
+
+        with self._sync_lock:
+            started = time.perf_counter()
+            before = self._file_signature()
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = libsql.connect(
+                    str(self.path), sync_url=self.sync_url, auth_token=self.auth_token
+                )
+                try:
+                    conn.sync()
+                finally:
+                    conn.close()
+            except Exception as e:
+                self.last_sync_error = str(e)
+                print(f"⚠️  로컬 복제본 동기화 실패: {e}")
+                return False
+
+            self.last_synced = time.time()
+            self.last_sync_duration = time.perf_counter() - started
+            self.last_sync_error = None
+            self.syncs += 1
+            if self._file_signature() != before:
+                self.generation += 1
+
+        print(f"🔁 로컬 복제본 동기화 완료 ({self.last_sync_duration:.2f}초)")
+        return True
+
+    def _file_signature(self) -> Tuple:
+        """복제본 파일(+WAL)의 수정 시각/크기"""
+        signature = []
+        for path in (self.path, self.path.with_name(self.path.name + "-wal")):
+            try:
+                stat = path.stat()
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def start_auto_sync(self, interval: float):
+        """
+        백그라운드 동기화 시작 (즉시 1회 + interval초마다)
+
+        Args:
+            interval: 동기화 주기 (초, 0이면 최초 1회만)
+        """
+        if self._sync_thread is not None and self._sync_thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._sync_thread = threading.Thread(
+            target=self._sync_loop, args=(interval,), name="replica-sync", daemon=True
+        )
+        self._sync_thread.start()
+
+    def stop_auto_sync(self):
+        """백그라운드 동기화 중지"""
+        self._stop_event.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join(timeout=5)
+            self._sync_thread = None
+
+    def _sync_loop(self, interval: float):
+        self.sync()
+        if interval <= 0:
+            return
+        while not self._stop_event.wait(interval):
+            self.sync()
+
+    @property
+    def sync_age(self) -> Optional[float]:
+        """마지막 동기화 이후 경과 시간 (초, 동기화 전이면 None)"""
+        if self.last_synced is None:
+            return None
+        return time.time() - self.last_synced
+
+    def is_fresh(self) -> bool:
+        """복제본 사용 가능 여부 (동기화됐고 max_staleness 이내)"""
+        age = self.sync_age
+        return age is not None and age <= self.max_staleness
+
+    # ------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        """스레드별 읽기 전용 연결 (재사용)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # mode=ro: 생성된 SQL이 복제본을 수정하지 못하도록
+            conn = sqlite3.connect(
+                f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+            )
+            self._local.conn = conn
+        return conn
+
+    def execute(
+        self, sql: str, max_rows: int = 0, timeout: Optional[float] = None
+    ) -> QueryResult:
+        """
+        로컬 복제본에서 SQL 실행
+
+        Args:
+            sql: 실행할 SQL
+            max_rows: 최대 행 수 (0 이하면 제한 없음)
+            timeout: 실행 제한 시간 (초, 넘으면 QueryTimeout)
+
+        Returns:
+            QueryResult
+        """
+        conn = self._connection()
+        with statement_deadline(conn, timeout):
+            cursor = conn.execute(sql)
+            try:
+                if cursor.description is None:
+                    return QueryResult.from_rows([], [])
+                columns = [desc[0] for desc in cursor.description]
+                return QueryResult.from_cursor(columns, cursor, max_rows)
+            finally:
+                cursor.close()
+
+    def try_execute(
+        self, sql: str, max_rows: int = 0, timeout: Optional[float] = None
+    ) -> Optional[QueryResult]:
+        """
+        복제본이 최신이면 실행, 아니면 None (호출 측이 원격 DB로 폴백)
+
+        제한 시간 초과(QueryTimeout)는 폴백하지 않고 그대로 전달
+        (원격 DB에서 다시 실행해도 똑같이 느리므로)
+
+        Args:
+            sql: 실행할 SQL
+            max_rows: 최대 행 수
+            timeout: 실행 제한 시간 (초)
+
+        Returns:
+            QueryResult 또는 None
+        """
+        if not self.is_fresh():
+            with self._stats_lock:
+                self.stale_misses += 1
+            return None
+
+        try:
+            result = self.execute(sql, max_rows, timeout)
+        except sqlite3.Error as e:
+            print(f"⚠️  로컬 복제본 실행 실패, 원격 DB로 폴백: {e}")
+            with self._stats_lock:
+                self.error_misses += 1
+            return None
+
+        with self._stats_lock:
+            self.hits += 1
+        return result
+
+    def status(self) -> Dict:
+        """
+        복제본 지표
+
+        Returns:
+            dict: 동기화 경과 시간, 적중률, 폴백 횟수 등
+        """
+        with self._stats_lock:
+            total = self.hits + self.stale_misses + self.error_misses
+            age = self.sync_age
+            return {
+                "fresh": self.is_fresh(),
+                "sync_age_sec": round(age, 1) if age is not None else None,
+                "last_sync_duration_sec": (
+                    round(self.last_sync_duration, 2)
+                    if self.last_sync_duration is not None
+                    else None
+                ),
+                "last_sync_error": self.last_sync_error,
+                "syncs": self.syncs,
+                "generation": self.generation,
+                "hits": self.hits,
+                "stale_misses": self.stale_misses,
+                "error_misses": self.error_misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
@@ -0,0 +1,187 @@
+"""
+database/result_cache.py
+
+SQL 실행 결과 캐시
+- 키: 정규화한 SQL (공백/대소문자/주석/IN 리터럴 순서 무시) + 데이터 버전
+- 크기 제한 LRU + TTL
+- 데이터 버전 = 메타데이터 버전 + 복제본 세대 + 적재 버전 → 바뀌면 이전 결과는 자동 무효화
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from database.query_result import QueryResult
+from database.sql_tokens import Token, tokenize_sql
+
+
+def _sort_in_lists(tokens: List[Token]) -> List[Token]:
+    """IN ('b', 'a') → IN ('a', 'b') (리터럴로만 된 목록만)"""
+    result = []
+    i = 0
+    while i < len(tokens):
+        result.append(tokens[i])
+        if tokens[i] == ("word", "in") and i + 1 < len(tokens):
+            if tokens[i + 1] == ("other", "("):
+                # ( 리터럴 , 리터럴 , ... ) 형태인지 확인
+                literals = []
+                j = i + 2
+                while j < len(tokens) and tokens[j][0] in ("string", "number"):
+                    literals.append(tokens[j])
+                    if j + 1 < len(tokens) and tokens[j + 1] == ("other", ","):
+                        j += 2
+                    else:
+                        j += 1
+                        break
+                if literals and j < len(tokens) and tokens[j] == ("other", ")"):
+                    result.append(("other", "("))
+                    for n, literal in enumerate(sorted(set(literals))):
+                        if n:
+                            result.append(("other", ","))
+                        result.append(literal)
+                    result.append(("other", ")"))
+                    i = j + 1
+                    continue
+        i += 1
+    return result
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    캐시 키용 SQL 정규화
+
+    - 주석 제거, 공백 정리, 리터럴 외 소문자화
+    - 끝의 세미콜론 제거
+    - IN 목록의 리터럴 정렬/중복 제거
+
+    Args:
+        sql: 원본 SQL
+
+    Returns:
+        정규화된 SQL (의미가 같은 SQL은 같은 문자열)
+    """
+    tokens = _sort_in_lists(tokenize_sql(sql))
+    while tokens and tokens[-1] == ("other", ";"):
+        tokens.pop()
+
+    out = []
+    prev_kind = None
+    for kind, value in tokens:
+        # 단어/리터럴끼리만 공백으로 구분 (구두점 주변 공백은 제거)
+        if out and kind != "other" and prev_kind not in (None, "other"):
+            out.append(" ")
+        out.append(value)
+        prev_kind = kind
+    return "".join(out)
+
+
+def is_cacheable_sql(normalized_sql: str) -> bool:
+    """조회 쿼리(SELECT / WITH)만 캐시"""
+    return normalized_sql.startswith(("select", "with"))
+
+
+class QueryResultCache:
+    """정규화 SQL 기반 결과 캐시 (LRU + TTL + 데이터 버전)"""
+
+    def __init__(
+        self,
+        max_size: int = 256,
+        ttl: float = 300,
+        max_rows: int = 5000,
+        version_fn: Optional[Callable[[], str]] = None,
+    ):
+        """
+        Args:
+            max_size: 최대 항목 수
+            ttl: 항목 유효 시간 (초, 0이면 만료 없음)
+            max_rows: 이보다 큰 결과는 캐시하지 않음
+            version_fn: 현재 데이터 버전을 반환하는 함수 (키에 포함)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.version_fn = version_fn
+
+        self._entries: "OrderedDict[str, Tuple[float, QueryResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def _key(self, normalized_sql: str, max_rows: int) -> str:
+        version = self.version_fn() if self.version_fn else ""
+        raw = f"{version}\x00{max_rows}\x00{normalized_sql}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get_or_execute(
+        self,
+        sql: str,
+        execute: Callable[[str, int], QueryResult],
+        max_rows: int = 0,
+    ) -> QueryResult:
+        """
+        캐시에 있으면 반환, 없으면 실행 후 저장
+
+        Args:
+            sql: 실행할 SQL
+            execute: (sql, max_rows) → QueryResult 실행 함수
+            max_rows: 최대 행 수
+
+        Returns:
+            QueryResult (캐시된 결과는 여러 요청이 공유하므로 수정하지 말 것)
+        """
+        normalized = normalize_sql(sql)
+        if self.max_size <= 0 or not is_cacheable_sql(normalized):
+            return execute(sql, max_rows)
+
+        key = self._key(normalized, max_rows)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, result = entry
+                if self.ttl and now - stored_at > self.ttl:
+                    del self._entries[key]
+                    self.expired += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+            self.misses += 1
+
+        # 실행은 잠금 밖에서 (느린 쿼리가 다른 캐시 조회를 막지 않도록)
+        result = execute(sql, max_rows)
+
+        if self.max_rows <= 0 or len(result) <= self.max_rows:
+            with self._lock:
+                self._entries[key] = (time.monotonic(), result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+        return result
+
+    def invalidate(self):
+        """전체 무효화 (데이터 적재 직후 등)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """캐시 통계 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
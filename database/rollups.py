@@ -0,0 +1,608 @@
+"""
+database/rollups.py
+
+자주 쓰는 집계를 미리 계산한 롤업 테이블
+- <테이블>_age_decade: 5세 단위 연령대 → "20대", "60대 이상" 묶음 합계
+- <테이블>_yearly: 월별 테이블 → 연도별 합계/평균/연말값 (비율 등은 합계 제외)
+- <테이블>_national: 시도 단위 테이블(geo_level)에 전국 행이 없으면 전국 합계
+
+생성한 테이블은 tables_metadata에 등록되어 검색/SQL 생성이 바로 사용한다.
+(MetadataManager 자동 새로고침이 반영, 벡터 검색은 setup_vector_db.py --sync 후)
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from database.index_advisor import (
+    existing_indexes,
+    index_name_for,
+    propose_index,
+    quote_identifier,
+    sql_literal,
+)
+
+AGE_DECADE_SUFFIX = "_age_decade"
+YEARLY_SUFFIX = "_yearly"
+NATIONAL_SUFFIX = "_national"
+ROLLUP_SUFFIXES = (AGE_DECADE_SUFFIX, YEARLY_SUFFIX, NATIONAL_SUFFIX)
+
+AGE_COLUMN = "연령대"
+VALUE_COLUMN = "값"
+MONTH_COLUMN = "년월"
+YEAR_COLUMN = "년도"
+REGION_COLUMN = "행정구역"
+NATIONAL_REGION = "전국"
+
+# 전국 합계는 시도 단위 테이블만 (시군구/읍면동 행이 섞이면 중복 합산)
+SIDO_GEO_LEVEL = "시도"
+LOWER_GEO_LEVEL_PATTERN = re.compile(r"시군구|시군|읍면동|구군")
+SIDO_COUNT = 17
+
+# 합산하면 의미가 없는 단위 (비율, 평균 등) → 합계 롤업 생성 안 함
+NON_ADDITIVE_UNIT_PATTERN = re.compile(r"%|퍼센트|비율|률|율|평균|지수|밀도|/")
+
+# "20-24", "20~24세", "100+", "85세 이상"
+_AGE_RANGE_PATTERN = re.compile(r"^\s*(\d+)\s*[-~]\s*(\d+)\s*세?\s*$")
+_AGE_OPEN_PATTERN = re.compile(r"^\s*(\d+)\s*(?:\+|세\s*이상)\s*$")
+
+# 연령 상한이 없는 구간의 상한 (계산용)
+_OPEN_AGE_UPPER = 200
+
+
+@dataclass
+class RollupResult:
+    """롤업 테이블 1개 생성 결과"""
+
+    table_name: str
+    source_table: str
+    kind: str  # "age_decade", "yearly", "national"
+    rows: int = 0
+    skipped: Optional[str] = None  # 생성하지 않은 이유
+
+
+# ============================================================
+# 연령대 묶음
+# ============================================================
+
+
+def parse_age_range(value: str) -> Optional[Tuple[int, int]]:
+    """
+    연령대 값 → (하한, 상한) (포함 구간)
+
+    "20-24" → (20, 24), "100+" → (100, 200), "계" → None
+    """
+    if value is None:
+        return None
+    text = str(value)
+    match = _AGE_RANGE_PATTERN.match(text)
+    if match:
+        low, high = int(match.group(1)), int(match.group(2))
+        return (low, high) if low <= high else None
+    match = _AGE_OPEN_PATTERN.match(text)
+    if match:
+        return int(match.group(1)), _OPEN_AGE_UPPER
+    return None
+
+
+def build_age_groups(values: Sequence[str]) -> Optional[Dict[str, List[str]]]:
+    """
+    연령대 값 목록 → {묶음 이름: [원본 연령대 값]}
+
+    - "N대": N ~ N+9세를 빈틈없이 덮는 구간이 모두 있을 때만
+    - "N대 이상": 하한이 N 이상인 모든 구간 (가장 높은 구간이 상한 없음일 때만)
+    - 구간끼리 겹치면 (예: "15-64"와 "15-19" 공존) 합계가 중복되므로 None
+
+    Args:
+        values: 테이블의 연령대 고유값
+
+    Returns:
+        묶음 매핑 (만들 수 없으면 None)
+    """
+    ranges = {}
+    for value in values:
+        parsed = parse_age_range(value)
+        if parsed:
+            ranges[value] = parsed
+    if not ranges:
+        return None
+
+    ordered = sorted(ranges.items(), key=lambda x: x[1])
+    for (_, prev), (_, cur) in zip(ordered, ordered[1:]):
+        if cur[0] <= prev[1]:
+            return None
+
+    groups: Dict[str, List[str]] = {}
+
+    for decade in range(10, 100, 10):
+        members = [v for v, (lo, hi) in ordered if lo >= decade and hi <= decade + 9]
+        covered = sorted(ranges[v] for v in members)
+        if not covered or covered[0][0] != decade or covered[-1][1] != decade + 9:
+            continue
+        if all(b[0] == a[1] + 1 for a, b in zip(covered, covered[1:])):
+            groups[f"{decade}대"] = members
+
+    if ordered[-1][1][1] == _OPEN_AGE_UPPER:
+        for decade in range(10, 100, 10):
+            covered = [(v, r) for v, r in ordered if r[0] >= decade]
+            # N세부터 빈틈없이 이어져야 "N대 이상"이 정확함
+            if len(covered) < 2 or covered[0][1][0] != decade:
+                continue
+            if all(b[0] == a[1] + 1 for (_, a), (_, b) in zip(covered, covered[1:])):
+                groups[f"{decade}대 이상"] = [v for v, _ in covered]
+
+    return groups or None
+
+
+# ============================================================
+# 공통
+# ============================================================
+
+
+def _fetchall(conn, sql: str) -> List[Tuple]:
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def _execute(conn, sql: str):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql)
+    finally:
+        cursor.close()
+
+
+def table_columns(conn, table_name: str) -> List[str]:
+    """실제 테이블 컬럼 목록 (PRAGMA table_info)"""
+    return [
+        row[1]
+        for row in _fetchall(conn, f"PRAGMA table_info({quote_identifier(table_name)})")
+    ]
+
+
+def is_additive(meta: Mapping) -> bool:
+    """값을 합산해도 의미가 있는 테이블인지 (단위 기준)"""
+    unit = str(meta.get("value_unit") or "")
+    return not NON_ADDITIVE_UNIT_PATTERN.search(unit)
+
+
+def _replace_table(conn, table_name: str, select_sql: str) -> int:
+    """
+    SELECT 결과로 테이블 교체 (새 테이블 생성 → 기존 삭제 → 이름 변경)
+
+    Returns:
+        int: 생성된 행 수
+    """
+    tmp_name = f"{table_name}__building"
+    _execute(conn, f"DROP TABLE IF EXISTS {quote_identifier(tmp_name)}")
+    _execute(conn, f"CREATE TABLE {quote_identifier(tmp_name)} AS {select_sql}")
+    _execute(conn, f"DROP TABLE IF EXISTS {quote_identifier(table_name)}")
+    _execute(
+        conn,
+        f"ALTER TABLE {quote_identifier(tmp_name)} "
+        f"RENAME TO {quote_identifier(table_name)}",
+    )
+    conn.commit()
+    return _fetchall(conn, f"SELECT COUNT(*) FROM {quote_identifier(table_name)}")[0][0]
+
+
+def _create_filter_index(conn, table_name: str, columns: Sequence[str]):
+    """롤업 테이블 기본 필터 인덱스 (index_advisor 스키마 규칙)"""
+    index_columns, _ = propose_index(table_name, set(columns))
+    if not index_columns:
+        return
+    existing = existing_indexes(conn, table_name)
+    name = index_name_for(table_name, index_columns)
+    if name in existing:
+        return
+    column_sql = ", ".join(quote_identifier(c) for c in index_columns)
+    _execute(
+        conn,
+        f"CREATE INDEX IF NOT EXISTS {quote_identifier(name)} "
+        f"ON {quote_identifier(table_name)} ({column_sql})",
+    )
+    conn.commit()
+
+
+# ============================================================
+# 롤업 SELECT 생성
+# ============================================================
+
+
+def age_decade_select(
+    source_table: str, columns: Sequence[str], groups: Mapping[str, List[str]]
+) -> str:
+    """연령대 묶음 합계 SELECT (VALUES CTE로 원본 → 묶음 매핑)"""
+    dims = [c for c in columns if c not in (AGE_COLUMN, VALUE_COLUMN)]
+    mapping = ", ".join(
+        f"({sql_literal(member)}, {sql_literal(group)})"
+        for group, members in groups.items()
+        for member in members
+    )
+    dim_sql = ", ".join(f"s.{quote_identifier(c)}" for c in dims)
+    select_dims = f"{dim_sql}, " if dims else ""
+    group_dims = f"{dim_sql}, " if dims else ""
+    return (
+        f"WITH age_map(src, grp) AS (VALUES {mapping}) "
+        f"SELECT {select_dims}m.grp AS {quote_identifier(AGE_COLUMN)}, "
+        f"SUM(s.{quote_identifier(VALUE_COLUMN)}) AS {quote_identifier(VALUE_COLUMN)} "
+        f"FROM {quote_identifier(source_table)} s "
+        f"JOIN age_map m ON s.{quote_identifier(AGE_COLUMN)} = m.src "
+        f"GROUP BY {group_dims}m.grp"
+    )
+
+
+def yearly_select(
+    source_table: str, columns: Sequence[str], additive: bool = True
+) -> str:
+    """
+    월별 → 연도별 SELECT
+
+    값: 12개월 합계 (합산 가능한 단위만), 평균값: 월평균,
+    연말값: 그 해 마지막 월의 값
+    (SQLite는 MAX() 집계가 1개일 때 나머지 컬럼을 그 행에서 가져옴)
+    """
+    dims = [c for c in columns if c not in (MONTH_COLUMN, VALUE_COLUMN)]
+    dim_sql = "".join(f"s.{quote_identifier(c)}, " for c in dims)
+    value = f"s.{quote_identifier(VALUE_COLUMN)}"
+    year_expr = f"substr(s.{quote_identifier(MONTH_COLUMN)}, 1, 4)"
+    sum_sql = f"SUM({value}) AS {quote_identifier(VALUE_COLUMN)}, " if additive else ""
+    return (
+        f"SELECT {dim_sql}{year_expr} AS {quote_identifier(YEAR_COLUMN)}, "
+        f"{sum_sql}"
+        f"AVG({value}) AS 평균값, "
+        f"{value} AS 연말값, "
+        f"MAX(s.{quote_identifier(MONTH_COLUMN)}) AS 기준월, "
+        f"COUNT(*) AS 월수 "
+        f"FROM {quote_identifier(source_table)} s "
+        f"GROUP BY {dim_sql}{year_expr}"
+    )
+
+
+def is_sido_level(meta: Mapping) -> bool:
+    """geo_level이 시도 단위인지 (하위 행정구역이 섞인 테이블 제외)"""
+    geo_level = str(meta.get("geo_level") or "")
+    return SIDO_GEO_LEVEL in geo_level and not LOWER_GEO_LEVEL_PATTERN.search(
+        geo_level
+    )
+
+
+def national_select(source_table: str, columns: Sequence[str]) -> str:
+    """시도별 → 전국 합계 SELECT"""
+    dims = [c for c in columns if c not in (REGION_COLUMN, VALUE_COLUMN)]
+    dim_sql = "".join(f"{quote_identifier(c)}, " for c in dims)
+    group_sql = ", ".join(quote_identifier(c) for c in dims)
+    return (
+        f"SELECT {sql_literal(NATIONAL_REGION)} AS {quote_identifier(REGION_COLUMN)}, "
+        f"{dim_sql}SUM({quote_identifier(VALUE_COLUMN)}) "
+        f"AS {quote_identifier(VALUE_COLUMN)} "
+        f"FROM {quote_identifier(source_table)}"
+        + (f" GROUP BY {group_sql}" if dims else "")
+    )
+
+
+# ============================================================
+# tables_metadata 등록
+# ============================================================
+
+
+def rollup_metadata_row(
+    source_row: Mapping,
+    table_name: str,
+    kind: str,
+    columns: Sequence[str],
+    groups: Optional[Mapping[str, List[str]]] = None,
+    additive: bool = True,
+) -> Dict:
+    """
+    원본 테이블 메타데이터 → 롤업 테이블 메타데이터 행
+
+    Args:
+        source_row: 원본 테이블의 tables_metadata 행
+        table_name: 롤업 테이블명
+        kind: "age_decade", "yearly", "national"
+        columns: 롤업 테이블 컬럼
+        groups: 연령대 묶음 (age_decade일 때)
+        additive: 값을 합산할 수 있는 단위인지 (yearly일 때, 아니면 합계 없음)
+
+    Returns:
+        tables_metadata 행 (원본 행의 컬럼 구성을 그대로 따름)
+    """
+    row = dict(source_row)
+    source_table = source_row["table_name"]
+    source_desc = source_row.get("short_desc_ko") or source_table
+
+    try:
+        column_detail = json.loads(source_row.get("column_schema_detail") or "{}")
+    except ValueError:
+        column_detail = {}
+    if not isinstance(column_detail, dict):
+        column_detail = {}
+    column_detail = {c: column_detail.get(c, "") for c in columns}
+
+    if kind == "age_decade":
+        labels = ", ".join(groups or {})
+        column_detail[AGE_COLUMN] = f"연령대 묶음 ({labels})"
+        desc = f"{source_desc} - 10세 단위 연령대 합계 (N대, N대 이상)"
+        keywords = "20대, 30대, 60대 이상, 연령대 묶음, 10세 단위"
+        example = (
+            f"SELECT {VALUE_COLUMN} FROM {table_name} "
+            f"WHERE {AGE_COLUMN} = '20대' ...; "
+            f"SELECT {VALUE_COLUMN} FROM {table_name} "
+            f"WHERE {AGE_COLUMN} = '60대 이상' ..."
+        )
+        caution = (
+            f"{source_table}의 5세 단위 연령대를 미리 합산한 테이블. "
+            f"연령대 IN (...) 대신 연령대 = '20대' / '60대 이상'으로 조회"
+        )
+    elif kind == "yearly":
+        column_detail.update(
+            {
+                YEAR_COLUMN: "연도 (YYYY)",
+                "평균값": "월평균",
+                "연말값": "해당 연도 마지막 월의 값",
+                "기준월": "연말값의 기준 년월",
+                "월수": "집계된 월 수",
+            }
+        )
+        example = (
+            f"SELECT {YEAR_COLUMN}, 연말값 AS 인구수 FROM {table_name} "
+            f"WHERE {YEAR_COLUMN} BETWEEN '2020' AND '2023' ..."
+        )
+        if additive:
+            column_detail[VALUE_COLUMN] = "연간 합계 (12개월 합)"
+            desc = f"{source_desc} - 연도별 집계 (합계, 월평균, 연말값)"
+            caution = (
+                f"{source_table}의 월별 값을 연도별로 집계한 테이블. "
+                f"인구처럼 시점 값은 연말값 또는 평균값, 흐름 값(출생 등)은 값(합계) 사용. "
+                f"진행 중인 연도는 월수가 12 미만"
+            )
+        else:
+            desc = f"{source_desc} - 연도별 집계 (월평균, 연말값)"
+            caution = (
+                f"{source_table}의 월별 값을 연도별로 집계한 테이블. "
+                f"합산할 수 없는 단위({source_row.get('value_unit')})라 합계 컬럼 없음, "
+                f"평균값 또는 연말값 사용. 진행 중인 연도는 월수가 12 미만"
+            )
+        keywords = "연도별, 연간, 연평균, 연말, 매년"
+        row["time_freq"] = "year"
+        for key in ("period_start", "period_end"):
+            if row.get(key):
+                row[key] = str(row[key])[:4]
+    else:
+        column_detail[REGION_COLUMN] = "전국 (시도 합계)"
+        desc = f"{source_desc} - 전국 합계"
+        keywords = "전국, 전국 합계, 합계"
+        example = (
+            f"SELECT {VALUE_COLUMN} FROM {table_name} "
+            f"WHERE {REGION_COLUMN} = '전국' ..."
+        )
+        caution = f"{source_table}의 시도별 값을 합산한 전국 합계 테이블"
+        row["geo_level"] = "national"
+
+    row.update(
+        {
+            "table_name": table_name,
+            "short_desc_ko": desc,
+            "keywords_ko": f"{source_row.get('keywords_ko') or ''}, {keywords}",
+            "columns_schema_outline": json.dumps(list(columns), ensure_ascii=False),
+            "column_schema_detail": json.dumps(column_detail, ensure_ascii=False),
+            "example_queries_ko": example,
+            "caution_ko": f"{caution}. {source_row.get('caution_ko') or ''}".strip(),
+        }
+    )
+    return row
+
+
+def register_metadata(conn, row: Mapping):
+    """tables_metadata에 행 등록 (같은 테이블명이면 교체)"""
+    names = list(row)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "DELETE FROM tables_metadata WHERE table_name = ?", (row["table_name"],)
+        )
+        cursor.execute(
+            f"INSERT INTO tables_metadata "
+            f"({', '.join(quote_identifier(n) for n in names)}) "
+            f"VALUES ({', '.join('?' for _ in names)})",
+            tuple(row[n] for n in names),
+        )
+    finally:
+        cursor.close()
+    conn.commit()
+
+
+# ============================================================
+# 빌드
+# ============================================================
+
+
+def build_rollups_for_table(conn, source_row: Mapping) -> List[RollupResult]:
+    """
+    원본 테이블 1개에 대해 가능한 롤업 테이블 생성 + 메타데이터 등록
+
+    Args:
+        conn: DB-API 연결 (원본 DB)
+        source_row: 원본 테이블의 tables_metadata 행
+
+    Returns:
+        RollupResult 리스트
+    """
+    source_table = source_row["table_name"]
+    columns = table_columns(conn, source_table)
+    results = []
+
+    if VALUE_COLUMN not in columns:
+        return results
+
+    additive = is_additive(source_row)
+    quoted = quote_identifier(source_table)
+
+    # 1. 연령대 묶음
+    if AGE_COLUMN in columns:
+        result = RollupResult(
+            source_table + AGE_DECADE_SUFFIX, source_table, "age_decade"
+        )
+        values = [
+            r[0]
+            for r in _fetchall(
+                conn, f"SELECT DISTINCT {quote_identifier(AGE_COLUMN)} FROM {quoted}"
+            )
+        ]
+        groups = build_age_groups(values)
+        if not additive:
+            result.skipped = f"합산 불가 단위 ({source_row.get('value_unit')})"
+        elif not groups:
+            result.skipped = "5세 단위 연령대 구간이 없거나 겹침"
+        else:
+            select_sql = age_decade_select(source_table, columns, groups)
+            result.rows = _replace_table(conn, result.table_name, select_sql)
+            _create_filter_index(conn, result.table_name, columns)
+            register_metadata(
+                conn,
+                rollup_metadata_row(
+                    source_row, result.table_name, "age_decade", columns, groups
+                ),
+            )
+        results.append(result)
+
+    # 2. 연도별 (월별 테이블만)
+    if MONTH_COLUMN in columns:
+        result = RollupResult(source_table + YEARLY_SUFFIX, source_table, "yearly")
+        yearly_columns = [c for c in columns if c not in (MONTH_COLUMN, VALUE_COLUMN)]
+        yearly_columns.append(YEAR_COLUMN)
+        if additive:
+            yearly_columns.append(VALUE_COLUMN)  # 비율/평균 등은 연간 합계 없음
+        yearly_columns += ["평균값", "연말값", "기준월", "월수"]
+        result.rows = _replace_table(
+            conn, result.table_name, yearly_select(source_table, columns, additive)
+        )
+        _create_filter_index(conn, result.table_name, yearly_columns)
+        register_metadata(
+            conn,
+            rollup_metadata_row(
+                source_row,
+                result.table_name,
+                "yearly",
+                yearly_columns,
+                additive=additive,
+            ),
+        )
+        results.append(result)
+
+    # 3. 전국 합계 (전국 행이 없는 시도 단위 테이블만)
+    if REGION_COLUMN in columns:
+        result = RollupResult(source_table + NATIONAL_SUFFIX, source_table, "national")
+        has_national = _fetchall(
+            conn,
+            f"SELECT 1 FROM {quoted} WHERE {quote_identifier(REGION_COLUMN)} = "
+            f"{sql_literal(NATIONAL_REGION)} LIMIT 1",
+        )
+        region_count = _fetchall(
+            conn,
+            f"SELECT COUNT(DISTINCT {quote_identifier(REGION_COLUMN)}) FROM {quoted}",
+        )[0][0]
+        if has_national:
+            result.skipped = "원본에 전국 행이 이미 있음"
+        elif not is_sido_level(source_row):
+            result.skipped = f"시도 단위 테이블이 아님 ({source_row.get('geo_level')})"
+        elif region_count > SIDO_COUNT:
+            result.skipped = f"행정구역 값이 {region_count}개 (시도보다 많음)"
+        elif not additive:
+            result.skipped = f"합산 불가 단위 ({source_row.get('value_unit')})"
+        else:
+            national_columns = [REGION_COLUMN]
+            national_columns += [
+                c for c in columns if c not in (REGION_COLUMN, VALUE_COLUMN)
+            ]
+            national_columns.append(VALUE_COLUMN)
+            result.rows = _replace_table(
+                conn, result.table_name, national_select(source_table, columns)
+            )
+            _create_filter_index(conn, result.table_name, national_columns)
+            register_metadata(
+                conn,
+                rollup_metadata_row(
+                    source_row, result.table_name, "national", national_columns
+                ),
+            )
+        results.append(result)
+
+    return results
+
+
+def is_rollup_table(table_name: str) -> bool:
+    """롤업 테이블 여부 (이름 규칙)"""
+    return table_name.endswith(ROLLUP_SUFFIXES)
+
+
+def build_all_rollups(
+    conn, metadata_rows: Mapping[str, Mapping], tables: Optional[Sequence[str]] = None
+) -> List[RollupResult]:
+    """
+    전체 (또는 지정) 원본 테이블의 롤업 생성
+
+    Args:
+        conn: DB-API 연결 (원본 DB)
+        metadata_rows: {테이블명: tables_metadata 행}
+        tables: 대상 원본 테이블 (None이면 롤업이 아닌 전체 테이블)
+
+    Returns:
+        RollupResult 리스트
+    """
+    results = []
+    for table_name, row in metadata_rows.items():
+        if is_rollup_table(table_name):
+            continue
+        if tables and table_name not in tables:
+            continue
+        try:
+            results.extend(build_rollups_for_table(conn, row))
+        except Exception as e:
+            conn.rollback()
+            results.append(
+                RollupResult(table_name, table_name, "error", skipped=str(e))
+            )
+    return results
+
+
+# ============================================================
+# 검색 시 롤업 테이블 우선
+# ============================================================
+
+# "20대", "60대 이상" (순위 표현은 호출 측에서 age_related로 걸러짐)
+DECADE_QUERY_PATTERN = re.compile(r"(?<!\d)[1-9]0대")
+YEARLY_QUERY_PATTERN = re.compile(r"연도별|년도별|연간|연평균|연말|매년|해마다|년별")
+NATIONAL_QUERY_PATTERN = re.compile(r"전국")
+
+
+def preferred_rollup_names(
+    query: str, table_name: str, age_related: bool = True
+) -> List[str]:
+    """
+    질문에 맞는 롤업 테이블 후보 이름 (우선순위 순, 존재 여부는 확인 안 함)
+
+    Args:
+        query: 사용자 질문
+        table_name: 원본 테이블명
+        age_related: 연령 질문 여부 ("1000대 기업" 같은 순위 표현 제외용)
+
+    Returns:
+        롤업 테이블명 리스트
+    """
+    if is_rollup_table(table_name):
+        return []
+    names = []
+    if age_related and DECADE_QUERY_PATTERN.search(query):
+        names.append(table_name + AGE_DECADE_SUFFIX)
+    if YEARLY_QUERY_PATTERN.search(query):
+        names.append(table_name + YEARLY_SUFFIX)
+    if NATIONAL_QUERY_PATTERN.search(query):
+        names.append(table_name + NATIONAL_SUFFIX)
+    return names
@@ -0,0 +1,308 @@
+"""
+database/sql_repair.py
+
+규칙 기반 SQL 자동 수정 (LLM 재생성 전에 시도)
+- 마크다운 코드블록 / "SQL:" 접두어 제거
+- 검증기가 찾은 문제 중 확실한 것 (괄호 컬럼 따옴표, '20-24세' → '20-24',
+  시간 형식, 큰따옴표 문자열, 오타가 분명한 테이블/컬럼명, 범주 값 사전에 없는 값)
+- YEAR()/MONTH() → substr()
+- 질문에 "전국"이 없으면 행정구역 != '전국' 조건 추가
+- 끝에서 닫히지 않은 따옴표 / 괄호 닫기
+
+수정 결과가 확실하지 않으면 원본을 그대로 돌려준다 (그때만 LLM 재생성).
+"""
+
+import re
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from database.query_guard import table_aliases
+from database.rollups import NATIONAL_SUFFIX
+from database.sql_tokens import apply_edits, identifier_name, tokenize_sql_spans
+from database.sql_validator import (
+    TableSchema,
+    ValueLookup,
+    check_syntax,
+    find_schema_issues,
+    unique_match,
+)
+
+REGION_COLUMN = "행정구역"
+NATIONAL_VALUE = "전국"
+
+_FENCE = re.compile(
+    r"```(?:sql|sqlite)?\s*(.*?)\s*(?:```|$)", re.IGNORECASE | re.DOTALL
+)
+_SQL_PREFIX = re.compile(r"^\s*(?:sql|query|쿼리)\s*:\s*", re.IGNORECASE)
+_QUERY_START = re.compile(r"\s*(?:select|with)\b", re.IGNORECASE)
+
+# 날짜 함수 → 문자열 자르기 (시간 컬럼이 'YYYY-MM' 문자열)
+_DATE_FUNCTIONS = {"year": "substr({}, 1, 4)", "month": "substr({}, 6, 2)"}
+
+# 검증기 편집 적용 반복 횟수 (테이블명 수정 → 컬럼 재검사)
+ISSUE_PASSES = 3
+
+# WHERE 절이 끝나는 최상위 키워드
+_CLAUSE_END = {"group", "order", "limit", "having", "window", "union", "except"}
+
+# (SQL, 스키마, 질문, DB 에러, 범주 값 사전) → (수정된 SQL, 수정 설명 리스트)
+RepairPass = Callable[
+    [str, Mapping[str, TableSchema], str, str, Optional[ValueLookup]],
+    Tuple[str, List[str]],
+]
+
+
+# ============================================================
+# 수정 규칙
+# ============================================================
+
+
+def strip_markdown(sql: str, *_) -> Tuple[str, List[str]]:
+    """코드블록 / 'SQL:' 접두어 / 감싼 따옴표 제거"""
+    fixed = sql.strip()
+    match = _FENCE.search(fixed)
+    if match:
+        fixed = match.group(1)
+    fixed = _SQL_PREFIX.sub("", fixed.replace("```", "")).strip()
+    # 쿼리 전체를 감싼 따옴표 ("SELECT ...", 'SELECT ...', `SELECT ...`)
+    while (
+        len(fixed) > 2
+        and fixed[0] == fixed[-1]
+        and fixed[0] in "\"'`"
+        and _QUERY_START.match(fixed[1:-1])
+    ):
+        fixed = fixed[1:-1].strip()
+    if fixed != sql.strip():
+        return fixed, ["마크다운/접두어/따옴표 제거"]
+    return sql, []
+
+
+def apply_issue_edits(
+    sql: str,
+    schema: Mapping[str, TableSchema],
+    user_query: str = "",
+    error: str = "",
+    value_lookup: Optional[ValueLookup] = None,
+) -> Tuple[str, List[str]]:
+    """
+    검증기가 찾은 문제 중 편집 정보가 있는 것만 적용
+
+    테이블명을 고치면 그 테이블의 컬럼을 다시 검사할 수 있으므로 몇 번 반복
+    """
+    fixes: List[str] = []
+    for _ in range(ISSUE_PASSES):
+        issues = [i for i in find_schema_issues(sql, schema, value_lookup) if i.edits]
+        if not issues:
+            break
+        sql = apply_edits(sql, [edit for issue in issues for edit in issue.edits])
+        fixes.extend(issue.message for issue in issues)
+    return sql, fixes
+
+
+def replace_date_functions(sql: str, *_) -> Tuple[str, List[str]]:
+    """YEAR(x) / MONTH(x) → substr(x, ...) (인자가 단일 식별자일 때만)"""
+    tokens = tokenize_sql_spans(sql)
+    edits = []
+    for i in range(len(tokens) - 3):
+        kind, value, start, _ = tokens[i]
+        if kind != "word" or value not in _DATE_FUNCTIONS:
+            continue
+        if tokens[i + 1][1] != "(" or tokens[i + 3][1] != ")":
+            continue
+        if tokens[i + 2][0] not in ("word", "quoted"):
+            continue
+        argument = sql[tokens[i + 2][2] : tokens[i + 2][3]]
+        edits.append((start, tokens[i + 3][3], _DATE_FUNCTIONS[value].format(argument)))
+    if not edits:
+        return sql, []
+    return apply_edits(sql, edits), [f"날짜 함수 {len(edits)}개 → substr()"]
+
+
+def add_region_filter(
+    sql: str, schema: Mapping[str, TableSchema], user_query: str = "", *_
+) -> Tuple[str, List[str]]:
+    """
+    행정구역 != '전국' 조건 추가 (프롬프트 규칙 6)
+
+    단일 테이블 조회이고, 질문에 "전국"이 없고, 행정구역 조건이 아직 없을 때만
+    """
+    if not user_query or NATIONAL_VALUE in user_query:
+        return sql, []
+
+    tables = {table.lower() for table in table_aliases(sql).values()}
+    lower_schema = {name.lower(): name for name in schema}
+    if len(tables) != 1:
+        return sql, []
+    table = lower_schema.get(tables.pop())
+    if (
+        table is None
+        or table.endswith(NATIONAL_SUFFIX)
+        or REGION_COLUMN not in schema[table].columns
+    ):
+        return sql, []
+
+    tokens = tokenize_sql_spans(sql)
+    if sum(1 for token in tokens if token[1] == "select") != 1:
+        return sql, []  # 서브쿼리는 범위 판단이 어려우므로 건드리지 않음
+    if any(
+        identifier_name(prev[:2]) == REGION_COLUMN
+        and cur[1] in ("=", "==", "!=", "<>", "in", "like", "not", "is")
+        for prev, cur in zip(tokens, tokens[1:])
+    ):
+        return sql, []
+
+    # 최상위 FROM 이후의 WHERE / 절 끝 위치
+    where = clause_end = None
+    depth, after_from = 0, False
+    for index, token in enumerate(tokens):
+        if token[1] == "(":
+            depth += 1
+        elif token[1] == ")":
+            depth -= 1
+        elif depth == 0 and token[1] == "from":
+            after_from = True
+        elif depth == 0 and after_from and token[1] == "where" and where is None:
+            where = index
+        elif depth == 0 and after_from and token[1] in _CLAUSE_END:
+            clause_end = index
+            break
+    if not after_from or where == len(tokens) - 1:
+        return sql, []
+    if clause_end is None:
+        clause_end = len(tokens) - 1 if tokens[-1][1] == ";" else len(tokens)
+    last_end = tokens[clause_end - 1][3]  # 조건이 끝나는 위치
+
+    condition = f"{REGION_COLUMN} != '{NATIONAL_VALUE}'"
+    if where is None:
+        edits = [(last_end, last_end, f" WHERE {condition}")]
+    else:
+        edits = [
+            (tokens[where][3], tokens[where + 1][2], f" {condition} AND ("),
+            (last_end, last_end, ")"),
+        ]
+    return apply_edits(sql, edits), [f"{condition} 조건 추가"]
+
+
+def close_unbalanced(sql: str, *_) -> Tuple[str, List[str]]:
+    """끝에서 닫히지 않은 작은따옴표 / 괄호 닫기 (문법 검사를 통과할 때만)"""
+    tokens = tokenize_sql_spans(sql)
+    depth = 0
+    for token in tokens:
+        if token[1] == "(":
+            depth += 1
+        elif token[1] == ")":
+            depth -= 1
+    unterminated_quote = ("other", "'") in [token[:2] for token in tokens]
+    if depth <= 0 and not unterminated_quote:
+        return sql, []
+
+    body = sql.rstrip().rstrip(";").rstrip()
+    suffix = ("'" if unterminated_quote else "") + ")" * max(depth, 0)
+    fixed = body + suffix + ";"
+    if check_syntax(fixed):
+        return sql, []
+    return fixed, [f"닫히지 않은 {suffix} 보완"]
+
+
+def fix_from_db_error(
+    sql: str,
+    schema: Mapping[str, TableSchema],
+    user_query: str = "",
+    error: str = "",
+    *_,
+) -> Tuple[str, List[str]]:
+    """'no such column: X' 등 DB 에러가 가리키는 이름을 비슷한 이름으로 교체"""
+    match = re.search(r"no such (column|table|function): ([\w.]+)", error or "")
+    if not match:
+        return sql, []
+    kind, name = match.groups()
+    name = name.split(".")[-1]
+
+    if kind == "table":
+        candidates = list(schema)
+    elif kind == "column":
+        referenced = {table.lower() for table in table_aliases(sql).values()}
+        candidates = sorted(
+            {
+                column
+                for table, table_schema in schema.items()
+                if table.lower() in referenced
+                for column in table_schema.columns
+            }
+        )
+    else:
+        return replace_date_functions(sql)
+
+    replacement = unique_match(name, candidates)
+    if replacement is None:
+        return sql, []
+    if not re.fullmatch(r"\w+", replacement):
+        replacement = '"' + replacement.replace('"', '""') + '"'
+    edits = [
+        (start, end, replacement)
+        for token_kind, value, start, end in tokenize_sql_spans(sql, lower=False)
+        if token_kind in ("word", "quoted")
+        and identifier_name((token_kind, value)).lower() == name.lower()
+    ]
+    if not edits:
+        return sql, []
+    return apply_edits(sql, edits), [f"{name} → {replacement}"]
+
+
+# ============================================================
+# 자동 수정
+# ============================================================
+
+# 실행 전 항상 적용하는 규칙 (순서대로)
+PROACTIVE_REPAIRS: List[RepairPass] = [
+    strip_markdown,
+    close_unbalanced,
+    replace_date_functions,
+    apply_issue_edits,
+    add_region_filter,
+]
+
+# DB 에러 종류(classify_sql_error) → 적용할 규칙
+REPAIRS_BY_ERROR: Dict[str, List[RepairPass]] = {
+    "syntax": [strip_markdown, close_unbalanced],
+    "schema": [fix_from_db_error, replace_date_functions, apply_issue_edits],
+    "value": [apply_issue_edits],
+    "other": [],
+}
+
+
+def repair_sql(
+    sql: str,
+    schema: Mapping[str, TableSchema],
+    user_query: str = "",
+    error_kind: Optional[str] = None,
+    error: str = "",
+    value_lookup: Optional[ValueLookup] = None,
+) -> Tuple[str, List[str]]:
+    """
+    규칙 기반 SQL 수정
+
+    Args:
+        sql: 생성된 SQL
+        schema: {테이블명: TableSchema}
+        user_query: 사용자 질문 ("전국" 여부 판단)
+        error_kind: DB 에러 종류 (None이면 실행 전 수정 규칙 전체)
+        error: DB 에러 메시지 (이름 교체용)
+        value_lookup: (테이블, 컬럼) → 실제 값 집합 (없는 값 → 비슷한 값 수정)
+
+    Returns:
+        (수정된 SQL, 적용한 수정 설명 리스트) - 수정이 없으면 (원본, [])
+    """
+    if error_kind is None:
+        passes = PROACTIVE_REPAIRS
+    else:
+        passes = REPAIRS_BY_ERROR.get(error_kind, [])
+
+    fixes: List[str] = []
+    for repair in passes:
+        try:
+            sql, applied = repair(sql, schema, user_query, error, value_lookup)
+        except Exception as e:  # 수정 규칙 오류로 실행이 막히지 않도록
+            print(f"⚠️ SQL 자동 수정 건너뜀 ({repair.__name__}): {e}")
+            continue
+        fixes.extend(applied)
+    return sql, fixes
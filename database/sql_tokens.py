@@ -0,0 +1,111 @@
+"""
+database/sql_tokens.py
+
+가벼운 SQL 토크나이저 (캐시 키 정규화, 인덱스 분석 등에서 공용)
+- 문자열 리터럴 / 따옴표 식별자 / 주석을 정확히 구분
+- 파서가 아니므로 구문 검증은 하지 않음
+"""
+
+import re
+from typing import List, Tuple
+
+# 문자열 리터럴 / 따옴표 식별자 / 주석 / 공백 / 숫자 / 단어 / 나머지 1글자
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<string>'(?:[^']|'')*')
+    | (?P<quoted>"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\])
+    | (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<space>\s+)
+    | (?P<number>\d+(?:\.\d+)?)
+    | (?P<word>\w+)
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# 두 글자 연산자 (비교 연산자 분석용)
+_COMPOUND_OPERATORS = {">=", "<=", "<>", "!=", "==", "||"}
+
+Token = Tuple[str, str]
+SpanToken = Tuple[str, str, int, int]  # (종류, 토큰, 시작, 끝)
+
+
+def tokenize_sql_spans(sql: str, lower: bool = True) -> List[SpanToken]:
+    """
+    SQL → [(종류, 토큰, 시작 위치, 끝 위치)] (주석/공백 제외)
+
+    위치는 원본 문자열 기준이라 토큰 단위로 SQL을 고쳐 쓸 때 사용
+
+    Args:
+        sql: SQL 문자열
+        lower: 리터럴/따옴표 식별자 외 토큰을 소문자로 변환
+
+    Returns:
+        토큰 리스트
+    """
+    tokens: List[SpanToken] = []
+    for match in _TOKEN_PATTERN.finditer(sql):
+        kind = match.lastgroup
+        value = match.group()
+        if kind in ("comment", "space"):
+            continue
+        if lower and kind in ("word", "other"):
+            value = value.lower()
+        # >=, <= 등은 한 토큰으로
+        if kind == "other" and tokens and tokens[-1][0] == "other":
+            _, prev_value, prev_start, prev_end = tokens[-1]
+            if prev_end == match.start() and prev_value + value in _COMPOUND_OPERATORS:
+                tokens[-1] = ("other", prev_value + value, prev_start, match.end())
+                continue
+        tokens.append((kind, value, match.start(), match.end()))
+    return tokens
+
+
+def tokenize_sql(sql: str, lower: bool = True) -> List[Token]:
+    """
+    SQL → [(종류, 토큰)] (주석/공백 제외)
+
+    종류: string, quoted, number, word, other
+
+    Args:
+        sql: SQL 문자열
+        lower: 리터럴/따옴표 식별자 외 토큰을 소문자로 변환
+
+    Returns:
+        토큰 리스트
+    """
+    return [(kind, value) for kind, value, _, _ in tokenize_sql_spans(sql, lower)]
+
+
+def apply_edits(sql: str, edits: List[Tuple[int, int, str]]) -> str:
+    """
+    (시작, 끝, 바꿀 문자열) 목록을 원본 SQL에 적용 (겹치는 편집은 앞의 것만)
+
+    Args:
+        sql: 원본 SQL
+        edits: 편집 목록 (위치는 원본 기준)
+
+    Returns:
+        편집된 SQL
+    """
+    result = []
+    position = 0
+    for start, end, replacement in sorted(edits, key=lambda e: (e[0], e[1])):
+        if start < position:
+            continue
+        result.append(sql[position:start])
+        result.append(replacement)
+        position = end
+    result.append(sql[position:])
+    return "".join(result)
+
+
+def identifier_name(token: Token) -> str:
+    """식별자 토큰 → 이름 (따옴표 제거)"""
+    kind, value = token
+    if kind == "quoted":
+        if value[0] == "[":
+            return value[1:-1]
+        quote = value[0]
+        return value[1:-1].replace(quote * 2, quote)
+    return value
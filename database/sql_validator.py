@@ -0,0 +1,815 @@
+"""
+database/sql_validator.py
+
+생성된 SQL 로컬 검증 (DB 실행 전)
+- 문법: 조회 쿼리 1개, 괄호/따옴표 짝, 끝나지 않은 절, 쉼표 위치
+- 스키마: 테이블/컬럼/별칭 존재 여부 (MetadataManager 스냅샷 기준, 비슷한 이름 제안),
+  다른 DB 전용 함수 (YEAR, NVL 등)
+- 값: 연령대 표기, 시간 컬럼 형식/기간 범위, 범주 값 사전(있으면)
+
+파서가 아니라 토큰 규칙 기반이므로, 확실한 오류만 보고한다 (애매하면 통과).
+"""
+
+import re
+from dataclasses import dataclass, field, replace
+from difflib import SequenceMatcher, get_close_matches
+from typing import Callable, Collection, Dict, List, Mapping, Optional, Set, Tuple
+
+from database.query_guard import table_aliases
+from database.sql_tokens import (
+    SpanToken,
+    Token,
+    identifier_name,
+    tokenize_sql,
+    tokenize_sql_spans,
+)
+
+# 보고할 최대 에러 수 (프롬프트가 길어지지 않도록)
+MAX_ERRORS = 5
+
+# 이 길이 이상의 이름/값은 2글자 차이까지 오타로 보고 자동 수정 (짧으면 1글자)
+AUTO_FIX_LONG_NAME = 6
+
+# (테이블, 컬럼) → 허용 값 집합 (사전이 없으면 None)
+ValueLookup = Callable[[str, str], Optional[Collection[str]]]
+
+# (시작, 끝, 바꿀 문자열) - 원본 SQL 위치 기준
+Edit = Tuple[int, int, str]
+
+# fmt: off
+SQL_KEYWORDS = {
+    "select", "from", "where", "and", "or", "not", "in", "is", "null", "as",
+    "join", "inner", "left", "right", "full", "outer", "cross", "natural", "on",
+    "using", "group", "by", "order", "asc", "desc", "limit", "offset", "having",
+    "distinct", "all", "union", "except", "intersect", "with", "recursive",
+    "case", "when", "then", "else", "end", "between", "like", "glob", "escape",
+    "exists", "cast", "collate", "nulls", "first", "last", "over", "partition",
+    "window", "rows", "range", "unbounded", "preceding", "following", "current",
+    "row", "filter", "true", "false", "current_date", "current_time",
+    "current_timestamp", "integer", "int", "real", "text", "numeric", "float",
+    "decimal", "varchar", "values", "indexed", "materialized",
+}
+
+# 알려진 SQLite 함수 (괄호가 든 컬럼명과 구분용, 여기 없다고 에러는 아님)
+SQL_FUNCTIONS = {
+    "count", "sum", "avg", "min", "max", "total", "group_concat", "abs", "round",
+    "cast", "coalesce", "ifnull", "nullif", "iif", "length", "lower", "upper",
+    "substr", "substring", "instr", "replace", "trim", "ltrim", "rtrim",
+    "printf", "format", "strftime", "date", "time", "datetime", "julianday",
+    "typeof", "random", "exists", "in", "values", "char", "hex", "quote",
+    "row_number", "rank", "dense_rank", "percent_rank", "cume_dist", "ntile",
+    "lag", "lead", "first_value", "last_value", "nth_value", "sign", "sqrt",
+    "power", "pow", "exp", "ln", "log", "log10", "floor", "ceil", "ceiling",
+    "mod", "pi", "likely", "unlikely", "concat", "concat_ws", "unicode",
+}
+# fmt: on
+
+# 다른 DB 문법 → SQLite 대안 (LLM이 자주 섞어 쓰는 것들)
+FUNCTION_HINTS = {
+    "year": "substr(년월, 1, 4)",
+    "month": "substr(년월, 6, 2)",
+    "date_format": "strftime() 또는 substr()",
+    "to_char": "strftime() 또는 substr()",
+    "to_date": "날짜 문자열 그대로 비교",
+    "isnull": "IFNULL()",
+    "nvl": "IFNULL()",
+    "len": "LENGTH()",
+    "top": "LIMIT",
+}
+
+# 조회 쿼리가 이 토큰으로 끝나면 절이 끝나지 않은 것
+# fmt: off
+_DANGLING_TOKENS = {
+    "select", "from", "where", "and", "or", "not", "by", "on", "join", "in",
+    "between", "like", "as", ",", "=", "==", "!=", "<>", "<", ">", "<=", ">=",
+    "+", "-", "/", "(",
+}
+# fmt: on
+
+AGE_COLUMN = "연령대"
+_AGE_WITH_UNIT = re.compile(r"^\d+\s*(?:-|~)\s*\d+\s*세$|^\d+\s*세")
+_AGE_DECADE = re.compile(r"^\d+대(?: 이상)?$")
+_AGE_DECADE_SUFFIX = "_age_decade"
+
+# 값 비교 연산자 (범주 값 사전 검사 대상)
+_MEMBERSHIP_OPERATORS = {"=", "==", "in"}
+_RANGE_OPERATORS = {"<", ">", "<=", ">=", "between"}
+
+
+@dataclass
+class TableSchema:
+    """검증용 테이블 스키마 1개"""
+
+    columns: Set[str]
+    period_column: str = ""
+    period_start: str = ""
+    period_end: str = ""
+    lower_columns: Dict[str, str] = field(default_factory=dict)  # {소문자: 원본}
+
+    def __post_init__(self):
+        self.lower_columns = {c.lower(): c for c in self.columns}
+
+    def has_column(self, name: str) -> bool:
+        return name.lower() in self.lower_columns
+
+
+@dataclass
+class SchemaIssue:
+    """검증 문제 1건 (edits가 있으면 규칙으로 자동 수정 가능)"""
+
+    message: str
+    kind: str  # table, column, qualifier, function, quote_column, string_quote, value
+    edits: List[Edit] = field(default_factory=list)
+
+
+def schema_from_detail(detail: Mapping) -> TableSchema:
+    """TableDetail (또는 같은 키의 dict) → TableSchema"""
+    columns = {c.strip() for c in str(detail["columns"]).split(",") if c.strip()}
+    column_detail = detail.get("column_detail")
+    if isinstance(column_detail, dict):
+        columns.update(column_detail)
+    period = str(detail.get("period") or "")
+    start, _, end = period.partition(" ~ ")
+    return TableSchema(
+        columns=columns,
+        period_column=detail.get("period_column", ""),
+        period_start=start.strip() if start.strip() not in ("", "None") else "",
+        period_end=end.strip() if end.strip() not in ("", "None") else "",
+    )
+
+
+# ============================================================
+# 문법 검사
+# ============================================================
+
+
+def check_syntax(sql: str) -> List[str]:
+    """
+    SQL 기본 문법 검사
+
+    Args:
+        sql: 생성된 SQL
+
+    Returns:
+        에러 메시지 리스트 (없으면 빈 리스트)
+    """
+    tokens = tokenize_sql(sql)
+    while tokens and tokens[-1] == ("other", ";"):
+        tokens.pop()
+
+    if not tokens:
+        return ["SQL이 비어 있습니다."]
+
+    errors = []
+    if tokens[0][1] not in ("select", "with"):
+        errors.append(
+            f"조회 쿼리(SELECT/WITH)만 실행할 수 있습니다 (시작: {tokens[0][1].upper()})."
+        )
+    if ("other", ";") in tokens:
+        errors.append("SQL 문장은 1개만 작성하세요 (중간에 ; 가 있습니다).")
+    if ("other", "'") in tokens:
+        errors.append("닫히지 않은 작은따옴표(')가 있습니다.")
+    if ("other", '"') in tokens:
+        errors.append('닫히지 않은 큰따옴표(")가 있습니다.')
+
+    depth = 0
+    for _, value in tokens:
+        if value == "(":
+            depth += 1
+        elif value == ")":
+            depth -= 1
+            if depth < 0:
+                break
+    if depth > 0:
+        errors.append(f"닫히지 않은 괄호가 {depth}개 있습니다.")
+    elif depth < 0:
+        errors.append("여는 괄호 없이 닫는 괄호 ')'가 있습니다.")
+
+    last = tokens[-1][1]
+    if tokens[-1][0] in ("word", "other") and last in _DANGLING_TOKENS:
+        errors.append(f"SQL이 '{last.upper()}' 뒤에서 끝났습니다 (절이 완성되지 않음).")
+
+    for prev, cur in zip(tokens, tokens[1:]):
+        if prev == ("other", ",") and cur[1] in ("from", "where", ")", ","):
+            errors.append(f"'{cur[1].upper()}' 앞에 불필요한 쉼표가 있습니다.")
+            break
+        if prev[1] in ("select", "(") and cur == ("other", ","):
+            errors.append("쉼표 앞에 컬럼이 없습니다.")
+            break
+
+    return errors[:MAX_ERRORS]
+
+
+# ============================================================
+# 스키마 / 값 검사
+# ============================================================
+
+
+def _is_identifier(token: Token) -> bool:
+    kind, value = token
+    if kind == "quoted":
+        return True
+    return kind == "word" and value.lower() not in SQL_KEYWORDS
+
+
+def _collect_names(tokens: List[Token]) -> Tuple[Set[str], Set[str]]:
+    """
+    쿼리 안에서 정의된 이름 수집
+
+    Returns:
+        (CTE 이름, 별칭/CTE 컬럼 이름) - 모두 소문자
+    """
+    ctes: Set[str] = set()
+    aliases: Set[str] = set()
+    n = len(tokens)
+
+    for i, token in enumerate(tokens):
+        lower = token[1].lower()
+        nxt = tokens[i + 1] if i + 1 < n else None
+
+        if lower == "as" and token[0] == "word" and nxt:
+            if nxt[0] in ("word", "quoted") and (
+                i + 2 >= n or tokens[i + 2][1] != "("
+            ):
+                aliases.add(identifier_name(nxt).lower())
+            elif nxt == ("other", "(") or nxt[1].lower() in ("materialized", "not"):
+                # name AS ( / name(col, ...) AS (
+                j = i - 1
+                if j >= 0 and tokens[j] == ("other", ")"):
+                    k = j
+                    while k >= 0 and tokens[k] != ("other", "("):
+                        if _is_identifier(tokens[k]):
+                            aliases.add(identifier_name(tokens[k]).lower())
+                        k -= 1
+                    j = k - 1
+                if j >= 0 and _is_identifier(tokens[j]):
+                    ctes.add(identifier_name(tokens[j]).lower())
+            continue
+
+        # 암시적 별칭: "SUM(값) total", "FROM (SELECT ...) t", "값 인구수"
+        if _is_identifier(token) and i > 0:
+            prev = tokens[i - 1]
+            prev_lower = prev[1].lower()
+            if (
+                prev == ("other", ")")
+                or prev[0] in ("string", "number", "quoted")
+                or (prev[0] == "word" and prev_lower == "end")
+                or (prev[0] == "word" and prev_lower not in SQL_KEYWORDS)
+            ) and not (nxt and nxt[1] in ("(", ".")):
+                aliases.add(identifier_name(token).lower())
+
+    return ctes, aliases
+
+
+def _suggest(name: str, candidates: Collection[str]) -> str:
+    matches = get_close_matches(name, list(candidates), n=3, cutoff=0.5)
+    return f" (비슷한 이름: {', '.join(matches)})" if matches else ""
+
+
+def _edit_size(a: str, b: str) -> int:
+    """두 문자열을 같게 만드는 데 더하고 빼야 하는 글자 수"""
+    blocks = SequenceMatcher(None, a, b).get_matching_blocks()
+    return len(a) + len(b) - 2 * sum(block.size for block in blocks)
+
+
+def unique_match(name: str, candidates: Collection[str]) -> Optional[str]:
+    """
+    자동 수정용 후보 (오타가 분명할 때만)
+
+    가장 가까운 후보가 1~2글자 차이이고 (짧은 이름은 1글자), 같은 거리의 후보가
+    없을 때만 반환
+    """
+    limit = 1 if len(name) < AUTO_FIX_LONG_NAME else 2
+    sizes = sorted((_edit_size(name, c), c) for c in candidates if c != name)
+    if not sizes or sizes[0][0] > limit:
+        return None
+    if len(sizes) > 1 and sizes[1][0] == sizes[0][0]:
+        return None
+    return sizes[0][1]
+
+
+def _is_subsequence(short: str, long: str) -> bool:
+    chars = iter(long)
+    return all(char in chars for char in short)
+
+
+def closest_value(literal: str, candidates: Collection[str]) -> Optional[str]:
+    """
+    없는 범주 값 → 실제 값 (하나로 정해질 때만)
+
+    오타('총인구스' → '총인구수'), 줄임말('서울' → '서울특별시', '충남' → '충청남도')
+    순서로 찾고, 후보가 여러 개면 None
+
+    Args:
+        literal: 쿼리의 값
+        candidates: 실제 값 집합
+
+    Returns:
+        고칠 값 또는 None
+    """
+    fixed = unique_match(literal, candidates)
+    if fixed or len(literal) < 2:
+        return fixed
+
+    prefixed = [c for c in candidates if c.startswith(literal)]
+    if len(prefixed) == 1:
+        return prefixed[0]
+    if prefixed:
+        return None
+
+    # 첫 글자가 같고 글자 순서가 유지되는 줄임말
+    abbreviated = [
+        c
+        for c in candidates
+        if c[:1] == literal[:1]
+        and len(c) > len(literal)
+        and _is_subsequence(literal, c)
+    ]
+    return abbreviated[0] if len(abbreviated) == 1 else None
+
+
+def _identifier_sql(name: str) -> str:
+    """식별자 → SQL 표기 (특수문자가 있으면 큰따옴표)"""
+    if re.fullmatch(r"\w+", name):
+        return name
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _string_sql(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _literals_after(tokens: List[SpanToken], i: int) -> Tuple[str, List[SpanToken]]:
+    """
+    tokens[i]가 컬럼일 때 뒤따르는 비교 연산자와 문자열 리터럴 토큰
+
+    Returns:
+        (연산자, 리터럴 토큰 리스트) - 비교가 아니면 ("", [])
+    """
+    n = len(tokens)
+    j = i + 1
+    if j < n and tokens[j][1].lower() == "not":
+        j += 1
+    if j >= n:
+        return "", []
+    operator = tokens[j][1].lower()
+
+    if operator in ("=", "==", "<", ">", "<=", ">="):
+        if j + 1 < n and tokens[j + 1][0] == "string":
+            return operator, [tokens[j + 1]]
+        return operator, []
+
+    if operator == "in" and j + 1 < n and tokens[j + 1][1] == "(":
+        literals = []
+        k = j + 2
+        while k < n and tokens[k][0] == "string":
+            literals.append(tokens[k])
+            if k + 1 < n and tokens[k + 1][1] == ",":
+                k += 2
+            else:
+                k += 1
+                break
+        if k < n and tokens[k][1] == ")":
+            return operator, literals
+        return operator, []
+
+    if operator == "between" and j + 3 < n:
+        low, conj, high = tokens[j + 1], tokens[j + 2], tokens[j + 3]
+        if low[0] == "string" and conj[1].lower() == "and" and high[0] == "string":
+            return operator, [low, high]
+
+    return "", []
+
+
+def _literal_value(token: SpanToken) -> str:
+    return token[1][1:-1].replace("''", "'")
+
+
+def _period_shape(value: str) -> str:
+    """'2024-01' → '9999-99' (형식 비교용)"""
+    return re.sub(r"\d", "9", value)
+
+
+def _is_period_prefix(value: str, shape: str) -> bool:
+    """'2023'이 '9999-99'의 앞부분(구분자 경계)인지 (년월 >= '2023' 같은 범위 비교용)"""
+    value_shape = _period_shape(value)
+    return (
+        0 < len(value_shape) < len(shape)
+        and shape.startswith(value_shape)
+        and not shape[len(value_shape)].isdigit()
+    )
+
+
+def normalize_period(value: str, example: str) -> Optional[str]:
+    """
+    시간 값을 예시와 같은 형식으로 변환 ('2024-1', '202401', '2024년 1월' → '2024-01')
+
+    Args:
+        value: 쿼리의 시간 값
+        example: 테이블의 기간 시작 값 (형식 기준)
+
+    Returns:
+        변환된 값 (변환할 수 없으면 None)
+    """
+    widths = [len(part) for part in re.findall(r"\d+", example)]
+    separators = re.findall(r"\D+", example)
+    parts = re.findall(r"\d+", value)
+    if len(parts) == 1 and len(parts[0]) == sum(widths):
+        digits, parts = parts[0], []
+        for width in widths:
+            parts.append(digits[:width])
+            digits = digits[width:]
+    if len(parts) != len(widths) or any(len(p) > w for p, w in zip(parts, widths)):
+        return None
+
+    result = parts[0].zfill(widths[0])
+    for separator, part, width in zip(separators, parts[1:], widths[1:]):
+        result += separator + part.zfill(width)
+    return result if _period_shape(result) == _period_shape(example) else None
+
+
+def normalize_age(value: str) -> Optional[str]:
+    """연령대 표기 → 숫자만 ('20-24세' → '20-24', '85세 이상' → '85+')"""
+    match = re.match(r"^(\d+)\s*[-~]\s*(\d+)\s*세?$", value)
+    if match:
+        return f"{match.group(1)}-{match.group(2)}"
+    match = re.match(r"^(\d+)\s*세\s*이상$", value)
+    if match:
+        return f"{match.group(1)}+"
+    return None
+
+
+def _check_literals(
+    column: str,
+    operator: str,
+    literals: List[SpanToken],
+    tables: List[Tuple[str, TableSchema]],
+    value_lookup: Optional[ValueLookup],
+) -> Optional[SchemaIssue]:
+    """
+    컬럼 비교 리터럴 검사 (후보 테이블 중 하나라도 맞으면 통과)
+
+    Args:
+        column: 컬럼명
+        operator: 비교 연산자
+        literals: 문자열 리터럴 토큰
+        tables: 이 컬럼을 가진 (테이블명, 스키마) 후보
+        value_lookup: (테이블, 컬럼) → 허용 값 (없으면 None)
+
+    Returns:
+        SchemaIssue 또는 None
+    """
+    if not literals or not tables:
+        return None
+    values = [_literal_value(token) for token in literals]
+
+    # 연령대 표기
+    if column == AGE_COLUMN and operator in _MEMBERSHIP_OPERATORS:
+        for token, literal in zip(literals, values):
+            if _AGE_WITH_UNIT.match(literal):
+                fixed = normalize_age(literal)
+                return SchemaIssue(
+                    f"연령대 값 '{literal}': 숫자만 사용하세요 "
+                    f"(예: '20-24', '100+').",
+                    "value",
+                    [(token[2], token[3], _string_sql(fixed))] if fixed else [],
+                )
+            if _AGE_DECADE.match(literal) and not any(
+                name.endswith(_AGE_DECADE_SUFFIX) for name, _ in tables
+            ):
+                return SchemaIssue(
+                    f"연령대 값 '{literal}': 원본 테이블에는 없는 값입니다. "
+                    "5세 단위 구간을 IN으로 나열하거나 (예: '20대' → "
+                    "IN ('20-24', '25-29')) _age_decade 롤업 테이블을 사용하세요.",
+                    "value",
+                )
+
+    # 시간 컬럼 형식 / 기간
+    period_tables = [
+        (name, schema)
+        for name, schema in tables
+        if schema.period_column == column and schema.period_start
+    ]
+    if period_tables and operator in _MEMBERSHIP_OPERATORS | _RANGE_OPERATORS:
+        issues = []
+        for name, schema in period_tables:
+            example = schema.period_start
+            shape = _period_shape(example)
+            # 범위 비교는 앞부분만 써도 문자열 비교로 맞게 동작 (년월 >= '2023')
+            bad = [
+                (token, value)
+                for token, value in zip(literals, values)
+                if _period_shape(value) != shape
+                and not (
+                    operator in _RANGE_OPERATORS and _is_period_prefix(value, shape)
+                )
+            ]
+            if bad:
+                edits = []
+                for token, value in bad:
+                    fixed = normalize_period(value, example)
+                    if fixed is None:
+                        edits = []
+                        break
+                    edits.append((token[2], token[3], _string_sql(fixed)))
+                issues.append(
+                    SchemaIssue(
+                        f"{column} 값 '{bad[0][1]}': {name}의 {column} 형식은 "
+                        f"'{example}' 형태입니다.",
+                        "value",
+                        edits,
+                    )
+                )
+                continue
+            if operator in _MEMBERSHIP_OPERATORS and schema.period_end:
+                outside = [v for v in values if not example <= v <= schema.period_end]
+                if len(outside) == len(values):
+                    issues.append(
+                        SchemaIssue(
+                            f"{column} 값 '{outside[0]}': {name}의 데이터 기간은 "
+                            f"{example} ~ {schema.period_end}입니다.",
+                            "value",
+                        )
+                    )
+                    continue
+            return None
+        return issues[0]
+
+    # 범주 값 사전
+    if value_lookup and operator in _MEMBERSHIP_OPERATORS:
+        known_sets = []
+        for name, _ in tables:
+            known = value_lookup(name, column)
+            if known is None:
+                return None  # 사전이 없는 테이블이 있으면 판단 안 함
+            known_sets.append(known)
+        for token, literal in zip(literals, values):
+            if not any(literal in known for known in known_sets):
+                candidates = set().union(*known_sets)
+                fixed = closest_value(literal, candidates)
+                hint = f" (실제 값: '{fixed}')" if fixed else _suggest(literal, candidates)
+                return SchemaIssue(
+                    f"{column} 값 '{literal}': 데이터에 없는 값입니다{hint}.",
+                    "value",
+                    [(token[2], token[3], _string_sql(fixed))] if fixed else [],
+                )
+
+    return None
+
+
+def find_schema_issues(
+    sql: str,
+    schema: Mapping[str, TableSchema],
+    value_lookup: Optional[ValueLookup] = None,
+) -> List[SchemaIssue]:
+    """
+    테이블/컬럼/함수/값 검사 (자동 수정 가능한 문제는 편집 정보 포함)
+
+    Args:
+        sql: 생성된 SQL
+        schema: {테이블명: TableSchema} (전체 카탈로그)
+        value_lookup: (테이블, 컬럼) → 허용 값 집합 (범주 값 사전, 선택)
+
+    Returns:
+        SchemaIssue 리스트 (최대 MAX_ERRORS개)
+    """
+    tokens = tokenize_sql_spans(sql, lower=False)
+    plain = [(kind, value) for kind, value, _, _ in tokens]
+    ctes, defined = _collect_names(plain)
+    lower_schema = {name.lower(): name for name in schema}
+
+    issues: List[SchemaIssue] = []
+
+    def add(issue: SchemaIssue):
+        if all(issue.message != other.message for other in issues):
+            issues.append(issue)
+
+    # 1. 테이블 (별칭 → 실제 테이블)
+    alias_tables: Dict[str, Optional[str]] = {}  # {별칭(소문자): 실제 테이블명}
+    unknown_tables: Set[str] = set()
+    for alias, table in table_aliases(sql).items():
+        real = None if table.lower() in ctes else lower_schema.get(table.lower())
+        if real is None and table.lower() not in ctes:
+            unknown_tables.add(table.lower())
+        alias_tables[alias.lower()] = real
+
+    referenced = sorted({t for t in alias_tables.values() if t})
+    known_columns: Dict[str, str] = {}
+    for table in referenced:
+        known_columns.update(schema[table].lower_columns)
+
+    def tables_with(
+        column: str, qualifier: Optional[str]
+    ) -> List[Tuple[str, TableSchema]]:
+        if qualifier is not None:
+            table = alias_tables.get(qualifier.lower())
+            return [(table, schema[table])] if table else []
+        return [(t, schema[t]) for t in referenced if schema[t].has_column(column)]
+
+    def replace_edit(index: int, replacement: Optional[str]) -> List[Edit]:
+        if replacement is None:
+            return []
+        return [(tokens[index][2], tokens[index][3], _identifier_sql(replacement))]
+
+    # 2. 식별자
+    n = len(tokens)
+    skip_until = 0
+    for i, token in enumerate(plain):
+        if i < skip_until or not _is_identifier(token):
+            continue
+
+        name = identifier_name(token)
+        lower = name.lower()
+        prev = plain[i - 1] if i > 0 else ("", "")
+        nxt = plain[i + 1] if i + 1 < n else ("", "")
+        prev_lower = prev[1].lower()
+
+        if lower in unknown_tables and (prev_lower in ("from", "join", ",")):
+            add(
+                SchemaIssue(
+                    f"존재하지 않는 테이블: {name}" + _suggest(name, schema),
+                    "table",
+                    replace_edit(i, unique_match(name, schema)),
+                )
+            )
+            continue
+        if prev_lower in ("from", "join") or prev_lower == "as":
+            continue
+
+        # 함수 호출 / 괄호가 든 컬럼명
+        if token[0] == "word" and nxt == ("other", "("):
+            if lower in SQL_FUNCTIONS or lower in ctes:
+                continue
+            quoted = [c for c in known_columns.values() if c.startswith(f"{name}(")]
+            if quoted:
+                # 괄호 안(컬럼명 일부)까지 한 덩어리로 교체
+                skip_until = i + 1
+                while skip_until < n and plain[skip_until] != ("other", ")"):
+                    skip_until += 1
+                edits = []
+                if skip_until < n:
+                    raw = sql[tokens[i][2] : tokens[skip_until][3]]
+                    if re.sub(r"\s+", "", raw) == quoted[0]:
+                        edits = [
+                            (tokens[i][2], tokens[skip_until][3], f'"{quoted[0]}"')
+                        ]
+                skip_until += 1
+                add(
+                    SchemaIssue(
+                        f'괄호가 있는 컬럼명은 큰따옴표로 감싸세요: "{quoted[0]}"',
+                        "quote_column",
+                        edits,
+                    )
+                )
+            elif lower in FUNCTION_HINTS:
+                add(
+                    SchemaIssue(
+                        f"SQLite에 없는 함수: {name.upper()}() "
+                        f"→ {FUNCTION_HINTS[lower]} 사용",
+                        "function",
+                    )
+                )
+            # 그 밖의 모르는 함수는 통과 (SQLite 버전/확장마다 달라 실행 에러로 판단)
+            continue
+
+        # 테이블.컬럼
+        qualifier = None
+        column, column_index = name, i
+        if nxt == ("other", "."):
+            qualifier = lower
+            if qualifier not in alias_tables and qualifier not in ctes:
+                if qualifier not in defined:
+                    add(SchemaIssue(f"알 수 없는 테이블/별칭: {name}", "qualifier"))
+                skip_until = i + 2
+                continue
+            if i + 2 < n and plain[i + 2][0] in ("word", "quoted"):
+                column, column_index = identifier_name(plain[i + 2]), i + 2
+                table = alias_tables.get(qualifier)
+                if table and not schema[table].has_column(column):
+                    add(
+                        SchemaIssue(
+                            f"없는 컬럼: {table}.{column}"
+                            + _suggest(column, schema[table].columns),
+                            "column",
+                            replace_edit(
+                                i + 2, unique_match(column, schema[table].columns)
+                            ),
+                        )
+                    )
+                    skip_until = i + 3
+                    continue
+            skip_until = i + 2
+        elif prev == ("other", "."):
+            continue
+        elif lower in defined or lower in ctes or lower in alias_tables:
+            continue
+        elif lower in lower_schema:
+            continue  # FROM a x, b y 의 b
+        elif lower not in known_columns:
+            if token[1].startswith('"'):
+                add(
+                    SchemaIssue(
+                        f"{token[1]}: 문자열 값은 작은따옴표로 감싸세요 ('{name}').",
+                        "string_quote",
+                        [(tokens[i][2], tokens[i][3], _string_sql(name))],
+                    )
+                )
+            elif referenced:
+                add(
+                    SchemaIssue(
+                        f"없는 컬럼: {name} (테이블: {', '.join(referenced)})"
+                        + _suggest(name, known_columns.values()),
+                        "column",
+                        replace_edit(i, unique_match(name, known_columns.values())),
+                    )
+                )
+            continue
+
+        # 3. 값
+        operator, literals = _literals_after(tokens, column_index)
+        issue = _check_literals(
+            known_columns.get(column.lower(), column),
+            operator,
+            literals,
+            tables_with(column, qualifier),
+            value_lookup,
+        )
+        if issue:
+            add(issue)
+
+        if len(issues) >= MAX_ERRORS:
+            break
+
+    return issues[:MAX_ERRORS]
+
+
+def check_schema(
+    sql: str,
+    schema: Mapping[str, TableSchema],
+    value_lookup: Optional[ValueLookup] = None,
+) -> List[str]:
+    """
+    테이블/컬럼/함수/값 검사
+
+    Args:
+        sql: 생성된 SQL
+        schema: {테이블명: TableSchema} (전체 카탈로그)
+        value_lookup: (테이블, 컬럼) → 허용 값 집합 (범주 값 사전, 선택)
+
+    Returns:
+        에러 메시지 리스트 (없으면 빈 리스트)
+    """
+    return [issue.message for issue in find_schema_issues(sql, schema, value_lookup)]
+
+
+# ============================================================
+# 카탈로그 스키마 (메타데이터 스냅샷 기준)
+# ============================================================
+
+# 스냅샷별 스키마 캐싱용 (메타데이터 버전, {테이블명: TableSchema})
+_CATALOG_SCHEMA = None
+
+
+def get_catalog_schema() -> Dict[str, TableSchema]:
+    """
+    전체 테이블 스키마 (메타데이터 버전이 바뀔 때만 다시 생성)
+
+    Returns:
+        {테이블명: TableSchema}
+    """
+    global _CATALOG_SCHEMA
+    from database.metadata_manager import get_metadata_manager
+
+    snapshot = get_metadata_manager().snapshot
+    cached = _CATALOG_SCHEMA
+    if cached is None or cached[0] != snapshot.version:
+        schema = {
+            name: schema_from_detail(detail)
+            for name, detail in snapshot.details.items()
+        }
+        cached = (snapshot.version, schema)
+        _CATALOG_SCHEMA = cached
+    return cached[1]
+
+
+def schema_for_tables(
+    tables_info: Optional[List[Mapping]] = None,
+    periods: Optional[Mapping[str, Tuple[str, str]]] = None,
+) -> Dict[str, TableSchema]:
+    """
+    카탈로그 스키마 + 검색된 테이블 정보 (검색 시점의 상세 정보 우선)
+
+    Args:
+        tables_info: 검색된 테이블 정보 리스트
+        periods: {테이블명: (시작, 끝)} 실제 데이터 기간 (범주 값 사전, 있으면 우선)
+
+    Returns:
+        {테이블명: TableSchema}
+    """
+    schema = dict(get_catalog_schema())
+    for table in tables_info or []:
+        schema[table["table_name"]] = schema_from_detail(table)
+    for name, (start, end) in (periods or {}).items():
+        if name in schema and schema[name].period_column:
+            schema[name] = replace(schema[name], period_start=start, period_end=end)
+    return schema
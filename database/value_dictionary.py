@@ -0,0 +1,449 @@
+"""
+database/value_dictionary.py
+
+테이블별 범주 값 사전 (항목, 행정구역, 연령대 등의 실제 값 + 실제 기간)
+- 테이블당 1회 스캔: SELECT 범주 컬럼들, MIN(시간), MAX(시간) ... GROUP BY 범주 컬럼들
+- 메타데이터 스냅샷이나 적재 버전(mark_data_loaded)이 바뀌면 백그라운드에서 다시 구축
+  (메타데이터 행 체크섬과 적재 버전이 같은 테이블은 재사용)
+- 적재 버전이 바뀐 뒤 다시 스캔하기 전까지 이전 값/기간은 검사에 쓰지 않음
+- 결과는 JSON 파일에 저장 (재시작 시 다시 스캔하지 않음)
+
+사용처: SQL 값 검증/자동 수정 (없는 값 → 비슷한 값), SQL 생성 프롬프트의 값 목록
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+import streamlit as st
+
+from database.index_advisor import quote_identifier
+
+# 범주가 아닌 컬럼 (값 / 시간 / 롤업 집계 컬럼)
+NON_CATEGORICAL_COLUMNS = {"값", "년월", "년도", "평균값", "연말값", "기준월", "월수"}
+
+
+@dataclass(frozen=True)
+class TableValues:
+    """테이블 1개의 범주 값 사전 (불변)"""
+
+    table_name: str
+    checksum: str  # 구축 당시 tables_metadata 행 체크섬
+    values: Mapping[str, FrozenSet[str]]  # {컬럼: 값 집합} (값이 너무 많은 컬럼 제외)
+    period_min: str = ""
+    period_max: str = ""
+    complete: bool = True  # 조합이 너무 많아 잘렸으면 False (검증에 사용 안 함)
+    data_version: str = ""  # 구축 당시 적재 버전 (바뀌면 다시 스캔)
+
+    def to_json(self) -> Dict:
+        return {
+            "checksum": self.checksum,
+            "data_version": self.data_version,
+            "values": {c: sorted(v) for c, v in self.values.items()},
+            "period_min": self.period_min,
+            "period_max": self.period_max,
+            "complete": self.complete,
+        }
+
+    @classmethod
+    def from_json(cls, table_name: str, data: Mapping) -> "TableValues":
+        return cls(
+            table_name=table_name,
+            checksum=data["checksum"],
+            values={c: frozenset(v) for c, v in data["values"].items()},
+            period_min=data.get("period_min", ""),
+            period_max=data.get("period_max", ""),
+            complete=data.get("complete", True),
+            data_version=data.get("data_version", ""),
+        )
+
+
+def categorical_columns(detail: Mapping) -> List[str]:
+    """
+    범주 값 사전을 만들 컬럼 (값/시간/집계 컬럼 제외)
+
+    Args:
+        detail: TableDetail (또는 같은 키의 dict)
+
+    Returns:
+        컬럼명 리스트 (메타데이터 순서)
+    """
+    columns = [c.strip() for c in str(detail["columns"]).split(",") if c.strip()]
+    excluded = NON_CATEGORICAL_COLUMNS | {detail.get("period_column", "")}
+    return [c for c in columns if c not in excluded]
+
+
+def scan_sql(table_name: str, columns: Sequence[str], period_column: str) -> str:
+    """
+    범주 값 + 기간을 한 번에 읽는 스캔 SQL
+
+    범주 컬럼 조합별로 묶으므로 테이블을 1번만 읽는다.
+    """
+    period = quote_identifier(period_column)
+    select = [quote_identifier(c) for c in columns]
+    sql = f"SELECT {', '.join(select + [f'MIN({period})', f'MAX({period})'])} "
+    sql += f"FROM {quote_identifier(table_name)}"
+    if columns:
+        sql += f" GROUP BY {', '.join(select)}"
+    return sql
+
+
+def build_table_values(
+    run: Callable[[str, int], Sequence[Tuple]],
+    detail: Mapping,
+    checksum: str,
+    max_values: int,
+    max_combinations: int,
+    data_version: str = "",
+) -> TableValues:
+    """
+    테이블 1개 스캔 → TableValues
+
+    Args:
+        run: (SQL, 최대 행 수) → 결과 행 (QueryResult)
+        detail: TableDetail
+        checksum: tables_metadata 행 체크섬
+        max_values: 컬럼별 최대 값 개수 (넘으면 범주로 보지 않음)
+        max_combinations: 최대 조합(결과 행) 수 (넘으면 불완전 처리)
+        data_version: 스캔 시점의 적재 버전
+
+    Returns:
+        TableValues
+    """
+    table_name = detail["table_name"]
+    columns = categorical_columns(detail)
+    period_column = detail.get("period_column") or "년월"
+    rows = run(scan_sql(table_name, columns, period_column), max_combinations)
+
+    collected: Dict[str, set] = {c: set() for c in columns}
+    periods = []
+    for row in rows:
+        for column, value in zip(columns, row):
+            if isinstance(value, str):
+                collected[column].add(value)
+        periods.extend(str(p) for p in row[len(columns) :] if p is not None)
+
+    values = {
+        column: frozenset(found)
+        for column, found in collected.items()
+        if found and len(found) <= max_values
+    }
+    return TableValues(
+        table_name=table_name,
+        checksum=checksum,
+        values=MappingProxyType(values),
+        period_min=min(periods) if periods else "",
+        period_max=max(periods) if periods else "",
+        complete=not getattr(rows, "truncated", False),
+        data_version=data_version,
+    )
+
+
+class ValueDictionary:
+    """
+    전체 테이블 범주 값 사전
+
+    읽기는 잠금 없이 현재 사전(불변 매핑) 참조만 읽고, 구축은 백그라운드 스레드 1개가
+    새 매핑을 만들어 통째로 교체한다. 구축 전/구축 중에 없는 테이블은 None (검사 생략).
+    """
+
+    def __init__(
+        self,
+        run: Callable[[str, int], Sequence[Tuple]],
+        path: Optional[str] = None,
+        max_values: int = 300,
+        max_combinations: int = 100000,
+        prompt_values: int = 30,
+        data_version_fn: Optional[Callable[[], str]] = None,
+    ):
+        """
+        Args:
+            run: (SQL, 최대 행 수) → 결과 행 (비용 검사 없이 실행)
+            path: 저장 파일 경로 (None이면 저장 안 함)
+            max_values: 컬럼별 최대 값 개수
+            max_combinations: 테이블별 최대 조합 수
+            prompt_values: 프롬프트에 넣을 컬럼별 최대 값 개수
+            data_version_fn: 현재 적재 버전 (바뀌면 전체 다시 스캔, 없으면 "")
+        """
+        self.run = run
+        self.path = Path(path) if path else None
+        self.max_values = max_values
+        self.max_combinations = max_combinations
+        self.prompt_values = prompt_values
+        self.data_version_fn = data_version_fn
+
+        self._tables: Mapping[str, TableValues] = MappingProxyType(
+            self._load_file()
+        )
+        self._prompt_hints: Dict[Tuple[str, str], str] = {}  # (테이블, 적재 버전)
+        self._hints_lock = threading.Lock()  # _tables / _prompt_hints 교체와 힌트 저장
+        self._metadata_version: Optional[int] = None
+        self._data_version = ""  # 마지막으로 확인한 적재 버전
+        self._built_data_version: Optional[str] = None
+        self._build_lock = threading.Lock()
+        self._build_thread: Optional[threading.Thread] = None
+
+        self.builds = 0
+        self.tables_scanned = 0
+        self.last_build_seconds: Optional[float] = None
+        self.last_build_error: Optional[str] = None
+
+    # ------------------------------------------------------------
+    # 구축
+    # ------------------------------------------------------------
+
+    def _load_file(self) -> Dict[str, TableValues]:
+        """저장된 사전 읽기 (없거나 깨졌으면 빈 사전)"""
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            return {
+                name: TableValues.from_json(name, entry)
+                for name, entry in data.items()
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️  범주 값 사전 파일 무시 (다시 구축): {e}")
+            return {}
+
+    def _save_file(self, tables: Mapping[str, TableValues]):
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {name: values.to_json() for name, values in tables.items()}
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(
+                json.dumps(payload, ensure_ascii=False), encoding="utf-8"
+            )
+            tmp_path.replace(self.path)
+        except OSError as e:
+            print(f"⚠️  범주 값 사전 저장 실패: {e}")
+
+    def build(self, snapshot, data_version: Optional[str] = None) -> int:
+        """
+        메타데이터 스냅샷 기준으로 사전 구축 (체크섬/적재 버전이 바뀐 테이블만 스캔)
+
+        Args:
+            snapshot: MetadataSnapshot
+            data_version: 적재 버전 (None이면 data_version_fn으로 조회)
+
+        Returns:
+            int: 새로 스캔한 테이블 수
+        """
+        from database.metadata_manager import metadata_checksum
+
+        if data_version is None:
+            data_version = self.data_version_fn() if self.data_version_fn else ""
+
+        with self._build_lock:
+            started = time.perf_counter()
+            current = self._tables
+            tables: Dict[str, TableValues] = {}
+            scanned = 0
+
+            for table_name, detail in snapshot.details.items():
+                checksum = metadata_checksum({table_name: snapshot.rows[table_name]})
+                cached = current.get(table_name)
+                if (
+                    cached is not None
+                    and cached.checksum == checksum
+                    and cached.data_version == data_version
+                ):
+                    tables[table_name] = cached
+                    continue
+                try:
+                    tables[table_name] = build_table_values(
+                        self.run,
+                        detail,
+                        checksum,
+                        self.max_values,
+                        self.max_combinations,
+                        data_version,
+                    )
+                    scanned += 1
+                except Exception as e:
+                    print(f"⚠️  범주 값 스캔 실패, 검사에서 제외: {table_name} ({e})")
+
+            with self._hints_lock:
+                self._tables = MappingProxyType(tables)
+                self._prompt_hints = {}
+            self._metadata_version = snapshot.version
+            self._built_data_version = data_version
+            self.builds += 1
+            self.tables_scanned += scanned
+            self.last_build_seconds = time.perf_counter() - started
+
+            if scanned or len(tables) != len(current):
+                self._save_file(tables)
+            print(
+                f"📚 범주 값 사전: {len(tables)}개 테이블 (스캔 {scanned}개, "
+                f"{self.last_build_seconds:.1f}초, 메타데이터 v{snapshot.version}, "
+                f"적재 버전 {data_version or '-'})"
+            )
+            return scanned
+
+    def refresh_async(self, snapshot, data_version: str = ""):
+        """백그라운드 구축 시작 (이미 구축 중이면 무시)"""
+        if self._build_thread is not None and self._build_thread.is_alive():
+            return
+
+        def _build():
+            try:
+                self.build(snapshot, data_version)
+                self.last_build_error = None
+            except Exception as e:
+                self.last_build_error = str(e)
+                print(f"⚠️  범주 값 사전 구축 실패 (기존 사전 유지): {e}")
+
+        # 같은 버전으로 중복 시작 방지
+        self._metadata_version = snapshot.version
+        self._built_data_version = data_version
+        self._build_thread = threading.Thread(
+            target=_build, name="value-dictionary", daemon=True
+        )
+        self._build_thread.start()
+
+    def ensure_current(self):
+        """
+        메타데이터/적재 버전이 바뀌었으면 백그라운드 재구축 (요청 경로에서는 비교만)
+
+        적재 버전은 data_version_fn이 주기적으로만 조회하므로 매 요청 DB 왕복은 없음
+        """
+        from database.metadata_manager import get_metadata_manager
+
+        snapshot = get_metadata_manager().snapshot
+        data_version = self.data_version_fn() if self.data_version_fn else ""
+        self._data_version = data_version
+        if (
+            snapshot.version != self._metadata_version
+            or data_version != self._built_data_version
+        ):
+            self.refresh_async(snapshot, data_version)
+
+    def _current(self, values: Optional[TableValues]) -> Optional[TableValues]:
+        """이전 적재 버전으로 만든 사전은 None (다시 스캔하기 전까지 검사 생략)"""
+        if values is None or values.data_version != self._data_version:
+            return None
+        return values
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+
+    def get(self, table_name: str) -> Optional[TableValues]:
+        """테이블 사전 (없거나 적재 버전이 지난 사전이면 None)"""
+        self.ensure_current()
+        return self._current(self._tables.get(table_name))
+
+    def lookup(self, table_name: str, column: str) -> Optional[FrozenSet[str]]:
+        """
+        (테이블, 컬럼) → 실제 값 집합 (sql_validator의 value_lookup)
+
+        Returns:
+            값 집합 (사전이 없거나, 불완전하거나, 범주 컬럼이 아니면 None)
+        """
+        values = self.get(table_name)
+        if values is None or not values.complete:
+            return None
+        return values.values.get(column)
+
+    def periods(self) -> Dict[str, Tuple[str, str]]:
+        """
+        {테이블명: (실제 시작, 실제 끝)} (검증 기간 보정용)
+
+        스캔이 잘린 테이블, 적재 버전이 지난 테이블은 제외 (메타데이터 기간 사용)
+        """
+        self.ensure_current()
+        return {
+            name: (values.period_min, values.period_max)
+            for name, values in self._tables.items()
+            if self._current(values) is not None
+            and values.complete
+            and values.period_min
+            and values.period_max
+        }
+
+    def prompt_hint(self, table_name: str) -> str:
+        """
+        SQL 생성 프롬프트용 값 목록 (컬럼별 최대 prompt_values개)
+
+        Returns:
+            "실제 값: 항목=[...]; 연령대=[...]" (사전이 없으면 빈 문자열,
+            스캔이 잘린 테이블은 "실제 값 일부 ..."로 표시하고 기간은 생략)
+        """
+        self.ensure_current()
+        key = (table_name, self._data_version)
+        with self._hints_lock:
+            tables, hints = self._tables, self._prompt_hints
+            hint = hints.get(key)
+        if hint is not None:
+            return hint
+
+        values = self._current(tables.get(table_name))
+        hint = ""
+        if values is not None and values.values:
+            parts = []
+            for column, found in values.values.items():
+                shown = sorted(found)[: self.prompt_values]
+                rest = len(found) - len(shown)
+                listed = ", ".join(f"'{v}'" for v in shown)
+                if rest > 0:
+                    listed += f" 외 {rest}개"
+                parts.append(f"{column}=[{listed}]")
+            if not values.complete:
+                hint = "실제 값 일부 (조합이 많아 전체 목록 아님): " + "; ".join(parts)
+            else:
+                hint = "실제 값: " + "; ".join(parts)
+            if values.complete and values.period_min:
+                hint += f"\n실제 기간: {values.period_min} ~ {values.period_max}"
+        with self._hints_lock:
+            if self._tables is tables:  # 그 사이 재구축됐으면 저장 안 함
+                hints[key] = hint
+        return hint
+
+    def stats(self) -> Dict:
+        """사전 지표"""
+        tables = self._tables
+        return {
+            "tables": len(tables),
+            "columns": sum(len(v.values) for v in tables.values()),
+            "incomplete_tables": sum(1 for v in tables.values() if not v.complete),
+            "metadata_version": self._metadata_version,
+            "data_version": self._built_data_version,
+            "builds": self.builds,
+            "tables_scanned": self.tables_scanned,
+            "last_build_seconds": (
+                round(self.last_build_seconds, 2)
+                if self.last_build_seconds is not None
+                else None
+            ),
+            "last_build_error": self.last_build_error,
+        }
+
+
+@st.cache_resource
+def get_value_dictionary() -> ValueDictionary:
+    """
+    ValueDictionary 싱글톤 (최초 호출 시 백그라운드 구축 시작)
+
+    Returns:
+        ValueDictionary 인스턴스
+    """
+    from config.settings import settings
+    from database.connection import db_manager
+
+    dictionary = ValueDictionary(
+        run=db_manager.execute_internal,
+        path=settings.VALUE_DICT_PATH or None,
+        max_values=settings.VALUE_DICT_MAX_VALUES,
+        max_combinations=settings.VALUE_DICT_MAX_COMBINATIONS,
+        prompt_values=settings.VALUE_DICT_PROMPT_VALUES,
+        data_version_fn=db_manager.load_version,
+    )
+    dictionary.ensure_current()
+    return dictionary
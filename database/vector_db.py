@@ -2,18 +2,28 @@
 임베딩 데이터베이스 설정 및 검색
 """
 
+import asyncio
 import sys
 import re
+import json
+import hashlib
 import streamlit as st
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, FrozenSet, Optional, Tuple
 
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from langchain_upstage import UpstageEmbeddings
 from langchain_chroma import Chroma
 from config.settings import settings
+from database.embedding_cache import CachedQueryEmbeddings
+from database.embeddings import create_embeddings, get_embedding_namespace
+from database.vector_index import NumpyVectorIndex
+from database.keyword_matcher import KeywordAutomaton
+from database.embedding_build import BatchEmbeddingBuilder
+from database.lexical_index import BM25Index, is_confident, reciprocal_rank_fusion
 
 
 # ============================================================
@@ -115,7 +125,102 @@ CATEGORY_KEYWORDS = {
     "도소매·서비스": ["소매", "도매", "서비스", "판매", "매출"],
 }
 
-# 카테고리별 테이블 맵 캐싱용
+# 메타 질문 키워드 (카테고리 분류 불필요)
+META_KEYWORDS = [
+    "무슨 데이터",
+    "어떤 데이터",
+    "데이터 종류",
+    "테이블 목록",
+    "뭐 있어",
+    "뭐가 있어",
+    "통계 종류",
+    "어떤 통계",
+]
+
+# "N대"가 연령대가 아닌 순위/규모 표현일 때 함께 나오는 키워드
+RANK_KEYWORDS = [
+    "순위",
+    "위",
+    "많은",
+    "큰",
+    "도시",
+    "기업",
+    "회사",
+    "국가",
+    "강국",
+    "업체",
+    "상위",
+    "하위",
+]
+
+# Rule 태그별 키워드 (get_required_tables_by_rule에서 사용)
+RULE_KEYWORDS = {
+    "meta": META_KEYWORDS,
+    "rank": RANK_KEYWORDS,
+    "labor": ["취업", "실업", "고용", "경제활동"],
+    "labor_age": [
+        "연령",
+        "세대",
+        "나이",
+        "20대",
+        "30대",
+        "40대",
+        "50대",
+        "60대",
+        "2030",
+        "청년",
+        "중년",
+        "장년",
+        "고령",
+    ],
+    "ratio": ["비중", "비율", "%", "퍼센트", "점유율"],
+    "ratio_age": ["연령", "나이", "고령", "청년", "노인"],
+    "ratio_labor": ["취업", "실업", "고용"],
+    "compare": ["대비"],
+    "population": ["인구"],
+    "employment": ["취업", "고용"],
+    "household": ["세대", "가구"],
+    "housing": ["주택", "아파트", "주거"],
+    "density": ["밀도"],
+}
+
+# 연령 숫자 패턴: "N세" 또는 "N대"
+AGE_NUMBER_PATTERN = re.compile(r"(\d+)(세|대)")
+
+CATEGORY_LABEL_PREFIX = "category:"
+
+
+def _build_keyword_automaton() -> KeywordAutomaton:
+    """카테고리 키워드 + Rule 키워드로 오토마톤 컴파일"""
+    keyword_labels: Dict[str, set] = {}
+
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        for keyword in keywords:
+            keyword_labels.setdefault(keyword, set()).add(
+                CATEGORY_LABEL_PREFIX + category
+            )
+
+    for tag, keywords in RULE_KEYWORDS.items():
+        for keyword in keywords:
+            keyword_labels.setdefault(keyword, set()).add(tag)
+
+    return KeywordAutomaton(keyword_labels)
+
+
+KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
+@dataclass(frozen=True)
+class QueryMatches:
+    """질문 1회 스캔 결과 (카테고리 감지와 Rule 판단이 공유)"""
+
+    keywords: FrozenSet[str]  # 매칭된 키워드
+    category_scores: Dict[str, int]  # {카테고리: 매칭 키워드 수}
+    tags: FrozenSet[str]  # Rule 태그 (labor, ratio, housing, ...)
+    age_related: bool  # 연령 숫자 패턴 감지 여부
+
+
+# 카테고리별 테이블 맵 캐싱용 (메타데이터 버전, 맵)
 CATEGORY_TABLE_MAP = None
 
 
@@ -129,18 +234,27 @@ def get_passage_embeddings():
     문서 임베딩용 (벡터 DB 구축 시 사용)
 
     Returns:
-        UpstageEmbeddings: passage 임베딩 모델
+        Embeddings: passage 임베딩 모델 (EMBEDDING_PROVIDER 설정에 따름)
     """
-    return UpstageEmbeddings(
-        api_key=settings.UPSTAGE_API_KEY, model="embedding-passage"
-    )
+    return create_embeddings("passage")
 
 
 @st.cache_resource
 def get_query_embeddings():
-    """질문 임베딩용 (검색 시 사용) - 캐싱"""
-    print("📌 Query 임베딩 모델 로드 완료")
-    return UpstageEmbeddings(api_key=settings.UPSTAGE_API_KEY, model="embedding-query")
+    """
+    질문 임베딩용 (검색 시 사용) - 캐싱
+
+    같은 질문은 임베딩 API를 다시 호출하지 않도록
+    CachedQueryEmbeddings(메모리 LRU + 디스크)로 감싸서 반환
+    """
+    embeddings = create_embeddings("query")
+    print(f"📌 Query 임베딩 모델 로드 완료: {get_embedding_namespace('query')}")
+    return CachedQueryEmbeddings(
+        embeddings,
+        namespace=get_embedding_namespace("query"),
+        max_size=settings.EMBEDDING_CACHE_SIZE,
+        db_path=settings.EMBEDDING_CACHE_PATH or None,
+    )
 
 
 @st.cache_resource
@@ -148,40 +262,56 @@ def get_vectorstore():
     """벡터스토어 로드 (캐싱)"""
     embeddings = get_query_embeddings()
     print("📌 벡터스토어 로드 완료")
-    return Chroma(persist_directory="./embedding_db", embedding_function=embeddings)
+    return Chroma(
+        persist_directory=settings.VECTOR_DB_DIR, embedding_function=embeddings
+    )
 
 
-def setup_embedding_db(db_path: str = None, force_recreate: bool = False):
-    """
-    DB에서 메타데이터 읽어서 벡터 DB 생성
+@st.cache_resource(max_entries=1)
+def _build_numpy_index(
+    metadata_version: int, collection_count: int
+) -> NumpyVectorIndex:
+    """메타데이터 버전 + 컬렉션 문서 수별 NumPy 벡터 인덱스 (바뀌면 새로 적재)"""
+    index = NumpyVectorIndex.from_chroma(get_vectorstore())
+    print(
+        f"📌 NumPy 벡터 인덱스 로드 완료: {len(index)}개 테이블 "
+        f"(메타데이터 v{metadata_version})"
+    )
+    return index
 
-    Args:
-        db_path: DB 파일 경로
-        force_recreate: True면 기존 DB 삭제 후 재생성
 
-    Returns:
-        Chroma vectorstore
+def get_numpy_index() -> NumpyVectorIndex:
+    """
+    NumPy 벡터 인덱스 로드 (VECTOR_BACKEND=numpy일 때 사용)
+
+    메타데이터 갱신이나 벡터 DB 동기화(sync_embedding_db)로 버전/문서 수가
+    바뀌면 다음 검색에서 인덱스를 다시 적재한다.
     """
-    import shutil
     from database.metadata_manager import get_metadata_manager
 
-    persist_dir = "./embedding_db"
+    return _build_numpy_index(
+        get_metadata_manager().version, get_vectorstore()._collection.count()
+    )
 
-    if force_recreate and Path(persist_dir).exists():
-        print(f"⚠️  기존 벡터 DB 삭제 중: {persist_dir}")
-        shutil.rmtree(persist_dir)
-        print("✅ 삭제 완료")
 
-    # 메타데이터 매니저
-    manager = get_metadata_manager()
+DOC_HASHES_FILE = "doc_hashes.json"
 
-    # 짧은 문서 생성
+
+def _collect_table_documents(manager) -> Tuple[List[str], List[str], List[Dict]]:
+    """
+    임베딩 대상 문서 수집 (ID = 테이블명)
+
+    Returns:
+        (ids, documents, metadatas)
+    """
+    ids = []
     documents = []
     metadatas = []
 
     for table_name in manager.get_table_names():
         # 짧은 문서 (임베딩용)
         short_doc = manager.get_short_doc(table_name)
+        ids.append(table_name)
         documents.append(short_doc)
 
         # 메타데이터 (필터링용)
@@ -198,38 +328,265 @@ def setup_embedding_db(db_path: str = None, force_recreate: bool = False):
             }
         )
 
-    # Upstage 임베딩
-    embeddings = get_passage_embeddings()
+    return ids, documents, metadatas
+
+
+def _document_hash(document: str, metadata: Dict) -> str:
+    """문서 + 필터용 메타데이터 해시 (둘 중 하나라도 바뀌면 재임베딩)"""
+    payload = json.dumps(
+        {"document": document, "metadata": metadata},
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load_doc_hashes(persist_dir: str) -> Dict:
+    """벡터 DB 옆에 저장된 문서 해시 로드"""
+    path = Path(persist_dir) / DOC_HASHES_FILE
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  문서 해시 파일 손상, 전체 비교로 진행: {e}")
+        return {}
+
+
+def _save_doc_hashes(persist_dir: str, hashes: Dict[str, str]):
+    """문서 해시 저장"""
+    path = Path(persist_dir) / DOC_HASHES_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"namespace": get_embedding_namespace("passage"), "tables": hashes},
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+def _embed_and_upsert(
+    vectorstore,
+    embeddings,
+    ids: List[str],
+    documents: List[str],
+    metadatas: List[Dict],
+    batch_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+):
+    """배치 임베딩 후 Chroma 컬렉션에 upsert"""
+    if not ids:
+        return
+
+    # 배치 + 병렬 + 체크포인트
+    builder = BatchEmbeddingBuilder(
+        embeddings,
+        namespace=get_embedding_namespace("passage"),
+        batch_size=batch_size or settings.EMBEDDING_BATCH_SIZE,
+        max_workers=max_workers or settings.EMBEDDING_MAX_WORKERS,
+        max_retries=settings.EMBEDDING_MAX_RETRIES,
+        checkpoint_dir=settings.EMBEDDING_CHECKPOINT_DIR or None,
+    )
+    vectors = builder.build(ids, documents)
 
-    # Chroma 벡터스토어 생성
-    vectorstore = Chroma.from_texts(
-        texts=documents,
-        embedding=embeddings,
+    # 임베딩은 이미 계산됨 → 컬렉션에 바로 저장
+    vectorstore._collection.upsert(
+        ids=ids,
+        embeddings=[vectors[doc_id] for doc_id in ids],
         metadatas=metadatas,
-        persist_directory=persist_dir,
+        documents=documents,
+    )
+
+    # 저장까지 끝났으면 체크포인트 정리
+    builder.clear_checkpoints()
+
+
+@st.cache_resource(max_entries=1)
+def _build_lexical_index(metadata_version: int) -> BM25Index:
+    """메타데이터 버전별 BM25 역색인 (버전이 바뀌면 새로 구축)"""
+    from database.metadata_manager import get_metadata_manager
+
+    snapshot = get_metadata_manager().snapshot
+    index = BM25Index(snapshot.rows)
+    print(
+        f"📌 BM25 어휘 인덱스 로드 완료: {len(index)}개 테이블 "
+        f"(메타데이터 v{snapshot.version})"
+    )
+    return index
+
+
+def get_lexical_index() -> BM25Index:
+    """메타데이터 BM25 역색인 로드 (현재 메타데이터 버전 기준 캐싱)"""
+    from database.metadata_manager import get_metadata_manager
+
+    return _build_lexical_index(get_metadata_manager().version)
+
+
+def setup_embedding_db(
+    db_path: str = None,
+    force_recreate: bool = False,
+    batch_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+):
+    """
+    DB에서 메타데이터 읽어서 벡터 DB 생성
+
+    배치 단위로 병렬 임베딩하고 완료된 배치는 체크포인트에 저장하므로,
+    중간에 실패해도 다시 실행하면 남은 배치만 임베딩한다.
+
+    Args:
+        db_path: DB 파일 경로
+        force_recreate: True면 기존 DB 삭제 후 재생성
+        batch_size: 배치당 문서 수 (기본: settings.EMBEDDING_BATCH_SIZE)
+        max_workers: 동시 임베딩 요청 수 (기본: settings.EMBEDDING_MAX_WORKERS)
+
+    Returns:
+        Chroma vectorstore
+    """
+    import shutil
+    from database.metadata_manager import get_metadata_manager
+
+    persist_dir = settings.VECTOR_DB_DIR
+
+    if force_recreate and Path(persist_dir).exists():
+        print(f"⚠️  기존 벡터 DB 삭제 중: {persist_dir}")
+        shutil.rmtree(persist_dir)
+        print("✅ 삭제 완료")
+
+    # 메타데이터 매니저
+    manager = get_metadata_manager()
+
+    # 짧은 문서 생성
+    ids, documents, metadatas = _collect_table_documents(manager)
+
+    # 임베딩 → Chroma 저장
+    embeddings = get_passage_embeddings()
+    vectorstore = Chroma(persist_directory=persist_dir, embedding_function=embeddings)
+    _embed_and_upsert(
+        vectorstore,
+        embeddings,
+        ids,
+        documents,
+        metadatas,
+        batch_size=batch_size,
+        max_workers=max_workers,
+    )
+
+    # 증분 동기화 기준 해시 저장
+    _save_doc_hashes(
+        persist_dir,
+        {
+            doc_id: _document_hash(doc, meta)
+            for doc_id, doc, meta in zip(ids, documents, metadatas)
+        },
     )
 
     print(f"✅ 벡터 DB 생성: {len(documents)}개 테이블")
-    print(f"📄 임베딩 모델: embedding-passage")
+    print(f"📄 임베딩 모델: {get_embedding_namespace('passage')}")
     return vectorstore
 
 
+def sync_embedding_db(
+    batch_size: Optional[int] = None, max_workers: Optional[int] = None
+) -> Dict[str, List[str]]:
+    """
+    벡터 DB 증분 동기화
+
+    테이블별 짧은 문서 해시를 벡터 DB 옆에 저장된 해시와 비교해서
+    추가/변경된 테이블만 임베딩하고, 삭제된 테이블은 컬렉션에서 지운다.
+
+    Args:
+        batch_size: 배치당 문서 수 (기본: settings.EMBEDDING_BATCH_SIZE)
+        max_workers: 동시 임베딩 요청 수 (기본: settings.EMBEDDING_MAX_WORKERS)
+
+    Returns:
+        {"added": [...], "changed": [...], "removed": [...], "unchanged": [...]}
+    """
+    from database.metadata_manager import get_metadata_manager
+
+    persist_dir = settings.VECTOR_DB_DIR
+
+    manager = get_metadata_manager()
+    ids, documents, metadatas = _collect_table_documents(manager)
+    current_hashes = {
+        doc_id: _document_hash(doc, meta)
+        for doc_id, doc, meta in zip(ids, documents, metadatas)
+    }
+
+    # 임베딩 모델이 바뀌었으면 저장된 해시는 무효
+    stored = _load_doc_hashes(persist_dir)
+    stored_hashes = {}
+    if stored.get("namespace") == get_embedding_namespace("passage"):
+        stored_hashes = stored.get("tables", {})
+
+    embeddings = get_passage_embeddings()
+    vectorstore = Chroma(persist_directory=persist_dir, embedding_function=embeddings)
+    existing_ids = set(vectorstore._collection.get(include=[])["ids"])
+
+    added, changed, unchanged = [], [], []
+    for doc_id in ids:
+        if doc_id not in existing_ids:
+            added.append(doc_id)
+        elif stored_hashes.get(doc_id) != current_hashes[doc_id]:
+            changed.append(doc_id)
+        else:
+            unchanged.append(doc_id)
+
+    # 메타데이터에 없는 문서 삭제 (예전 UUID ID로 저장된 문서 포함)
+    removed = sorted(existing_ids - set(ids))
+    if removed:
+        vectorstore._collection.delete(ids=removed)
+
+    # 추가/변경된 테이블만 임베딩
+    targets = set(added) | set(changed)
+    positions = [i for i, doc_id in enumerate(ids) if doc_id in targets]
+    _embed_and_upsert(
+        vectorstore,
+        embeddings,
+        [ids[i] for i in positions],
+        [documents[i] for i in positions],
+        [metadatas[i] for i in positions],
+        batch_size=batch_size,
+        max_workers=max_workers,
+    )
+
+    _save_doc_hashes(persist_dir, current_hashes)
+
+    print(
+        f"✅ 벡터 DB 동기화: 추가 {len(added)}개, 변경 {len(changed)}개, "
+        f"삭제 {len(removed)}개, 유지 {len(unchanged)}개"
+    )
+    return {
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "unchanged": unchanged,
+    }
+
+
 # ============================================================
 # 카테고리 관련 함수
 # ============================================================
 
 
-def build_category_table_map() -> Dict[str, List[str]]:
+def build_category_table_map(all_meta: Optional[Dict] = None) -> Dict[str, List[str]]:
     """
     메타데이터에서 카테고리별 테이블 매핑 구축
 
+    Args:
+        all_meta: {테이블명: 메타데이터 행} (없으면 현재 스냅샷)
+
     Returns:
         {카테고리: [테이블명 리스트]}
     """
-    from database.metadata_manager import get_metadata_manager
+    if all_meta is None:
+        from database.metadata_manager import get_metadata_manager
 
-    manager = get_metadata_manager()
-    all_meta = manager._cache  # get_all_tables_metadata() 대신 직접 접근
+        manager = get_metadata_manager()
+        all_meta = manager._cache  # get_all_tables_metadata() 대신 직접 접근
 
     category_map = {}
     for table_name, meta in all_meta.items():
@@ -243,99 +600,117 @@ def build_category_table_map() -> Dict[str, List[str]]:
 
 
 def get_category_table_map() -> Dict[str, List[str]]:
-    """카테고리별 테이블 맵 반환 (캐싱)"""
+    """카테고리별 테이블 맵 반환 (메타데이터 버전이 바뀌면 다시 구축)"""
+    from database.metadata_manager import get_metadata_manager
+
     global CATEGORY_TABLE_MAP
-    if CATEGORY_TABLE_MAP is None:
-        CATEGORY_TABLE_MAP = build_category_table_map()
-    return CATEGORY_TABLE_MAP
+    snapshot = get_metadata_manager().snapshot
+    if CATEGORY_TABLE_MAP is None or CATEGORY_TABLE_MAP[0] != snapshot.version:
+        CATEGORY_TABLE_MAP = (snapshot.version, build_category_table_map(snapshot.rows))
+    return CATEGORY_TABLE_MAP[1]
 
 
-def detect_age_related(query: str) -> bool:
+def detect_age_related(query: str, matches: Optional[QueryMatches] = None) -> bool:
     """
     연령 관련 질문인지 패턴으로 감지
 
     Args:
         query: 사용자 질문
+        matches: match_query 결과 (없으면 새로 매칭)
 
     Returns:
         bool: 연령 관련 질문이면 True
     """
+    if matches is None:
+        matches = match_query(query)
+    return matches.age_related
 
-    # 패턴 1: "N세" (0세~150세)
-    if re.search(r"\d+세", query):
-        return True
 
-    # 패턴 2: "N대" (10대, 20대, ...) - 연령대만 해당
-    age_decade_pattern = re.search(r"(\d+)대", query)
-    if age_decade_pattern:
-        number = int(age_decade_pattern.group(1))
+def _detect_age_pattern(query: str, rank_matched: bool) -> bool:
+    """
+    연령 숫자 패턴 감지 (정규식 1회 스캔)
 
-        # 10, 20, 30, ..., 90만 연령대 가능성
-        if number >= 10 and number % 10 == 0 and number <= 90:
+    - "N세", "N~N세", "N세 이상/이하/미만/초과" → 연령
+    - "N대" (10, 20, ..., 90) → 순위 관련 키워드가 없을 때만 연령대
+    """
+    first_decade = None
+
+    for match in AGE_NUMBER_PATTERN.finditer(query):
+        # 패턴 1, 3, 4: "N세" 포함
+        if match.group(2) == "세":
+            return True
+        if first_decade is None:
+            first_decade = int(match.group(1))
+
+    # 패턴 2: 첫 번째 "N대"만 확인 - 10, 20, ..., 90만 연령대 가능성
+    if first_decade is not None:
+        if 10 <= first_decade <= 90 and first_decade % 10 == 0:
             # 문맥 확인: 순위 관련 키워드가 있으면 제외
-            rank_keywords = [
-                "순위",
-                "위",
-                "많은",
-                "큰",
-                "도시",
-                "기업",
-                "회사",
-                "국가",
-                "강국",
-                "업체",
-                "상위",
-                "하위",
-            ]
-            if not any(kw in query for kw in rank_keywords):
+            if not rank_matched:
                 return True
 
-    # 패턴 3: "N~N세" (0~14세)
-    if re.search(r"\d+~\d+세", query):
-        return True
+    return False
 
-    # 패턴 4: "N세 이상/이하/미만/초과"
-    if re.search(r"\d+세\s*(이상|이하|미만|초과)", query):
-        return True
 
-    return False
+@lru_cache(maxsize=1024)
+def match_query(query: str) -> QueryMatches:
+    """
+    질문 키워드 매칭 (오토마톤 1회 스캔 + 연령 정규식 1회)
 
+    detect_category, get_required_tables_by_rule, detect_age_related가
+    이 결과 하나를 공유한다.
 
-def detect_category(query: str) -> Optional[str]:
+    Args:
+        query: 사용자 질문
+
+    Returns:
+        QueryMatches: 매칭 키워드, 카테고리 점수, Rule 태그, 연령 여부
+    """
+    keywords = frozenset(KEYWORD_AUTOMATON.find(query))
+
+    category_scores: Dict[str, int] = {}
+    tags = set()
+    for keyword in keywords:
+        for label in KEYWORD_AUTOMATON.labels(keyword):
+            if label.startswith(CATEGORY_LABEL_PREFIX):
+                category = label[len(CATEGORY_LABEL_PREFIX) :]
+                category_scores[category] = category_scores.get(category, 0) + 1
+            else:
+                tags.add(label)
+
+    return QueryMatches(
+        keywords=keywords,
+        category_scores=category_scores,
+        tags=frozenset(tags),
+        age_related=_detect_age_pattern(query, "rank" in tags),
+    )
+
+
+def detect_category(
+    query: str, matches: Optional[QueryMatches] = None
+) -> Optional[str]:
     """
     질문에서 카테고리 감지 (예외 처리 포함)
 
     Args:
         query: 사용자 질문
+        matches: match_query 결과 (없으면 새로 매칭)
 
     Returns:
         str: 카테고리명, 'multiple' (복합), 'meta' (메타질문), None (범위외)
     """
+    if matches is None:
+        matches = match_query(query)
 
     # 0. 메타 질문 감지 (카테고리 분류 불필요)
-    meta_keywords = [
-        "무슨 데이터",
-        "어떤 데이터",
-        "데이터 종류",
-        "테이블 목록",
-        "뭐 있어",
-        "뭐가 있어",
-        "통계 종류",
-        "어떤 통계",
-    ]
-    if any(kw in query for kw in meta_keywords):
+    if "meta" in matches.tags:
         return "meta"
 
-    # 1. 각 카테고리별 매칭 점수 계산
-    category_scores = {}
-
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        score = sum(1 for kw in keywords if kw in query)
-        if score > 0:
-            category_scores[category] = score
+    # 1. 각 카테고리별 매칭 점수
+    category_scores = dict(matches.category_scores)
 
     # 1-1. 인구 카테고리 보정: 연령 패턴 감지
-    if detect_age_related(query):
+    if matches.age_related:
         category_scores["인구"] = category_scores.get("인구", 0) + 2  # 가중치 부여
         print(f"  🔍 연령 패턴 감지 → 인구 카테고리 가중치 +2")
 
@@ -409,51 +784,39 @@ def _validate_category_match(
 # ============================================================
 
 
-def get_required_tables_by_rule(query: str) -> List[str]:
+def get_required_tables_by_rule(
+    query: str, matches: Optional[QueryMatches] = None
+) -> List[str]:
     """
     Rule 기반 필수 테이블 판단 (복합 카테고리 고려)
 
     Args:
         query: 사용자 질문
+        matches: match_query 결과 (없으면 새로 매칭)
 
     Returns:
         list: 필수 테이블명 리스트
     """
+    if matches is None:
+        matches = match_query(query)
+
+    tags = matches.tags
     required = []
 
     # Rule 0: 노동 + 연령 (단일 테이블로 해결 가능)
-    if any(kw in query for kw in ["취업", "실업", "고용", "경제활동"]):
-        if any(
-            age in query
-            for age in [
-                "연령",
-                "세대",
-                "나이",
-                "20대",
-                "30대",
-                "40대",
-                "50대",
-                "60대",
-                "2030",
-                "청년",
-                "중년",
-                "장년",
-                "고령",
-            ]
-        ) or detect_age_related(query):
+    if "labor" in tags:
+        if "labor_age" in tags or matches.age_related:
             return ["labor_economic_activity_age_stats"]
 
     # Rule 1: "비중", "비율" → 분자 + 분모 (복합)
-    if any(keyword in query for keyword in ["비중", "비율", "%", "퍼센트", "점유율"]):
+    if "ratio" in tags:
         # 인구 비중 질문
-        if any(
-            age_word in query for age_word in ["연령", "나이", "고령", "청년", "노인"]
-        ) or detect_age_related(query):
+        if "ratio_age" in tags or matches.age_related:
             required.extend(
                 ["population_age_stats", "population_gender_stats"]  # 분자  # 분모
             )
         # 취업자 비중 질문
-        elif any(labor_word in query for labor_word in ["취업", "실업", "고용"]):
+        elif "ratio_labor" in tags:
             required.extend(
                 [
                     "labor_economic_activity_age_stats",  # 취업자수
@@ -462,9 +825,9 @@ def get_required_tables_by_rule(query: str) -> List[str]:
             )
 
     # Rule 2: "대비" → 비교 대상 (복합)
-    if "대비" in query:
+    if "compare" in tags:
         # "인구 대비 취업자"
-        if "인구" in query and any(kw in query for kw in ["취업", "고용"]):
+        if "population" in tags and "employment" in tags:
             required.extend(
                 [
                     "population_gender_stats",  # 인구
@@ -473,17 +836,17 @@ def get_required_tables_by_rule(query: str) -> List[str]:
             )
 
     # Rule 3: "세대" 명시 (단일)
-    if "세대" in query or "가구" in query:
+    if "household" in tags:
         # 노동 관련이 아닐 때만
-        if not any(kw in query for kw in ["취업", "실업", "고용", "경제활동"]):
+        if "labor" not in tags:
             required.append("population_stats")
 
     # Rule 4: "주택" 명시 (단일)
-    if "주택" in query or "아파트" in query or "주거" in query:
+    if "housing" in tags:
         required.append("housing_type_sido_stats")
 
     # Rule 5: "밀도" → 인구 + 면적 (복합, 현재 면적 데이터 없으면 스킵)
-    if "밀도" in query:
+    if "density" in tags:
         required.append("population_gender_stats")
         # TODO: 면적 데이터 테이블 추가 시 여기 추가
 
@@ -530,42 +893,106 @@ def merge_unique_tables(
     return final_tables
 
 
-def search_tables_hierarchical(
-    query: str, n_results: int = 5, category_filter: Optional[str] = None
+def prefer_rollup_tables(
+    query: str, tables: List[Dict], matches: Optional[QueryMatches] = None
 ) -> List[Dict]:
     """
-    계층적 검색: 짧은 문서 검색 → 상세 정보 로드
+    질문에 맞는 롤업 테이블이 있으면 원본 대신 사용
+
+    "20대", "60대 이상" → <테이블>_age_decade, "연도별/연평균" → <테이블>_yearly,
+    "전국" → <테이블>_national (scripts/build_rollups.py로 생성된 경우만)
 
     Args:
         query: 사용자 질문
-        n_results: 반환할 테이블 수
-        category_filter: 카테고리 필터 (예: "인구")
+        tables: 검색 결과 테이블 리스트 (순위 순)
+        matches: match_query 결과 (없으면 새로 스캔)
 
     Returns:
-        상세 정보가 포함된 테이블 리스트
+        롤업 테이블로 교체된 리스트 (순서 유지, 중복 제거)
     """
     from database.metadata_manager import get_metadata_manager
+    from database.rollups import preferred_rollup_names
 
+    matches = matches or match_query(query)
     manager = get_metadata_manager()
 
-    vectorstore = get_vectorstore()
+    results = []
+    seen = set()
+    for table in tables:
+        chosen = table
+        for name in preferred_rollup_names(
+            query, table["table_name"], age_related=matches.age_related
+        ):
+            detailed = manager.get_detailed_info(name)
+            if detailed:
+                chosen = detailed.with_distance(table.get("distance"))
+                print(f"  ✓ 롤업 테이블 사용: {table['table_name']} → {name}")
+                break
+        if chosen["table_name"] not in seen:
+            seen.add(chosen["table_name"])
+            results.append(chosen)
+
+    return results
 
-    # 벡터 검색
-    search_kwargs = {"k": n_results * 2}  # 여유있게
 
-    # 카테고리 필터 적용
-    if category_filter:
-        search_kwargs["filter"] = {"topic_main": category_filter}
+def _vector_search(
+    query: str, k: int, category_filter: Optional[str] = None
+) -> List[Tuple[str, float]]:
+    """
+    설정된 백엔드(VECTOR_BACKEND)로 벡터 검색
 
-    results = vectorstore.similarity_search_with_score(query, **search_kwargs)
+    Args:
+        query: 사용자 질문
+        k: 검색 개수
+        category_filter: 카테고리 필터 (topic_main)
+
+    Returns:
+        [(테이블명, 거리)] - 거리 오름차순
+    """
+    if settings.VECTOR_BACKEND == "numpy":
+        index = get_numpy_index()
+        query_vector = get_query_embeddings().embed_query(query)
+        results = index.search(query_vector, k=k, topic_main=category_filter)
+    else:
+        vectorstore = get_vectorstore()
+
+        search_kwargs = {"k": k}
+
+        # 카테고리 필터 적용
+        if category_filter:
+            search_kwargs["filter"] = {"topic_main": category_filter}
+
+        docs = vectorstore.similarity_search_with_score(query, **search_kwargs)
+        results = [
+            (doc.metadata.get("table_name"), distance) for doc, distance in docs
+        ]
+
+    return results
+
+
+def search_tables_hierarchical(
+    query: str, n_results: int = 5, category_filter: Optional[str] = None
+) -> List[Dict]:
+    """
+    계층적 검색: 짧은 문서 검색 → 상세 정보 로드
+
+    Args:
+        query: 사용자 질문
+        n_results: 반환할 테이블 수
+        category_filter: 카테고리 필터 (예: "인구")
+
+    Returns:
+        상세 정보가 포함된 테이블 리스트
+    """
+    # 벡터 검색 (여유있게)
+    results = _vector_search(query, n_results * 2, category_filter)
 
     # 임계값 필터링 (거리 2.0 이하만)
     filtered_tables = []
     distance_map = {}
 
-    for doc, distance in results:
+    for table_name, distance in results:
         if distance <= 2.0:
-            table_name = doc.metadata.get("table_name")
             if table_name:
                 filtered_tables.append(table_name)
                 distance_map[table_name] = distance
@@ -574,16 +1001,109 @@ def search_tables_hierarchical(
     top_tables = filtered_tables[:n_results]
 
     # 상세 정보 로드
+    return _load_table_details(top_tables, distance_map)
+
+
+def _load_table_details(
+    table_names: List[str], distance_map: Dict[str, float]
+) -> List[Dict]:
+    """
+    테이블 상세 정보 로드 (벡터 거리가 있으면 함께 기록)
+
+    Args:
+        table_names: 테이블명 리스트 (순위 순)
+        distance_map: {테이블명: 벡터 거리}
+
+    Returns:
+        상세 정보가 포함된 테이블 리스트
+    """
+    from database.metadata_manager import get_metadata_manager
+
+    manager = get_metadata_manager()
+
     detailed_tables = []
-    for table_name in top_tables:
+    for table_name in table_names:
         detailed = manager.get_detailed_info(table_name)
         if detailed:
-            detailed["distance"] = round(distance_map[table_name], 3)
-            detailed_tables.append(detailed)
+            # 상세 정보는 공유, 거리만 요청별로 덧붙임
+            distance = distance_map.get(table_name)
+            detailed_tables.append(
+                detailed.with_distance(
+                    round(distance, 3) if distance is not None else None
+                )
+            )
 
     return detailed_tables
 
 
+def _unique(names: List[str]) -> List[str]:
+    """순서를 유지한 중복 제거"""
+    return list(dict.fromkeys(names))
+
+
+def _lexical_search(
+    query: str, k: int, category_filter: Optional[str] = None
+) -> Tuple[List[Tuple[str, float]], bool]:
+    """
+    BM25 어휘 검색 (최소 점수 이상만)
+
+    Returns:
+        ([(테이블명, 점수)], 어휘 신호만으로 확실한지 여부)
+    """
+    lexical_results = [
+        (table_name, score)
+        for table_name, score in get_lexical_index().search(
+            query, k=k, topic_main=category_filter
+        )
+        if score >= settings.HYBRID_LEXICAL_MIN_SCORE
+    ]
+    confident = is_confident(
+        lexical_results, settings.HYBRID_SKIP_MIN_SCORE, settings.HYBRID_SKIP_RATIO
+    )
+    return lexical_results, confident
+
+
+def search_tables_hybrid(
+    query: str, n_results: int = 5, category_filter: Optional[str] = None
+) -> List[Dict]:
+    """
+    하이브리드 검색: BM25 어휘 검색 + 벡터 검색 → RRF 융합
+
+    어휘 검색 1위가 충분히 확실하면 임베딩 호출 없이 바로 반환
+
+    Args:
+        query: 사용자 질문
+        n_results: 반환할 테이블 수
+        category_filter: 카테고리 필터 (예: "인구")
+
+    Returns:
+        상세 정보가 포함된 테이블 리스트
+    """
+    # 1. BM25 어휘 검색 (인메모리, 임베딩 불필요)
+    lexical_results, confident = _lexical_search(query, n_results * 2, category_filter)
+    print(f"어휘 검색: {[(t, round(s, 2)) for t, s in lexical_results]}")
+
+    # 2. 어휘 신호만으로 확실하면 임베딩 생략
+    if confident:
+        print("  ⚡ 어휘 검색 확신 → 임베딩 호출 생략")
+        lexical_names = _unique([t for t, _ in lexical_results])
+        return _load_table_details(lexical_names[:n_results], {})
+
+    # 3. 벡터 검색 (임계값 거리 2.0 이하만)
+    distance_map = {}
+    for table_name, distance in _vector_search(query, n_results * 2, category_filter):
+        if table_name and distance <= 2.0:
+            distance_map.setdefault(table_name, distance)
+
+    # 4. RRF 융합
+    fused = reciprocal_rank_fusion(
+        [list(distance_map), _unique([t for t, _ in lexical_results])],
+        k=settings.HYBRID_RRF_K,
+    )
+
+    return _load_table_details([t for t, _ in fused[:n_results]], distance_map)
+
+
 def smart_search_tables(query: str, n_results: int = 5) -> List[Dict]:
     """
     스마트 검색: 예외 상황 고려
@@ -595,12 +1115,52 @@ def smart_search_tables(query: str, n_results: int = 5) -> List[Dict]:
     Returns:
         프롬프트에 넣을 상세 테이블 정보 리스트
     """
+    matches, category, n_results = _plan_search(query, n_results)
+    vector_results = _vector_candidates(query, n_results, category)
+    return _finish_search(query, vector_results, matches, category, n_results)
+
+
+async def asmart_search_tables(query: str, n_results: int = 5) -> List[Dict]:
+    """
+    smart_search_tables의 비동기 버전
+
+    질문 임베딩이 필요하면 먼저 비동기로 받아 캐시에 넣어두고,
+    이후 벡터 검색(캐시 hit, 로컬 인덱스 조회)은 스레드에서 실행한다.
+
+    Args:
+        query: 사용자 질문
+        n_results: 반환할 테이블 수
+
+    Returns:
+        프롬프트에 넣을 상세 테이블 정보 리스트
+    """
+    matches, category, n_results = _plan_search(query, n_results)
+    if _needs_query_embedding(query, n_results * 2, category):
+        await get_query_embeddings().aembed_query(query)
+    vector_results = await asyncio.to_thread(
+        _vector_candidates, query, n_results, category
+    )
+    return _finish_search(query, vector_results, matches, category, n_results)
+
+
+def _plan_search(
+    query: str, n_results: int
+) -> Tuple[QueryMatches, Optional[str], int]:
+    """
+    키워드 매칭 + 카테고리 감지 (검색 1단계)
+
+    Returns:
+        (키워드 매칭 결과, 카테고리 필터 - 없으면 None, 조정된 검색 수)
+    """
     print(f"\n{'='*60}")
     print(f"테이블 검색: {query}")
     print(f"{'='*60}")
 
+    # 0. 키워드 매칭 (1회 스캔, 이후 단계에서 공유)
+    matches = match_query(query)
+
     # 1. 카테고리 감지
-    category = detect_category(query)
+    category = detect_category(query, matches)
 
     # 예외 처리
     if category == "meta":
@@ -626,13 +1186,32 @@ def smart_search_tables(query: str, n_results: int = 5) -> List[Dict]:
     else:
         print("카테고리: 감지 안됨 (전체 검색)")
 
-    # 2. 벡터 검색
-    vector_results = search_tables_hierarchical(
+    return matches, category, n_results
+
+
+def _needs_query_embedding(
+    query: str, n_results: int, category_filter: Optional[str]
+) -> bool:
+    """벡터 검색 단계에서 질문 임베딩이 필요한지 (어휘 검색 확신이면 불필요)"""
+    if not settings.HYBRID_SEARCH_ENABLED:
+        return True
+    _, confident = _lexical_search(query, n_results * 2, category_filter)
+    return not confident
+
+
+def _vector_candidates(
+    query: str, n_results: int, category: Optional[str]
+) -> List[Dict]:
+    """벡터 검색 (하이브리드 설정 시 BM25 + 벡터 융합, 검색 2단계)"""
+    search_fn = (
+        search_tables_hybrid
+        if settings.HYBRID_SEARCH_ENABLED
+        else search_tables_hierarchical
+    )
+    vector_results = search_fn(
         query,
         n_results=n_results * 2,  # 여유있게 검색 (필터링 대비)
-        category_filter=(
-            category if category not in ["meta", "multiple", None] else None
-        ),
+        category_filter=category,
     )
 
     print(f"벡터 검색: {len(vector_results)}개")
@@ -640,8 +1219,19 @@ def smart_search_tables(query: str, n_results: int = 5) -> List[Dict]:
         distance = table.get("distance", "N/A")
         print(f"  - {table['table_name']} (거리: {distance})")
 
+    return vector_results
+
+
+def _finish_search(
+    query: str,
+    vector_results: List[Dict],
+    matches: QueryMatches,
+    category: Optional[str],
+    n_results: int,
+) -> List[Dict]:
+    """Rule 기반 필수 테이블 병합 → 롤업 우선 → 카테고리 검증 (검색 3단계)"""
     # 3. Rule 기반 필수 테이블
-    required_tables = get_required_tables_by_rule(query)
+    required_tables = get_required_tables_by_rule(query, matches)
 
     if required_tables:
         print(f"Rule 감지: {required_tables}")
@@ -649,8 +1239,11 @@ def smart_search_tables(query: str, n_results: int = 5) -> List[Dict]:
     # 4. 병합
     final_results = merge_unique_tables(vector_results, required_tables)
 
+    # 4-1. 미리 집계된 롤업 테이블 우선
+    final_results = prefer_rollup_tables(query, final_results, matches)
+
     # 5. 카테고리 일치도 검증 (단일 카테고리일 때만)
-    if category and category not in ["meta", "multiple"]:
+    if category:
         final_results = _validate_category_match(
             final_results, category, strict=False  # 복합 질문 가능성 고려
         )
@@ -688,7 +1281,7 @@ def search_tables_from_db(
     embeddings = get_query_embeddings()
 
     vectorstore = Chroma(
-        persist_directory="./embedding_db", embedding_function=embeddings
+        persist_directory=settings.VECTOR_DB_DIR, embedding_function=embeddings
     )
 
     results = vectorstore.similarity_search_with_score(query, k=n_results)
@@ -0,0 +1,149 @@
+"""
+database/vector_index.py
+
+인메모리 NumPy 벡터 인덱스 (Chroma 대체 검색 백엔드)
+- 전체 테이블 임베딩을 하나의 연속 float32 행렬로 적재
+- 검색 = 행렬-벡터 곱 1회 + top-k
+- topic_main 필터는 미리 계산한 boolean mask로 처리
+- Chroma와 같은 (table_name, distance) 결과 형식
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class NumpyVectorIndex:
+    """테이블 임베딩 행렬 기반 벡터 인덱스"""
+
+    def __init__(
+        self,
+        table_names: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+        topics: Sequence[Optional[str]],
+        space: str = "l2",
+    ):
+        """
+        Args:
+            table_names: 행 순서대로의 테이블명
+            vectors: 테이블별 임베딩 (n, dim)
+            topics: 테이블별 topic_main
+            space: 거리 방식 ("l2", "cosine", "ip") - Chroma 컬렉션 설정과 동일하게
+        """
+        if space not in ("l2", "cosine", "ip"):
+            raise ValueError(f"지원하지 않는 거리 방식: {space}")
+
+        self.space = space
+        self.table_names = list(table_names)
+        self.matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+
+        if self.matrix.ndim != 2 or len(self.matrix) != len(self.table_names):
+            raise ValueError("임베딩 행렬 크기가 테이블 수와 맞지 않습니다.")
+
+        if space == "cosine":
+            norms = np.linalg.norm(self.matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self.matrix = np.ascontiguousarray(self.matrix / norms)
+
+        # ||x||^2 (l2 거리 계산용)
+        self._sq_norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+
+        # topic_main별 boolean mask
+        self._topic_masks: Dict[str, np.ndarray] = {}
+        topic_array = np.array([t or "" for t in topics], dtype=object)
+        for topic in set(topic_array.tolist()):
+            if topic:
+                self._topic_masks[topic] = topic_array == topic
+
+    @classmethod
+    def from_chroma(cls, vectorstore) -> "NumpyVectorIndex":
+        """
+        Chroma 컬렉션에 저장된 임베딩으로 인덱스 생성
+
+        Args:
+            vectorstore: langchain_chroma.Chroma 인스턴스
+
+        Returns:
+            NumpyVectorIndex
+        """
+        data = vectorstore.get(include=["embeddings", "metadatas"])
+        metadatas = data.get("metadatas") or []
+        embeddings = data.get("embeddings")
+        if embeddings is None:
+            embeddings = []
+
+        collection_meta = getattr(vectorstore._collection, "metadata", None) or {}
+        space = collection_meta.get("hnsw:space", "l2")
+
+        table_names = []
+        topics = []
+        vectors = []
+        for meta, vector in zip(metadatas, embeddings):
+            meta = meta or {}
+            if not meta.get("table_name"):
+                continue
+            table_names.append(meta["table_name"])
+            topics.append(meta.get("topic_main"))
+            vectors.append(vector)
+
+        if not vectors:
+            raise ValueError(
+                "벡터 DB에 임베딩이 없습니다. setup_vector_db.py를 먼저 실행하세요."
+            )
+
+        return cls(table_names, vectors, topics, space=space)
+
+    def __len__(self) -> int:
+        return len(self.table_names)
+
+    def search(
+        self, query_vector: Sequence[float], k: int, topic_main: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        top-k 검색
+
+        Args:
+            query_vector: 질문 임베딩
+            k: 반환 개수
+            topic_main: 카테고리 필터 (없으면 전체)
+
+        Returns:
+            [(테이블명, 거리)] - 거리 오름차순
+        """
+        query = np.asarray(query_vector, dtype=np.float32)
+        if self.space == "cosine":
+            norm = np.linalg.norm(query)
+            if norm > 0:
+                query = query / norm
+
+        scores = self.matrix @ query
+
+        if self.space == "l2":
+            distances = self._sq_norms - 2.0 * scores + float(query @ query)
+            distances = np.maximum(distances, 0.0)
+        else:
+            # cosine / ip: Chroma와 동일하게 1 - 내적
+            distances = 1.0 - scores
+
+        if topic_main:
+            mask = self._topic_masks.get(topic_main)
+            if mask is None:
+                return []
+            candidates = np.flatnonzero(mask)
+        else:
+            candidates = np.arange(len(distances))
+
+        if len(candidates) == 0 or k <= 0:
+            return []
+
+        candidate_distances = distances[candidates]
+        if k < len(candidates):
+            top = np.argpartition(candidate_distances, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(candidate_distances[top], kind="stable")]
+
+        return [
+            (self.table_names[candidates[i]], float(candidate_distances[i]))
+            for i in top
+        ]
@@ -13,23 +13,34 @@ from frontend.utils.session import (
     get_thread_id,
 )
 from frontend.utils.format import (
-    format_sql_result,
     extract_sql_from_response,
-    extract_column_names,
+    query_result_to_dataframe,
 )
-from agents.graph import create_stats_chatbot_graph
+from agents.graph import create_stats_chatbot_graph, stream_graph
 from agents.nodes.content import format_answer_by_style
-from database.vector_db import get_vectorstore, get_query_embeddings
+from database.vector_db import (
+    get_vectorstore,
+    get_query_embeddings,
+    get_numpy_index,
+)
+from database.connection import db_manager
 from database.metadata_manager import get_metadata_manager
+from database.value_dictionary import get_value_dictionary
+from config.settings import settings
 from frontend.utils.format import style_dataframe_with_highlight
 
 
 @st.cache_resource
 def initialize_graph():
     """그래프 초기화 (캐싱)"""
+    db_manager.warm_up()
     manager = get_metadata_manager()
+    if settings.VALUE_DICT_ENABLED:
+        get_value_dictionary()
     embeddings = get_query_embeddings()
     vectorstore = get_vectorstore()
+    if settings.VECTOR_BACKEND == "numpy":
+        get_numpy_index()
     graph = create_stats_chatbot_graph()
     return graph
 
@@ -62,15 +73,11 @@ def render_chat():
             if metadata.get("query_result"):
                 display_data = metadata.get("chart_data") or metadata["query_result"]
 
-                # DataFrame 변환 (extended_sql 기준으로 컬럼명 추출)
-                if isinstance(display_data, list) and display_data:
-                    sql_query = metadata.get("extended_sql") or metadata.get(
-                        "sql_query", ""
-                    )
-                    col_names = extract_column_names(sql_query, len(display_data[0]))
-                    df = pd.DataFrame(display_data, columns=col_names)
-                else:
-                    df = format_sql_result(display_data)
+                # DataFrame 변환 (QueryResult는 커서 컬럼명 그대로 사용)
+                sql_query = metadata.get("extended_sql") or metadata.get(
+                    "sql_query", ""
+                )
+                df = query_result_to_dataframe(display_data, sql_query)
 
                 if isinstance(df, pd.DataFrame) and not df.empty:
                     with st.expander("데이터 테이블"):
@@ -94,14 +101,9 @@ def render_chat():
                 chart_spec = metadata["chart_spec"]
                 target_value = metadata.get("target_value")
 
-                if isinstance(query_result, list) and query_result:
-                    col_names = extract_column_names(sql_query, len(query_result[0]))
-
-                    df = pd.DataFrame(query_result, columns=col_names)
+                if query_result is not None and len(query_result):
+                    df = query_result_to_dataframe(query_result, sql_query)
                     df.columns = [str(col) for col in df.columns]
-
-                elif isinstance(query_result, pd.DataFrame):
-                    df = query_result
                 else:
                     df = None
 
@@ -222,125 +224,118 @@ def handle_user_input(prompt: str, graph):
         st.markdown(prompt)
 
     with st.chat_message("assistant"):
-        with st.spinner("답변 생성 중..."):
-            try:
-                messages = get_messages()
-                conversation_history = "\n".join(
-                    [f"{msg['role']}: {msg['content']}" for msg in messages[-4:]]
-                )
+        # 스피너 대신 단계별 진행 상황 + 응답 토큰 스트리밍
+        status = st.status("답변 생성 중...", expanded=False)
+        placeholder = st.empty()
+        try:
+            messages = get_messages()
+            conversation_history = "\n".join(
+                [f"{msg['role']}: {msg['content']}" for msg in messages[-4:]]
+            )
 
-                state = {
-                    "user_query": prompt,
-                    "conversation_history": conversation_history,
-                }
+            state = {
+                "user_query": prompt,
+                "conversation_history": conversation_history,
+            }
+
+            config = {"configurable": {"thread_id": get_thread_id()}}
+
+            final_state = {}
+            streamed = ""
+            for kind, payload in stream_graph(graph, state, config):
+                if kind == "progress":
+                    status.write(payload)
+                    status.update(label=payload)
+                elif kind == "token":
+                    streamed += payload
+                    placeholder.markdown(streamed + "▌")
+                else:
+                    final_state = payload
+            status.update(label="답변 완료", state="complete")
 
-                config = {"configurable": {"thread_id": get_thread_id()}}
+            response = final_state.get(
+                "final_response", "답변을 생성하지 못했습니다."
+            )
+            placeholder.markdown(response)
 
-                final_state = graph.invoke(state, config=config)
+            # chart_spec이 있으면 시각화
+            if final_state.get("chart_spec"):
+                from frontend.components.visualization import create_chart
 
-                response = final_state.get(
-                    "final_response", "답변을 생성하지 못했습니다."
+                query_result = final_state.get("chart_data") or final_state.get(
+                    "query_result"
                 )
-                st.markdown(response)
-
-                # chart_spec이 있으면 시각화
-                if final_state.get("chart_spec"):
-                    from frontend.components.visualization import create_chart
-
-                    query_result = final_state.get("chart_data") or final_state.get(
-                        "query_result"
-                    )
-                    sql_query = final_state.get("extended_sql") or final_state.get(
-                        "sql_query", ""
-                    )
-                    chart_spec = final_state["chart_spec"]
-                    target_value = final_state.get("target_value")
-
-                    if isinstance(query_result, list) and query_result:
-                        col_names = extract_column_names(
-                            sql_query, len(query_result[0])
-                        )
+                sql_query = final_state.get("extended_sql") or final_state.get(
+                    "sql_query", ""
+                )
+                chart_spec = final_state["chart_spec"]
+                target_value = final_state.get("target_value")
 
-                        df = pd.DataFrame(query_result, columns=col_names)
-                        df.columns = [str(col) for col in df.columns]
+                if query_result is not None and len(query_result):
+                    df = query_result_to_dataframe(query_result, sql_query)
+                    df.columns = [str(col) for col in df.columns]
+                else:
+                    df = None
 
-                    elif isinstance(query_result, pd.DataFrame):
-                        df = query_result
+                if df is not None and not df.empty:
+                    chart = create_chart(df, chart_spec, target_value)
+                    if chart:
+                        st.plotly_chart(chart, use_container_width=True)
                     else:
-                        df = None
-
-                    if df is not None and not df.empty:
-                        chart = create_chart(df, chart_spec, target_value)
-                        if chart:
-                            st.plotly_chart(chart, use_container_width=True)
-                        else:
-                            st.warning("차트 생성 중 오류가 발생했습니다.")
-
-                # SQL 쿼리 표시
-                if final_state.get("sql_query"):
-                    with st.expander("실행된 SQL"):
-                        st.code(final_state["sql_query"], language="sql")
-
-                # 데이터 테이블 표시 - chart_data 우선 사용
-                if final_state.get("query_result"):
-                    display_data = (
-                        final_state.get("chart_data") or final_state["query_result"]
-                    )
-
-                    # DataFrame 변환 (extended_sql 기준으로 컬럼명 추출)
-                    if isinstance(display_data, list) and display_data:
-                        sql_query = final_state.get("extended_sql") or final_state.get(
-                            "sql_query", ""
-                        )
+                        st.warning("차트 생성 중 오류가 발생했습니다.")
 
-                        print(f"[DEBUG] SQL: {sql_query}")
-                        print(f"[DEBUG] 데이터 첫 행: {display_data[0]}")
+            # SQL 쿼리 표시
+            if final_state.get("sql_query"):
+                with st.expander("실행된 SQL"):
+                    st.code(final_state["sql_query"], language="sql")
 
-                        col_names = extract_column_names(
-                            sql_query, len(display_data[0])
-                        )
+            # 데이터 테이블 표시 - chart_data 우선 사용
+            if final_state.get("query_result"):
+                display_data = (
+                    final_state.get("chart_data") or final_state["query_result"]
+                )
 
-                        print(
-                            f"[DEBUG] 추출된 컬럼명: {col_names}, 실제 컬럼 수: {len(display_data[0])}"
-                        )
+                # DataFrame 변환 (QueryResult는 커서 컬럼명 그대로 사용)
+                sql_query = final_state.get("extended_sql") or final_state.get(
+                    "sql_query", ""
+                )
+                df = query_result_to_dataframe(display_data, sql_query)
+                print(f"[DEBUG] 데이터 컬럼: {list(df.columns)}, 행 수: {len(df)}")
 
-                        df = pd.DataFrame(display_data, columns=col_names)
-                    else:
-                        df = format_sql_result(display_data)
-
-                    if isinstance(df, pd.DataFrame) and not df.empty:
-                        with st.expander("데이터 테이블"):
-                            col1, col2, col3 = st.columns([1, 2, 1])
-                            with col2:
-                                target = final_state.get("target_value")
-                                styled_df = style_dataframe_with_highlight(df, target)
-                                st.dataframe(
-                                    styled_df,
-                                    hide_index=True,
-                                    # height=400,
-                                    use_container_width=True,
-                                )
-                # 메타데이터 저장
-                metadata = {
-                    "sql_query": final_state.get("sql_query"),
-                    "query_result": final_state.get("query_result"),
-                    "chart_data": final_state.get("chart_data"),
-                    "extended_sql": final_state.get("extended_sql"),
-                    "target_value": final_state.get("target_value"),
-                    "chart_spec": final_state.get("chart_spec"),
-                    "scenario_type": final_state.get("scenario_type"),
-                    "insight": final_state.get("insight"),
-                    "processed_data": final_state.get("processed_data"),
-                    "tables_info": final_state.get("tables_info"),
-                }
-
-                add_message("assistant", response, metadata)
-
-            except Exception as e:
-                error_msg = f"오류가 발생했습니다: {str(e)}"
-                st.error(error_msg)
-                add_message("assistant", error_msg, {})
-
-            finally:
-                st.session_state.is_processing = False
-                st.rerun()
+                if isinstance(df, pd.DataFrame) and not df.empty:
+                    with st.expander("데이터 테이블"):
+                        col1, col2, col3 = st.columns([1, 2, 1])
+                        with col2:
+                            target = final_state.get("target_value")
+                            styled_df = style_dataframe_with_highlight(df, target)
+                            st.dataframe(
+                                styled_df,
+                                hide_index=True,
+                                # height=400,
+                                use_container_width=True,
+                            )
+            # 메타데이터 저장
+            metadata = {
+                "sql_query": final_state.get("sql_query"),
+                "query_result": final_state.get("query_result"),
+                "chart_data": final_state.get("chart_data"),
+                "extended_sql": final_state.get("extended_sql"),
+                "target_value": final_state.get("target_value"),
+                "chart_spec": final_state.get("chart_spec"),
+                "scenario_type": final_state.get("scenario_type"),
+                "insight": final_state.get("insight"),
+                "processed_data": final_state.get("processed_data"),
+                "tables_info": final_state.get("tables_info"),
+            }
+
+            add_message("assistant", response, metadata)
+
+        except Exception as e:
+            error_msg = f"오류가 발생했습니다: {str(e)}"
+            status.update(label="오류 발생", state="error")
+            st.error(error_msg)
+            add_message("assistant", error_msg, {})
+
+        finally:
+            st.session_state.is_processing = False
+            st.rerun()
@@ -1,7 +1,9 @@
 """데이터 포맷팅 유틸리티"""
 
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+
+from database.query_result import QueryResult
 
 
 def format_sql_result(data: List[Dict[str, Any]]) -> pd.DataFrame:
@@ -58,8 +60,21 @@ def extract_sql_from_response(response: str) -> Optional[str]:
     return None
 
 
-def extract_column_names(sql_query: str, data_row_length: int) -> List[str]:
-    """SQL 쿼리에서 컬럼명 추출"""
+def extract_column_names(sql_query: str, data: Union[int, QueryResult]) -> List[str]:
+    """
+    결과 컬럼명 추출
+
+    Args:
+        sql_query: 실행한 SQL
+        data: QueryResult (커서 컬럼명 그대로 사용) 또는 행 길이 (SQL 파싱)
+
+    Returns:
+        컬럼명 리스트
+    """
+    if isinstance(data, QueryResult):
+        return list(data.columns)
+
+    data_row_length = data
     if "SELECT" in sql_query.upper():
         select_part = sql_query.split("FROM")[0].replace("SELECT", "").strip()
         col_names = [col.strip() for col in select_part.split(",")]
@@ -79,6 +94,27 @@ def extract_column_names(sql_query: str, data_row_length: int) -> List[str]:
         return [f"col_{i}" for i in range(data_row_length)]
 
 
+def query_result_to_dataframe(data: Any, sql_query: str = "") -> pd.DataFrame:
+    """
+    SQL 실행 결과 → DataFrame
+
+    Args:
+        data: QueryResult, DataFrame 또는 행 튜플 리스트
+        sql_query: 실행한 SQL (행 리스트일 때 컬럼명 추출용)
+
+    Returns:
+        DataFrame
+    """
+    if isinstance(data, pd.DataFrame):
+        return data
+    if isinstance(data, QueryResult):
+        return data.to_dataframe()
+    if isinstance(data, list) and data and isinstance(data[0], (tuple, list)):
+        col_names = extract_column_names(sql_query, len(data[0]))
+        return pd.DataFrame(data, columns=col_names)
+    return format_sql_result(data)
+
+
 def style_dataframe_with_highlight(
     df: pd.DataFrame, target_value: Optional[str] = None
 ):
@@ -11,9 +11,16 @@ from pathlib import Path
 # 프로젝트 루트 경로 추가
 sys.path.insert(0, str(Path(__file__).parent))
 
-from agents.graph import create_stats_chatbot_graph
-from database.vector_db import get_vectorstore, get_query_embeddings
+from agents.graph import create_stats_chatbot_graph, stream_graph
+from database.vector_db import (
+    get_vectorstore,
+    get_query_embeddings,
+    get_numpy_index,
+)
+from database.connection import db_manager
 from database.metadata_manager import get_metadata_manager
+from database.value_dictionary import get_value_dictionary
+from config.settings import settings
 
 
 def print_header():
@@ -49,14 +56,23 @@ def main():
     # 그래프 초기화
     print("🔄 챗봇 초기화 중...")
 
+    # 0. DB 커넥션 워밍업
+    db_manager.warm_up()
+
     # 1. MetadataManager 초기화
     manager = get_metadata_manager()
 
+    # 1-1. 범주 값 사전 (바뀐 테이블만 백그라운드 스캔)
+    if settings.VALUE_DICT_ENABLED:
+        get_value_dictionary()
+
     # 2. 임베딩 모델 초기화
     embeddings = get_query_embeddings()
 
     # 3. 벡터스토어 초기화
     vectorstore = get_vectorstore()
+    if settings.VECTOR_BACKEND == "numpy":
+        get_numpy_index()
 
     # 4. 그래프 초기화
     graph = create_stats_chatbot_graph()
@@ -98,23 +114,33 @@ def main():
             # 설정 (세션 관리)
             config = {"configurable": {"thread_id": thread_id}}
 
-            # 그래프 실행
+            # 그래프 실행 (단계별 진행 상황 + 응답 토큰 스트리밍)
             print("\n🤔 답변 생성 중...\n")
-            final_state = graph.invoke(state, config=config)
-
-            # 시나리오 정보 출력
-            scenario_type = final_state.get("scenario_type", "unknown")
-            reasoning = final_state.get("reasoning", "")
-
-            print(f"🎯 시나리오: {scenario_type}")
-            if reasoning:
-                print(f"📝 분류 이유: {reasoning}")
-            print()
-
-            # 결과 출력
-            print_separator()
-            print("📋 답변:")
-            print(final_state.get("final_response", "답변을 생성하지 못했습니다."))
+            final_state = {}
+            streamed = ""
+            for kind, payload in stream_graph(graph, state, config):
+                if kind == "progress":
+                    print(f"  {payload}")
+                elif kind == "token":
+                    if not streamed:
+                        print_separator()
+                        print("📋 답변:")
+                    streamed += payload
+                    print(payload, end="", flush=True)
+                else:
+                    final_state = payload
+
+            # 결과 출력 (스트리밍된 답변 뒤에는 출처 등 나머지만)
+            response = final_state.get("final_response", "답변을 생성하지 못했습니다.")
+            answer = streamed.strip()
+            if answer and response.startswith(answer):
+                print(response[len(answer) :])
+            else:
+                if streamed:
+                    print()  # 중간에 끊긴 스트리밍 줄바꿈
+                print_separator()
+                print("📋 답변:")
+                print(response)
             print_separator()
 
             # 디버그 정보 (선택사항)
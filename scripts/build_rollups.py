@@ -0,0 +1,78 @@
+"""
+롤업 테이블 생성 스크립트
+
+자주 쓰는 집계(10세 단위 연령대, 연도별, 전국 합계)를 미리 계산한 테이블을 만들고
+tables_metadata에 등록
+
+사용법:
+    python scripts/build_rollups.py                        # 전체 원본 테이블
+    python scripts/build_rollups.py --tables population_age_stats
+    python scripts/build_rollups.py --sync-vectors         # 생성 후 벡터 DB 동기화
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.connection import db_manager
+from database.metadata_manager import fetch_metadata_rows
+from database.rollups import build_all_rollups
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="롤업 테이블 생성")
+    parser.add_argument("--tables", nargs="*", default=None, help="대상 원본 테이블")
+    parser.add_argument(
+        "--sync-vectors",
+        action="store_true",
+        help="생성 후 벡터 DB 증분 동기화 (새 롤업 테이블 임베딩)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """롤업 테이블 생성 메인 함수"""
+    args = parse_args()
+
+    print("=" * 60)
+    print("롤업 테이블 생성")
+    print("=" * 60)
+
+    db_manager.get_db()
+    conn = db_manager.engine.raw_connection()
+    try:
+        metadata_rows = fetch_metadata_rows(conn)
+        results = build_all_rollups(conn, metadata_rows, tables=args.tables)
+    finally:
+        conn.close()
+
+    built = 0
+    for result in results:
+        if result.skipped:
+            print(f"⏭️  {result.table_name}: {result.skipped}")
+        else:
+            built += 1
+            print(f"✅ {result.table_name} ({result.rows}행) ← {result.source_table}")
+
+    print(f"\n✅ 완료: 롤업 테이블 {built}개 생성")
+    if not built:
+        return
+
+    # 실행 중인 앱에서도 원본 기준으로 캐시된 결과가 남지 않도록 적재 버전 올림
+    db_manager.mark_data_loaded(f"rollups: {built}개")
+
+    if args.sync_vectors:
+        from database.vector_db import sync_embedding_db
+
+        sync_embedding_db()
+    else:
+        print("ℹ️  벡터 검색에 반영하려면: python scripts/setup_vector_db.py --sync")
+
+
+if __name__ == "__main__":
+    main()
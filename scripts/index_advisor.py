@@ -0,0 +1,109 @@
+"""
+인덱스 분석/생성 스크립트
+
+tables_metadata의 컬럼 스키마와 execute_sql 쿼리 로그를 바탕으로
+테이블별 복합 인덱스를 제안하고, --apply 시 생성 후 전/후 실행 계획과 시간을 비교
+
+사용법:
+    python scripts/index_advisor.py                  # 제안만 (현재 실행 계획/시간)
+    python scripts/index_advisor.py --apply          # 인덱스 생성 + 전/후 비교
+    python scripts/index_advisor.py --tables population_age_stats --runs 10
+    python scripts/index_advisor.py --analyze        # 쿼리 비용 검사용 행 수 통계 갱신
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.connection import db_manager
+from database.index_advisor import (
+    advise_indexes,
+    analyze_tables,
+    format_report,
+    table_columns_from_metadata,
+)
+from database.metadata_manager import MetadataManager
+from database.query_log import query_log
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="인덱스 분석/생성")
+    parser.add_argument("--apply", action="store_true", help="제안한 인덱스 생성")
+    parser.add_argument("--tables", nargs="*", default=None, help="대상 테이블")
+    parser.add_argument("--runs", type=int, default=5, help="시간 측정 반복 횟수")
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="대상 테이블 ANALYZE (쿼리 비용 검사가 쓰는 행 수 통계)",
+    )
+    parser.add_argument(
+        "--log-limit", type=int, default=None, help="분석할 최근 쿼리 로그 수"
+    )
+    parser.add_argument(
+        "--min-share",
+        type=float,
+        default=0.3,
+        help="인덱스에 포함할 컬럼의 최소 사용 비율 (쿼리 로그 기준)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """인덱스 분석 메인 함수"""
+    args = parse_args()
+
+    print("=" * 60)
+    print("인덱스 분석" + (" + 생성" if args.apply else " (제안만)"))
+    print("=" * 60)
+
+    manager = MetadataManager(refresh_interval=0)
+    table_columns = table_columns_from_metadata(manager)
+    if args.tables:
+        table_columns = {t: c for t, c in table_columns.items() if t in args.tables}
+
+    logged_sqls = [
+        entry["sql"]
+        for entry in query_log.read(limit=args.log_limit)
+        if entry.get("sql") and not entry.get("error")
+    ]
+    print(f"📜 쿼리 로그: {len(logged_sqls)}건, 대상 테이블: {len(table_columns)}개\n")
+
+    db_manager.get_db()
+    conn = db_manager.engine.raw_connection()
+    try:
+        if args.analyze:
+            failed = analyze_tables(conn, table_columns)
+            analyzed = len(table_columns) - len(failed)
+            print(f"📊 ANALYZE: {analyzed}/{len(table_columns)}개\n")
+        reports = advise_indexes(
+            conn,
+            table_columns,
+            logged_sqls,
+            apply=args.apply,
+            runs=args.runs,
+            min_share=args.min_share,
+        )
+    finally:
+        conn.close()
+
+    for report in reports:
+        print(format_report(report))
+        print()
+
+    created = sum(r.created for r in reports)
+    print(f"✅ 완료: 제안 {len(reports)}개, 생성 {created}개")
+    if args.analyze:
+        # 실행 중인 앱이 테이블별 행 수(데이터 버전별 캐시)를 다시 읽도록
+        db_manager.mark_data_loaded("analyze")
+    elif created:
+        # 새 인덱스 반영 전 결과가 캐시에 남지 않도록
+        db_manager.invalidate_cache()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+데이터 적재 완료 기록 스크립트
+
+팩트 테이블 적재(ingest) 직후 실행하면 적재 버전이 올라가
+실행 중인 앱의 SQL 결과 캐시가 DATA_VERSION_CHECK_INTERVAL초 안에 무효화됨
+
+사용법:
+    python scripts/mark_data_loaded.py
+    python scripts/mark_data_loaded.py --note "population_age_stats 2024년 추가"
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import settings
+from database.connection import db_manager
+
+
+def main():
+    """적재 버전 기록 메인 함수"""
+    parser = argparse.ArgumentParser(description="데이터 적재 완료 기록")
+    parser.add_argument("--note", default="", help="적재 내용 메모")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"데이터 적재 버전 기록: {settings.DATA_VERSION_TABLE}")
+    print("=" * 60)
+
+    db_manager.mark_data_loaded(args.note)
+
+
+if __name__ == "__main__":
+    main()
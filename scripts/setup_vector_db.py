@@ -5,31 +5,63 @@
 
 사용법:
     python scripts/setup_vector_db.py
+    python scripts/setup_vector_db.py --batch-size 32 --workers 8
+    python scripts/setup_vector_db.py --sync   # 추가/변경된 테이블만 임베딩
+    EMBEDDING_PROVIDER=local python scripts/setup_vector_db.py   # 오프라인 임베딩
+
+중간에 실패하면 같은 명령으로 다시 실행하세요.
+완료된 배치는 체크포인트에서 복원되고 남은 배치만 임베딩합니다.
 """
 
 import sys
+import argparse
 from pathlib import Path
 
 # 프로젝트 루트 경로 추가
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from database.vector_db import setup_embedding_db
+from config.settings import settings
+from database.vector_db import setup_embedding_db, sync_embedding_db
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="벡터 DB 초기화")
+    parser.add_argument("--batch-size", type=int, default=None, help="배치당 문서 수")
+    parser.add_argument("--workers", type=int, default=None, help="동시 임베딩 요청 수")
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="증분 동기화 (추가/변경된 테이블만 임베딩, 삭제된 테이블 제거)",
+    )
+    return parser.parse_args()
 
 
 def main():
     """벡터 DB 초기화 메인 함수"""
+    args = parse_args()
 
     print("=" * 60)
     print("벡터 DB 초기화 시작")
     print("=" * 60)
     print()
 
-    persist_dir = Path("./embedding_db")
+    persist_dir = Path(settings.VECTOR_DB_DIR)
     force_recreate = False
 
-    if persist_dir.exists():
+    if args.sync:
+        if not persist_dir.exists():
+            print("ℹ️  기존 벡터 DB가 없어 전체 생성으로 진행합니다.")
+        else:
+            sync_embedding_db(batch_size=args.batch_size, max_workers=args.workers)
+            print()
+            print("✅ 동기화 완료!")
+            return
+
+    elif persist_dir.exists():
         print("⚠️  기존 벡터 DB가 존재합니다.")
+        print("   (변경분만 반영하려면 --sync 옵션을 사용하세요)")
         confirm = input("삭제하고 새로 만들까요? (y/N): ")
         if confirm.lower() == "y":
             force_recreate = True
@@ -38,8 +70,12 @@ def main():
             return
 
     try:
-        # 벡터 DB 생성 (1~2분 소요)
-        vectorstore = setup_embedding_db(force_recreate=force_recreate)
+        # 벡터 DB 생성 (배치 병렬 임베딩, 체크포인트로 재개 가능)
+        vectorstore = setup_embedding_db(
+            force_recreate=force_recreate,
+            batch_size=args.batch_size,
+            max_workers=args.workers,
+        )
 
         print()
         print("=" * 60)
@@ -62,7 +98,7 @@ def main():
         print("✅ 모든 작업 완료!")
         print()
         print("📁 생성된 파일:")
-        print("  ./embedding_db/")
+        print(f"  {settings.VECTOR_DB_DIR}/")
 
     except Exception as e:
         print()
@@ -0,0 +1,42 @@
+"""
+로컬 복제본 수동 동기화 스크립트
+
+데이터 적재(ingest) 직후 주기를 기다리지 않고 바로 반영할 때 실행
+
+사용법:
+    python scripts/sync_replica.py
+    DB_REPLICA_PATH=./replica.db python scripts/sync_replica.py
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import settings
+from database.replica import LocalReplica
+
+
+def main():
+    """로컬 복제본 동기화 메인 함수"""
+    print("=" * 60)
+    print(f"로컬 복제본 동기화: {settings.DB_REPLICA_PATH}")
+    print("=" * 60)
+
+    replica = LocalReplica(
+        path=settings.DB_REPLICA_PATH,
+        sync_url=settings.TURSO_DATABASE_URL,
+        auth_token=settings.TURSO_AUTH_TOKEN,
+        max_staleness=settings.DB_REPLICA_MAX_STALENESS,
+    )
+
+    if not replica.sync():
+        sys.exit(1)
+
+    print(f"📊 {replica.status()}")
+
+
+if __name__ == "__main__":
+    main()
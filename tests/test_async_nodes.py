@@ -0,0 +1,152 @@
+"""agents/nodes 비동기 노드 테스트 (같은 LLM 응답이면 동기 노드와 같은 Command)"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import agents.nodes.analysis as analysis
+import agents.nodes.intent as intent
+import agents.nodes.response as response
+from agents.nodes import (
+    aanalyze_insight,
+    aclassify_intent,
+    agenerate_response,
+    analyze_insight,
+    aprocess_data,
+    classify_intent,
+    generate_response,
+    process_data,
+)
+from config.settings import settings
+from database.query_result import QueryResult
+
+RESULT = QueryResult.from_rows(["년도", "값"], [("2022", 100), ("2023", 110)])
+
+STATE = {
+    "user_query": "2022년 대비 2023년 인구 증가율은?",
+    "conversation_history": "없음",
+    "scenario_type": "derived_calculation",
+    "query_result": RESULT,
+    "processed_data": None,
+    "insight": "",
+    "tables_info": [],
+}
+
+
+class FakeLLM:
+    """invoke/ainvoke/stream/astream이 같은 응답을 주는 가짜 LLM"""
+
+    def __init__(self, content, fail=False):
+        self.content = content
+        self.fail = fail
+        self.calls = []
+
+    def _reply(self, kind, prompt):
+        self.calls.append(kind)
+        if self.fail:
+            raise RuntimeError("LLM 오류")
+        return SimpleNamespace(content=self.content)
+
+    def invoke(self, prompt):
+        return self._reply("invoke", prompt)
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(0)
+        return self._reply("ainvoke", prompt)
+
+    def stream(self, prompt):
+        self._reply("stream", prompt)
+        for part in self.content.split(" "):
+            yield SimpleNamespace(content=part + " ")
+
+    async def astream(self, prompt):
+        self._reply("astream", prompt)
+        for part in self.content.split(" "):
+            await asyncio.sleep(0)
+            yield SimpleNamespace(content=part + " ")
+
+
+def use_llm(monkeypatch, module, llm):
+    for name in ("get_llm", "get_llm_text"):
+        if hasattr(module, name):
+            monkeypatch.setattr(module, name, lambda: llm)
+
+
+def same_command(sync_command, async_command):
+    assert async_command.goto == sync_command.goto
+    assert async_command.update == sync_command.update
+
+
+@pytest.mark.parametrize(
+    "content",
+    [json.dumps({"scenario_type": "table_view", "reasoning": "표"}), "JSON 아님"],
+)
+def test_classify_intent(monkeypatch, content):
+    llm = FakeLLM(content)
+    use_llm(monkeypatch, intent, llm)
+    monkeypatch.setattr(settings, "INTENT_RULES_ENABLED", False)
+
+    sync_command = classify_intent(STATE)
+    async_command = asyncio.run(aclassify_intent(STATE))
+
+    same_command(sync_command, async_command)
+    assert llm.calls == ["invoke", "ainvoke"]
+
+
+@pytest.mark.parametrize(
+    "content, fail",
+    [
+        (json.dumps({"calculated_data": {"증가율": 10.0}, "description": "증가율"}), False),
+        ("JSON 아님", False),
+        ("", True),
+    ],
+)
+def test_process_data(monkeypatch, content, fail):
+    llm = FakeLLM(content, fail)
+    use_llm(monkeypatch, analysis, llm)
+
+    sync_command = process_data(STATE)
+    async_command = asyncio.run(aprocess_data(STATE))
+
+    same_command(sync_command, async_command)
+    assert async_command.goto == "analyze_insight"
+    assert llm.calls == ["invoke", "ainvoke"]
+
+
+def test_process_data_skips_llm_for_simple_scenarios(monkeypatch):
+    llm = FakeLLM("{}")
+    use_llm(monkeypatch, analysis, llm)
+    state = {**STATE, "scenario_type": "table_view"}
+
+    same_command(process_data(state), asyncio.run(aprocess_data(state)))
+    assert llm.calls == []
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_analyze_insight(monkeypatch, fail):
+    llm = FakeLLM("  10% 증가했습니다  ", fail)
+    use_llm(monkeypatch, analysis, llm)
+
+    sync_command = analyze_insight(STATE)
+    async_command = asyncio.run(aanalyze_insight(STATE))
+
+    same_command(sync_command, async_command)
+    assert async_command.update == {"insight": "" if fail else "10% 증가했습니다"}
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_generate_response_streams_same_tokens(monkeypatch, fail):
+    llm = FakeLLM("인구가 10% 증가했습니다", fail)
+    use_llm(monkeypatch, response, llm)
+    sync_tokens, async_tokens = [], []
+
+    sync_command = generate_response(STATE, sync_tokens.append)
+    async_command = asyncio.run(agenerate_response(STATE, async_tokens.append))
+
+    same_command(sync_command, async_command)
+    assert async_tokens == sync_tokens
+    assert [event["token"] for event in async_tokens] == (
+        [] if fail else ["인구가 ", "10% ", "증가했습니다 "]
+    )
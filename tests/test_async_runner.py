@@ -0,0 +1,116 @@
+"""agents/async_runner.py 테스트 (공유 루프 실행, 비동기 이터레이터 중계, 취소 전달)"""
+
+import asyncio
+import threading
+
+import pytest
+
+from agents.async_runner import AsyncRunner
+
+
+@pytest.fixture
+def runner():
+    runner = AsyncRunner()
+    yield runner
+    runner.stop()
+
+
+def consume(iterator, timeout=2.0):
+    """다른 스레드에서 이터레이터를 끝까지 소비 → (항목, 예외), 멈추면 실패"""
+    items, errors = [], []
+
+    def run():
+        try:
+            items.extend(iterator)
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "소비 측이 멈춤"
+    return items, errors[0] if errors else None
+
+
+async def numbers(count, error=None):
+    for i in range(count):
+        await asyncio.sleep(0)
+        yield i
+    if error is not None:
+        raise error
+
+
+def test_run_returns_result_on_shared_loop(runner):
+    async def loop_of():
+        return asyncio.get_running_loop()
+
+    assert runner.run(loop_of()) is runner.loop
+    assert runner.run(loop_of()) is runner.loop
+
+
+def test_run_raises_and_cancels_on_timeout(runner):
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def fail():
+        raise ValueError("실패")
+
+    with pytest.raises(ValueError):
+        runner.run(fail())
+    with pytest.raises(TimeoutError):
+        runner.run(slow(), timeout=0.05)
+    assert cancelled.wait(1)
+
+
+def test_iterate_yields_items_in_order(runner):
+    items, error = consume(runner.iterate(numbers(5)))
+
+    assert items == [0, 1, 2, 3, 4]
+    assert error is None
+
+
+def test_iterate_forwards_exceptions(runner):
+    items, error = consume(runner.iterate(numbers(2, ValueError("실패"))))
+
+    assert items == [0, 1]
+    assert isinstance(error, ValueError)
+
+
+def test_iterate_forwards_cancellation(runner):
+    async def cancelled_midway():
+        yield "first"
+        await asyncio.sleep(0)
+        asyncio.current_task().cancel()
+        await asyncio.sleep(1)
+        yield "never"
+
+    items, error = consume(runner.iterate(cancelled_midway()))
+
+    assert items == ["first"]
+    assert isinstance(error, asyncio.CancelledError)
+
+
+def test_iterate_cancels_producer_when_consumer_stops(runner):
+    closed = threading.Event()
+
+    async def endless():
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+                await asyncio.sleep(0.001)
+        finally:
+            closed.set()
+
+    iterator = runner.iterate(endless())
+    assert next(iterator) == 0
+    iterator.close()
+
+    assert closed.wait(1)
@@ -0,0 +1,173 @@
+"""database/connection.py 테스트 (커넥션 풀, 헬스 체크, 컬럼 단위 결과, 복제본 우선 실행)"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+import database.connection as connection
+from config import settings
+from database.connection import DatabaseManager, pool_metrics
+from database.replica import LocalReplica
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = tmp_path / "stats.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE population (행정구역 TEXT, 값 INTEGER)")
+        conn.executemany(
+            "INSERT INTO population VALUES (?, ?)",
+            [
+                ("서울특별시", 9_400_000),
+                ("부산광역시", 3_300_000),
+                ("대구광역시", 2_300_000),
+            ],
+        )
+    return path
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    """connect()가 만든 엔진 목록 (Turso 전용 auth_token 인자는 빼고 SQLite로 생성)"""
+    created = []
+
+    def sqlite_engine(uri, connect_args, **kwargs):
+        connect_args = {k: v for k, v in connect_args.items() if k != "auth_token"}
+        engine = create_engine(uri, connect_args=connect_args, **kwargs)
+        created.append(engine)
+        return engine
+
+    monkeypatch.setattr(connection, "create_engine", sqlite_engine)
+    return created
+
+
+@pytest.fixture
+def manager(db_file, engines, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 2)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 1)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.2)
+    monkeypatch.setattr(settings, "DB_REPLICA_ENABLED", False)
+    pool_metrics.reset()
+    manager = DatabaseManager()
+    manager.db_uri = f"sqlite:///{db_file}"
+    yield manager
+    manager.close()
+
+
+def test_concurrent_first_calls_create_one_engine(manager, engines):
+    threads = [threading.Thread(target=manager.get_db) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(engines) == 1
+    assert isinstance(manager.engine.pool, connection.InstrumentedQueuePool)
+
+
+def test_warm_up_opens_distinct_connections(manager):
+    manager.get_db()
+    pool_metrics.reset()  # SQLDatabase 생성 시 스키마 조회분 제외
+
+    opened = manager.warm_up(5)  # 풀 크기(2)까지만
+
+    status = manager.pool_status()
+    assert opened == 2
+    assert (status["pool_size"], status["idle"], status["checked_out"]) == (2, 2, 0)
+    assert status["checkouts"] == 2
+
+
+def test_warm_up_disabled(manager):
+    assert manager.warm_up(0) == 0
+    assert manager.engine is None
+
+
+def test_exhausted_pool_times_out_and_is_counted(manager):
+    manager.get_db()
+    pool_metrics.reset()
+    held = [manager.engine.connect() for _ in range(3)]  # 풀 2 + 오버플로우 1
+    try:
+        with pytest.raises(PoolTimeoutError):
+            manager.engine.connect()
+        status = manager.pool_status()
+    finally:
+        for conn in held:
+            conn.close()
+
+    assert (status["checked_out"], status["overflow"]) == (3, 1)
+    assert (status["checkouts"], status["timeouts"]) == (3, 1)
+    assert status["max_wait_ms"] >= 150
+
+
+def test_health_check_reports_pool_and_failures(manager, tmp_path):
+    health = manager.health_check()
+
+    assert health["ok"] and health["error"] is None
+    assert health["pool"]["idle"] == 1
+    assert health["replica"] is None
+    assert {"result_cache", "query_guard"} <= health.keys()
+
+    broken = DatabaseManager()
+    broken.db_uri = f"sqlite:///{tmp_path / 'missing' / 'x.db'}"
+    failed = broken.health_check()
+    broken.close()
+    assert failed["ok"] is False and failed["error"]
+
+
+def test_execute_remote_returns_cursor_columns(manager):
+    result = manager.execute_remote(
+        "SELECT 행정구역 AS 지역, 값 FROM population ORDER BY 값 DESC", max_rows=2
+    )
+
+    assert result.columns == ("지역", "값")
+    assert result.rows() == [("서울특별시", 9_400_000), ("부산광역시", 3_300_000)]
+    assert result.truncated
+
+
+def test_execute_remote_keeps_colons_and_non_row_statements(manager):
+    result = manager.execute_remote("SELECT ':year' AS 텍스트")
+    empty = manager.execute_remote("CREATE TEMP TABLE scratch (a)")
+
+    assert result.rows() == [(":year",)]
+    assert (empty.columns, len(empty)) == ((), 0)
+
+
+@pytest.fixture
+def replica(tmp_path, manager, monkeypatch):
+    path = tmp_path / "replica.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE population (행정구역 TEXT, 값 INTEGER)")
+        conn.execute("INSERT INTO population VALUES ('복제본', 1)")
+    replica = LocalReplica(str(path), "libsql://example", "token", max_staleness=60)
+    monkeypatch.setattr(settings, "DB_REPLICA_ENABLED", True)
+    manager.replica = replica
+    return replica
+
+
+def test_fresh_replica_serves_reads(manager, replica):
+    replica.last_synced = time.time()
+
+    result = manager.execute_internal("SELECT 행정구역 FROM population")
+
+    assert result.rows() == [("복제본",)]
+    assert manager.health_check()["replica"]["hits"] == 1
+
+
+def test_stale_or_failing_replica_falls_back_to_remote(manager, replica, db_file):
+    with sqlite3.connect(db_file) as conn:
+        conn.execute("CREATE TABLE remote_only (a)")
+
+    stale = manager.execute_internal("SELECT COUNT(*) FROM population")
+    replica.last_synced = time.time()
+    fresh = manager.execute_internal("SELECT COUNT(*) FROM population")
+    missing = manager.execute_internal("SELECT COUNT(*) FROM remote_only")
+
+    assert stale.rows() == [(3,)]  # 원격 DB
+    assert fresh.rows() == [(1,)]  # 복제본
+    assert missing.rows() == [(0,)]  # 복제본 실패 → 원격 DB
+    status = replica.status()
+    assert (status["hits"], status["stale_misses"], status["error_misses"]) == (1, 1, 1)
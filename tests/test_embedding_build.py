@@ -0,0 +1,147 @@
+"""database/embedding_build.py 테스트 (배치 병렬 임베딩, 체크포인트 재개, 재시도)"""
+
+import threading
+import time
+from typing import List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+import database.embedding_build as embedding_build
+from database.embedding_build import BatchEmbeddingBuilder
+
+IDS = [f"table_{i}" for i in range(7)]
+TEXTS = [f"문서 {i}" * (i + 1) for i in range(7)]
+
+
+class RecordingEmbeddings(Embeddings):
+    """배치별 호출과 동시 실행 수를 기록하는 가짜 임베딩 (fail_on 문서가 있으면 실패)"""
+
+    def __init__(self, fail_on=(), failures=1, delay=0.0):
+        self.fail_on = set(fail_on)
+        self.failures = failures  # fail_on 배치가 실패할 횟수
+        self.delay = delay
+        self.batches = []
+        self._lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.batches.append(list(texts))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            fail = self.failures > 0 and bool(self.fail_on & set(texts))
+            if fail:
+                self.failures -= 1
+        try:
+            time.sleep(self.delay)
+            if fail:
+                raise RuntimeError("임베딩 API 오류")
+            return [[float(len(text)), 1.0] for text in texts]
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(embedding_build.time, "sleep", lambda seconds: None)
+
+
+def expected_vectors(ids=IDS, texts=TEXTS):
+    return {doc_id: [float(len(text)), 1.0] for doc_id, text in zip(ids, texts)}
+
+
+def test_build_embeds_all_batches_with_bounded_workers():
+    api = RecordingEmbeddings(delay=0.02)
+    builder = BatchEmbeddingBuilder(api, "fake", batch_size=2, max_workers=2)
+
+    vectors = builder.build(IDS, TEXTS)
+
+    assert vectors == expected_vectors()
+    assert sorted(len(batch) for batch in api.batches) == [1, 2, 2, 2]
+    assert api.max_running == 2
+
+
+def test_resume_skips_checkpointed_batches(tmp_path):
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    failing = RecordingEmbeddings(fail_on=[TEXTS[2]], failures=10)
+    builder = BatchEmbeddingBuilder(
+        failing, "fake", batch_size=2, max_retries=0, checkpoint_dir=checkpoint_dir
+    )
+    with pytest.raises(RuntimeError):
+        builder.build(IDS, TEXTS)
+
+    api = RecordingEmbeddings()
+    resumed = BatchEmbeddingBuilder(
+        api, "fake", batch_size=2, checkpoint_dir=checkpoint_dir
+    )
+    vectors = resumed.build(IDS, TEXTS)
+
+    assert vectors == expected_vectors()
+    assert api.batches == [TEXTS[2:4]]  # 실패한 배치만 다시 임베딩
+
+
+def test_changed_documents_or_namespace_are_reembedded(tmp_path):
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    BatchEmbeddingBuilder(
+        RecordingEmbeddings(), "fake", batch_size=2, checkpoint_dir=checkpoint_dir
+    ).build(IDS, TEXTS)
+    texts = TEXTS[:6] + ["바뀐 문서"]
+
+    api = RecordingEmbeddings()
+    BatchEmbeddingBuilder(
+        api, "fake", batch_size=2, checkpoint_dir=checkpoint_dir
+    ).build(IDS, texts)
+    other = RecordingEmbeddings()
+    BatchEmbeddingBuilder(
+        other, "other-model", batch_size=2, checkpoint_dir=checkpoint_dir
+    ).build(IDS, TEXTS)
+
+    assert api.batches == [["바뀐 문서"]]
+    assert len(other.batches) == 4
+
+
+def test_corrupt_checkpoint_is_reembedded(tmp_path):
+    checkpoint_dir = tmp_path / "checkpoints"
+    builder = BatchEmbeddingBuilder(
+        RecordingEmbeddings(), "fake", batch_size=4, checkpoint_dir=str(checkpoint_dir)
+    )
+    builder.build(IDS, TEXTS)
+    for path in checkpoint_dir.glob("batch_*.json"):
+        path.write_text("{깨진 파일")
+
+    api = RecordingEmbeddings()
+    vectors = BatchEmbeddingBuilder(
+        api, "fake", batch_size=4, checkpoint_dir=str(checkpoint_dir)
+    ).build(IDS, TEXTS)
+
+    assert vectors == expected_vectors()
+    assert len(api.batches) == 2
+
+
+def test_transient_failure_is_retried(no_backoff):
+    api = RecordingEmbeddings(fail_on=[TEXTS[0]], failures=2)
+    builder = BatchEmbeddingBuilder(api, "fake", batch_size=7, max_retries=2)
+
+    vectors = builder.build(IDS, TEXTS)
+
+    assert vectors == expected_vectors()
+    assert len(api.batches) == 3
+
+
+def test_clear_checkpoints(tmp_path):
+    checkpoint_dir = tmp_path / "checkpoints"
+    builder = BatchEmbeddingBuilder(
+        RecordingEmbeddings(), "fake", checkpoint_dir=str(checkpoint_dir)
+    )
+    builder.build(IDS, TEXTS)
+    assert list(checkpoint_dir.glob("batch_*.json"))
+
+    builder.clear_checkpoints()
+
+    assert not checkpoint_dir.exists()
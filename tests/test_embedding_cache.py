@@ -0,0 +1,135 @@
+"""database/embedding_cache.py 테스트 (메모리 LRU, 디스크 저장소, hit/miss 통계)"""
+
+import asyncio
+from typing import List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from database.embedding_cache import CachedQueryEmbeddings
+
+
+class CountingEmbeddings(Embeddings):
+    """텍스트 길이로 벡터를 만드는 가짜 임베딩 (호출한 텍스트 기록)"""
+
+    def __init__(self):
+        self.queries = []
+        self.documents = []
+
+    def embed_query(self, text: str) -> List[float]:
+        self.queries.append(text)
+        return [float(len(text)), 0.5]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        self.queries.append(text)
+        return [float(len(text)), 0.25]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.documents.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+@pytest.fixture
+def api():
+    return CountingEmbeddings()
+
+
+def test_repeated_query_hits_memory(api):
+    cache = CachedQueryEmbeddings(api, "fake:query")
+
+    first = cache.embed_query("서울  인구 ")
+    second = cache.embed_query(" 서울 인구")
+
+    assert first == second == [5.0, 0.5]
+    assert api.queries == ["서울 인구"]  # 공백 정규화 후 1번만 호출
+    stats = cache.stats()
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (1, 0, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_returned_vector_is_a_copy(api):
+    cache = CachedQueryEmbeddings(api, "fake:query")
+
+    cache.embed_query("인구").append(99.0)
+
+    assert cache.embed_query("인구") == [2.0, 0.5]
+
+
+def test_lru_evicts_least_recently_used(api):
+    cache = CachedQueryEmbeddings(api, "fake:query", max_size=2)
+
+    cache.embed_query("a")
+    cache.embed_query("bb")
+    cache.embed_query("a")  # a를 최근 사용으로
+    cache.embed_query("ccc")  # bb 제거
+    cache.embed_query("a")
+    cache.embed_query("bb")
+
+    assert api.queries == ["a", "bb", "ccc", "bb"]
+    assert cache.stats()["size"] == 2
+
+
+def test_disk_store_survives_restart(api, tmp_path):
+    db_path = str(tmp_path / "cache" / "query_embeddings.db")
+    CachedQueryEmbeddings(api, "fake:query", db_path=db_path).embed_query("출생아 수")
+
+    restarted = CachedQueryEmbeddings(api, "fake:query", db_path=db_path)
+    vector = restarted.embed_query("출생아 수")
+
+    assert vector == [5.0, 0.5]
+    assert api.queries == ["출생아 수"]
+    assert restarted.stats()["disk_hits"] == 1
+    restarted.embed_query("출생아 수")
+    assert restarted.stats()["hits"] == 1  # 디스크 hit 후 메모리에 올라옴
+
+
+def test_namespace_separates_models(api, tmp_path):
+    db_path = str(tmp_path / "query_embeddings.db")
+    CachedQueryEmbeddings(api, "model-a", db_path=db_path).embed_query("인구")
+
+    CachedQueryEmbeddings(api, "model-b", db_path=db_path).embed_query("인구")
+
+    assert api.queries == ["인구", "인구"]
+
+
+def test_unusable_disk_store_falls_back_to_memory(api, tmp_path):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    cache = CachedQueryEmbeddings(api, "fake:query", db_path=str(blocker / "x.db"))
+
+    cache.embed_query("인구")
+    cache.embed_query("인구")
+
+    assert api.queries == ["인구"]
+    assert cache.stats()["hits"] == 1
+
+
+def test_async_query_shares_cache(api):
+    cache = CachedQueryEmbeddings(api, "fake:query")
+
+    first = asyncio.run(cache.aembed_query("고용률"))
+    second = cache.embed_query("고용률")
+
+    assert first == second == [3.0, 0.25]
+    assert api.queries == ["고용률"]
+
+
+def test_documents_are_not_cached(api):
+    cache = CachedQueryEmbeddings(api, "fake:query")
+
+    cache.embed_documents(["문서"])
+    cache.embed_documents(["문서"])
+
+    assert api.documents == ["문서", "문서"]
+    assert cache.stats()["size"] == 0
+
+
+def test_clear_empties_memory_and_disk(api, tmp_path):
+    db_path = str(tmp_path / "query_embeddings.db")
+    cache = CachedQueryEmbeddings(api, "fake:query", db_path=db_path)
+    cache.embed_query("인구")
+
+    cache.clear()
+    cache.embed_query("인구")
+
+    assert api.queries == ["인구", "인구"]
@@ -0,0 +1,83 @@
+"""database/embeddings.py 테스트 (로컬 해싱 임베딩, 제공자 선택)"""
+
+import math
+
+import pytest
+
+from config.settings import settings
+from database.embeddings import (
+    HashingEmbeddings,
+    create_embeddings,
+    get_embedding_namespace,
+)
+
+
+def cosine(a, b):
+    return sum(x * y for x, y in zip(a, b))  # 둘 다 L2 정규화됨
+
+
+def test_vectors_are_deterministic_and_normalized():
+    embeddings = HashingEmbeddings(dim=64)
+
+    vector = embeddings.embed_query("시도별 주민등록인구")
+
+    assert len(vector) == 64
+    assert vector == HashingEmbeddings(dim=64).embed_query("시도별 주민등록인구")
+    assert math.sqrt(sum(v * v for v in vector)) == pytest.approx(1.0)
+
+
+def test_documents_and_queries_share_space():
+    embeddings = HashingEmbeddings(dim=128)
+
+    documents = embeddings.embed_documents(["주민등록인구", "고용률"])
+
+    assert documents[0] == embeddings.embed_query("주민등록인구")
+    assert len(documents) == 2
+
+
+def test_similar_text_scores_higher():
+    embeddings = HashingEmbeddings()
+    query = embeddings.embed_query("서울 인구")
+
+    near = embeddings.embed_query("시도별 인구 서울")
+    far = embeddings.embed_query("수출입 무역수지")
+
+    assert cosine(query, near) > cosine(query, far)
+
+
+def test_text_without_words_is_zero_vector():
+    assert HashingEmbeddings(dim=8).embed_query("?! ...") == [0.0] * 8
+
+
+def test_local_provider(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_PROVIDER", "local")
+    monkeypatch.setattr(settings, "LOCAL_EMBEDDING_DIM", 32)
+
+    embeddings = create_embeddings("passage")
+
+    assert isinstance(embeddings, HashingEmbeddings)
+    assert embeddings.dim == 32
+    assert get_embedding_namespace("query") == get_embedding_namespace("passage")
+    assert get_embedding_namespace("query") == "local:hashing-32"
+
+
+def test_upstage_namespace_differs_by_kind(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_PROVIDER", "upstage")
+
+    assert get_embedding_namespace("query") == "upstage:embedding-query"
+    assert get_embedding_namespace("passage") == "upstage:embedding-passage"
+
+
+def test_invalid_kind_or_provider(monkeypatch):
+    with pytest.raises(ValueError):
+        create_embeddings("document")
+    monkeypatch.setattr(settings, "EMBEDDING_PROVIDER", "unknown")
+    with pytest.raises(ValueError):
+        create_embeddings("query")
+
+
+def test_vector_db_dir_is_separated_by_provider(monkeypatch):
+    monkeypatch.delenv("VECTOR_DB_DIR", raising=False)
+    monkeypatch.setattr(settings, "EMBEDDING_PROVIDER", "local")
+
+    assert settings.VECTOR_DB_DIR == "./embedding_db_local"
@@ -0,0 +1,200 @@
+"""agents/graph.py 테스트 (병렬 분기 합류, 진행 이벤트 스트리밍)"""
+
+import asyncio
+import threading
+import uuid
+
+import pytest
+from langgraph.graph import END
+from langgraph.types import Command
+
+import agents.graph as graph_module
+from config.settings import settings
+from database.query_result import QueryResult
+
+RESULT = QueryResult.from_rows(["행정구역", "인구"], [("서울", 9_400_000)])
+
+
+class FakeNodes:
+    """노드 이름 → (동기, 비동기) 가짜 노드 (실제 노드와 같은 방식으로 라우팅)"""
+
+    def __init__(self, scenario_type="table_view"):
+        self.scenario_type = scenario_type
+        self.calls = []
+        self.seen = {}  # 노드 → 실행 시점의 상태
+        self.thread_barrier = threading.Barrier(2, timeout=2)
+        self.async_barrier = None
+
+    def command(self, name, state):
+        self.calls.append(name)
+        self.seen[name] = dict(state)
+        if name == "classify_intent":
+            if self.scenario_type == "out_of_scope":
+                return Command(
+                    goto=END,
+                    update={"scenario_type": "out_of_scope", "final_response": "범위 외"},
+                )
+            return Command(
+                goto="search_tables",
+                update={"scenario_type": self.scenario_type, "reasoning": "테스트"},
+            )
+        if name == "search_tables":
+            return Command(
+                goto="generate_sql", update={"tables_info": [{"table_name": "인구"}]}
+            )
+        if name == "generate_sql":
+            return Command(goto="execute_sql", update={"sql_query": "SELECT 1"})
+        if name == "execute_sql":
+            return Command(
+                goto=["process_data", "plan_visualization"],
+                update={"query_result": RESULT},
+            )
+        if name == "process_data":
+            return Command(goto="analyze_insight", update={"processed_data": None})
+        if name == "analyze_insight":
+            return Command(update={"insight": "서울 인구 940만"})
+        if name == "plan_visualization":
+            return Command(update={"chart_spec": {"chart_type": "bar"}})
+        raise AssertionError(f"예상하지 못한 노드: {name}")
+
+    def respond(self, state, writer):
+        self.calls.append("generate_response")
+        self.seen["generate_response"] = dict(state)
+        for token in ("서울 ", "인구는 ", "940만"):
+            writer({"token": token})
+        return Command(goto=END, update={"final_response": "서울 인구는 940만"})
+
+    def sync_node(self, name):
+        if name == "generate_response":
+            return self.respond
+
+        def node(state):
+            if name in ("process_data", "plan_visualization"):
+                self.thread_barrier.wait()  # 두 분기가 동시에 실행 중이어야 통과
+            return self.command(name, state)
+
+        return node
+
+    def async_node(self, name):
+        if name == "generate_response":
+            return self.respond
+
+        async def node(state):
+            if name in ("process_data", "plan_visualization"):
+                if self.async_barrier is None:
+                    self.async_barrier = asyncio.Barrier(2)
+                await asyncio.wait_for(self.async_barrier.wait(), timeout=2)
+            return self.command(name, state)
+
+        return node
+
+
+@pytest.fixture
+def fake_nodes(monkeypatch):
+    nodes = FakeNodes()
+    for name in graph_module.NODES:
+        monkeypatch.setitem(
+            graph_module.NODES, name, (nodes.sync_node(name), nodes.async_node(name))
+        )
+    return nodes
+
+
+def new_config():
+    return {"configurable": {"thread_id": uuid.uuid4().hex}}
+
+
+def run(use_async, state):
+    graph = graph_module.create_stats_chatbot_graph(use_async=use_async)
+    if use_async:
+        return asyncio.run(graph.ainvoke(state, config=new_config()))
+    return graph.invoke(state, config=new_config())
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_branches_run_in_parallel_and_join(fake_nodes, use_async):
+    final_state = run(use_async, {"user_query": "2023년 서울 인구"})
+
+    assert fake_nodes.calls[:4] == [
+        "classify_intent",
+        "search_tables",
+        "generate_sql",
+        "execute_sql",
+    ]
+    assert set(fake_nodes.calls[4:6]) == {"process_data", "plan_visualization"}
+    assert fake_nodes.calls[6:] == ["analyze_insight", "generate_response"]
+
+    joined = fake_nodes.seen["generate_response"]
+    assert joined["insight"] == "서울 인구 940만"
+    assert joined["chart_spec"] == {"chart_type": "bar"}
+    assert final_state["final_response"] == "서울 인구는 940만"
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_out_of_scope_ends_before_search(fake_nodes, use_async):
+    fake_nodes.scenario_type = "out_of_scope"
+
+    final_state = run(use_async, {"user_query": "오늘 날씨 어때?"})
+
+    assert fake_nodes.calls == ["classify_intent"]
+    assert final_state["final_response"] == "범위 외"
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_stream_graph_yields_progress_tokens_then_done(
+    fake_nodes, monkeypatch, use_async
+):
+    monkeypatch.setattr(settings, "GRAPH_ASYNC_ENABLED", use_async)
+    graph = graph_module.create_stats_chatbot_graph(use_async=use_async)
+
+    events = list(
+        graph_module.stream_graph(graph, {"user_query": "서울 인구"}, new_config())
+    )
+
+    kinds = [kind for kind, _ in events]
+    progress = [value for kind, value in events if kind == "progress"]
+    tokens = [value for kind, value in events if kind == "token"]
+    assert kinds[-1] == "done" and kinds.count("done") == 1
+    assert events[-1][1]["final_response"] == "서울 인구는 940만"
+    last_progress = max(i for i, kind in enumerate(kinds) if kind == "progress")
+    assert kinds.index("token") > last_progress
+    assert tokens == ["서울 ", "인구는 ", "940만"]
+    assert progress[:4] == [
+        "🎯 질문 분류: table_view (테스트)",
+        "🔎 테이블 1개: 인구",
+        "🛠️ SQL 생성: `SELECT 1`",
+        "📊 조회 결과: 1행",
+    ]
+    assert set(progress[4:]) == {"💡 인사이트 분석 완료", "📈 차트 준비 완료"}
+
+
+def test_stream_graph_out_of_scope_only_done(fake_nodes, monkeypatch):
+    fake_nodes.scenario_type = "out_of_scope"
+    monkeypatch.setattr(settings, "GRAPH_ASYNC_ENABLED", True)
+    graph = graph_module.create_stats_chatbot_graph(use_async=True)
+
+    events = list(
+        graph_module.stream_graph(graph, {"user_query": "날씨"}, new_config())
+    )
+
+    assert [kind for kind, _ in events] == ["done"]
+    assert events[0][1]["final_response"] == "범위 외"
+
+
+@pytest.mark.parametrize(
+    "node, update, expected",
+    [
+        ("search_tables", {"tables_info": []}, "🔎 관련 테이블을 찾지 못했습니다"),
+        (
+            "execute_sql",
+            {"sql_error": "no such column: x\n..."},
+            "🔁 SQL 재시도: no such column: x",
+        ),
+        ("execute_sql", {}, None),
+        ("process_data", {"processed_data": None}, None),
+        ("classify_intent", {"scenario_type": "out_of_scope"}, None),
+        ("generate_response", {"final_response": "답변"}, None),
+        ("search_tables", None, None),
+    ],
+)
+def test_describe_progress(node, update, expected):
+    assert graph_module.describe_progress(node, update) == expected
@@ -0,0 +1,92 @@
+"""agents/intent_rules.py 테스트 (규칙 빠른 경로가 프롬프트 예시와 어긋나지 않는지)"""
+
+import pytest
+
+from agents.intent_rules import classify_by_rules
+from config.settings import settings
+
+# utils/prompts/intent.py의 예시 (경계 사례 포함)
+PROMPT_EXAMPLES = [
+    ("서울시 2023년 인구수 알려줘", "single_value"),
+    ("부산의 3년간 인구 데이터 보여줘", "table_view"),
+    ("전국 평균 인구수는?", "simple_aggregation"),
+    ("인구가 가장 많은 도시는?", "simple_aggregation"),
+    ("서울과 부산의 인구 차이는?", "simple_aggregation"),
+    ("2023년 상반기와 2022년 상반기의 월평균 인구 차이는?", "simple_aggregation"),
+    ("A 지역과 B 지역의 합계는?", "simple_aggregation"),
+    ("10 나누기 5는?", "simple_aggregation"),
+    ("서울 남자를 여자로 나눈 값은?", "simple_aggregation"),
+    ("2020년 인구의 10%는?", "simple_aggregation"),
+    ("A에서 B를 뺀 값은?", "simple_aggregation"),
+    ("2020년 대비 2023년 인구 증가율은?", "derived_calculation"),
+    ("남녀 성비는?", "derived_calculation"),
+    ("인구밀도는?", "derived_calculation"),
+    ("전년 대비 몇 퍼센트 증가했나요?", "derived_calculation"),
+    ("A가 B의 몇 배인가?", "derived_calculation"),
+    ("서울 남녀 성비는?", "derived_calculation"),
+    ("2020년 인구가 전체의 몇 %인가?", "derived_calculation"),
+    ("전년 대비 증가율은?", "derived_calculation"),
+    ("전국에서 인구 증가율이 가장 높은 상위 5개 도시는?", "multi_step_analysis"),
+    ("오늘 날씨 어때?", "out_of_scope"),
+    ("맛집 추천해줘", "out_of_scope"),
+    ("파이썬 코드 짜줘", "out_of_scope"),
+]
+
+# single_value로 확정하면 안 되는 질문 (표 조회/비교, 추이)
+NOT_SINGLE_VALUE = [
+    "2023년 서울과 부산 인구는?",
+    "2023년 인구의 10%는?",
+    "2023년 서울 인구의 2배는?",
+    "서울 인구 추이는?",
+]
+
+# 카테고리 키워드는 없지만 통계 질문일 수 있는 표현 (범위 외로 확정하면 안 됨)
+MAYBE_IN_SCOPE = ["영화 관람객 수", "게임 산업 매출 규모", "드라마 제작 편수"]
+
+
+@pytest.mark.parametrize("query, expected", PROMPT_EXAMPLES)
+def test_fast_path_agrees_with_prompt_examples(query, expected):
+    guess = classify_by_rules(query)
+
+    if guess.confidence >= settings.INTENT_RULE_MIN_CONFIDENCE:
+        assert guess.scenario_type == expected, guess.features
+
+
+@pytest.mark.parametrize("query", NOT_SINGLE_VALUE)
+def test_no_single_value_fast_path(query):
+    guess = classify_by_rules(query)
+
+    assert not (
+        guess.scenario_type == "single_value"
+        and guess.confidence >= settings.INTENT_RULE_MIN_CONFIDENCE
+    ), guess.features
+
+
+@pytest.mark.parametrize("query", ["서울시 2023년 인구수 알려줘", "2023년 서울 인구는?"])
+def test_single_value_fast_path(query):
+    guess = classify_by_rules(query)
+
+    assert guess.scenario_type == "single_value", guess.features
+    assert guess.confidence >= settings.INTENT_RULE_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("query", MAYBE_IN_SCOPE)
+def test_off_topic_subject_escalates(query):
+    guess = classify_by_rules(query)
+
+    assert guess.confidence < settings.INTENT_RULE_MIN_CONFIDENCE, guess.features
+
+
+@pytest.mark.parametrize("query", ["오늘 날씨 어때?", "맛집 추천해줘", "안녕"])
+def test_off_topic_request_fast_path(query):
+    guess = classify_by_rules(query)
+
+    assert guess.scenario_type == "out_of_scope"
+    assert guess.confidence >= settings.INTENT_RULE_MIN_CONFIDENCE
+
+
+def test_context_reference_escalates():
+    guess = classify_by_rules("그럼 부산은?", "user: 2023년 서울 인구 알려줘")
+
+    assert guess.scenario_type is None
+    assert guess.confidence == 0.0
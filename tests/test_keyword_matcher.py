@@ -0,0 +1,66 @@
+"""database/keyword_matcher.py 테스트"""
+
+from database.keyword_matcher import KeywordAutomaton
+
+
+def naive_find(keywords, text):
+    """키워드마다 부분 문자열 검사 (비교 기준)"""
+    return {keyword for keyword in keywords if keyword and keyword in text}
+
+
+def test_overlapping_keywords():
+    automaton = KeywordAutomaton({"취업": ["employment"], "취업자": ["employment"]})
+
+    assert automaton.find("2023년 취업자 수는?") == {"취업", "취업자"}
+
+
+def test_suffix_keywords_via_failure_links():
+    # "인구수" 경로에서 실패 링크로 "구수", "수"도 찾아야 함
+    automaton = KeywordAutomaton({"인구수": [], "구수": [], "수": [], "인구밀도": []})
+
+    assert automaton.find("서울 인구수") == {"인구수", "구수", "수"}
+    assert automaton.find("인구밀도") == {"인구밀도"}
+
+
+def test_no_match_and_empty_text():
+    automaton = KeywordAutomaton({"출생": ["birth"]})
+
+    assert automaton.find("오늘 날씨 어때?") == set()
+    assert automaton.find("") == set()
+
+
+def test_empty_keyword_is_ignored():
+    automaton = KeywordAutomaton({"": ["x"], "고용률": ["employment"]})
+
+    assert len(automaton) == 1
+    assert automaton.find("고용률") == {"고용률"}
+
+
+def test_labels():
+    automaton = KeywordAutomaton({"혼인": ["marriage", "Rule3"]})
+
+    assert automaton.labels("혼인") == frozenset({"marriage", "Rule3"})
+    assert automaton.labels("이혼") == frozenset()
+
+
+def test_matches_naive_scan():
+    keywords = [
+        "인구", "인구수", "구", "출생", "출생아", "생아", "사망", "사망자", "률", "고용률",
+    ]
+    automaton = KeywordAutomaton({keyword: [] for keyword in keywords})
+    texts = [
+        "2020년 출생아 수와 사망자 수 차이",
+        "인구수 대비 고용률은?",
+        "구구구 인인구",
+        "출생출생아생아",
+    ]
+
+    for text in texts:
+        assert automaton.find(text) == naive_find(keywords, text), text
+
+
+def test_regex_metacharacters_are_literal():
+    automaton = KeywordAutomaton({"(%)": [], "a.b": []})
+
+    assert automaton.find("비율(%)") == {"(%)"}
+    assert automaton.find("axb") == set()
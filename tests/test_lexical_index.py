@@ -0,0 +1,92 @@
+"""database/lexical_index.py 테스트 (BM25, RRF)"""
+
+import pytest
+
+from database.lexical_index import (
+    BM25Index,
+    is_confident,
+    reciprocal_rank_fusion,
+    tokenize_ko,
+)
+
+TABLE_METADATA = {
+    "population_stats": {
+        "keywords_ko": "인구, 총인구, 인구수",
+        "short_desc_ko": "시도별 총인구 통계",
+        "topic_main": "population",
+    },
+    "birth_stats": {
+        "keywords_ko": "출생, 출생아, 출산",
+        "short_desc_ko": "시도별 출생아 수",
+        "topic_main": "population",
+    },
+    "employment_stats": {
+        "keywords_ko": "고용률, 취업자, 실업률",
+        "short_desc_ko": "시도별 고용 지표",
+        "topic_main": "employment",
+        "columns_schema_outline": '{"고용률": "REAL", "시도": "TEXT"}',
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def index():
+    return BM25Index(TABLE_METADATA)
+
+
+def test_tokenize_ko_ngrams_skip_digits():
+    tokens = tokenize_ko("2023년 서울특별시")
+
+    assert "서울" in tokens and "서울특" in tokens
+    assert "2023" not in tokens and "20" not in tokens
+    assert "년" not in tokens  # 최소 길이 미만
+
+
+def test_search_with_josa(index):
+    # 조사가 붙어도 n-gram으로 매칭
+    results = index.search("서울의 출생아는 몇 명이야?", k=3)
+
+    assert results[0][0] == "birth_stats"
+    assert all(score > 0 for _, score in results)
+
+
+def test_search_reads_json_schema_fields(index):
+    results = index.search("고용률", k=3)
+
+    assert results[0][0] == "employment_stats"
+
+
+def test_search_topic_filter_and_limits(index):
+    assert index.search("고용률", k=3, topic_main="population") == []
+    assert index.search("출생아", k=0) == []
+    assert index.search("날씨", k=3) == []
+    assert len(index.search("시도별 통계", k=2)) <= 2
+
+
+def test_empty_index():
+    index = BM25Index({})
+
+    assert len(index) == 0
+    assert index.search("인구", k=5) == []
+
+
+def test_is_confident():
+    assert not is_confident([], min_score=1.0, min_ratio=1.5)
+    assert not is_confident([("a", 0.5)], min_score=1.0, min_ratio=1.5)
+    assert is_confident([("a", 2.0)], min_score=1.0, min_ratio=1.5)
+    assert is_confident([("a", 3.0), ("b", 1.0)], min_score=1.0, min_ratio=1.5)
+    assert not is_confident([("a", 3.0), ("b", 2.5)], min_score=1.0, min_ratio=1.5)
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "a"], ["b"]], k=60)
+    names = [name for name, _ in fused]
+
+    assert names == ["b", "a", "c"]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61 + 1 / 61)
+    assert fused[2][1] == pytest.approx(1 / 63)
+
+
+def test_reciprocal_rank_fusion_empty():
+    assert reciprocal_rank_fusion([]) == []
+    assert reciprocal_rank_fusion([[], []]) == []
@@ -0,0 +1,180 @@
+"""agents/llm_clients.py 테스트 (동시 호출 제한, 스트림 슬롯 반납)"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agents.llm_clients import ConcurrencyLimiter, PooledLLM
+
+
+class FakeChatModel:
+    """호출마다 delay초 걸리는 가짜 LLM 클라이언트 (동시 호출 수 기록)"""
+
+    def __init__(self, delay: float = 0.0, chunks=("안", "녕")):
+        self.delay = delay
+        self.chunks = chunks
+        self.temperature = 0.1
+        self._lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def _enter(self):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+    def _exit(self):
+        with self._lock:
+            self.running -= 1
+
+    def invoke(self, prompt):
+        self._enter()
+        try:
+            time.sleep(self.delay)
+            return f"응답: {prompt}"
+        finally:
+            self._exit()
+
+    async def ainvoke(self, prompt):
+        self._enter()
+        try:
+            await asyncio.sleep(self.delay)
+            return f"응답: {prompt}"
+        finally:
+            self._exit()
+
+    def stream(self, prompt):
+        yield from self.chunks
+
+    async def astream(self, prompt):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def test_invoke_respects_limit_across_threads():
+    client = FakeChatModel(delay=0.02)
+    llm = PooledLLM("fake/text", client, ConcurrencyLimiter(2))
+
+    threads = [threading.Thread(target=llm.invoke, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert client.max_running == 2
+    assert llm.limiter.active == 0
+    assert llm.metrics.snapshot()["calls"] == 6
+
+
+def test_ainvoke_waits_without_blocking_event_loop():
+    client = FakeChatModel(delay=0.02)
+    llm = PooledLLM("fake/text", client, ConcurrencyLimiter(2))
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.005)
+
+    async def run():
+        calls = asyncio.gather(*(llm.ainvoke(i) for i in range(6)))
+        results, _ = await asyncio.gather(calls, ticker())
+        return results
+
+    results = asyncio.run(run())
+
+    assert results == [f"응답: {i}" for i in range(6)]
+    assert client.max_running == 2
+    assert len(ticks) == 5  # 대기 중에도 다른 코루틴이 계속 실행됨
+    assert llm.limiter.active == 0
+
+
+def test_sync_and_async_callers_share_limit():
+    client = FakeChatModel(delay=0.02)
+    llm = PooledLLM("fake/text", client, ConcurrencyLimiter(2))
+
+    async def run():
+        return await asyncio.gather(*(llm.ainvoke(i) for i in range(4)))
+
+    threads = [threading.Thread(target=llm.invoke, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    asyncio.run(run())
+    for thread in threads:
+        thread.join()
+
+    assert client.max_running == 2
+    assert llm.limiter.active == 0
+
+
+def test_cancelled_waiter_leaves_queue():
+    limiter = ConcurrencyLimiter(1)
+
+    async def run():
+        limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire_async())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+        await asyncio.wait_for(limiter.acquire_async(), timeout=1)
+        limiter.release()
+
+    asyncio.run(run())
+
+    assert limiter.active == 0
+
+
+def test_cancel_after_hand_over_returns_slot():
+    limiter = ConcurrencyLimiter(1)
+
+    async def run():
+        limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire_async())
+        await asyncio.sleep(0)
+        limiter.release()  # 슬롯이 waiter에게 넘어가는 중에 취소
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert limiter.active == 0
+
+
+def test_stream_releases_slot_when_iteration_ends():
+    llm = PooledLLM("fake/text", FakeChatModel(), ConcurrencyLimiter(1))
+
+    stream = llm.stream("질문")
+    assert next(stream) == "안"
+    assert llm.limiter.active == 1
+    assert list(stream) == ["녕"]
+
+    assert llm.limiter.active == 0
+    assert llm.metrics.snapshot()["in_flight"] == 0
+
+
+def test_stream_releases_slot_when_closed_early():
+    llm = PooledLLM("fake/text", FakeChatModel(), ConcurrencyLimiter(1))
+
+    stream = llm.stream("질문")
+    next(stream)
+    stream.close()
+
+    assert llm.limiter.active == 0
+    assert llm.metrics.snapshot()["errors"] == 0
+    assert llm.invoke("다음") == "응답: 다음"
+
+
+def test_astream_releases_slot_when_iteration_ends():
+    llm = PooledLLM("fake/text", FakeChatModel(), ConcurrencyLimiter(1))
+
+    async def run():
+        return [chunk async for chunk in llm.astream("질문")]
+
+    assert asyncio.run(run()) == ["안", "녕"]
+    assert llm.limiter.active == 0
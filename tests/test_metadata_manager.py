@@ -0,0 +1,240 @@
+"""database/metadata_manager.py 테스트 (불변 상세 레코드, 프롬프트 블록, 스냅샷 새로고침)"""
+
+import dataclasses
+import json
+import sqlite3
+import time
+from types import MappingProxyType, SimpleNamespace
+
+import pytest
+
+import database.metadata_manager as metadata_manager
+from agents.nodes.sql import format_tables_info
+from config.settings import settings
+from database.connection import db_manager
+from database.metadata_manager import (
+    DETAIL_FIELDS,
+    MetadataManager,
+    build_snapshot,
+    build_table_detail,
+    render_prompt_block,
+)
+
+
+def metadata_row(table_name, **overrides):
+    row = {
+        "table_name": table_name,
+        "short_desc_ko": f"{table_name} 설명",
+        "topic_main": "인구",
+        "topic_sub": "주민등록",
+        "keywords_ko": "인구, 주민등록",
+        "columns_schema_outline": json.dumps(["행정구역", "년월", "값"]),
+        "column_schema_detail": json.dumps({"행정구역": "시도명"}, ensure_ascii=False),
+        "example_queries_ko": "서울 인구",
+        "caution_ko": "없음",
+        "period_start": "2020-01",
+        "period_end": "2024-12",
+        "geo_level": "시도",
+        "time_freq": "month",
+        "value_unit": "명",
+        "org_id": "101",
+        "tbl_id": "DT_1B04005N",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_table_detail_reads_like_a_dict():
+    detail = build_table_detail("population", metadata_row("population"))
+
+    assert detail["columns"] == "행정구역, 년월, 값"
+    assert detail["column_detail"] == {"행정구역": "시도명"}
+    assert detail["period"] == "2020-01 ~ 2024-12"
+    assert detail.get("caution") == "없음"
+    assert detail.get("distance") is None
+    assert list(detail) == list(DETAIL_FIELDS)
+    assert dict(detail)["table_name"] == "population"
+    with pytest.raises(KeyError):
+        detail["distance"]
+
+
+@pytest.mark.parametrize(
+    "time_freq, period_column", [("year", "년도"), ("month", "년월"), ("", "년월")]
+)
+def test_period_column_follows_time_freq(time_freq, period_column):
+    detail = build_table_detail("t", metadata_row("t", time_freq=time_freq))
+
+    assert detail["period_column"] == period_column
+
+
+def test_table_detail_is_immutable():
+    detail = build_table_detail("population", metadata_row("population"))
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        detail.caution = "변경"
+
+
+def test_hit_adds_distance_and_shares_detail():
+    detail = build_table_detail("population", metadata_row("population"))
+
+    hit = detail.with_distance(0.25)
+
+    assert hit["distance"] == 0.25
+    assert hit["description"] == detail["description"]
+    assert len(hit) == len(detail) + 1
+    assert list(hit)[-1] == "distance"
+    assert hit.detail is detail
+    assert "distance" not in detail.with_distance(None)
+
+
+
+def test_prompt_block_contents():
+    block = render_prompt_block(
+        build_table_detail("births", metadata_row("births", time_freq="year"))
+    )
+
+    assert block.splitlines()[0] == "### births"
+    assert "시간컬럼: 년도" in block
+    assert "**값의 단위: 명**" in block
+    assert render_prompt_block({"table_name": "t", "description": "d", "columns": "c"})
+
+
+def test_snapshot_prerenders_prompt_blocks():
+    snapshot = build_snapshot({"births": metadata_row("births")}, version=1)
+
+    assert snapshot.prompt_blocks["births"] == render_prompt_block(
+        snapshot.details["births"]
+    )
+
+
+@pytest.fixture
+def current_snapshot(monkeypatch):
+    snapshot = build_snapshot({"births": metadata_row("births")}, version=2)
+    snapshot = dataclasses.replace(
+        snapshot, prompt_blocks=MappingProxyType({"births": "### births (사전 렌더링)"})
+    )
+    manager = SimpleNamespace(snapshot=snapshot)
+    monkeypatch.setattr(metadata_manager, "get_metadata_manager", lambda: manager)
+    monkeypatch.setattr(settings, "VALUE_DICT_PROMPT_VALUES", 0)
+    return snapshot
+
+
+def test_format_tables_info_reuses_current_blocks(current_snapshot):
+    hit = current_snapshot.details["births"].with_distance(0.1)
+
+    assert format_tables_info([hit]) == "### births (사전 렌더링)"
+
+
+def test_format_tables_info_renders_stale_or_unknown_tables(current_snapshot):
+    stale = build_table_detail("births", metadata_row("births", caution_ko="옛 주의"))
+    unknown = {"table_name": "other", "description": "d", "columns": "c"}
+
+    text = format_tables_info([stale.with_distance(0.1), unknown])
+
+    assert "주의사항: 옛 주의" in text  # 검색 시점의 상세 정보 유지
+    assert "### other" in text
+    assert "사전 렌더링" not in text
+
+
+def test_snapshot_skips_unparsable_rows_and_is_read_only():
+    rows = {
+        "population": metadata_row("population"),
+        "broken": metadata_row("broken", columns_schema_outline="[깨진 JSON"),
+    }
+
+    snapshot = build_snapshot(rows, version=1)
+
+    assert list(snapshot.details) == ["population"]
+    assert set(snapshot.rows) == {"population", "broken"}
+    with pytest.raises(TypeError):
+        snapshot.details["other"] = snapshot.details["population"]
+
+
+def test_checksum_depends_only_on_content():
+    rows = {"a": metadata_row("a"), "b": metadata_row("b")}
+
+    same = build_snapshot(dict(reversed(rows.items())), version=2)
+    changed = build_snapshot({**rows, "b": metadata_row("b", caution_ko="주의")}, 3)
+
+    assert build_snapshot(rows, version=1).checksum == same.checksum
+    assert changed.checksum != same.checksum
+
+
+class MetadataDB:
+    """tables_metadata만 있는 SQLite 파일 (연결마다 새로 열어 풀 연결처럼 사용)"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        row = metadata_row("population")
+        self.columns = list(row)
+        with self.connect() as conn:
+            conn.execute(f"CREATE TABLE tables_metadata ({', '.join(self.columns)})")
+        self.put(row)
+
+    def connect(self):
+        return sqlite3.connect(self.path)
+
+    def put(self, row):
+        placeholders = ", ".join("?" for _ in self.columns)
+        with self.connect() as conn:
+            conn.execute(
+                "DELETE FROM tables_metadata WHERE table_name = ?", (row["table_name"],)
+            )
+            conn.execute(
+                f"INSERT INTO tables_metadata VALUES ({placeholders})",
+                [row[column] for column in self.columns],
+            )
+
+    def execute(self, sql):
+        with self.connect() as conn:
+            conn.execute(sql)
+
+
+@pytest.fixture
+def metadata_db(tmp_path, monkeypatch):
+    db = MetadataDB(tmp_path / "metadata.db")
+    engine = SimpleNamespace(raw_connection=db.connect)
+    monkeypatch.setattr(db_manager, "get_db", lambda: SimpleNamespace(_engine=engine))
+    return db
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "시간 초과"
+        time.sleep(0.01)
+
+
+def test_refresh_swaps_snapshot_only_when_content_changes(metadata_db):
+    manager = MetadataManager(refresh_interval=0)
+    held = manager.snapshot
+
+    assert manager.refresh() is False
+    metadata_db.put(metadata_row("population", caution_ko="새 주의사항"))
+    metadata_db.put(metadata_row("births"))
+    assert manager.refresh() is True
+
+    assert manager.version == 2
+    assert manager.get_detailed_info("population")["caution"] == "새 주의사항"
+    assert manager.get_table_names() == ["births", "population"]
+    assert "births" in manager.get_prompt_block("births")
+    # 요청 중에 잡아 둔 스냅샷은 그대로
+    assert held.version == 1
+    assert held.details["population"]["caution"] == "없음"
+    assert list(held.rows) == ["population"]
+
+
+def test_auto_refresh_survives_failures(metadata_db):
+    manager = MetadataManager(refresh_interval=0.02)
+    try:
+        metadata_db.execute("ALTER TABLE tables_metadata RENAME TO broken")
+        time.sleep(0.1)
+        assert manager.version == 1  # 실패해도 기존 스냅샷 유지
+        assert manager.get_detailed_info("population") is not None
+
+        metadata_db.execute("ALTER TABLE broken RENAME TO tables_metadata")
+        metadata_db.put(metadata_row("population", value_unit="천명"))
+        wait_for(lambda: manager.version == 2)
+        assert manager.get_detailed_info("population")["value_unit"] == "천명"
+    finally:
+        manager.stop_auto_refresh()
@@ -0,0 +1,186 @@
+"""database/query_guard.py 테스트 (LIMIT 추가, 실행 계획 비용 추정)"""
+
+import sqlite3
+
+import pytest
+
+from database.query_guard import (
+    DEFAULT_UNKNOWN_ROWS,
+    QueryGuard,
+    QueryRejected,
+    apply_row_limit,
+    estimate_plan_cost,
+    table_aliases,
+)
+
+ROWS = {"pop": 100_000, "birth": 5_000}
+
+
+def row_count(table_name):
+    return ROWS.get(table_name)
+
+
+def test_apply_row_limit_adds_limit():
+    assert apply_row_limit("SELECT * FROM t", 100) == "SELECT * FROM t\nLIMIT 100"
+    assert apply_row_limit("SELECT * FROM t;  ", 5) == "SELECT * FROM t\nLIMIT 5"
+
+
+def test_apply_row_limit_after_trailing_comment():
+    limited = apply_row_limit("SELECT * FROM t -- 주석", 10)
+
+    assert limited.endswith("\nLIMIT 10")
+
+
+def test_apply_row_limit_keeps_existing_top_level_limit():
+    sql = "SELECT * FROM t ORDER BY 값 DESC LIMIT 5"
+
+    assert apply_row_limit(sql, 100) is sql
+
+
+def test_apply_row_limit_ignores_subquery_limit():
+    sql = "SELECT * FROM t WHERE id IN (SELECT id FROM u LIMIT 3)"
+
+    assert apply_row_limit(sql, 10).endswith("\nLIMIT 10")
+
+
+def test_apply_row_limit_skips_non_select_and_disabled():
+    assert apply_row_limit("DELETE FROM t", 10) == "DELETE FROM t"
+    assert apply_row_limit("SELECT 1", 0) == "SELECT 1"
+    multi = "SELECT 1; SELECT 2"
+    assert apply_row_limit(multi, 10) == multi
+
+
+def test_apply_row_limit_with_cte():
+    sql = "WITH a AS (SELECT * FROM t LIMIT 1) SELECT * FROM a"
+
+    assert apply_row_limit(sql, 10).endswith("\nLIMIT 10")
+
+
+def test_table_aliases():
+    join = 'SELECT * FROM pop p JOIN "birth" AS b ON p.id = b.id WHERE 1'
+    comma = "SELECT * FROM pop p, birth WHERE p.id = birth.id"
+
+    assert table_aliases(join) == {"p": "pop", "b": "birth"}
+    assert table_aliases(comma) == {"p": "pop", "birth": "birth"}
+
+
+def test_full_scan_cost():
+    plan = [(2, 0, 0, "SCAN pop")]
+
+    cost = estimate_plan_cost(plan, row_count)
+
+    assert cost.total == 100_000
+    assert cost.full_scans == ["pop"]
+
+
+def test_search_uses_index_selectivity():
+    plan = [(2, 0, 0, "SEARCH pop USING INDEX idx (행정구역=? AND 년월>?)")]
+
+    cost = estimate_plan_cost(plan, row_count)
+
+    assert cost.total == pytest.approx(100_000 / 10 / 4)
+    assert cost.full_scans == []
+
+
+def test_nested_loop_multiplies():
+    plan = [
+        (2, 0, 0, "SCAN p"),
+        (3, 0, 0, "SEARCH b USING INDEX idx (id=?)"),
+    ]
+
+    cost = estimate_plan_cost(plan, row_count, {"p": "pop", "b": "birth"})
+
+    assert cost.total == pytest.approx(100_000 + 100_000 * 500)
+
+
+def test_correlated_subquery_repeats_per_outer_row():
+    plan = [
+        (2, 0, 0, "SCAN birth"),
+        (4, 0, 0, "CORRELATED SCALAR SUBQUERY 1"),
+        (7, 4, 0, "SCAN pop"),
+    ]
+
+    cost = estimate_plan_cost(plan, row_count)
+
+    assert cost.correlated_subqueries == 1
+    assert cost.total == pytest.approx(5_000 + 5_000 * 100_000)
+
+
+def test_unknown_tables_use_default_rows():
+    plan = [(2, 0, 0, "SCAN cte_result"), (5, 0, 0, "USE TEMP B-TREE FOR ORDER BY")]
+
+    cost = estimate_plan_cost(plan, row_count)
+
+    assert cost.total == DEFAULT_UNKNOWN_ROWS * 2
+    assert cost.full_scans == []
+    assert cost.temp_btrees == 1
+
+
+def test_guard_rejects_expensive_and_limits_cheap_queries():
+    guard = QueryGuard(max_cost=50_000, row_count_fn=row_count)
+
+    with pytest.raises(QueryRejected) as exc:
+        guard.prepare("SELECT * FROM pop", lambda sql: [(2, 0, 0, "SCAN pop")])
+    assert "전체 스캔: pop" in str(exc.value)
+
+    sql = guard.prepare(
+        "SELECT * FROM birth", lambda sql: [(2, 0, 0, "SCAN birth")], max_rows=100
+    )
+    assert sql.endswith("\nLIMIT 101")
+    assert guard.stats()["rejected"] == 1
+
+
+def test_guard_caches_row_counts_per_data_version():
+    calls = []
+    version = ["v1"]
+
+    def counting(table_name):
+        calls.append(table_name)
+        return row_count(table_name)
+
+    guard = QueryGuard(max_cost=0, row_count_fn=counting, version_fn=lambda: version[0])
+    guard.table_rows("pop")
+    guard.table_rows("pop")
+    assert calls == ["pop"]
+
+    version[0] = "v2"
+    guard.table_rows("pop")
+    assert calls == ["pop", "pop"]
+
+
+def test_estimate_with_sqlite_plan():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE pop (행정구역 TEXT, 년월 TEXT, 값 INTEGER)")
+    conn.execute("CREATE INDEX idx_pop ON pop (행정구역, 년월)")
+
+    def explain(sql):
+        return conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+
+    scan = estimate_plan_cost(explain("SELECT SUM(값) FROM pop"), row_count)
+    search = estimate_plan_cost(
+        explain("SELECT 값 FROM pop WHERE 행정구역 = '서울' AND 년월 > '2020'"),
+        row_count,
+    )
+    conn.close()
+
+    assert scan.full_scans == ["pop"]
+    assert search.total < scan.total
+
+
+def test_guard_skips_explain_without_row_stats():
+    calls = []
+
+    def explain(sql):
+        calls.append(sql)
+        return [(2, 0, 0, "SCAN events")]
+
+    guard = QueryGuard(max_cost=10, row_count_fn=row_count)
+
+    sql = guard.prepare("SELECT * FROM events", explain, max_rows=5)
+
+    assert sql.endswith("\nLIMIT 6")
+    assert calls == []
+    assert guard.stats()["unestimated"] == 1
+    with pytest.raises(QueryRejected):
+        guard.prepare("SELECT * FROM events e JOIN pop p USING (id)", explain)
+    assert len(calls) == 1
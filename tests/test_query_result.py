@@ -0,0 +1,80 @@
+"""database/query_result.py 테스트 (컬럼 단위 결과, 행 접근, 커서 읽기)"""
+
+import sqlite3
+
+import pytest
+
+from database.query_result import QueryResult
+
+ROWS = [("서울특별시", 2023, 9_400_000), ("부산광역시", 2023, 3_300_000)]
+
+
+@pytest.fixture
+def result():
+    return QueryResult.from_rows(["행정구역", "년도", "인구"], ROWS)
+
+
+@pytest.fixture
+def cursor():
+    conn = sqlite3.connect(":memory:")
+    cursor = conn.execute(
+        "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 5) "
+        "SELECT i AS 번호, i * 10 AS 값 FROM n"
+    )
+    yield cursor
+    conn.close()
+
+
+def test_rows_and_columns(result):
+    assert result.columns == ("행정구역", "년도", "인구")
+    assert result.column("인구") == [9_400_000, 3_300_000]
+    assert len(result) == 2
+    assert result[0] == ("서울특별시", 2023, 9_400_000)
+    assert result[-1][0] == "부산광역시"
+    assert result[:1] == [ROWS[0]]
+    assert list(result) == ROWS
+    assert result.rows() == ROWS
+
+
+def test_str_matches_db_run_format(result):
+    assert str(result) == str(ROWS)
+    assert repr(QueryResult.from_rows(["a"], [])) == "[]"
+
+
+def test_empty_result_keeps_columns():
+    empty = QueryResult.from_rows(["a", "b"], [])
+
+    assert empty.columns == ("a", "b")
+    assert len(empty) == 0
+    assert not empty
+    assert empty.column("b") == []
+
+
+def test_from_cursor_truncates_at_max_rows(cursor):
+    result = QueryResult.from_cursor(["번호", "값"], cursor, max_rows=3)
+
+    assert result.rows() == [(1, 10), (2, 20), (3, 30)]
+    assert result.truncated
+
+
+def test_from_cursor_without_limit(cursor):
+    result = QueryResult.from_cursor(["번호", "값"], cursor)
+
+    assert len(result) == 5
+    assert not result.truncated
+
+
+def test_from_cursor_exact_max_rows_is_not_truncated(cursor):
+    result = QueryResult.from_cursor(["번호", "값"], cursor, max_rows=5)
+
+    assert len(result) == 5
+    assert not result.truncated
+
+
+def test_to_dataframe_keeps_duplicate_columns():
+    result = QueryResult.from_rows(["값", "값"], [(1, 2), (3, 4)])
+
+    df = result.to_dataframe()
+
+    assert list(df.columns) == ["값", "값"]
+    assert df.iloc[1].tolist() == [3, 4]
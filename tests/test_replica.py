@@ -0,0 +1,115 @@
+"""database/replica.py 테스트 (로컬 복제본 실행, 최신성 판단, 동기화 세대)"""
+
+import sqlite3
+import time
+
+import libsql_experimental
+import pytest
+
+from database.replica import LocalReplica
+
+
+class FakeLibsqlConnection:
+    """sync() 호출 시 on_sync를 실행하는 가짜 libsql 연결"""
+
+    def __init__(self, on_sync):
+        self.on_sync = on_sync
+
+    def sync(self):
+        self.on_sync()
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def replica_file(tmp_path):
+    path = tmp_path / "replica.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE population (행정구역 TEXT, 값 INTEGER)")
+        conn.execute("INSERT INTO population VALUES ('서울특별시', 9400000)")
+    return path
+
+
+@pytest.fixture
+def replica(replica_file):
+    return LocalReplica(str(replica_file), "libsql://example", "token", 60)
+
+
+def use_sync(monkeypatch, on_sync):
+    monkeypatch.setattr(
+        libsql_experimental,
+        "connect",
+        lambda path, sync_url, auth_token: FakeLibsqlConnection(on_sync),
+    )
+
+
+def test_never_synced_replica_is_not_used(replica):
+    assert replica.try_execute("SELECT * FROM population") is None
+    assert replica.status()["stale_misses"] == 1
+    assert replica.status()["fresh"] is False
+
+
+def test_fresh_replica_serves_queries(replica):
+    replica.last_synced = time.time()
+
+    result = replica.try_execute("SELECT 행정구역, 값 FROM population")
+
+    assert result.rows() == [("서울특별시", 9_400_000)]
+    assert result.columns == ("행정구역", "값")
+    assert replica.status()["hit_rate"] == 1.0
+
+
+def test_stale_replica_falls_back(replica):
+    replica.last_synced = time.time() - 120  # max_staleness 60초 초과
+
+    assert replica.try_execute("SELECT 1") is None
+    assert replica.status()["stale_misses"] == 1
+
+
+def test_replica_is_read_only_and_errors_fall_back(replica, replica_file):
+    replica.last_synced = time.time()
+
+    assert replica.try_execute("DELETE FROM population") is None
+    assert replica.try_execute("SELECT * FROM no_such_table") is None
+    assert replica.status()["error_misses"] == 2
+    with sqlite3.connect(replica_file) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM population").fetchone() == (1,)
+
+
+def test_sync_bumps_generation_only_when_file_changes(
+    replica, replica_file, monkeypatch
+):
+    def write_row():
+        with sqlite3.connect(replica_file) as conn:
+            conn.execute("INSERT INTO population VALUES ('부산광역시', 3300000)")
+
+    use_sync(monkeypatch, lambda: None)
+    assert replica.sync() is True
+    assert (replica.syncs, replica.generation) == (1, 0)
+    assert replica.is_fresh()
+
+    use_sync(monkeypatch, write_row)
+    replica.sync()
+    assert replica.generation == 1
+
+
+def test_failed_sync_keeps_previous_state(replica, monkeypatch):
+    def fail():
+        raise ConnectionError("네트워크 오류")
+
+    use_sync(monkeypatch, fail)
+
+    assert replica.sync() is False
+    assert replica.last_synced is None
+    assert "네트워크 오류" in replica.status()["last_sync_error"]
+
+
+def test_auto_sync_runs_once_immediately(replica, monkeypatch):
+    use_sync(monkeypatch, lambda: None)
+
+    replica.start_auto_sync(interval=0)
+    replica._sync_thread.join(timeout=2)
+    replica.stop_auto_sync()
+
+    assert replica.syncs == 1
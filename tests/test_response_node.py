@@ -0,0 +1,33 @@
+"""agents/nodes/response.py 테스트 (잘린 결과 안내, 출처 섹션)"""
+
+from agents.nodes.response import _finish_response, _response_prompt
+from database.query_result import QueryResult
+
+RESULT = QueryResult.from_rows(["행정구역", "값"], [("서울", 1), ("부산", 2)])
+
+
+def state(truncated):
+    return {
+        "user_query": "시도별 인구",
+        "query_result": RESULT,
+        "result_truncated": truncated,
+        "tables_info": [
+            {"description": "주민등록인구", "org_id": "101", "tbl_id": "DT_1"}
+        ],
+    }
+
+
+def test_truncated_result_is_mentioned():
+    command = _finish_response(state(True), "답변")
+
+    response = command.update["final_response"]
+    assert response.startswith("답변\n\n⚠️ 조회 결과가 많아 처음 2행만")
+    assert "orgId=101&tblId=DT_1" in response
+    assert "처음 2행만" in _response_prompt(state(True))
+
+
+def test_complete_result_has_no_notice():
+    command = _finish_response(state(False), "답변")
+
+    assert "⚠️" not in command.update["final_response"]
+    assert "처음" not in _response_prompt(state(False))
@@ -0,0 +1,132 @@
+"""database/result_cache.py 테스트 (SQL 정규화, 결과 캐시)"""
+
+from database.query_result import QueryResult
+from database.result_cache import QueryResultCache, is_cacheable_sql, normalize_sql
+
+
+class CountingExecutor:
+    """실행 횟수를 세는 가짜 실행 함수"""
+
+    def __init__(self, n_rows: int = 1):
+        self.calls = 0
+        self.n_rows = n_rows
+
+    def __call__(self, sql: str, max_rows: int) -> QueryResult:
+        self.calls += 1
+        return QueryResult.from_rows(["값"], [(i,) for i in range(self.n_rows)])
+
+
+def test_normalize_whitespace_case_comments_semicolon():
+    a = "SELECT  값\nFROM t -- 주석\nWHERE 시점 = '2023';"
+    b = "select 값 from T /* 다른 주석 */ where 시점='2023'"
+
+    assert normalize_sql(a) == normalize_sql(b)
+
+
+def test_normalize_keeps_literal_case_and_spacing():
+    assert normalize_sql("SELECT 'Seoul  A'") != normalize_sql("SELECT 'seoul a'")
+    assert normalize_sql('SELECT "Col" FROM t') != normalize_sql('SELECT "col" FROM t')
+
+
+def test_normalize_sorts_and_dedupes_in_lists():
+    a = "SELECT * FROM t WHERE 지역 IN ('부산', '서울', '부산')"
+    b = "SELECT * FROM t WHERE 지역 IN ('서울','부산')"
+
+    assert normalize_sql(a) == normalize_sql(b)
+
+
+def test_normalize_leaves_subquery_in_alone():
+    sql = "SELECT * FROM t WHERE id IN (SELECT id FROM u ORDER BY id)"
+
+    assert "select id from u order by id" in normalize_sql(sql)
+
+
+def test_is_cacheable_sql():
+    assert is_cacheable_sql(normalize_sql("SELECT 1"))
+    assert is_cacheable_sql(normalize_sql("WITH a AS (SELECT 1) SELECT * FROM a"))
+    assert not is_cacheable_sql(normalize_sql("DELETE FROM t"))
+    assert not is_cacheable_sql(normalize_sql("PRAGMA table_info(t)"))
+
+
+def test_cache_hits_equivalent_sql():
+    cache = QueryResultCache(max_size=8, ttl=0)
+    execute = CountingExecutor()
+
+    first = cache.get_or_execute("SELECT 값 FROM t", execute)
+    second = cache.get_or_execute("select  값  from t;", execute)
+
+    assert execute.calls == 1
+    assert second is first
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_skips_writes():
+    cache = QueryResultCache(max_size=8, ttl=0)
+    execute = CountingExecutor()
+
+    cache.get_or_execute("UPDATE t SET 값 = 1", execute)
+    cache.get_or_execute("UPDATE t SET 값 = 1", execute)
+
+    assert execute.calls == 2
+
+
+def test_cache_key_includes_data_version_and_max_rows():
+    version = ["v1"]
+    cache = QueryResultCache(max_size=8, ttl=0, version_fn=lambda: version[0])
+    execute = CountingExecutor()
+
+    cache.get_or_execute("SELECT 1", execute, max_rows=10)
+    cache.get_or_execute("SELECT 1", execute, max_rows=20)
+    assert execute.calls == 2
+
+    version[0] = "v2"
+    cache.get_or_execute("SELECT 1", execute, max_rows=10)
+    assert execute.calls == 3
+
+
+def test_cache_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("database.result_cache.time.monotonic", lambda: now[0])
+    cache = QueryResultCache(max_size=8, ttl=60)
+    execute = CountingExecutor()
+
+    cache.get_or_execute("SELECT 1", execute)
+    now[0] += 30
+    cache.get_or_execute("SELECT 1", execute)
+    now[0] += 61
+    cache.get_or_execute("SELECT 1", execute)
+
+    assert execute.calls == 2
+    assert cache.stats()["expired"] == 1
+
+
+def test_cache_lru_eviction_and_large_results():
+    cache = QueryResultCache(max_size=2, ttl=0, max_rows=5)
+    execute = CountingExecutor()
+
+    for sql in ("SELECT 1", "SELECT 2", "SELECT 1", "SELECT 3"):
+        cache.get_or_execute(sql, execute)
+    assert cache.stats()["evictions"] == 1
+
+    cache.get_or_execute("SELECT 1", execute)  # 최근 사용 → 남아 있음
+    assert execute.calls == 3
+
+    big = CountingExecutor(n_rows=6)
+    cache.get_or_execute("SELECT 4", big)
+    cache.get_or_execute("SELECT 4", big)
+    assert big.calls == 2  # max_rows 초과 결과는 캐시하지 않음
+
+
+def test_invalidate_and_disabled_cache():
+    cache = QueryResultCache(max_size=8, ttl=0)
+    execute = CountingExecutor()
+
+    cache.get_or_execute("SELECT 1", execute)
+    cache.invalidate()
+    cache.get_or_execute("SELECT 1", execute)
+    assert execute.calls == 2
+
+    disabled = QueryResultCache(max_size=0)
+    disabled.get_or_execute("SELECT 1", execute)
+    disabled.get_or_execute("SELECT 1", execute)
+    assert execute.calls == 4
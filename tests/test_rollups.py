@@ -0,0 +1,195 @@
+"""database/rollups.py 테스트 (연령대 묶음, 롤업 생성)"""
+
+import json
+import sqlite3
+
+import pytest
+
+from database.rollups import (
+    build_age_groups,
+    build_rollups_for_table,
+    is_additive,
+    is_sido_level,
+    parse_age_range,
+    preferred_rollup_names,
+)
+
+FIVE_YEAR_AGES = [f"{n}-{n + 4}" for n in range(0, 100, 5)] + ["100+"]
+
+METADATA_COLUMNS = [
+    "table_name",
+    "short_desc_ko",
+    "value_unit",
+    "keywords_ko",
+    "columns_schema_outline",
+    "column_schema_detail",
+    "example_queries_ko",
+    "caution_ko",
+    "time_freq",
+    "period_start",
+    "period_end",
+    "geo_level",
+]
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"CREATE TABLE tables_metadata ({', '.join(METADATA_COLUMNS)})")
+    yield conn
+    conn.close()
+
+
+def metadata_row(conn, table_name):
+    row = conn.execute(
+        "SELECT column_schema_detail, caution_ko FROM tables_metadata "
+        "WHERE table_name = ?",
+        (table_name,),
+    ).fetchone()
+    return json.loads(row[0]), row[1]
+
+
+def test_parse_age_range():
+    assert parse_age_range("20-24") == (20, 24)
+    assert parse_age_range("20~24세") == (20, 24)
+    assert parse_age_range("100+") == (100, 200)
+    assert parse_age_range("85세 이상") == (85, 200)
+    assert parse_age_range("계") is None
+    assert parse_age_range("30-25") is None
+
+
+def test_build_age_groups_five_year_bands():
+    groups = build_age_groups(["계"] + FIVE_YEAR_AGES)
+
+    assert groups["20대"] == ["20-24", "25-29"]
+    assert groups["90대"] == ["90-94", "95-99"]
+    assert groups["60대 이상"][0] == "60-64"
+    assert groups["60대 이상"][-1] == "100+"
+    assert "0대" not in groups
+
+
+def test_build_age_groups_incomplete_decade_is_skipped():
+    groups = build_age_groups(["20-24", "30-34", "35-39"])
+
+    assert "20대" not in groups
+    assert groups["30대"] == ["30-34", "35-39"]
+
+
+def test_build_age_groups_overlapping_or_missing():
+    assert build_age_groups(["15-64", "15-19", "20-24"]) is None
+    assert build_age_groups(["계", "남자"]) is None
+    assert build_age_groups([]) is None
+
+
+def test_open_ended_group_needs_open_top_band():
+    groups = build_age_groups(["60-64", "65-69", "70-74", "75-79"])
+
+    assert "60대 이상" not in groups
+
+
+def test_is_additive():
+    assert is_additive({"value_unit": "명"})
+    assert is_additive({})
+    for unit in ("%", "퍼센트", "고용률", "명/㎢", "평균 연령", "지수"):
+        assert not is_additive({"value_unit": unit}), unit
+
+
+def test_preferred_rollup_names():
+    assert preferred_rollup_names("20대 인구", "pop") == ["pop_age_decade"]
+    assert preferred_rollup_names("연도별 전국 출생", "birth") == [
+        "birth_yearly",
+        "birth_national",
+    ]
+    assert preferred_rollup_names("1000대 기업", "corp", age_related=False) == []
+    assert preferred_rollup_names("20대 인구", "pop_age_decade") == []
+
+
+def test_yearly_rollup_sums_additive_values(conn):
+    conn.execute('CREATE TABLE births ("행정구역" TEXT, "년월" TEXT, "값" INTEGER)')
+    conn.executemany(
+        "INSERT INTO births VALUES (?, ?, ?)",
+        [("서울", f"2023{m:02d}", m) for m in range(1, 13)]
+        + [("부산", f"2023{m:02d}", 1) for m in range(1, 13)],
+    )
+    source_row = {
+        "table_name": "births",
+        "value_unit": "명",
+        "short_desc_ko": "출생",
+        "geo_level": "시도",
+    }
+
+    results = {r.kind: r for r in build_rollups_for_table(conn, source_row)}
+
+    assert results["yearly"].rows == 2
+    row = conn.execute(
+        "SELECT 값, 연말값, 월수 FROM births_yearly WHERE 행정구역 = '서울'"
+    ).fetchone()
+    assert row == (78, 12, 12)
+    detail, _ = metadata_row(conn, "births_yearly")
+    assert detail["값"] == "연간 합계 (12개월 합)"
+
+    national = conn.execute(
+        "SELECT 값 FROM births_national WHERE 년월 = '202301'"
+    ).fetchone()
+    assert national == (2,)
+
+
+def test_yearly_rollup_has_no_sum_for_rates(conn):
+    conn.execute('CREATE TABLE employment ("행정구역" TEXT, "년월" TEXT, "값" REAL)')
+    conn.executemany(
+        "INSERT INTO employment VALUES (?, ?, ?)",
+        [("서울", f"2023{m:02d}", 60.0 + m) for m in range(1, 13)],
+    )
+    source_row = {"table_name": "employment", "value_unit": "%"}
+
+    results = {r.kind: r for r in build_rollups_for_table(conn, source_row)}
+
+    columns = [
+        r[1] for r in conn.execute("PRAGMA table_info(employment_yearly)").fetchall()
+    ]
+    assert "값" not in columns
+    assert {"평균값", "연말값"} <= set(columns)
+    assert conn.execute("SELECT 연말값 FROM employment_yearly").fetchone() == (72.0,)
+
+    detail, caution = metadata_row(conn, "employment_yearly")
+    assert "값" not in detail
+    assert "합계" not in detail.get("평균값", "")
+    assert "합계 컬럼 없음" in caution
+
+    assert results["national"].skipped
+
+
+def test_is_sido_level():
+    assert is_sido_level({"geo_level": "시도"})
+    assert is_sido_level({"geo_level": "전국, 시도"})
+    assert not is_sido_level({"geo_level": "시도, 시군구"})
+    assert not is_sido_level({"geo_level": "시군구"})
+    assert not is_sido_level({})
+
+
+def test_no_national_rollup_for_mixed_level_table(conn):
+    conn.execute('CREATE TABLE mixed ("행정구역" TEXT, "년도" TEXT, "값" INTEGER)')
+    conn.executemany(
+        "INSERT INTO mixed VALUES (?, ?, ?)",
+        [("서울특별시", "2023", 100), ("종로구", "2023", 10), ("중구", "2023", 20)],
+    )
+
+    labeled = build_rollups_for_table(
+        conn, {"table_name": "mixed", "value_unit": "명", "geo_level": "시도, 시군구"}
+    )
+    [national] = [r for r in labeled if r.kind == "national"]
+    assert national.skipped
+    assert national.rows == 0
+
+    conn.executemany(
+        "INSERT INTO mixed VALUES (?, '2023', 1)", [(f"구{i}",) for i in range(20)]
+    )
+    many_regions = build_rollups_for_table(
+        conn, {"table_name": "mixed", "value_unit": "명", "geo_level": "시도"}
+    )
+    [national] = [r for r in many_regions if r.kind == "national"]
+    assert "시도보다 많음" in national.skipped
+    tables = conn.execute(
+        "SELECT name FROM sqlite_master WHERE name = 'mixed_national'"
+    ).fetchall()
+    assert tables == []
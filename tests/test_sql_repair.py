@@ -0,0 +1,140 @@
+"""database/sql_repair.py 테스트 (규칙 기반 SQL 자동 수정)"""
+
+from database.sql_repair import (
+    add_region_filter,
+    close_unbalanced,
+    fix_from_db_error,
+    replace_date_functions,
+    repair_sql,
+    strip_markdown,
+)
+from database.sql_validator import TableSchema, check_schema
+
+SCHEMA = {
+    "population": TableSchema(
+        columns={"행정구역", "행정구역별(읍면동)", "년월", "값"},
+        period_column="년월",
+        period_start="2020-01",
+        period_end="2024-12",
+    ),
+    "population_national": TableSchema(columns={"행정구역", "년월", "값"}),
+    "pop_age": TableSchema(columns={"행정구역", "년도", "연령대", "값"}),
+}
+
+
+def value_lookup(table, column):
+    return {"서울특별시", "부산광역시"} if column == "행정구역" else None
+
+
+def test_strip_markdown():
+    fixed, fixes = strip_markdown("```sql\nSELECT 값 FROM population;\n```")
+
+    assert fixed == "SELECT 값 FROM population;"
+    assert fixes
+    assert strip_markdown("SQL: SELECT 1")[0] == "SELECT 1"
+    assert strip_markdown("SELECT 1") == ("SELECT 1", [])
+
+
+def test_strip_markdown_wrapping_quotes():
+    assert strip_markdown('"SELECT 값 FROM population"')[0] == "SELECT 값 FROM population"
+    assert strip_markdown("`SELECT 1`")[0] == "SELECT 1"
+    assert strip_markdown("SQL: 'SELECT 값 FROM t WHERE 행정구역 = '서울''")[0] == (
+        "SELECT 값 FROM t WHERE 행정구역 = '서울'"
+    )
+    sql = "SELECT 값 FROM t WHERE 행정구역 = '서울'"
+    assert strip_markdown(sql) == (sql, [])
+    assert strip_markdown("'서울'") == ("'서울'", [])
+
+
+def test_close_unbalanced():
+    fixed, fixes = close_unbalanced("SELECT 값 FROM population WHERE 년월 IN ('2023-01'")
+
+    assert fixed == "SELECT 값 FROM population WHERE 년월 IN ('2023-01');"
+    assert fixes
+    assert close_unbalanced("SELECT 1") == ("SELECT 1", [])
+
+
+def test_replace_date_functions():
+    fixed, fixes = replace_date_functions(
+        "SELECT YEAR(년월), MONTH(년월) FROM population"
+    )
+
+    assert fixed == "SELECT substr(년월, 1, 4), substr(년월, 6, 2) FROM population"
+    assert fixes
+    sql = "SELECT YEAR(DATE(년월)) FROM population"
+    assert replace_date_functions(sql) == (sql, [])
+
+
+def test_add_region_filter():
+    sql = "SELECT 값 FROM population WHERE 년월 = '2023-12' OR 년월 = '2022-12'"
+
+    fixed, fixes = add_region_filter(sql, SCHEMA, "2023년 시도별 인구")
+
+    assert fixed == (
+        "SELECT 값 FROM population WHERE 행정구역 != '전국' AND "
+        "(년월 = '2023-12' OR 년월 = '2022-12')"
+    )
+    assert fixes
+
+
+def test_add_region_filter_before_group_by():
+    sql = "SELECT 행정구역, SUM(값) FROM population GROUP BY 행정구역;"
+
+    fixed, _ = add_region_filter(sql, SCHEMA, "시도별 인구 합계")
+
+    assert fixed == (
+        "SELECT 행정구역, SUM(값) FROM population WHERE 행정구역 != '전국' "
+        "GROUP BY 행정구역;"
+    )
+
+
+def test_add_region_filter_leaves_sql_alone():
+    queries = [
+        ("SELECT 값 FROM population", "전국 인구"),
+        ("SELECT 값 FROM population WHERE 행정구역 = '서울특별시'", "서울 인구"),
+        ("SELECT 값 FROM population_national", "인구"),
+        ("SELECT 값 FROM population WHERE 값 > (SELECT AVG(값) FROM population)", "인구"),
+        ("SELECT p.값 FROM population p JOIN pop_age a USING (행정구역)", "인구"),
+    ]
+    for sql, question in queries:
+        assert add_region_filter(sql, SCHEMA, question) == (sql, []), sql
+
+
+def test_fix_from_db_error():
+    sql = "SELECT 행정구, 값 FROM population"
+
+    fixed, fixes = fix_from_db_error(sql, SCHEMA, "", "no such column: 행정구")
+
+    assert fixed == "SELECT 행정구역, 값 FROM population"
+    assert fixes
+    assert fix_from_db_error(sql, SCHEMA, "", "database is locked") == (sql, [])
+
+
+def test_repair_sql_proactive_fixes_validator_issues():
+    sql = (
+        "```sql\nSELECT 값 FROM populaton WHERE 행정구역별(읍면동) = '제주' "
+        "AND 행정구역 = '서울' AND 년월 = '202312'\n```"
+    )
+
+    fixed, fixes = repair_sql(sql, SCHEMA, "서울 인구", value_lookup=value_lookup)
+
+    assert fixed == (
+        "SELECT 값 FROM population WHERE \"행정구역별(읍면동)\" = '제주' "
+        "AND 행정구역 = '서울특별시' AND 년월 = '2023-12'"
+    )
+    assert len(fixes) >= 4
+    assert check_schema(fixed, SCHEMA, value_lookup) == []
+
+
+def test_repair_sql_keeps_valid_sql():
+    sql = "SELECT 값 FROM population WHERE 행정구역 = '서울특별시' AND 년월 = '2023-12'"
+
+    assert repair_sql(sql, SCHEMA, "서울 인구", value_lookup=value_lookup) == (sql, [])
+
+
+def test_repair_sql_by_error_kind():
+    sql = "SELECT 값 FROM population WHERE 년월 = '202312'"
+
+    assert repair_sql(sql, SCHEMA, error_kind="other") == (sql, [])
+    fixed, _ = repair_sql(sql, SCHEMA, error_kind="value")
+    assert fixed.endswith("'2023-12'")
@@ -0,0 +1,254 @@
+"""database/sql_validator.py 테스트 (정상 SQL 통과 / 확실한 오류 보고)"""
+
+import pytest
+
+from database.sql_validator import (
+    TableSchema,
+    check_schema,
+    check_syntax,
+    closest_value,
+    find_schema_issues,
+    normalize_period,
+    schema_from_detail,
+)
+
+SCHEMA = {
+    "population": TableSchema(
+        columns={"행정구역", "행정구역별(읍면동)", "년월", "항목", "값"},
+        period_column="년월",
+        period_start="2020-01",
+        period_end="2024-12",
+    ),
+    "birth": TableSchema(
+        columns={"행정구역", "년도", "값"},
+        period_column="년도",
+        period_start="2015",
+        period_end="2023",
+    ),
+    "pop_age": TableSchema(columns={"행정구역", "년도", "연령대", "값"}),
+    "pop_age_age_decade": TableSchema(columns={"행정구역", "년도", "연령대", "값"}),
+}
+
+REGIONS = {"서울특별시", "부산광역시", "충청남도", "충청북도"}
+
+
+def value_lookup(table, column):
+    return REGIONS if column == "행정구역" else None
+
+
+VALID_SQL = [
+    # JOIN + 별칭
+    "SELECT p.행정구역, p.값, b.값 AS 출생아수 FROM population p "
+    "JOIN birth b ON p.행정구역 = b.행정구역 "
+    "WHERE p.년월 = '2023-12' AND b.년도 = '2023'",
+    "SELECT population.값 FROM population LEFT JOIN birth USING (행정구역)",
+    "SELECT a.값, b.값 FROM birth a, birth b WHERE a.행정구역 = b.행정구역",
+    # CTE
+    "WITH s AS (SELECT 행정구역, SUM(값) AS total FROM birth "
+    "WHERE 년도 BETWEEN '2020' AND '2023' GROUP BY 행정구역) "
+    "SELECT 행정구역, total FROM s ORDER BY total DESC LIMIT 5",
+    "WITH t(region, v) AS (SELECT 행정구역, 값 FROM birth) SELECT region, v FROM t",
+    "WITH a AS (SELECT 값 FROM birth WHERE 년도 = '2022'), "
+    "b AS (SELECT 값 FROM birth WHERE 년도 = '2023') "
+    "SELECT b.값 - a.값 AS 증감 FROM a, b",
+    # 윈도우 함수
+    "SELECT 행정구역, 년도, 값, LAG(값) OVER (PARTITION BY 행정구역 ORDER BY 년도) "
+    "AS prev, RANK() OVER (ORDER BY 값 DESC) rnk FROM birth",
+    "SELECT 년도, SUM(값) OVER (ORDER BY 년도 ROWS BETWEEN 2 PRECEDING "
+    "AND CURRENT ROW) AS 이동합계 FROM birth",
+    # UNION
+    "SELECT 행정구역, 값 FROM birth WHERE 년도 = '2022' "
+    "UNION ALL SELECT 행정구역, 값 FROM birth WHERE 년도 = '2023'",
+    # 괄호가 든 컬럼명 (큰따옴표)
+    'SELECT "행정구역별(읍면동)", 값 FROM population '
+    "WHERE \"행정구역별(읍면동)\" = '제주특별자치도'",
+    # 서브쿼리 / 스칼라 서브쿼리 / CASE
+    "SELECT t.행정구역, t.합계 FROM (SELECT 행정구역, SUM(값) AS 합계 "
+    "FROM birth GROUP BY 행정구역) t",
+    "SELECT 행정구역, 값 * 100.0 / (SELECT SUM(값) FROM birth WHERE 년도 = '2023') "
+    "AS 비중 FROM birth WHERE 년도 = '2023'",
+    "SELECT CASE WHEN 값 > 100 THEN '많음' ELSE '적음' END AS 구분 FROM birth",
+    "SELECT 행정구역 FROM birth WHERE 값 > (SELECT AVG(값) FROM birth)",
+    # 함수, 기간 IN, 주석, 세미콜론이 든 문자열, 소문자
+    "SELECT substr(년월, 1, 4) AS 연도, CAST(값 AS REAL), ROUND(AVG(값), 1) "
+    "FROM population GROUP BY substr(년월, 1, 4)",
+    "SELECT 값 FROM population WHERE 년월 IN ('2023-01', '2023-02')",
+    "-- 2023년 출생\nSELECT 값 FROM birth /* 연도 */ WHERE 년도 = '2023';",
+    "SELECT 값 FROM population WHERE 항목 = '인구;세대'",
+    "select 행정구역, 값 from birth where 년도 = '2023' order by 값 desc",
+    # 따옴표 별칭, HAVING, EXISTS, FILTER, 순번 GROUP BY
+    'SELECT SUM(값) AS "총 출생아" FROM birth ORDER BY "총 출생아" DESC',
+    "SELECT 행정구역, SUM(값) AS 합계 FROM birth GROUP BY 1 HAVING 합계 > 100",
+    "SELECT 행정구역 FROM birth b WHERE EXISTS "
+    "(SELECT 1 FROM population p WHERE p.행정구역 = b.행정구역)",
+    "SELECT COALESCE(NULLIF(값, 0), 1), IIF(값 > 0, 'Y', 'N'), "
+    "COUNT(*) FILTER (WHERE 값 > 0) FROM birth",
+    # 롤업 테이블의 연령대 묶음, 원본 테이블의 5세 단위 값
+    "SELECT 값 FROM pop_age_age_decade WHERE 연령대 = '20대'",
+    "SELECT SUM(값) FROM pop_age WHERE 연령대 IN ('20-24', '25-29')",
+    # 범주 값 사전에 있는 값
+    "SELECT 값 FROM birth WHERE 행정구역 IN ('서울특별시', '부산광역시')",
+    # 목록에 없는 SQLite 함수, 년월 앞부분(연도)으로 범위 비교
+    "SELECT trunc(값 / 1000.0), ifnull(값, 0) FROM birth",
+    "SELECT 값 FROM population WHERE 년월 >= '2023' AND 년월 < '2024'",
+    "SELECT 값 FROM population WHERE 년월 BETWEEN '2023' AND '2023-12'",
+]
+
+
+@pytest.mark.parametrize("sql", VALID_SQL)
+def test_valid_sql_passes(sql):
+    assert check_syntax(sql) == []
+    assert check_schema(sql, SCHEMA, value_lookup) == []
+
+
+@pytest.mark.parametrize(
+    "sql, expected",
+    [
+        ("", "비어"),
+        ("DELETE FROM birth", "SELECT/WITH"),
+        ("SELECT 1; SELECT 2", "1개만"),
+        ("SELECT 값 FROM birth WHERE 행정구역 = '서울", "작은따옴표"),
+        ("SELECT SUM(값 FROM birth", "닫히지 않은 괄호"),
+        ("SELECT 값) FROM birth", "여는 괄호 없이"),
+        ("SELECT 값 FROM birth WHERE", "WHERE"),
+        ("SELECT 값, FROM birth", "쉼표"),
+        ("SELECT , 값 FROM birth", "쉼표 앞에"),
+    ],
+)
+def test_syntax_errors(sql, expected):
+    errors = check_syntax(sql)
+
+    assert errors and expected in errors[0]
+
+
+def issue_of(sql, kind):
+    issues = find_schema_issues(sql, SCHEMA, value_lookup)
+    matching = [issue for issue in issues if issue.kind == kind]
+    assert matching, issues
+    return matching[0]
+
+
+def apply_edits(sql, issue):
+    for start, end, text in sorted(issue.edits, reverse=True):
+        sql = sql[:start] + text + sql[end:]
+    return sql
+
+
+def test_unknown_table_is_fixed():
+    sql = "SELECT 값 FROM births"
+    issue = issue_of(sql, "table")
+
+    assert "births" in issue.message
+    assert apply_edits(sql, issue) == "SELECT 값 FROM birth"
+
+
+def test_unknown_column():
+    issue = issue_of("SELECT 인구 FROM birth", "column")
+
+    assert "인구" in issue.message
+
+
+def test_unknown_qualified_column():
+    issue = issue_of("SELECT b.인구수 FROM birth b", "column")
+
+    assert "birth.인구수" in issue.message
+
+
+def test_unknown_qualifier():
+    issue = issue_of("SELECT x.값 FROM birth b", "qualifier")
+
+    assert "x" in issue.message
+
+
+def test_non_sqlite_function():
+    issue = issue_of("SELECT YEAR(년월) FROM population", "function")
+
+    assert "substr" in issue.message
+
+
+def test_year_prefix_needs_range_operator():
+    issue = issue_of("SELECT 값 FROM population WHERE 년월 = '2023'", "value")
+
+    assert "'2020-01' 형태" in issue.message
+    assert issue_of("SELECT 값 FROM population WHERE 년월 > '2023-1'", "value")
+
+
+def test_unquoted_paren_column_is_fixed():
+    sql = "SELECT 값 FROM population WHERE 행정구역별(읍면동) = '제주특별자치도'"
+    issue = issue_of(sql, "quote_column")
+
+    fixed = apply_edits(sql, issue)
+    assert '"행정구역별(읍면동)"' in fixed
+    assert check_schema(fixed, SCHEMA, value_lookup) == []
+
+
+def test_double_quoted_string_value():
+    sql = 'SELECT 값 FROM birth WHERE 행정구역 = "서울특별시"'
+    issue = issue_of(sql, "string_quote")
+
+    assert apply_edits(sql, issue).endswith("= '서울특별시'")
+
+
+def test_period_format_is_fixed():
+    sql = "SELECT 값 FROM population WHERE 년월 = '202312'"
+    issue = issue_of(sql, "value")
+
+    assert apply_edits(sql, issue).endswith("'2023-12'")
+
+
+def test_period_out_of_range():
+    issue = issue_of("SELECT 값 FROM birth WHERE 년도 = '2030'", "value")
+
+    assert "2015 ~ 2023" in issue.message
+
+
+def test_age_value_with_unit_is_fixed():
+    sql = "SELECT 값 FROM pop_age WHERE 연령대 = '20-24세'"
+    issue = issue_of(sql, "value")
+
+    assert apply_edits(sql, issue).endswith("'20-24'")
+
+
+def test_age_decade_on_source_table():
+    issue = issue_of("SELECT 값 FROM pop_age WHERE 연령대 = '20대'", "value")
+
+    assert "_age_decade" in issue.message
+
+
+def test_unknown_category_value_is_fixed():
+    sql = "SELECT 값 FROM birth WHERE 행정구역 = '서울'"
+    issue = issue_of(sql, "value")
+
+    assert apply_edits(sql, issue).endswith("'서울특별시'")
+
+
+def test_ambiguous_category_value_is_not_fixed():
+    issue = issue_of("SELECT 값 FROM birth WHERE 행정구역 = '충청'", "value")
+
+    assert issue.edits == []
+
+
+def test_schema_from_detail():
+    schema = schema_from_detail(
+        {
+            "columns": "행정구역, 년월, 값",
+            "column_detail": {"항목": "설명"},
+            "period_column": "년월",
+            "period": "2020-01 ~ 2024-12",
+        }
+    )
+
+    assert schema.columns == {"행정구역", "년월", "값", "항목"}
+    assert (schema.period_start, schema.period_end) == ("2020-01", "2024-12")
+    empty = schema_from_detail({"columns": "값", "period": "None ~ None"})
+    assert empty.period_start == ""
+
+
+def test_normalize_period_and_closest_value():
+    assert normalize_period("2024-1", "2020-01") == "2024-01"
+    assert normalize_period("202401", "2020-01") == "2024-01"
+    assert normalize_period("2024년 1월", "2020-01") == "2024-01"
+    assert normalize_period("2024", "2020-01") is None
+
+    assert closest_value("충남", REGIONS) == "충청남도"
+    assert closest_value("충청", REGIONS) is None
@@ -0,0 +1,148 @@
+"""database/value_dictionary.py 테스트 (범주 값 스캔, 불완전 사전 처리)"""
+
+import sqlite3
+import threading
+from types import MappingProxyType, SimpleNamespace
+
+import pytest
+
+import database.metadata_manager as metadata_manager
+import database.sql_validator as sql_validator
+from database.query_result import QueryResult
+from database.sql_validator import check_schema, schema_for_tables
+from database.value_dictionary import (
+    ValueDictionary,
+    build_table_values,
+    categorical_columns,
+    scan_sql,
+)
+
+DETAIL = {
+    "table_name": "population",
+    "columns": "행정구역, 항목, 년월, 값",
+    "period_column": "년월",
+}
+
+ROWS = [
+    ("서울특별시", "총인구수", "2020-01", "2024-12"),
+    ("부산광역시", "총인구수", "2021-01", "2024-06"),
+]
+
+
+def run_rows(truncated=False):
+    def run(sql, max_rows):
+        return QueryResult.from_rows(["a", "b", "c", "d"], ROWS, truncated=truncated)
+
+    return run
+
+
+@pytest.fixture
+def dictionary(monkeypatch):
+    monkeypatch.setattr(ValueDictionary, "ensure_current", lambda self: None)
+    dictionary = ValueDictionary(run=None, path=None, prompt_values=1)
+    complete = build_table_values(run_rows(), DETAIL, "c1", 300, 100)
+    partial = build_table_values(
+        run_rows(truncated=True), dict(DETAIL, table_name="partial"), "c2", 300, 2
+    )
+    dictionary._tables = MappingProxyType(
+        {"population": complete, "partial": partial}
+    )
+    return dictionary
+
+
+def test_categorical_columns_and_scan_sql():
+    assert categorical_columns(DETAIL) == ["행정구역", "항목"]
+    assert scan_sql("population", ["행정구역"], "년월") == (
+        'SELECT "행정구역", MIN("년월"), MAX("년월") '
+        'FROM "population" GROUP BY "행정구역"'
+    )
+
+
+def test_build_table_values():
+    values = build_table_values(run_rows(), DETAIL, "c1", 300, 100)
+
+    assert values.values["행정구역"] == {"서울특별시", "부산광역시"}
+    assert (values.period_min, values.period_max) == ("2020-01", "2024-12")
+    assert values.complete
+
+
+def test_columns_with_too_many_values_are_dropped():
+    values = build_table_values(run_rows(), DETAIL, "c1", 1, 100)
+
+    assert "행정구역" not in values.values
+    assert "항목" in values.values
+
+
+def test_incomplete_tables_are_not_used_for_checks(dictionary):
+    assert dictionary.lookup("population", "행정구역") == {"서울특별시", "부산광역시"}
+    assert dictionary.lookup("partial", "행정구역") is None
+    assert dictionary.periods() == {"population": ("2020-01", "2024-12")}
+
+
+def test_prompt_hint_marks_partial_values(dictionary):
+    complete = dictionary.prompt_hint("population")
+    partial = dictionary.prompt_hint("partial")
+
+    assert complete.startswith("실제 값: ")
+    assert "외 1개" in complete
+    assert "실제 기간: 2020-01 ~ 2024-12" in complete
+    assert partial.startswith("실제 값 일부")
+    assert "실제 기간" not in partial
+    assert dictionary.prompt_hint("missing") == ""
+
+
+def test_data_reload_rescans_before_checking_new_months(monkeypatch):
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.execute('CREATE TABLE population ("행정구역" TEXT, "년월" TEXT, "값" INTEGER)')
+    conn.execute("INSERT INTO population VALUES ('서울특별시', '2024-12', 1)")
+    detail = {
+        "table_name": "population",
+        "columns": "행정구역, 년월, 값",
+        "period_column": "년월",
+        "period": "2020-01 ~ 2024-12",
+    }
+    snapshot = SimpleNamespace(
+        version=1, details={"population": detail}, rows={"population": detail}
+    )
+    monkeypatch.setattr(
+        metadata_manager,
+        "get_metadata_manager",
+        lambda: SimpleNamespace(snapshot=snapshot),
+    )
+    monkeypatch.setattr(sql_validator, "get_catalog_schema", dict)
+
+    scan_allowed = threading.Event()
+    scan_allowed.set()
+
+    def run(sql, max_rows):
+        scan_allowed.wait(5)
+        cursor = conn.execute(sql)
+        columns = [c[0] for c in cursor.description]
+        return QueryResult.from_cursor(columns, cursor, max_rows)
+
+    load_version = ["1"]
+    dictionary = ValueDictionary(run=run, data_version_fn=lambda: load_version[0])
+
+    def errors(sql):
+        dictionary.ensure_current()
+        dictionary._build_thread.join()
+        schema = schema_for_tables([detail], dictionary.periods())
+        return check_schema(sql, schema, dictionary.lookup)
+
+    new_month = (
+        "SELECT 값 FROM population WHERE 행정구역 = '부산광역시' AND 년월 = '2025-01'"
+    )
+    assert errors(new_month)
+
+    # 적재 + mark_data_loaded → 다시 스캔하기 전에는 이전 사전을 쓰지 않음
+    conn.execute("INSERT INTO population VALUES ('부산광역시', '2025-01', 2)")
+    scan_allowed.clear()
+    load_version[0] = "2"
+    assert dictionary.lookup("population", "행정구역") is None
+    assert "population" not in dictionary.periods()
+    assert dictionary.prompt_hint("population") == ""
+    scan_allowed.set()
+
+    assert errors(new_month) == []
+    assert dictionary.periods()["population"] == ("2024-12", "2025-01")
+    assert dictionary.stats()["data_version"] == "2"
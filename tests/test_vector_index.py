@@ -0,0 +1,138 @@
+"""database/vector_index.py 테스트 (NumPy 검색 결과를 Chroma 검색과 비교)"""
+
+import random
+from types import SimpleNamespace
+
+import chromadb
+import pytest
+from langchain_chroma import Chroma
+
+import database.metadata_manager as metadata_manager
+import database.vector_db as vector_db
+from database.vector_index import NumpyVectorIndex
+
+DIM = 8
+TOPICS = ["인구", "고용", "출생"]
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = random.Random(7)
+    names = [f"table_{i:02d}" for i in range(30)]
+    vectors = [[rng.uniform(-1, 1) for _ in range(DIM)] for _ in names]
+    topics = [TOPICS[i % len(TOPICS)] for i in range(len(names))]
+    queries = [[rng.uniform(-1, 1) for _ in range(DIM)] for _ in range(5)]
+    return names, vectors, topics, queries
+
+
+def chroma_store(corpus, space):
+    names, vectors, topics, _ = corpus
+    store = Chroma(
+        collection_name=f"tables_{space}",
+        client=chromadb.EphemeralClient(),
+        collection_metadata={"hnsw:space": space},
+    )
+    store._collection.upsert(
+        ids=names,
+        embeddings=vectors,
+        metadatas=[{"table_name": n, "topic_main": t} for n, t in zip(names, topics)],
+        documents=names,
+    )
+    return store
+
+
+def chroma_search(store, vector, k, topic_main=None):
+    result = store._collection.query(
+        query_embeddings=[vector],
+        n_results=k,
+        where={"topic_main": topic_main} if topic_main else None,
+        include=["metadatas", "distances"],
+    )
+    return [
+        (meta["table_name"], distance)
+        for meta, distance in zip(result["metadatas"][0], result["distances"][0])
+    ]
+
+
+def assert_same_results(actual, expected):
+    assert [name for name, _ in actual] == [name for name, _ in expected]
+    for (_, got), (_, want) in zip(actual, expected):
+        assert got == pytest.approx(want, rel=1e-4, abs=1e-4)
+
+
+@pytest.mark.parametrize("space", ["l2", "cosine"])
+def test_search_matches_chroma(corpus, space):
+    store = chroma_store(corpus, space)
+    index = NumpyVectorIndex.from_chroma(store)
+
+    assert index.space == space
+    assert len(index) == 30
+    for query in corpus[3]:
+        assert_same_results(index.search(query, k=5), chroma_search(store, query, 5))
+
+
+@pytest.mark.parametrize("space", ["l2", "cosine"])
+def test_topic_filter_matches_chroma(corpus, space):
+    store = chroma_store(corpus, space)
+    index = NumpyVectorIndex.from_chroma(store)
+
+    for query in corpus[3]:
+        results = index.search(query, k=4, topic_main="고용")
+        assert_same_results(results, chroma_search(store, query, 4, "고용"))
+        assert all(int(name[-2:]) % 3 == 1 for name, _ in results)
+
+
+def test_search_orders_by_distance():
+    index = NumpyVectorIndex(
+        ["far", "near", "mid"], [[3.0, 0.0], [1.0, 0.1], [2.0, 0.0]], ["a", "a", "b"]
+    )
+
+    results = index.search([1.0, 0.0], k=3)
+
+    assert [name for name, _ in results] == ["near", "mid", "far"]
+    assert results[0][1] == pytest.approx(0.01)
+    assert index.search([1.0, 0.0], k=1) == results[:1]
+
+
+def test_cosine_ignores_vector_length():
+    index = NumpyVectorIndex(
+        ["long", "angled"], [[10.0, 0.0], [1.0, 1.0]], [None, None], space="cosine"
+    )
+
+    results = index.search([2.0, 0.0], k=2)
+
+    assert [name for name, _ in results] == ["long", "angled"]
+    assert results[0][1] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_unknown_topic_and_empty_k():
+    index = NumpyVectorIndex(["a"], [[1.0, 0.0]], ["인구"])
+
+    assert index.search([1.0, 0.0], k=3, topic_main="없는 주제") == []
+    assert index.search([1.0, 0.0], k=0) == []
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        NumpyVectorIndex(["a"], [[1.0]], [None], space="dot")
+    with pytest.raises(ValueError):
+        NumpyVectorIndex(["a", "b"], [[1.0]], [None, None])
+
+
+def test_get_numpy_index_reloads_on_new_version_or_count(corpus, monkeypatch):
+    store = chroma_store(corpus, "l2")
+    manager = SimpleNamespace(version=1)
+    monkeypatch.setattr(vector_db, "get_vectorstore", lambda: store)
+    monkeypatch.setattr(metadata_manager, "get_metadata_manager", lambda: manager)
+
+    first = vector_db.get_numpy_index()
+    assert vector_db.get_numpy_index() is first
+
+    manager.version = 2
+    second = vector_db.get_numpy_index()
+    assert second is not first
+
+    store._collection.delete(ids=["table_00"])
+    third = vector_db.get_numpy_index()
+    assert third is not second
+    assert len(third) == 29
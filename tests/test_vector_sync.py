@@ -0,0 +1,133 @@
+"""database/vector_db.py 벡터 DB 증분 동기화 테스트 (짧은 문서 해시 비교)"""
+
+from typing import List
+
+import pytest
+from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
+
+import database.metadata_manager as metadata_manager
+import database.vector_db as vector_db
+from config.settings import settings
+
+
+class RecordingEmbeddings(Embeddings):
+    """임베딩한 문서를 기록하는 가짜 임베딩"""
+
+    def __init__(self):
+        self.documents = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.documents.extend(texts)
+        return [[float(len(text)), 1.0, 0.5] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [float(len(text)), 1.0, 0.5]
+
+
+class FakeManager:
+    """MetadataManager 대신 짧은 문서와 필터용 메타데이터만 제공"""
+
+    def __init__(self, tables):
+        self.tables = tables  # {테이블명: (짧은 문서, topic_main)}
+
+    def get_table_names(self):
+        return list(self.tables)
+
+    def get_short_doc(self, table_name):
+        return self.tables[table_name][0]
+
+    @property
+    def _cache(self):
+        return {
+            name: {
+                "topic_main": topic,
+                "topic_sub": "",
+                "keywords_ko": "",
+                "period_start": "2020",
+                "period_end": "2023",
+                "geo_level": "시도",
+            }
+            for name, (_, topic) in self.tables.items()
+        }
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    manager = FakeManager(
+        {
+            "population": ("시도별 주민등록인구", "인구"),
+            "births": ("시도별 출생아 수", "인구"),
+            "employment": ("시도별 고용률", "고용"),
+        }
+    )
+    embeddings = RecordingEmbeddings()
+    monkeypatch.setenv("VECTOR_DB_DIR", str(tmp_path / "embedding_db"))
+    monkeypatch.setattr(settings, "EMBEDDING_CHECKPOINT_DIR", "")
+    monkeypatch.setattr(metadata_manager, "get_metadata_manager", lambda: manager)
+    monkeypatch.setattr(vector_db, "get_passage_embeddings", lambda: embeddings)
+    return manager, embeddings
+
+
+def stored_ids():
+    store = Chroma(persist_directory=settings.VECTOR_DB_DIR)
+    return sorted(store._collection.get(include=[])["ids"])
+
+
+def test_first_sync_adds_everything(env):
+    _, embeddings = env
+
+    result = vector_db.sync_embedding_db()
+
+    assert sorted(result["added"]) == ["births", "employment", "population"]
+    assert result["changed"] == result["removed"] == result["unchanged"] == []
+    assert len(embeddings.documents) == 3
+    assert stored_ids() == ["births", "employment", "population"]
+
+
+def test_unchanged_tables_are_not_reembedded(env):
+    _, embeddings = env
+    vector_db.sync_embedding_db()
+    embeddings.documents.clear()
+
+    result = vector_db.sync_embedding_db()
+
+    assert sorted(result["unchanged"]) == ["births", "employment", "population"]
+    assert embeddings.documents == []
+
+
+def test_only_added_changed_and_removed_tables_are_touched(env):
+    manager, embeddings = env
+    vector_db.sync_embedding_db()
+    embeddings.documents.clear()
+    manager.tables["births"] = ("시도별 출생아 수와 합계출산율", "인구")
+    manager.tables["employment"] = ("시도별 고용률", "노동")  # 메타데이터만 변경
+    del manager.tables["population"]
+    manager.tables["housing"] = ("시도별 주택 수", "주거")
+
+    result = vector_db.sync_embedding_db()
+
+    assert result == {
+        "added": ["housing"],
+        "changed": ["births", "employment"],
+        "removed": ["population"],
+        "unchanged": [],
+    }
+    assert sorted(embeddings.documents) == sorted(
+        ["시도별 출생아 수와 합계출산율", "시도별 고용률", "시도별 주택 수"]
+    )
+    assert stored_ids() == ["births", "employment", "housing"]
+
+
+def test_embedding_model_change_reembeds_everything(env, monkeypatch):
+    _, embeddings = env
+    vector_db.sync_embedding_db()
+    embeddings.documents.clear()
+    monkeypatch.setattr(
+        vector_db, "get_embedding_namespace", lambda kind: f"other:{kind}"
+    )
+
+    result = vector_db.sync_embedding_db()
+
+    assert sorted(result["changed"]) == ["births", "employment", "population"]
+    assert len(embeddings.documents) == 3
@@ -74,6 +74,11 @@ SQL: SELECT (SELECT 값 FROM population_gender_stats WHERE 행정구역 = '전
    - 예: "행정구역별(읍면동)", "종사상지위별(2)", "연령계층별(5세)"
    - 올바른 예: WHERE "행정구역별(읍면동)" = '제주특별자치도'
    - 잘못된 예: WHERE 행정구역별(읍면동) = '제주특별자치도'
+10. **롤업 테이블 (미리 집계된 테이블) 우선**:
+   - 테이블 정보에 _age_decade 테이블이 있으면 연령대 = '20대', 연령대 = '60대 이상'으로 조회 (IN 나열, SUM 불필요)
+   - _yearly 테이블은 연도별 집계 (년도, 값=연간 합계, 평균값=월평균, 연말값=마지막 월 값). 비율/평균 등 합산할 수 없는 단위는 값 컬럼이 없으므로 평균값 또는 연말값 사용
+   - _national 테이블은 시도별 값을 합산한 전국 합계 (행정구역 = '전국')
+   - 롤업 테이블이 없을 때만 규칙 2, 3처럼 원본 테이블에서 직접 집계
 
 ## 멀티턴 대화 처리:
 - 이전 대화에서 언급된 지역/연도/항목/테이블을 현재 질문에 반영하세요